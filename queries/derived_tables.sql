@@ -0,0 +1,521 @@
+-- =====================================================================================
+-- PHANTOM SEC Compliance Analytics POC - Derived Tables
+-- =====================================================================================
+-- Pre-aggregated and derived tables built by the generators (or rebuilt with
+-- scripts/rollups.py) next to the Bronze JSON files. Run after snowflake_setup.sql,
+-- in the same database, schema and stage.
+--
+-- Execute sections in order:
+-- 1. Rollup Table Creation
+-- 2. Revenue Snapshot Table Creation
+-- 3. Cohort Retention Table Creation
+-- 4. Customer Snapshot Table Creation
+-- 5. Date Dimension Table Creation
+-- 6. SCD Type 2 History Table Creation
+-- 7. Data Loading Commands
+-- =====================================================================================
+
+USE DATABASE PHANTOM_SEC_POC;
+USE SCHEMA BRONZE;
+
+-- =====================================================================================
+-- 1. CREATE ROLLUP TABLES
+-- =====================================================================================
+-- Measures are additive: averages are stored as a sum plus a count so any coarser
+-- grain can be re-aggregated (e.g. SUM(total_automation_level) / SUM(adoption_count)).
+
+-- AGG_SUBSCRIPTIONS_MONTHLY (month x segment x product tier)
+-- Subscription events rolled up for "ARR by segment by quarter" style questions
+CREATE OR REPLACE TABLE AGG_SUBSCRIPTIONS_MONTHLY (
+    event_month DATE NOT NULL,
+    segment VARCHAR(20),
+    product_tier VARCHAR(20) NOT NULL,
+    event_count INTEGER NOT NULL,
+    new_events INTEGER NOT NULL,
+    expansion_events INTEGER NOT NULL,
+    churn_events INTEGER NOT NULL,
+    total_mrr INTEGER NOT NULL,
+    total_arr INTEGER NOT NULL,
+    new_arr INTEGER NOT NULL,
+    expansion_arr INTEGER NOT NULL,
+    churned_arr INTEGER NOT NULL,
+    total_contract_value INTEGER NOT NULL,
+    total_contract_months INTEGER NOT NULL
+);
+
+-- AGG_ADOPTIONS_FRAMEWORK_INDUSTRY (framework x industry x maturity)
+-- Framework adoptions rolled up for "hours saved by framework and industry" style questions
+CREATE OR REPLACE TABLE AGG_ADOPTIONS_FRAMEWORK_INDUSTRY (
+    framework_id INTEGER NOT NULL,
+    framework_name VARCHAR(50),
+    industry VARCHAR(50),
+    compliance_maturity VARCHAR(15),
+    adoption_count INTEGER NOT NULL,
+    certified_count INTEGER NOT NULL,
+    completed_count INTEGER NOT NULL,
+    total_hours_saved INTEGER NOT NULL,
+    total_implementation_cost INTEGER NOT NULL,
+    total_automation_level INTEGER NOT NULL,
+    total_audit_score INTEGER NOT NULL,
+    audit_score_count INTEGER NOT NULL,
+    FOREIGN KEY (framework_id) REFERENCES DIM_COMPLIANCE_FRAMEWORKS(framework_id)
+);
+
+-- AGG_ACTIVITIES_WEEKLY (week x framework x activity type)
+-- Compliance activities rolled up by the Monday starting each week
+CREATE OR REPLACE TABLE AGG_ACTIVITIES_WEEKLY (
+    activity_week DATE NOT NULL,
+    framework_id INTEGER NOT NULL,
+    framework_name VARCHAR(50),
+    activity_type VARCHAR(20) NOT NULL,
+    activity_count INTEGER NOT NULL,
+    automated_count INTEGER NOT NULL,
+    successful_count INTEGER NOT NULL,
+    evidence_count INTEGER NOT NULL,
+    total_duration_minutes INTEGER NOT NULL,
+    FOREIGN KEY (framework_id) REFERENCES DIM_COMPLIANCE_FRAMEWORKS(framework_id)
+);
+
+-- =====================================================================================
+-- 2. CREATE REVENUE SNAPSHOT TABLES
+-- =====================================================================================
+-- Built from FACT_SUBSCRIPTION_EVENTS by scripts/revenue_snapshots.py. Amounts are
+-- normalized to MRR by billing period (quarterly / 3, annual / 12, upfront / 24).
+
+-- FACT_MRR_DAILY (customer x day, only days with MRR > 0)
+-- Point-in-time MRR/ARR: filter to one snapshot_date, e.g. 2024-12-31 for ARR at end of Q4 2024
+CREATE OR REPLACE TABLE FACT_MRR_DAILY (
+    snapshot_date DATE NOT NULL,
+    customer_id INTEGER NOT NULL,
+    event_id INTEGER NOT NULL,
+    product_tier VARCHAR(20) NOT NULL,
+    mrr_amount DECIMAL(12,2) NOT NULL,
+    arr_amount DECIMAL(14,2) NOT NULL,
+    FOREIGN KEY (customer_id) REFERENCES DIM_CUSTOMERS(customer_id),
+    FOREIGN KEY (event_id) REFERENCES FACT_SUBSCRIPTION_EVENTS(event_id)
+);
+
+-- FACT_ARR_BRIDGE (one row per month)
+-- starting_arr + new_arr + reactivation_arr + expansion_arr - contraction_arr - churned_arr = ending_arr
+CREATE OR REPLACE TABLE FACT_ARR_BRIDGE (
+    bridge_month DATE PRIMARY KEY,
+    starting_arr DECIMAL(14,2) NOT NULL,
+    new_arr DECIMAL(14,2) NOT NULL,
+    reactivation_arr DECIMAL(14,2) NOT NULL,
+    expansion_arr DECIMAL(14,2) NOT NULL,
+    contraction_arr DECIMAL(14,2) NOT NULL,
+    churned_arr DECIMAL(14,2) NOT NULL,
+    ending_arr DECIMAL(14,2) NOT NULL,
+    starting_customers INTEGER NOT NULL,
+    new_customers INTEGER NOT NULL,
+    churned_customers INTEGER NOT NULL,
+    ending_customers INTEGER NOT NULL
+);
+
+-- =====================================================================================
+-- 3. CREATE COHORT RETENTION TABLE
+-- =====================================================================================
+-- Built from FACT_SUBSCRIPTION_EVENTS and DIM_CUSTOMERS by scripts/cohort_retention.py.
+-- Counts and MRR are additive, so rates across cohorts are re-derived from sums
+-- (e.g. SUM(retained_mrr) / SUM(starting_mrr) for NRR).
+
+-- FACT_COHORT_RETENTION (signup month x segment x months since signup)
+-- Measured at each month end; a customer joins the base once their first subscription event has happened
+CREATE OR REPLACE TABLE FACT_COHORT_RETENTION (
+    cohort_month DATE NOT NULL,
+    segment VARCHAR(20) NOT NULL,
+    months_since_signup INTEGER NOT NULL,
+    period_month DATE NOT NULL,
+    cohort_customers INTEGER NOT NULL,
+    retained_customers INTEGER NOT NULL,
+    starting_mrr DECIMAL(14,2) NOT NULL,
+    retained_mrr DECIMAL(14,2) NOT NULL,
+    gross_retained_mrr DECIMAL(14,2) NOT NULL,
+    logo_retention DECIMAL(6,4),
+    net_revenue_retention DECIMAL(10,4),
+    gross_revenue_retention DECIMAL(6,4),
+    PRIMARY KEY (cohort_month, segment, months_since_signup)
+);
+
+-- =====================================================================================
+-- 4. CREATE CUSTOMER SNAPSHOT TABLE
+-- =====================================================================================
+-- Written by the generators as a by-product (or rebuilt with scripts/customer_snapshot.py):
+-- the customer profile plus each customer's final subscription, adoption and activity state.
+
+-- DIM_CUSTOMER_SNAPSHOT (one row per customer)
+-- e.g. enterprise customers with 90%+ automation, or the current tier of churned accounts, without joining the facts
+CREATE OR REPLACE TABLE DIM_CUSTOMER_SNAPSHOT (
+    customer_id INTEGER PRIMARY KEY,
+    company_name VARCHAR(255) NOT NULL,
+    industry VARCHAR(50) NOT NULL,
+    segment VARCHAR(20) NOT NULL,
+    compliance_maturity VARCHAR(15) NOT NULL,
+    employee_count INTEGER NOT NULL,
+    signup_date DATE NOT NULL,
+    current_tier VARCHAR(20),
+    current_billing_period VARCHAR(20),
+    current_mrr INTEGER NOT NULL,
+    current_arr INTEGER NOT NULL,
+    is_churned BOOLEAN NOT NULL,
+    churn_date DATE,
+    first_subscription_date DATE,
+    last_event_date DATE,
+    last_event_type VARCHAR(20),
+    subscription_event_count INTEGER NOT NULL,
+    expansion_count INTEGER NOT NULL,
+    downgrade_count INTEGER NOT NULL,
+    frameworks_adopted INTEGER NOT NULL,
+    active_frameworks INTEGER NOT NULL,
+    completed_frameworks INTEGER NOT NULL,
+    certified_frameworks INTEGER NOT NULL,
+    adopted_framework_names VARCHAR(500),
+    avg_automation_level DECIMAL(5,1),
+    max_automation_level INTEGER,
+    total_hours_saved INTEGER NOT NULL,
+    total_implementation_cost INTEGER NOT NULL,
+    avg_audit_score DECIMAL(5,1),
+    activity_count INTEGER NOT NULL,
+    automated_activities INTEGER NOT NULL,
+    successful_activities INTEGER NOT NULL,
+    activity_automation_rate DECIMAL(5,1),
+    activity_success_rate DECIMAL(5,1),
+    total_activity_minutes INTEGER NOT NULL,
+    last_activity_date DATE,
+    FOREIGN KEY (customer_id) REFERENCES DIM_CUSTOMERS(customer_id)
+);
+
+-- =====================================================================================
+-- 5. CREATE DATE DIMENSION TABLE
+-- =====================================================================================
+-- Written by scripts/generate_date_dimension.py after the other generators: every day
+-- of the dataset's years with calendar, fiscal (February start) and business-day
+-- attributes. The semantic views join facts to it on the date column.
+
+-- DIM_DATE (one row per day)
+CREATE OR REPLACE TABLE DIM_DATE (
+    calendar_date DATE PRIMARY KEY,
+    date_key INTEGER NOT NULL UNIQUE,
+    year INTEGER NOT NULL,
+    quarter INTEGER NOT NULL,
+    quarter_name VARCHAR(7) NOT NULL,
+    month INTEGER NOT NULL,
+    month_name VARCHAR(9) NOT NULL,
+    year_month VARCHAR(7) NOT NULL,
+    iso_year INTEGER NOT NULL,
+    iso_week INTEGER NOT NULL,
+    week_start_date DATE NOT NULL,
+    day_of_month INTEGER NOT NULL,
+    day_of_year INTEGER NOT NULL,
+    day_of_week INTEGER NOT NULL,
+    day_name VARCHAR(9) NOT NULL,
+    is_weekend BOOLEAN NOT NULL,
+    is_holiday BOOLEAN NOT NULL,
+    holiday_name VARCHAR(50),
+    is_business_day BOOLEAN NOT NULL,
+    is_month_end BOOLEAN NOT NULL,
+    fiscal_year INTEGER NOT NULL,
+    fiscal_quarter INTEGER NOT NULL,
+    fiscal_quarter_name VARCHAR(12) NOT NULL,
+    fiscal_month INTEGER NOT NULL
+);
+
+-- =====================================================================================
+-- 6. CREATE SCD TYPE 2 HISTORY TABLES
+-- =====================================================================================
+-- Written by the generators as each transition is created (scripts/scd_history.py).
+-- A version is valid from valid_from (inclusive) to valid_to (exclusive); the current
+-- version has valid_to = 9999-12-31, so an as-of query is one range predicate:
+--   WHERE valid_from <= '2023-06-30' AND valid_to > '2023-06-30'
+
+-- DIM_ADOPTION_STATUS_HISTORY (adoption x status version: active -> completed -> certified)
+CREATE OR REPLACE TABLE DIM_ADOPTION_STATUS_HISTORY (
+    adoption_id INTEGER NOT NULL,
+    customer_id INTEGER NOT NULL,
+    framework_id INTEGER NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    valid_from DATE NOT NULL,
+    valid_to DATE NOT NULL,
+    version INTEGER NOT NULL,
+    is_current BOOLEAN NOT NULL,
+    PRIMARY KEY (adoption_id, version),
+    FOREIGN KEY (adoption_id) REFERENCES FACT_FRAMEWORK_ADOPTIONS(adoption_id),
+    FOREIGN KEY (customer_id) REFERENCES DIM_CUSTOMERS(customer_id),
+    FOREIGN KEY (framework_id) REFERENCES DIM_COMPLIANCE_FRAMEWORKS(framework_id)
+);
+
+-- DIM_CUSTOMER_TIER_HISTORY (customer x product tier / subscription status version)
+CREATE OR REPLACE TABLE DIM_CUSTOMER_TIER_HISTORY (
+    customer_id INTEGER NOT NULL,
+    product_tier VARCHAR(20) NOT NULL,
+    subscription_status VARCHAR(10) NOT NULL,
+    change_event_id INTEGER NOT NULL,
+    change_event_type VARCHAR(20) NOT NULL,
+    valid_from DATE NOT NULL,
+    valid_to DATE NOT NULL,
+    version INTEGER NOT NULL,
+    is_current BOOLEAN NOT NULL,
+    PRIMARY KEY (customer_id, version),
+    FOREIGN KEY (customer_id) REFERENCES DIM_CUSTOMERS(customer_id),
+    FOREIGN KEY (change_event_id) REFERENCES FACT_SUBSCRIPTION_EVENTS(event_id)
+);
+
+-- =====================================================================================
+-- 7. DATA LOADING COMMANDS
+-- =====================================================================================
+
+-- Load AGG_SUBSCRIPTIONS_MONTHLY
+PUT file://data/AGG_SUBSCRIPTIONS_MONTHLY.json @PHANTOM_SEC_DATA_STAGE OVERWRITE=TRUE;
+
+COPY INTO AGG_SUBSCRIPTIONS_MONTHLY
+FROM (
+  SELECT
+    TO_DATE($1:event_month::VARCHAR, 'MM/DD/YYYY'),
+    $1:segment::VARCHAR(20),
+    $1:product_tier::VARCHAR(20),
+    $1:event_count::INTEGER,
+    $1:new_events::INTEGER,
+    $1:expansion_events::INTEGER,
+    $1:churn_events::INTEGER,
+    $1:total_mrr::INTEGER,
+    $1:total_arr::INTEGER,
+    $1:new_arr::INTEGER,
+    $1:expansion_arr::INTEGER,
+    $1:churned_arr::INTEGER,
+    $1:total_contract_value::INTEGER,
+    $1:total_contract_months::INTEGER
+  FROM @PHANTOM_SEC_DATA_STAGE/AGG_SUBSCRIPTIONS_MONTHLY.json
+)
+FILE_FORMAT = (FORMAT_NAME = JSON_FORMAT)
+ON_ERROR = 'ABORT_STATEMENT';
+
+-- Load AGG_ADOPTIONS_FRAMEWORK_INDUSTRY
+PUT file://data/AGG_ADOPTIONS_FRAMEWORK_INDUSTRY.json @PHANTOM_SEC_DATA_STAGE OVERWRITE=TRUE;
+
+COPY INTO AGG_ADOPTIONS_FRAMEWORK_INDUSTRY
+FROM (
+  SELECT
+    $1:framework_id::INTEGER,
+    $1:framework_name::VARCHAR(50),
+    $1:industry::VARCHAR(50),
+    $1:compliance_maturity::VARCHAR(15),
+    $1:adoption_count::INTEGER,
+    $1:certified_count::INTEGER,
+    $1:completed_count::INTEGER,
+    $1:total_hours_saved::INTEGER,
+    $1:total_implementation_cost::INTEGER,
+    $1:total_automation_level::INTEGER,
+    $1:total_audit_score::INTEGER,
+    $1:audit_score_count::INTEGER
+  FROM @PHANTOM_SEC_DATA_STAGE/AGG_ADOPTIONS_FRAMEWORK_INDUSTRY.json
+)
+FILE_FORMAT = (FORMAT_NAME = JSON_FORMAT)
+ON_ERROR = 'ABORT_STATEMENT';
+
+-- Load AGG_ACTIVITIES_WEEKLY
+PUT file://data/AGG_ACTIVITIES_WEEKLY.json @PHANTOM_SEC_DATA_STAGE OVERWRITE=TRUE;
+
+COPY INTO AGG_ACTIVITIES_WEEKLY
+FROM (
+  SELECT
+    TO_DATE($1:activity_week::VARCHAR, 'MM/DD/YYYY'),
+    $1:framework_id::INTEGER,
+    $1:framework_name::VARCHAR(50),
+    $1:activity_type::VARCHAR(20),
+    $1:activity_count::INTEGER,
+    $1:automated_count::INTEGER,
+    $1:successful_count::INTEGER,
+    $1:evidence_count::INTEGER,
+    $1:total_duration_minutes::INTEGER
+  FROM @PHANTOM_SEC_DATA_STAGE/AGG_ACTIVITIES_WEEKLY.json
+)
+FILE_FORMAT = (FORMAT_NAME = JSON_FORMAT)
+ON_ERROR = 'ABORT_STATEMENT';
+
+-- Load FACT_MRR_DAILY (one file per month)
+PUT file://data/FACT_MRR_DAILY/*.json @PHANTOM_SEC_DATA_STAGE/FACT_MRR_DAILY/ OVERWRITE=TRUE;
+
+COPY INTO FACT_MRR_DAILY
+FROM (
+  SELECT
+    TO_DATE($1:snapshot_date::VARCHAR, 'MM/DD/YYYY'),
+    $1:customer_id::INTEGER,
+    $1:event_id::INTEGER,
+    $1:product_tier::VARCHAR(20),
+    $1:mrr_amount::DECIMAL(12,2),
+    $1:arr_amount::DECIMAL(14,2)
+  FROM @PHANTOM_SEC_DATA_STAGE/FACT_MRR_DAILY/
+)
+FILE_FORMAT = (FORMAT_NAME = JSON_FORMAT)
+ON_ERROR = 'ABORT_STATEMENT';
+
+-- Load FACT_ARR_BRIDGE
+PUT file://data/FACT_ARR_BRIDGE.json @PHANTOM_SEC_DATA_STAGE OVERWRITE=TRUE;
+
+COPY INTO FACT_ARR_BRIDGE
+FROM (
+  SELECT
+    TO_DATE($1:bridge_month::VARCHAR, 'MM/DD/YYYY'),
+    $1:starting_arr::DECIMAL(14,2),
+    $1:new_arr::DECIMAL(14,2),
+    $1:reactivation_arr::DECIMAL(14,2),
+    $1:expansion_arr::DECIMAL(14,2),
+    $1:contraction_arr::DECIMAL(14,2),
+    $1:churned_arr::DECIMAL(14,2),
+    $1:ending_arr::DECIMAL(14,2),
+    $1:starting_customers::INTEGER,
+    $1:new_customers::INTEGER,
+    $1:churned_customers::INTEGER,
+    $1:ending_customers::INTEGER
+  FROM @PHANTOM_SEC_DATA_STAGE/FACT_ARR_BRIDGE.json
+)
+FILE_FORMAT = (FORMAT_NAME = JSON_FORMAT)
+ON_ERROR = 'ABORT_STATEMENT';
+
+-- Load FACT_COHORT_RETENTION
+PUT file://data/FACT_COHORT_RETENTION.json @PHANTOM_SEC_DATA_STAGE OVERWRITE=TRUE;
+
+COPY INTO FACT_COHORT_RETENTION
+FROM (
+  SELECT
+    TO_DATE($1:cohort_month::VARCHAR, 'MM/DD/YYYY'),
+    $1:segment::VARCHAR(20),
+    $1:months_since_signup::INTEGER,
+    TO_DATE($1:period_month::VARCHAR, 'MM/DD/YYYY'),
+    $1:cohort_customers::INTEGER,
+    $1:retained_customers::INTEGER,
+    $1:starting_mrr::DECIMAL(14,2),
+    $1:retained_mrr::DECIMAL(14,2),
+    $1:gross_retained_mrr::DECIMAL(14,2),
+    $1:logo_retention::DECIMAL(6,4),
+    $1:net_revenue_retention::DECIMAL(10,4),
+    $1:gross_revenue_retention::DECIMAL(6,4)
+  FROM @PHANTOM_SEC_DATA_STAGE/FACT_COHORT_RETENTION.json
+)
+FILE_FORMAT = (FORMAT_NAME = JSON_FORMAT)
+ON_ERROR = 'ABORT_STATEMENT';
+
+-- Load DIM_CUSTOMER_SNAPSHOT
+PUT file://data/DIM_CUSTOMER_SNAPSHOT.json @PHANTOM_SEC_DATA_STAGE OVERWRITE=TRUE;
+
+COPY INTO DIM_CUSTOMER_SNAPSHOT
+FROM (
+  SELECT
+    $1:customer_id::INTEGER,
+    $1:company_name::VARCHAR(255),
+    $1:industry::VARCHAR(50),
+    $1:segment::VARCHAR(20),
+    $1:compliance_maturity::VARCHAR(15),
+    $1:employee_count::INTEGER,
+    TO_DATE($1:signup_date::VARCHAR, 'MM/DD/YYYY'),
+    $1:current_tier::VARCHAR(20),
+    $1:current_billing_period::VARCHAR(20),
+    $1:current_mrr::INTEGER,
+    $1:current_arr::INTEGER,
+    $1:is_churned::BOOLEAN,
+    TO_DATE($1:churn_date::VARCHAR, 'MM/DD/YYYY'),
+    TO_DATE($1:first_subscription_date::VARCHAR, 'MM/DD/YYYY'),
+    TO_DATE($1:last_event_date::VARCHAR, 'MM/DD/YYYY'),
+    $1:last_event_type::VARCHAR(20),
+    $1:subscription_event_count::INTEGER,
+    $1:expansion_count::INTEGER,
+    $1:downgrade_count::INTEGER,
+    $1:frameworks_adopted::INTEGER,
+    $1:active_frameworks::INTEGER,
+    $1:completed_frameworks::INTEGER,
+    $1:certified_frameworks::INTEGER,
+    $1:adopted_framework_names::VARCHAR(500),
+    $1:avg_automation_level::DECIMAL(5,1),
+    $1:max_automation_level::INTEGER,
+    $1:total_hours_saved::INTEGER,
+    $1:total_implementation_cost::INTEGER,
+    $1:avg_audit_score::DECIMAL(5,1),
+    $1:activity_count::INTEGER,
+    $1:automated_activities::INTEGER,
+    $1:successful_activities::INTEGER,
+    $1:activity_automation_rate::DECIMAL(5,1),
+    $1:activity_success_rate::DECIMAL(5,1),
+    $1:total_activity_minutes::INTEGER,
+    TO_DATE($1:last_activity_date::VARCHAR, 'MM/DD/YYYY')
+  FROM @PHANTOM_SEC_DATA_STAGE/DIM_CUSTOMER_SNAPSHOT.json
+)
+FILE_FORMAT = (FORMAT_NAME = JSON_FORMAT)
+ON_ERROR = 'ABORT_STATEMENT';
+
+-- Load DIM_DATE
+PUT file://data/DIM_DATE.json @PHANTOM_SEC_DATA_STAGE OVERWRITE=TRUE;
+
+COPY INTO DIM_DATE
+FROM (
+  SELECT
+    TO_DATE($1:calendar_date::VARCHAR, 'MM/DD/YYYY'),
+    $1:date_key::INTEGER,
+    $1:year::INTEGER,
+    $1:quarter::INTEGER,
+    $1:quarter_name::VARCHAR(7),
+    $1:month::INTEGER,
+    $1:month_name::VARCHAR(9),
+    $1:year_month::VARCHAR(7),
+    $1:iso_year::INTEGER,
+    $1:iso_week::INTEGER,
+    TO_DATE($1:week_start_date::VARCHAR, 'MM/DD/YYYY'),
+    $1:day_of_month::INTEGER,
+    $1:day_of_year::INTEGER,
+    $1:day_of_week::INTEGER,
+    $1:day_name::VARCHAR(9),
+    $1:is_weekend::BOOLEAN,
+    $1:is_holiday::BOOLEAN,
+    $1:holiday_name::VARCHAR(50),
+    $1:is_business_day::BOOLEAN,
+    $1:is_month_end::BOOLEAN,
+    $1:fiscal_year::INTEGER,
+    $1:fiscal_quarter::INTEGER,
+    $1:fiscal_quarter_name::VARCHAR(12),
+    $1:fiscal_month::INTEGER
+  FROM @PHANTOM_SEC_DATA_STAGE/DIM_DATE.json
+)
+FILE_FORMAT = (FORMAT_NAME = JSON_FORMAT)
+ON_ERROR = 'ABORT_STATEMENT';
+
+-- Load DIM_ADOPTION_STATUS_HISTORY
+PUT file://data/DIM_ADOPTION_STATUS_HISTORY.json @PHANTOM_SEC_DATA_STAGE OVERWRITE=TRUE;
+
+COPY INTO DIM_ADOPTION_STATUS_HISTORY
+FROM (
+  SELECT
+    $1:adoption_id::INTEGER,
+    $1:customer_id::INTEGER,
+    $1:framework_id::INTEGER,
+    $1:status::VARCHAR(20),
+    TO_DATE($1:valid_from::VARCHAR, 'MM/DD/YYYY'),
+    TO_DATE($1:valid_to::VARCHAR, 'MM/DD/YYYY'),
+    $1:version::INTEGER,
+    $1:is_current::BOOLEAN
+  FROM @PHANTOM_SEC_DATA_STAGE/DIM_ADOPTION_STATUS_HISTORY.json
+)
+FILE_FORMAT = (FORMAT_NAME = JSON_FORMAT)
+ON_ERROR = 'ABORT_STATEMENT';
+
+-- Load DIM_CUSTOMER_TIER_HISTORY
+PUT file://data/DIM_CUSTOMER_TIER_HISTORY.json @PHANTOM_SEC_DATA_STAGE OVERWRITE=TRUE;
+
+COPY INTO DIM_CUSTOMER_TIER_HISTORY
+FROM (
+  SELECT
+    $1:customer_id::INTEGER,
+    $1:product_tier::VARCHAR(20),
+    $1:subscription_status::VARCHAR(10),
+    $1:change_event_id::INTEGER,
+    $1:change_event_type::VARCHAR(20),
+    TO_DATE($1:valid_from::VARCHAR, 'MM/DD/YYYY'),
+    TO_DATE($1:valid_to::VARCHAR, 'MM/DD/YYYY'),
+    $1:version::INTEGER,
+    $1:is_current::BOOLEAN
+  FROM @PHANTOM_SEC_DATA_STAGE/DIM_CUSTOMER_TIER_HISTORY.json
+)
+FILE_FORMAT = (FORMAT_NAME = JSON_FORMAT)
+ON_ERROR = 'ABORT_STATEMENT';
+
+-- =====================================================================================
+-- END OF SCRIPT
+-- =====================================================================================
@@ -30,7 +30,25 @@ CREATE OR REPLACE SEMANTIC VIEW PHANTOM_SEC_COMPLIANCE_OPERATIONS
     activities AS FACT_COMPLIANCE_ACTIVITIES
       PRIMARY KEY (activity_id)
       WITH SYNONYMS ('compliance work', 'control activities', 'audit work', 'compliance tasks')
-      COMMENT = 'Granular compliance work activities and control implementations'
+      COMMENT = 'Granular compliance work activities and control implementations',
+    
+    -- Calendar dimension for adoption starts (DIM_DATE)
+    start_calendar AS DIM_DATE
+      PRIMARY KEY (calendar_date)
+      WITH SYNONYMS ('adoption start calendar', 'adoption start fiscal calendar')
+      COMMENT = 'Calendar and fiscal attributes of each adoption start day; filter on these instead of applying date functions to the fact rows',
+    
+    -- Calendar dimension for activities (DIM_DATE)
+    activity_calendar AS DIM_DATE
+      PRIMARY KEY (calendar_date)
+      WITH SYNONYMS ('activity calendar', 'activity fiscal calendar')
+      COMMENT = 'Calendar and fiscal attributes of each activity day; filter on these instead of applying date functions to the fact rows',
+    
+    -- Adoption status history (SCD Type 2, written by the adoption generator)
+    status_history AS DIM_ADOPTION_STATUS_HISTORY
+      PRIMARY KEY (adoption_id, version)
+      WITH SYNONYMS ('adoption status history', 'status timeline', 'historical status')
+      COMMENT = 'Every status an adoption has been in with valid_from (inclusive) and valid_to (exclusive); filter valid_from <= day AND valid_to > day for the status on a given day'
   )
   
   RELATIONSHIPS (
@@ -44,7 +62,13 @@ CREATE OR REPLACE SEMANTIC VIEW PHANTOM_SEC_COMPLIANCE_OPERATIONS
     activity_to_framework AS
       activities (framework_id) REFERENCES frameworks,
     activity_to_adoption AS
-      activities (adoption_id) REFERENCES adoptions
+      activities (adoption_id) REFERENCES adoptions,
+    adoption_to_start_calendar AS
+      adoptions (start_date) REFERENCES start_calendar,
+    activity_to_activity_calendar AS
+      activities (activity_date) REFERENCES activity_calendar,
+    status_history_to_adoption AS
+      status_history (adoption_id) REFERENCES adoptions
   )
   
   FACTS (
@@ -131,7 +155,56 @@ CREATE OR REPLACE SEMANTIC VIEW PHANTOM_SEC_COMPLIANCE_OPERATIONS
       COMMENT = 'Whether the compliance activity was successful',
     activities.evidence_collected AS activities.evidence_collected
       WITH SYNONYMS = ('evidence status', 'documentation', 'proof collected')
-      COMMENT = 'Whether evidence was collected for the activity'
+      COMMENT = 'Whether evidence was collected for the activity',
+    
+    -- Adoption start calendar dimensions (precomputed in DIM_DATE)
+    start_calendar.start_year AS start_calendar.year
+      WITH SYNONYMS = ('adoption start year')
+      COMMENT = 'Calendar year of the adoption start',
+    start_calendar.start_quarter AS start_calendar.quarter_name
+      WITH SYNONYMS = ('adoption start quarter')
+      COMMENT = 'Calendar quarter of the adoption start, e.g. Q4 2024',
+    start_calendar.start_month AS start_calendar.year_month
+      WITH SYNONYMS = ('adoption start month')
+      COMMENT = 'Calendar month of the adoption start as YYYY-MM',
+    start_calendar.start_fiscal_year AS start_calendar.fiscal_year
+      WITH SYNONYMS = ('adoption start fiscal year')
+      COMMENT = 'Fiscal year of the adoption start (February - January, named for the year it ends in)',
+    start_calendar.start_fiscal_quarter AS start_calendar.fiscal_quarter_name
+      WITH SYNONYMS = ('adoption start fiscal quarter')
+      COMMENT = 'Fiscal quarter of the adoption start, e.g. FQ4 FY2025',
+    start_calendar.start_is_business_day AS start_calendar.is_business_day
+      WITH SYNONYMS = ('adoption start on a business day')
+      COMMENT = 'True when the adoption start fell on a weekday that is not a US federal holiday',
+    
+    -- Activity calendar dimensions (precomputed in DIM_DATE)
+    activity_calendar.activity_year AS activity_calendar.year
+      WITH SYNONYMS = ('activity year')
+      COMMENT = 'Calendar year of the activity',
+    activity_calendar.activity_quarter AS activity_calendar.quarter_name
+      WITH SYNONYMS = ('activity quarter')
+      COMMENT = 'Calendar quarter of the activity, e.g. Q4 2024',
+    activity_calendar.activity_month AS activity_calendar.year_month
+      WITH SYNONYMS = ('activity month')
+      COMMENT = 'Calendar month of the activity as YYYY-MM',
+    activity_calendar.activity_fiscal_year AS activity_calendar.fiscal_year
+      WITH SYNONYMS = ('activity fiscal year')
+      COMMENT = 'Fiscal year of the activity (February - January, named for the year it ends in)',
+    activity_calendar.activity_fiscal_quarter AS activity_calendar.fiscal_quarter_name
+      WITH SYNONYMS = ('activity fiscal quarter')
+      COMMENT = 'Fiscal quarter of the activity, e.g. FQ4 FY2025',
+    activity_calendar.activity_is_business_day AS activity_calendar.is_business_day
+      WITH SYNONYMS = ('activity on a business day')
+      COMMENT = 'True when the activity fell on a weekday that is not a US federal holiday',
+    
+    -- Adoption status history dimensions
+    status_history.historical_status AS status_history.status
+      WITH SYNONYMS = ('status on date', 'status as of', 'point in time status')
+      COMMENT = 'Adoption status during the version: active, completed, certified',
+    status_history.status_valid_from AS status_history.valid_from
+      COMMENT = 'First day the adoption had this status',
+    status_history.status_valid_to AS status_history.valid_to
+      COMMENT = 'Day the adoption left this status (exclusive); 9999-12-31 for the current status'
   )
   
   METRICS (
@@ -164,7 +237,12 @@ CREATE OR REPLACE SEMANTIC VIEW PHANTOM_SEC_COMPLIANCE_OPERATIONS
     activities.total_activities AS COUNT(activity_id)
       COMMENT = 'Total compliance activities performed',
     activities.average_duration AS AVG(duration_minutes)
-      COMMENT = 'Average activity duration in minutes'
+      COMMENT = 'Average activity duration in minutes',
+    
+    -- Point-in-time Adoption Metrics (filter status_history.valid_from <= day AND status_history.valid_to > day)
+    status_history.adoptions_in_status AS COUNT(DISTINCT adoption_id)
+      WITH SYNONYMS = ('adoptions as of', 'active adoptions on date')
+      COMMENT = 'Adoptions whose status version covers the filtered day'
   )
   
   COMMENT = 'Compliance operations semantic view for Phantom Sec focusing on framework adoptions, implementation efficiency, automation levels, and risk management across the compliance automation platform';
\ No newline at end of file
@@ -36,7 +36,25 @@ CREATE OR REPLACE SEMANTIC VIEW PHANTOM_SEC_CUSTOMER_SUCCESS_ANALYTICS
     activities AS FACT_COMPLIANCE_ACTIVITIES
       PRIMARY KEY (activity_id)
       WITH SYNONYMS ('compliance work', 'control activities', 'audit tasks', 'compliance operations')
-      COMMENT = 'Detailed compliance work activities showing engagement and automation levels'
+      COMMENT = 'Detailed compliance work activities showing engagement and automation levels',
+    
+    -- Precomputed cohort retention (built by scripts/cohort_retention.py)
+    cohorts AS FACT_COHORT_RETENTION
+      PRIMARY KEY (cohort_month, segment, months_since_signup)
+      WITH SYNONYMS ('cohort retention', 'retention matrix', 'signup cohorts')
+      COMMENT = 'Retention of each signup month and segment cohort at every month end since signup: customers still paying and MRR kept versus starting MRR',
+    
+    -- Denormalized customer state (written by the generators)
+    customer_snapshot AS DIM_CUSTOMER_SNAPSHOT
+      PRIMARY KEY (customer_id)
+      WITH SYNONYMS ('customer snapshot', 'customer health', 'account status', 'customer 360')
+      COMMENT = 'One row per customer with their current subscription, framework adoption and activity state; answers current-state questions without joining the fact tables',
+    
+    -- Calendar dimension for subscription events (DIM_DATE)
+    event_calendar AS DIM_DATE
+      PRIMARY KEY (calendar_date)
+      WITH SYNONYMS ('subscription event calendar', 'subscription event fiscal calendar')
+      COMMENT = 'Calendar and fiscal attributes of each subscription event day; filter on these instead of applying date functions to the fact rows'
   )
   
   RELATIONSHIPS (
@@ -52,7 +70,11 @@ CREATE OR REPLACE SEMANTIC VIEW PHANTOM_SEC_CUSTOMER_SUCCESS_ANALYTICS
     activity_to_framework AS
       activities (framework_id) REFERENCES frameworks,
     activity_to_adoption AS
-      activities (adoption_id) REFERENCES adoptions
+      activities (adoption_id) REFERENCES adoptions,
+    snapshot_to_customer AS
+      customer_snapshot (customer_id) REFERENCES customers,
+    subscription_to_event_calendar AS
+      subscriptions (event_date) REFERENCES event_calendar
   )
   
   FACTS (
@@ -77,7 +99,14 @@ CREATE OR REPLACE SEMANTIC VIEW PHANTOM_SEC_CUSTOMER_SUCCESS_ANALYTICS
     
     -- Customer profile metrics
     customers.employee_count AS customers.employee_count,
-    customers.annual_revenue AS customers.annual_revenue
+    customers.annual_revenue AS customers.annual_revenue,
+    
+    -- Current customer state
+    customer_snapshot.current_mrr AS customer_snapshot.current_mrr,
+    customer_snapshot.current_arr AS customer_snapshot.current_arr,
+    customer_snapshot.avg_automation_level AS customer_snapshot.avg_automation_level,
+    customer_snapshot.activity_automation_rate AS customer_snapshot.activity_automation_rate,
+    customer_snapshot.frameworks_adopted AS customer_snapshot.frameworks_adopted
   )
   
   DIMENSIONS (
@@ -126,7 +155,55 @@ CREATE OR REPLACE SEMANTIC VIEW PHANTOM_SEC_CUSTOMER_SUCCESS_ANALYTICS
       COMMENT = 'Name of compliance framework: SOC2, ISO27001, HIPAA, etc.',
     adoptions.status AS adoptions.status
       WITH SYNONYMS = ('implementation status', 'project phase', 'completion status')
-      COMMENT = 'Framework adoption status: active, completed, certified'
+      COMMENT = 'Framework adoption status: active, completed, certified',
+    
+    -- Cohort retention dimensions
+    cohorts.cohort_month AS cohorts.cohort_month
+      WITH SYNONYMS = ('signup cohort', 'signup month', 'cohort')
+      COMMENT = 'First day of the month the cohort''s customers signed up',
+    cohorts.months_since_signup AS cohorts.months_since_signup
+      WITH SYNONYMS = ('cohort age', 'customer tenure', 'months since onboarding')
+      COMMENT = 'Whole months between the signup month and the month retention is measured at (0 = signup month)',
+    cohorts.period_month AS cohorts.period_month
+      WITH SYNONYMS = ('measurement month', 'retention month')
+      COMMENT = 'First day of the calendar month retention is measured at the end of',
+    cohorts.cohort_segment AS cohorts.segment
+      WITH SYNONYMS = ('cohort segment')
+      COMMENT = 'Customer segment of the cohort: startup, mid_market, enterprise',
+    
+    -- Current customer state dimensions
+    customer_snapshot.current_tier AS customer_snapshot.current_tier
+      WITH SYNONYMS = ('current plan', 'latest tier', 'current product tier')
+      COMMENT = 'Product tier of the customer''s latest subscription event (kept for churned customers)',
+    customer_snapshot.is_churned AS customer_snapshot.is_churned
+      WITH SYNONYMS = ('churned', 'lost customer', 'cancelled')
+      COMMENT = 'True when the customer''s latest subscription event is a churn',
+    customer_snapshot.snapshot_segment AS customer_snapshot.segment
+      WITH SYNONYMS = ('snapshot segment')
+      COMMENT = 'Customer segment, repeated on the snapshot for single-table questions',
+    customer_snapshot.adopted_framework_names AS customer_snapshot.adopted_framework_names
+      WITH SYNONYMS = ('adopted frameworks', 'framework list')
+      COMMENT = 'Comma-separated names of the frameworks the customer has adopted',
+    
+    -- Subscription event calendar dimensions (precomputed in DIM_DATE)
+    event_calendar.event_year AS event_calendar.year
+      WITH SYNONYMS = ('subscription event year', 'calendar year')
+      COMMENT = 'Calendar year of the subscription event',
+    event_calendar.event_quarter AS event_calendar.quarter_name
+      WITH SYNONYMS = ('subscription event quarter', 'quarter')
+      COMMENT = 'Calendar quarter of the subscription event, e.g. Q4 2024',
+    event_calendar.event_month AS event_calendar.year_month
+      WITH SYNONYMS = ('subscription event month', 'month')
+      COMMENT = 'Calendar month of the subscription event as YYYY-MM',
+    event_calendar.event_fiscal_year AS event_calendar.fiscal_year
+      WITH SYNONYMS = ('subscription event fiscal year', 'fiscal year', 'FY')
+      COMMENT = 'Fiscal year of the subscription event (February - January, named for the year it ends in)',
+    event_calendar.event_fiscal_quarter AS event_calendar.fiscal_quarter_name
+      WITH SYNONYMS = ('subscription event fiscal quarter', 'fiscal quarter')
+      COMMENT = 'Fiscal quarter of the subscription event, e.g. FQ4 FY2025',
+    event_calendar.event_is_business_day AS event_calendar.is_business_day
+      WITH SYNONYMS = ('subscription event on a business day', 'working day')
+      COMMENT = 'True when the subscription event fell on a weekday that is not a US federal holiday'
   )
   
   METRICS (
@@ -153,7 +230,33 @@ CREATE OR REPLACE SEMANTIC VIEW PHANTOM_SEC_CUSTOMER_SUCCESS_ANALYTICS
     -- Simple Engagement Metrics
     activities.total_activities AS COUNT(activity_id)
       WITH SYNONYMS = ('total work')
-      COMMENT = 'Total number of compliance activities'
+      COMMENT = 'Total number of compliance activities',
+    
+    -- Cohort Retention Metrics (pick one months_since_signup or period_month)
+    cohorts.logo_retention_rate AS CAST(SUM(retained_customers) AS FLOAT) / NULLIF(SUM(cohort_customers), 0)
+      WITH SYNONYMS = ('customer retention', 'logo retention')
+      COMMENT = 'Share of cohort customers still paying',
+    cohorts.net_revenue_retention AS CAST(SUM(retained_mrr) AS FLOAT) / NULLIF(SUM(starting_mrr), 0)
+      WITH SYNONYMS = ('nrr', 'net dollar retention', 'ndr')
+      COMMENT = 'Current MRR of the cohort over its starting MRR, including expansion',
+    cohorts.gross_revenue_retention AS CAST(SUM(gross_retained_mrr) AS FLOAT) / NULLIF(SUM(starting_mrr), 0)
+      WITH SYNONYMS = ('grr', 'gross dollar retention')
+      COMMENT = 'Cohort MRR kept over its starting MRR, with each customer capped at their starting MRR',
+    cohorts.cohort_size AS SUM(cohort_customers)
+      COMMENT = 'Customers in the cohort whose subscription had started by the measurement date',
+    
+    -- Current-state Metrics (single scan of the customer snapshot)
+    customer_snapshot.snapshot_customers AS COUNT(customer_id)
+      COMMENT = 'Number of customers in the snapshot matching the filters',
+    customer_snapshot.highly_automated_customers AS SUM(CASE WHEN avg_automation_level >= 90 THEN 1 ELSE 0 END)
+      WITH SYNONYMS = ('customers with 90% automation', 'high automation customers')
+      COMMENT = 'Customers whose average framework automation level is 90% or more',
+    customer_snapshot.churned_customers AS SUM(CASE WHEN is_churned THEN 1 ELSE 0 END)
+      WITH SYNONYMS = ('lost customers', 'churned accounts')
+      COMMENT = 'Customers whose latest subscription event is a churn',
+    customer_snapshot.current_total_arr AS SUM(current_arr)
+      WITH SYNONYMS = ('current arr', 'live arr')
+      COMMENT = 'ARR of every customer''s latest subscription event (0 for churned customers)'
   )
   
   COMMENT = 'Customer success analytics semantic view combining financial and compliance data for holistic customer insights, focusing on portfolio metrics, ROI, and engagement for Phantom Sec platform';
\ No newline at end of file
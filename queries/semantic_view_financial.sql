@@ -18,13 +18,43 @@ CREATE OR REPLACE SEMANTIC VIEW PHANTOM_SEC_FINANCIAL_ANALYTICS
     subscriptions AS FACT_SUBSCRIPTION_EVENTS
       PRIMARY KEY (event_id)
       WITH SYNONYMS ('subscription events', 'revenue events', 'contracts', 'deals', 'agreements')
-      COMMENT = 'Customer subscription lifecycle events including new subscriptions, renewals, expansions, and churn'
+      COMMENT = 'Customer subscription lifecycle events including new subscriptions, renewals, expansions, and churn',
+    
+    -- Daily MRR snapshot (derived from subscription events)
+    mrr_daily AS FACT_MRR_DAILY
+      PRIMARY KEY (customer_id, snapshot_date)
+      WITH SYNONYMS ('daily revenue', 'revenue snapshot', 'point in time revenue')
+      COMMENT = 'Each paying customer''s normalized MRR and ARR on every day; filter to a single snapshot_date for point-in-time revenue',
+    
+    -- Monthly ARR bridge (derived from subscription events)
+    arr_bridge AS FACT_ARR_BRIDGE
+      PRIMARY KEY (bridge_month)
+      WITH SYNONYMS ('arr waterfall', 'revenue bridge', 'arr movements')
+      COMMENT = 'Monthly ARR movements: starting ARR, new, reactivation, expansion, contraction, churn and ending ARR',
+    
+    -- Calendar dimension for subscription events (DIM_DATE)
+    event_calendar AS DIM_DATE
+      PRIMARY KEY (calendar_date)
+      WITH SYNONYMS ('subscription event calendar', 'subscription event fiscal calendar')
+      COMMENT = 'Calendar and fiscal attributes of each subscription event day; filter on these instead of applying date functions to the fact rows',
+    
+    -- Customer tier history (SCD Type 2, written by the subscription event generator)
+    tier_history AS DIM_CUSTOMER_TIER_HISTORY
+      PRIMARY KEY (customer_id, version)
+      WITH SYNONYMS ('tier history', 'plan history', 'customer tier timeline')
+      COMMENT = 'Every product tier and subscription status a customer has had with valid_from (inclusive) and valid_to (exclusive); filter valid_from <= day AND valid_to > day for the tier on a given day'
   )
   
   RELATIONSHIPS (
     -- Define relationships between entities
     subscription_to_customer AS
-      subscriptions (customer_id) REFERENCES customers
+      subscriptions (customer_id) REFERENCES customers,
+    mrr_daily_to_customer AS
+      mrr_daily (customer_id) REFERENCES customers,
+    subscription_to_event_calendar AS
+      subscriptions (event_date) REFERENCES event_calendar,
+    tier_history_to_customer AS
+      tier_history (customer_id) REFERENCES customers
   )
   
   FACTS (
@@ -41,6 +71,12 @@ CREATE OR REPLACE SEMANTIC VIEW PHANTOM_SEC_FINANCIAL_ANALYTICS
     subscriptions.event_date AS subscriptions.event_date
       WITH SYNONYMS = ('date', 'subscription date', 'contract date', 'deal date')
       COMMENT = 'Date when the subscription event occurred',
+    mrr_daily.snapshot_date AS mrr_daily.snapshot_date
+      WITH SYNONYMS = ('as of date', 'snapshot date', 'point in time')
+      COMMENT = 'Day the MRR snapshot applies to; use the last day of a period for period-end ARR',
+    arr_bridge.bridge_month AS arr_bridge.bridge_month
+      WITH SYNONYMS = ('bridge month', 'movement month')
+      COMMENT = 'First day of the month the ARR movements occurred in',
     
     -- Customer dimensions
     customers.segment AS customers.segment
@@ -74,10 +110,65 @@ CREATE OR REPLACE SEMANTIC VIEW PHANTOM_SEC_FINANCIAL_ANALYTICS
       COMMENT = 'Sales channel: self_serve, inside_sales, field_sales, partner',
     subscriptions.payment_method AS subscriptions.payment_method
       WITH SYNONYMS = ('payment type', 'payment option')
-      COMMENT = 'Payment method: credit_card, ach, wire_transfer, invoice'
+      COMMENT = 'Payment method: credit_card, ach, wire_transfer, invoice',
+    
+    -- Subscription event calendar dimensions (precomputed in DIM_DATE)
+    event_calendar.event_year AS event_calendar.year
+      WITH SYNONYMS = ('subscription event year', 'calendar year')
+      COMMENT = 'Calendar year of the subscription event',
+    event_calendar.event_quarter AS event_calendar.quarter_name
+      WITH SYNONYMS = ('subscription event quarter', 'quarter')
+      COMMENT = 'Calendar quarter of the subscription event, e.g. Q4 2024',
+    event_calendar.event_month AS event_calendar.year_month
+      WITH SYNONYMS = ('subscription event month', 'month')
+      COMMENT = 'Calendar month of the subscription event as YYYY-MM',
+    event_calendar.event_fiscal_year AS event_calendar.fiscal_year
+      WITH SYNONYMS = ('subscription event fiscal year', 'fiscal year', 'FY')
+      COMMENT = 'Fiscal year of the subscription event (February - January, named for the year it ends in)',
+    event_calendar.event_fiscal_quarter AS event_calendar.fiscal_quarter_name
+      WITH SYNONYMS = ('subscription event fiscal quarter', 'fiscal quarter')
+      COMMENT = 'Fiscal quarter of the subscription event, e.g. FQ4 FY2025',
+    event_calendar.event_is_business_day AS event_calendar.is_business_day
+      WITH SYNONYMS = ('subscription event on a business day', 'working day')
+      COMMENT = 'True when the subscription event fell on a weekday that is not a US federal holiday',
+    
+    -- Customer tier history dimensions
+    tier_history.historical_tier AS tier_history.product_tier
+      WITH SYNONYMS = ('tier on date', 'plan as of', 'point in time tier')
+      COMMENT = 'Product tier during the version: starter, professional, enterprise, enterprise_plus',
+    tier_history.historical_subscription_status AS tier_history.subscription_status
+      WITH SYNONYMS = ('subscription status as of', 'churned as of')
+      COMMENT = 'Subscription status during the version: active, churned',
+    tier_history.tier_valid_from AS tier_history.valid_from
+      COMMENT = 'First day the customer had this tier and status',
+    tier_history.tier_valid_to AS tier_history.valid_to
+      COMMENT = 'Day the tier or status changed (exclusive); 9999-12-31 for the current version'
   )
   
   METRICS (
+    -- Point-in-time Revenue Metrics (filter mrr_daily.snapshot_date to one day)
+    mrr_daily.point_in_time_mrr AS SUM(mrr_amount)
+      WITH SYNONYMS = ('current mrr', 'mrr as of')
+      COMMENT = 'Normalized MRR of all paying customers on the snapshot date',
+    mrr_daily.point_in_time_arr AS SUM(arr_amount)
+      WITH SYNONYMS = ('current arr', 'arr as of', 'period end arr', 'ending arr')
+      COMMENT = 'ARR of all paying customers on the snapshot date, e.g. ARR at end of Q4 2024 is snapshot_date = 2024-12-31',
+    mrr_daily.paying_customers AS COUNT(DISTINCT customer_id)
+      COMMENT = 'Number of paying customers on the snapshot date',
+    
+    -- ARR Bridge Metrics
+    arr_bridge.bridge_new_arr AS SUM(new_arr)
+      COMMENT = 'ARR added by first-time customers in the month(s)',
+    arr_bridge.bridge_expansion_arr AS SUM(expansion_arr)
+      COMMENT = 'ARR added by existing customers increasing their contract',
+    arr_bridge.bridge_contraction_arr AS SUM(contraction_arr)
+      COMMENT = 'ARR lost to downgrades by customers who stayed',
+    arr_bridge.bridge_churned_arr AS SUM(churned_arr)
+      COMMENT = 'ARR lost from customers who churned',
+    arr_bridge.net_new_arr AS SUM(new_arr + reactivation_arr + expansion_arr - contraction_arr - churned_arr)
+      WITH SYNONYMS = ('net arr change', 'arr growth')
+      COMMENT = 'Net change in ARR over the month(s)',
+    
     -- Revenue Metrics
     subscriptions.total_mrr AS SUM(mrr_amount)
       COMMENT = 'Total Monthly Recurring Revenue across all customers',
@@ -193,7 +284,12 @@ CREATE OR REPLACE SEMANTIC VIEW PHANTOM_SEC_FINANCIAL_ANALYTICS
     subscriptions.professional_tier_rate AS AVG(CASE WHEN product_tier = 'professional' THEN 1 ELSE 0 END)
       COMMENT = 'Percentage of subscriptions on professional tier',
     subscriptions.starter_tier_rate AS AVG(CASE WHEN product_tier = 'starter' THEN 1 ELSE 0 END)
-      COMMENT = 'Percentage of subscriptions on starter tier'
+      COMMENT = 'Percentage of subscriptions on starter tier',
+    
+    -- Point-in-time Tier Metrics (filter tier_history.valid_from <= day AND tier_history.valid_to > day)
+    tier_history.customers_on_tier AS COUNT(DISTINCT customer_id)
+      WITH SYNONYMS = ('customers by tier as of', 'tier mix on date')
+      COMMENT = 'Customers whose tier version covers the filtered day'
   )
   
   COMMENT = 'Financial analytics semantic view for Phantom Sec compliance automation platform focusing on revenue, ARR, MRR, contract performance, and customer financial metrics';
\ No newline at end of file
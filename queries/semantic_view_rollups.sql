@@ -0,0 +1,145 @@
+-- =====================================================================================
+-- PHANTOM SEC ROLLUP ANALYTICS - Semantic View
+-- =====================================================================================
+-- Purpose: Answer common trend questions from the pre-aggregated rollup tables
+--          (queries/derived_tables.sql) instead of scanning and joining the FACT tables
+-- Focus: ARR/MRR by month, segment and tier; framework value by industry and maturity;
+--        weekly compliance workload by framework and activity type
+-- Target Questions: "ARR by segment by quarter", "Hours saved by framework and industry",
+--                   "Weekly automation rate by framework"
+-- =====================================================================================
+
+CREATE OR REPLACE SEMANTIC VIEW PHANTOM_SEC_ROLLUP_ANALYTICS
+  TABLES (
+    -- Compliance frameworks dimension
+    frameworks AS DIM_COMPLIANCE_FRAMEWORKS
+      PRIMARY KEY (framework_id)
+      WITH SYNONYMS ('standards', 'compliance programs', 'regulations', 'security frameworks')
+      COMMENT = 'Compliance frameworks and standards available for implementation',
+
+    -- Monthly subscription rollup
+    subscriptions_monthly AS AGG_SUBSCRIPTIONS_MONTHLY
+      WITH SYNONYMS ('monthly revenue', 'revenue by month', 'subscription trends')
+      COMMENT = 'Subscription events aggregated by month, customer segment and product tier',
+
+    -- Framework adoption rollup
+    adoption_rollup AS AGG_ADOPTIONS_FRAMEWORK_INDUSTRY
+      WITH SYNONYMS ('implementations by industry', 'framework value', 'adoption summary')
+      COMMENT = 'Framework adoptions aggregated by framework, customer industry and compliance maturity',
+
+    -- Weekly activity rollup
+    activity_rollup AS AGG_ACTIVITIES_WEEKLY
+      WITH SYNONYMS ('weekly compliance work', 'activity trends', 'workload by week')
+      COMMENT = 'Compliance activities aggregated by week, framework and activity type'
+  )
+
+  RELATIONSHIPS (
+    adoption_rollup_to_framework AS
+      adoption_rollup (framework_id) REFERENCES frameworks,
+    activity_rollup_to_framework AS
+      activity_rollup (framework_id) REFERENCES frameworks
+  )
+
+  DIMENSIONS (
+    -- Time dimensions
+    subscriptions_monthly.event_month AS subscriptions_monthly.event_month
+      WITH SYNONYMS = ('month', 'revenue month', 'billing month')
+      COMMENT = 'First day of the month the subscription events occurred in',
+    activity_rollup.activity_week AS activity_rollup.activity_week
+      WITH SYNONYMS = ('week', 'work week')
+      COMMENT = 'Monday starting the week the compliance activities occurred in',
+
+    -- Subscription dimensions
+    subscriptions_monthly.segment AS subscriptions_monthly.segment
+      WITH SYNONYMS = ('customer segment', 'customer size', 'company size')
+      COMMENT = 'Customer segment: startup, mid_market, enterprise',
+    subscriptions_monthly.product_tier AS subscriptions_monthly.product_tier
+      WITH SYNONYMS = ('plan', 'subscription tier', 'pricing tier')
+      COMMENT = 'Product tier: starter, professional, enterprise, enterprise_plus',
+
+    -- Adoption dimensions
+    adoption_rollup.framework_name AS adoption_rollup.framework_name
+      WITH SYNONYMS = ('standard name', 'certification name', 'compliance standard')
+      COMMENT = 'Name of compliance framework: SOC2, ISO27001, HIPAA, etc.',
+    adoption_rollup.industry AS adoption_rollup.industry
+      WITH SYNONYMS = ('vertical', 'sector', 'industry vertical')
+      COMMENT = 'Customer industry classification',
+    adoption_rollup.compliance_maturity AS adoption_rollup.compliance_maturity
+      WITH SYNONYMS = ('maturity', 'experience level', 'compliance experience')
+      COMMENT = 'Customer compliance maturity: beginner, intermediate, advanced',
+
+    -- Activity dimensions
+    activity_rollup.framework_name AS activity_rollup.framework_name
+      WITH SYNONYMS = ('activity framework', 'standard worked on')
+      COMMENT = 'Compliance framework the activities were performed for',
+    activity_rollup.activity_type AS activity_rollup.activity_type
+      WITH SYNONYMS = ('work type', 'task type', 'compliance activity type')
+      COMMENT = 'Type of compliance activity: control_check, questionnaire, audit, remediation, training',
+
+    -- Framework dimensions
+    frameworks.framework_category AS frameworks.framework_category
+      WITH SYNONYMS = ('framework type', 'standard category', 'compliance category')
+      COMMENT = 'Category of compliance framework'
+  )
+
+  METRICS (
+    -- Revenue Metrics (same definitions as PHANTOM_SEC_FINANCIAL_ANALYTICS, pre-summed)
+    subscriptions_monthly.total_mrr AS SUM(total_mrr)
+      COMMENT = 'Total Monthly Recurring Revenue across subscription events',
+    subscriptions_monthly.arr AS SUM(total_arr)
+      WITH SYNONYMS = ('annual recurring revenue', 'yearly revenue', 'annual revenue')
+      COMMENT = 'Annual Recurring Revenue calculated from MRR based on billing period',
+    subscriptions_monthly.new_customer_arr AS SUM(new_arr)
+      COMMENT = 'ARR from new customer acquisitions',
+    subscriptions_monthly.expansion_arr AS SUM(expansion_arr)
+      COMMENT = 'ARR from customer expansions and upsells',
+    subscriptions_monthly.churned_arr AS SUM(churned_arr)
+      COMMENT = 'ARR lost from customer churn',
+    subscriptions_monthly.total_contract_value AS SUM(total_contract_value)
+      WITH SYNONYMS = ('tcv', 'total bookings')
+      COMMENT = 'Total contract value across all subscriptions',
+    subscriptions_monthly.average_contract_value AS CAST(SUM(total_contract_value) AS FLOAT) / NULLIF(SUM(event_count), 0)
+      WITH SYNONYMS = ('acv', 'average deal size')
+      COMMENT = 'Average total contract value over contract length',
+    subscriptions_monthly.average_contract_length AS CAST(SUM(total_contract_months) AS FLOAT) / NULLIF(SUM(event_count), 0)
+      COMMENT = 'Average contract length in months',
+    subscriptions_monthly.total_events AS SUM(event_count)
+      COMMENT = 'Total number of subscription events',
+    subscriptions_monthly.new_events AS SUM(new_events)
+      COMMENT = 'Number of new subscription events',
+    subscriptions_monthly.churn_events AS SUM(churn_events)
+      COMMENT = 'Number of churn events',
+
+    -- Framework Value Metrics
+    adoption_rollup.total_adoptions AS SUM(adoption_count)
+      COMMENT = 'Total number of framework adoptions',
+    adoption_rollup.total_hours_saved AS SUM(total_hours_saved)
+      WITH SYNONYMS = ('time savings', 'efficiency gains')
+      COMMENT = 'Total hours saved across all implementations',
+    adoption_rollup.average_hours_saved AS CAST(SUM(total_hours_saved) AS FLOAT) / NULLIF(SUM(adoption_count), 0)
+      COMMENT = 'Average hours saved per implementation',
+    adoption_rollup.total_cost AS SUM(total_implementation_cost)
+      COMMENT = 'Total implementation cost',
+    adoption_rollup.average_automation_level AS CAST(SUM(total_automation_level) AS FLOAT) / NULLIF(SUM(adoption_count), 0)
+      WITH SYNONYMS = ('automation score')
+      COMMENT = 'Average automation level achieved',
+    adoption_rollup.average_audit_score AS CAST(SUM(total_audit_score) AS FLOAT) / NULLIF(SUM(audit_score_count), 0)
+      WITH SYNONYMS = ('compliance score')
+      COMMENT = 'Average audit score achieved',
+    adoption_rollup.certification_rate AS CAST(SUM(certified_count) AS FLOAT) / NULLIF(SUM(adoption_count), 0)
+      COMMENT = 'Share of adoptions that reached certification',
+
+    -- Activity Metrics
+    activity_rollup.total_activities AS SUM(activity_count)
+      COMMENT = 'Total compliance activities performed',
+    activity_rollup.automation_rate AS CAST(SUM(automated_count) AS FLOAT) / NULLIF(SUM(activity_count), 0)
+      COMMENT = 'Share of compliance activities that were automated',
+    activity_rollup.success_rate AS CAST(SUM(successful_count) AS FLOAT) / NULLIF(SUM(activity_count), 0)
+      COMMENT = 'Share of compliance activities that succeeded',
+    activity_rollup.evidence_rate AS CAST(SUM(evidence_count) AS FLOAT) / NULLIF(SUM(activity_count), 0)
+      COMMENT = 'Share of compliance activities with evidence collected',
+    activity_rollup.average_duration AS CAST(SUM(total_duration_minutes) AS FLOAT) / NULLIF(SUM(activity_count), 0)
+      COMMENT = 'Average activity duration in minutes'
+  )
+
+  COMMENT = 'Rollup analytics semantic view for Phantom Sec answering month, segment, framework and industry trend questions from pre-aggregated tables';
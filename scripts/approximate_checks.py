@@ -0,0 +1,706 @@
+#!/usr/bin/env python3
+"""
+Sampling-based approximate quality checks with confidence intervals.
+
+Distribution checks run on samples instead of every row:
+1. Segment mix of DIM_CUSTOMERS (reservoir sample)
+2. Event-type mix of FACT_SUBSCRIPTION_EVENTS (reservoir sample)
+3. Framework adoption rates against EXPECTED_ADOPTION_RATES (reservoir sample)
+4. Automation/success rates and mean duration by activity type of
+   FACT_COMPLIANCE_ACTIVITIES (uniform and stratified reservoir samples)
+
+Each estimate carries a confidence interval. An expected range is reported as
+'pass' when the whole interval lies inside it, 'fail' when the whole interval
+lies outside it, and 'inconclusive' otherwise. Keys and hard invariants
+(primary key uniqueness, foreign keys, segment ranges, date ordering, contract
+lengths, activity categories, first event is 'new') are still checked exactly.
+
+Each fact file is read once and reduced to a summary: its key sets (as
+runs of consecutive ids), invariant counts, first events and a reservoir
+sample of just the columns the estimates read. Summaries are cached under
+the data directory's .qa_cache keyed by file size and modification time, so
+a rerun only streams new or changed files. The per-file samples are merged
+into one uniform sample per table, and the key sets and counts are merged
+exactly.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+from typing import List, Dict, Any, Tuple, Optional, Iterable, Callable
+
+from business_rules import EXPECTED_ADOPTION_RATES, EXPECTED_DURATION_MINUTES, evaluate_rules
+from incremental_checks import CACHE_DIR_NAME, print_partition_stats
+from quality_checks import (
+    ACTIVITY_RULE_ISSUES,
+    TABLE_FILES,
+    activity_rule_issues,
+    finish_quality_run,
+    load_json_data,
+    load_table,
+    table_paths,
+    validate_dim_customers,
+    validate_dim_frameworks,
+    validate_foreign_keys,
+    print_quality_report
+)
+
+# Expected ranges for activity metrics, as enforced by the exact checks
+EXPECTED_AUTOMATION_RATE = (0.0, 0.8)
+EXPECTED_SUCCESS_RATE = (0.7, 0.95)
+
+PRIMARY_KEYS = {
+    'customers': 'customer_id',
+    'frameworks': 'framework_id',
+    'events': 'event_id',
+    'adoptions': 'adoption_id',
+    'activities': 'activity_id'
+}
+
+# Foreign key columns of each fact table -> referenced table
+FOREIGN_KEYS = {
+    'events': {'customer_id': 'customers'},
+    'adoptions': {'customer_id': 'customers', 'framework_id': 'frameworks'},
+    'activities': {'customer_id': 'customers', 'framework_id': 'frameworks', 'adoption_id': 'adoptions'}
+}
+
+FACT_TABLES = ['events', 'adoptions', 'activities']
+
+# Columns (and the defaults the estimates read them with) kept in each fact
+# table's per-file sample, and the stratified sample's stratum column
+SAMPLE_COLUMNS = {
+    'events': {'event_type': 'unknown'},
+    'adoptions': {'framework_id': None},
+    'activities': {'automated_flag': False, 'success_flag': False}
+}
+STRATIFIED_SAMPLES = {
+    'activities': ('activity_type', {'duration_minutes': 0})
+}
+
+# Bump when summary contents change so stale cache entries are ignored
+SUMMARY_VERSION = 2
+
+class ReservoirSampler:
+    """
+    Uniform fixed-size sample of a stream (Algorithm L).
+
+    Once the reservoir is full, the gap to the next replacement is drawn
+    directly, so a batch of rows costs one random draw per replacement
+    rather than one per row.
+    """
+
+    def __init__(self, size: int, rng: random.Random):
+        self.size = size
+        self.rng = rng
+        self.seen = 0
+        self.sample = []
+        self._weight = 1.0
+        # 1-based stream position of the next row to keep once the reservoir is full
+        self._next = math.inf
+
+    def _gap(self) -> int:
+        # 1 - random() is in (0, 1], so the logs are defined
+        self._weight *= (1.0 - self.rng.random()) ** (1.0 / self.size)
+        if self._weight >= 1.0:
+            return 1
+        return int(math.log(1.0 - self.rng.random()) / math.log(1.0 - self._weight)) + 1
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.extend([row])
+
+    def extend(self, rows: Any) -> None:
+        """Offer a batch of rows (a list, or any sequence supporting len, indexing and slicing)."""
+        start = self.seen
+        self.seen += len(rows)
+        fill = min(len(rows), self.size - len(self.sample))
+        if fill > 0:
+            self.sample.extend(rows[:fill])
+            if len(self.sample) < self.size:
+                return
+            self._next = start + fill + self._gap()
+
+        if self._next > self.seen:
+            return
+        # Same steps as _gap, inlined: this loop runs once per replacement
+        sample, size, uniform, log = self.sample, self.size, self.rng.random, math.log
+        inverse_size, weight, position, end = 1.0 / size, self._weight, self._next, self.seen
+        while position <= end:
+            sample[int(uniform() * size)] = rows[position - start - 1]
+            weight *= (1.0 - uniform()) ** inverse_size
+            position += 1 if weight >= 1.0 else int(log(1.0 - uniform()) / log(1.0 - weight)) + 1
+        self._weight, self._next = weight, position
+
+    @classmethod
+    def merged(cls, parts: List[Tuple[int, List[Any]]], size: int, rng: random.Random) -> 'ReservoirSampler':
+        """
+        Uniform sample of the union of several streams from their own (seen, sample) reservoirs.
+
+        Each pick chooses a stream in proportion to its rows not yet picked and
+        takes a random row of its reservoir not taken yet, which draws without
+        replacement from the union exactly. The result is read-only.
+        """
+        sampler = cls(size, rng)
+        pools = [list(sample) for _, sample in parts]
+        remaining = [seen for seen, _ in parts]
+        taken = [0] * len(parts)
+        total = sampler.seen = sum(remaining)
+        for _ in range(min(size, total)):
+            pick = rng.randrange(total)
+            i = 0
+            while pick >= remaining[i]:
+                pick -= remaining[i]
+                i += 1
+            # Partial Fisher-Yates: only the rows actually taken are shuffled
+            pool, t = pools[i], taken[i]
+            j = t + rng.randrange(len(pool) - t)
+            pool[t], pool[j] = pool[j], pool[t]
+            sampler.sample.append(pool[t])
+            taken[i] += 1
+            remaining[i] -= 1
+            total -= 1
+        return sampler
+
+class StratifiedSampler:
+    """One reservoir per stratum, with exact stratum population counts."""
+
+    def __init__(self, key: Callable[[Dict[str, Any]], Any], size_per_stratum: int, rng: random.Random):
+        self.key = key
+        self.size_per_stratum = size_per_stratum
+        self.rng = rng
+        self.strata = {}
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.extend([row])
+
+    def extend(self, rows: Iterable[Dict[str, Any]]) -> None:
+        groups = {}
+        for row in rows:
+            stratum = self.key(row)
+            group = groups.get(stratum)
+            if group is None:
+                group = groups[stratum] = []
+            group.append(row)
+        for stratum, group in groups.items():
+            if stratum not in self.strata:
+                self.strata[stratum] = ReservoirSampler(self.size_per_stratum, self.rng)
+            self.strata[stratum].extend(group)
+
+class KeyTracker:
+    """Exact primary key uniqueness and referenced foreign keys of one table, kept as key sets."""
+
+    def __init__(self, key: str, foreign_keys: Iterable[str] = ()):
+        self.key = key
+        self.keys = set()
+        self.duplicates = 0
+        self.missing = 0
+        self.references = {column: set() for column in foreign_keys}
+
+    def add_rows(self, rows: List[Dict[str, Any]]) -> None:
+        batch = {row.get(self.key) for row in rows}
+        missing = sum(1 for row in rows if row.get(self.key) is None) if None in batch else 0
+        batch.discard(None)
+        before = len(self.keys)
+        self.keys |= batch
+        self.missing += missing
+        self.duplicates += len(rows) - missing - (len(self.keys) - before)
+        for column, referenced in self.references.items():
+            referenced.update({row.get(column) for row in rows})
+
+    def merge(self, summary: Dict[str, Any]) -> None:
+        """Add another file's key summary; keys seen in earlier files count as duplicates."""
+        keys = expand_keys(summary['keys'])
+        before = len(self.keys)
+        self.keys |= keys
+        self.missing += summary['missing']
+        self.duplicates += summary['duplicates'] + len(keys) - (len(self.keys) - before)
+        for column, referenced in self.references.items():
+            referenced |= expand_keys(summary['references'][column])
+
+class FactInvariants:
+    """Exact rule violations and first event per customer, accumulated file by file."""
+
+    def __init__(self):
+        self.violations = {}
+        self.first_events = {}
+
+    def add_rows(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        for name, failing in evaluate_rules(table, rows).items():
+            self.violations[name] = self.violations.get(name, 0) + len(failing)
+        if table == 'events':
+            # Earliest event per customer must be 'new'; ties keep the first row seen.
+            # MM/DD/YYYY -> (YYYY, MM, DD) compares chronologically without parsing every date
+            first_events = self.first_events
+            for event in rows:
+                value = event.get('event_date', '01/01/2020')
+                event_date = (value[6:], value[:2], value[3:5])
+                customer_id = event.get('customer_id')
+                if customer_id not in first_events or event_date < first_events[customer_id][0]:
+                    first_events[customer_id] = (event_date, event.get('event_type'))
+
+    def merge(self, summary: Dict[str, Any]) -> None:
+        """Add another file's invariant summary, in file order."""
+        for name, count in summary['violations'].items():
+            self.violations[name] = self.violations.get(name, 0) + count
+        first_events = self.first_events
+        for customer_id, event_date, event_type in summary['first_events']:
+            event_date = tuple(event_date)
+            if customer_id not in first_events or event_date < first_events[customer_id][0]:
+                first_events[customer_id] = (event_date, event_type)
+
+def compress_keys(values: Iterable[Any]) -> Dict[str, List[Any]]:
+    """A key set as runs of consecutive integers, plus any other values (e.g. None) as-is."""
+    # type() rather than isinstance keeps booleans out of the integer runs
+    integers = sorted(v for v in values if type(v) is int)
+    runs = []
+    for value in integers:
+        if runs and value == runs[-1][1] + 1:
+            runs[-1][1] = value
+        else:
+            runs.append([value, value])
+    return {'runs': runs, 'other': [v for v in values if type(v) is not int]}
+
+def expand_keys(compressed: Dict[str, List[Any]]) -> set:
+    keys = set(compressed['other'])
+    for start, end in compressed['runs']:
+        keys.update(range(start, end + 1))
+    return keys
+
+def project_sample(sampler: ReservoirSampler, columns: Dict[str, Any]) -> List[Any]:
+    """(seen, rows reduced to the sampled columns as value lists) of a reservoir."""
+    defaults = list(columns.items())
+    return [sampler.seen, [[row.get(column, default) for column, default in defaults] for row in sampler.sample]]
+
+def summarize_file(table: str, rows: List[Dict[str, Any]], sample_size: int,
+                   rng: random.Random) -> Dict[str, Any]:
+    """Reduce one fact file to its cacheable summary: keys, invariants and column samples."""
+    tracker = KeyTracker(PRIMARY_KEYS[table], FOREIGN_KEYS[table])
+    tracker.add_rows(rows)
+    invariants = FactInvariants()
+    invariants.add_rows(table, rows)
+    uniform = ReservoirSampler(sample_size, rng)
+    uniform.extend(rows)
+
+    summary = {
+        'rows': len(rows),
+        'keys': compress_keys(tracker.keys),
+        'duplicates': tracker.duplicates,
+        'missing': tracker.missing,
+        'references': {column: compress_keys(values) for column, values in tracker.references.items()},
+        'violations': invariants.violations,
+        'first_events': [[customer_id, list(event_date), event_type]
+                         for customer_id, (event_date, event_type) in invariants.first_events.items()],
+        'sample': project_sample(uniform, SAMPLE_COLUMNS[table])
+    }
+    if table in STRATIFIED_SAMPLES:
+        stratum_column, columns = STRATIFIED_SAMPLES[table]
+        stratified = StratifiedSampler(lambda row: row.get(stratum_column, 'unknown'), sample_size, rng)
+        stratified.extend(rows)
+        # A list, since strata such as None are not JSON object keys
+        summary['strata'] = [[stratum] + project_sample(sampler, columns)
+                             for stratum, sampler in stratified.strata.items()]
+    return summary
+
+def summary_cache_path(data_dir: str, table: str) -> str:
+    return os.path.join(data_dir, CACHE_DIR_NAME, f"approximate_{table}.json")
+
+def load_summary_cache(data_dir: str, table: str, sample_size: int, seed: Optional[int]) -> Dict[str, Any]:
+    """Cached file summaries, unless written by another version, sample size or seed."""
+    try:
+        with open(summary_cache_path(data_dir, table), 'r') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if (cache.get('version'), cache.get('sample_size')) != (SUMMARY_VERSION, sample_size):
+        return {}
+    if seed is not None and cache.get('seed') != seed:
+        return {}
+    return cache.get('files', {})
+
+def save_summary_cache(data_dir: str, table: str, sample_size: int, seed: Optional[int],
+                       files: Dict[str, Any]) -> None:
+    path = summary_cache_path(data_dir, table)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        # dumps uses the C encoder; dump to a file does not
+        f.write(json.dumps({'version': SUMMARY_VERSION, 'sample_size': sample_size, 'seed': seed, 'files': files}))
+    os.replace(tmp_path, path)
+
+def table_summaries(data_dir: str, table: str, sample_size: int,
+                    seed: Optional[int]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Summaries of every data file of a fact table in file order, streaming
+    only files whose size or modification time changed since they were cached.
+
+    With a seed, each file is sampled with its own generator seeded from the
+    seed and file name, so a cached summary is the one a rescan would build.
+    """
+    cached = load_summary_cache(data_dir, table, sample_size, seed)
+    files = {}
+    summaries = []
+    stats = {'partitions': 0, 'scanned': 0, 'reused': 0}
+    for path in table_paths(data_dir, TABLE_FILES[table]):
+        name = os.path.relpath(path, data_dir)
+        stat = os.stat(path)
+        entry = cached.get(name)
+        stats['partitions'] += 1
+        if entry and (entry['size'], entry['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+            stats['reused'] += 1
+        else:
+            rng = random.Random(f"{seed}:{name}") if seed is not None else random.Random()
+            entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                     'summary': summarize_file(table, load_json_data(path), sample_size, rng)}
+            stats['scanned'] += 1
+        files[name] = entry
+        summaries.append(entry['summary'])
+
+    if not summaries:
+        # Reports the missing file the same way load_table does
+        load_json_data(os.path.join(data_dir, TABLE_FILES[table]))
+        return [], stats
+    # Files that disappeared are dropped from the cache as well
+    save_summary_cache(data_dir, table, sample_size, seed, files)
+    return summaries, stats
+
+def merged_sample(parts: List[List[Any]], columns: Dict[str, Any], size: int,
+                  rng: random.Random) -> ReservoirSampler:
+    """One uniform sample of a table from its per-file projected samples, as row dicts."""
+    sampler = ReservoirSampler.merged([(seen, rows) for seen, rows in parts], size, rng)
+    sampler.sample = [dict(zip(columns, values)) for values in sampler.sample]
+    return sampler
+
+def z_score(confidence: float) -> float:
+    """Two-sided normal critical value for a confidence level."""
+    return statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+
+def finite_population_correction(n: int, population: int) -> float:
+    """Shrink factor for standard errors when sampling without replacement."""
+    if population <= 1 or n >= population:
+        return 0.0
+    return math.sqrt((population - n) / (population - 1))
+
+def proportion_interval(successes: int, n: int, population: int, z: float) -> Tuple[float, float, float]:
+    """Wilson score interval for a proportion, with finite population correction."""
+    if n == 0:
+        return 0.0, 0.0, 1.0
+    p = successes / n
+    fpc = finite_population_correction(n, population)
+    if fpc == 0.0:
+        return p, p, p
+    # Effective sample size grows as the sample approaches the population
+    n_eff = n / (fpc ** 2)
+    denominator = 1 + z ** 2 / n_eff
+    center = (p + z ** 2 / (2 * n_eff)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n_eff + z ** 2 / (4 * n_eff ** 2)) / denominator
+    return p, max(0.0, center - margin), min(1.0, center + margin)
+
+def mean_interval(values: List[float], population: int, z: float) -> Tuple[float, float, float]:
+    """Normal-approximation interval for a mean, with finite population correction."""
+    if not values:
+        return 0.0, 0.0, 0.0
+    # Float arithmetic: statistics.mean/stdev sum exactly with fractions, which dominates on large samples
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, mean, mean
+    stdev = math.sqrt(sum((value - mean) ** 2 for value in values) / (len(values) - 1))
+    margin = z * stdev / math.sqrt(len(values)) * finite_population_correction(len(values), population)
+    return mean, mean - margin, mean + margin
+
+def tolerance_status(low: float, high: float, expected: Optional[Tuple[float, float]]) -> str:
+    """Compare a confidence interval with an expected range."""
+    if expected is None:
+        return 'n/a'
+    min_expected, max_expected = expected
+    if min_expected <= low and high <= max_expected:
+        return 'pass'
+    if high < min_expected or low > max_expected:
+        return 'fail'
+    return 'inconclusive'
+
+def estimate(point: float, low: float, high: float, n: int, population: int,
+             expected: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+    """Package one estimate with its interval and tolerance status."""
+    return {
+        'estimate': point,
+        'ci_low': low,
+        'ci_high': high,
+        'sample_size': n,
+        'population': population,
+        'expected': list(expected) if expected else None,
+        'status': tolerance_status(low, high, expected)
+    }
+
+def estimate_mix(sampler: ReservoirSampler, column: str, z: float) -> Dict[str, Dict[str, Any]]:
+    """Estimate the share of each category of a column from a uniform sample."""
+    counts = {}
+    for row in sampler.sample:
+        value = row.get(column, 'unknown')
+        counts[value] = counts.get(value, 0) + 1
+    n = len(sampler.sample)
+    return {
+        value: estimate(*proportion_interval(count, n, sampler.seen, z), n, sampler.seen)
+        for value, count in sorted(counts.items())
+    }
+
+def estimate_adoption_rates(sampler: ReservoirSampler, frameworks: List[Dict[str, Any]],
+                            total_customers: int, z: float) -> Dict[str, Dict[str, Any]]:
+    """
+    Estimate each framework's adoption rate (% of customers) from a sample of adoptions.
+
+    The share of sampled adoptions for a framework is scaled by the exact
+    adoptions-per-customer ratio, so the interval scales the same way.
+    """
+    n = len(sampler.sample)
+    scale = (sampler.seen / total_customers) * 100 if total_customers else 0
+    counts = {}
+    for adoption in sampler.sample:
+        counts[adoption.get('framework_id')] = counts.get(adoption.get('framework_id'), 0) + 1
+
+    rates = {}
+    for framework in frameworks:
+        share, low, high = proportion_interval(counts.get(framework['framework_id'], 0), n, sampler.seen, z)
+        expected = EXPECTED_ADOPTION_RATES.get(framework['framework_name'])
+        rates[framework['framework_name']] = estimate(share * scale, low * scale, high * scale,
+                                                      n, sampler.seen, expected)
+    return rates
+
+def estimate_activity_metrics(uniform: ReservoirSampler, by_type: StratifiedSampler,
+                              z: float) -> Dict[str, Any]:
+    """Estimate automation/success rates and mean duration per activity type."""
+    n = len(uniform.sample)
+    automated = sum(1 for a in uniform.sample if a.get('automated_flag', False))
+    successful = sum(1 for a in uniform.sample if a.get('success_flag', False))
+
+    durations = {}
+    for activity_type, sampler in sorted(by_type.strata.items()):
+        values = [a.get('duration_minutes', 0) for a in sampler.sample]
+        durations[activity_type] = estimate(*mean_interval(values, sampler.seen, z), len(values),
+                                            sampler.seen, EXPECTED_DURATION_MINUTES.get(activity_type))
+
+    return {
+        'automation_rate': estimate(*proportion_interval(automated, n, uniform.seen, z), n, uniform.seen,
+                                    EXPECTED_AUTOMATION_RATE),
+        'success_rate': estimate(*proportion_interval(successful, n, uniform.seen, z), n, uniform.seen,
+                                 EXPECTED_SUCCESS_RATE),
+        'duration_by_type': durations
+    }
+
+def validate_primary_keys(trackers: Dict[str, KeyTracker]) -> Dict[str, Any]:
+    """Exact check that every table's primary key is present and unique."""
+    issues = []
+    duplicates = {}
+    for table, key in PRIMARY_KEYS.items():
+        tracker = trackers[table]
+        duplicates[table] = tracker.duplicates
+        if tracker.duplicates:
+            issues.append(f"{tracker.duplicates} duplicate {key} values in {TABLE_FILES[table]}")
+        if tracker.missing:
+            issues.append(f"{tracker.missing} rows without {key} in {TABLE_FILES[table]}")
+
+    return {
+        'table': 'PRIMARY KEYS',
+        'duplicate_keys': duplicates,
+        'issues': issues
+    }
+
+def validate_fact_invariants(invariants: FactInvariants) -> Dict[str, Any]:
+    """Exact hard invariants on fact tables that a sample cannot vouch for."""
+    issues = []
+    violations = invariants.violations
+
+    invalid_event_types = violations.get('event_type_values', 0)
+    unrealistic_contracts = violations.get('contract_length_by_event_type', 0)
+    negative_mrr = violations.get('mrr_amount_range', 0)
+    if invalid_event_types:
+        issues.append(f"{invalid_event_types} events have an unknown event_type")
+    if unrealistic_contracts:
+        issues.append(f"{unrealistic_contracts} events have unrealistic contract lengths (<12 months)")
+    if negative_mrr:
+        issues.append(f"{negative_mrr} events have a missing or negative mrr_amount")
+
+    invalid_first_events = sum(1 for _, event_type in invariants.first_events.values() if event_type != 'new')
+    if invalid_first_events:
+        issues.append(f"{invalid_first_events} customers don't have 'new' as their first event")
+
+    invalid_statuses = violations.get('status_values', 0)
+    temporal_issues = violations.get('completion_after_start', 0)
+    if invalid_statuses:
+        issues.append(f"{invalid_statuses} adoptions have an unknown status")
+    if temporal_issues:
+        issues.append(f"{temporal_issues} adoptions have invalid date sequences")
+
+    activity_violations = {name: violations.get(name, 0) for name in ACTIVITY_RULE_ISSUES}
+    issues.extend(activity_rule_issues(activity_violations))
+
+    return {
+        'table': 'FACT INVARIANTS',
+        'invalid_event_types': invalid_event_types,
+        'unrealistic_contracts': unrealistic_contracts,
+        'negative_mrr': negative_mrr,
+        'invalid_first_events': invalid_first_events,
+        'invalid_statuses': invalid_statuses,
+        'temporal_issues': temporal_issues,
+        'activity_rule_violations': activity_violations,
+        'issues': issues
+    }
+
+def collect_distribution_issues(approximations: Dict[str, Any]) -> List[str]:
+    """Turn failed tolerance checks into report issues."""
+    issues = []
+    for framework_name, result in approximations['adoption_rates'].items():
+        if result['status'] == 'fail':
+            issues.append(f"{framework_name} adoption rate CI {result['ci_low']:.1f}-{result['ci_high']:.1f}% "
+                          f"outside expected range {result['expected'][0]}-{result['expected'][1]}%")
+    activity = approximations['activity_metrics']
+    for metric in ('automation_rate', 'success_rate'):
+        if activity[metric]['status'] == 'fail':
+            issues.append(f"{metric} CI {activity[metric]['ci_low']:.1%}-{activity[metric]['ci_high']:.1%} "
+                          f"outside expected range")
+    for activity_type, result in activity['duration_by_type'].items():
+        if result['status'] == 'fail':
+            issues.append(f"{activity_type} mean duration CI {result['ci_low']:.0f}-{result['ci_high']:.0f} "
+                          f"minutes outside expected range")
+    return issues
+
+def run_approximate_checks(data_dir: str = '../data', sample_size: int = 10000,
+                           confidence: float = 0.95, seed: Optional[int] = None) -> Dict[str, Any]:
+    """Run exact key/invariant checks and sample-based distribution checks, streaming only changed files."""
+    rng = random.Random(seed)
+    z = z_score(confidence)
+
+    # Dimensions are small and checked whole; facts are streamed file by file
+    customers = load_table(data_dir, 'customers')
+    frameworks = load_table(data_dir, 'frameworks')
+
+    samplers = {'customers': [ReservoirSampler(sample_size, rng)]}
+    trackers = {table: KeyTracker(key, FOREIGN_KEYS.get(table, ())) for table, key in PRIMARY_KEYS.items()}
+    invariants = FactInvariants()
+
+    for table, rows in (('customers', customers), ('frameworks', frameworks)):
+        trackers[table].add_rows(rows)
+    samplers['customers'][0].extend(customers)
+
+    row_counts = {'customers': len(customers), 'frameworks': len(frameworks)}
+    partition_stats = {}
+    for table in FACT_TABLES:
+        summaries, partition_stats[table] = table_summaries(data_dir, table, sample_size, seed)
+        for summary in summaries:
+            trackers[table].merge(summary)
+            invariants.merge(summary)
+        row_counts[table] = sum(summary['rows'] for summary in summaries)
+        samplers[table] = [merged_sample([summary['sample'] for summary in summaries],
+                                         SAMPLE_COLUMNS[table], sample_size, rng)]
+        if table in STRATIFIED_SAMPLES:
+            stratum_column, columns = STRATIFIED_SAMPLES[table]
+            by_stratum = {}
+            for summary in summaries:
+                for stratum, seen, sample in summary['strata']:
+                    by_stratum.setdefault(stratum, []).append([seen, sample])
+            stratified = StratifiedSampler(lambda row: row.get(stratum_column, 'unknown'), sample_size, rng)
+            stratified.strata = {stratum: merged_sample(parts, columns, sample_size, rng)
+                                 for stratum, parts in by_stratum.items()}
+            samplers[table].append(stratified)
+
+    activity_sampler, duration_sampler = samplers['activities']
+    approximations = {
+        'confidence': confidence,
+        'segment_mix': estimate_mix(samplers['customers'][0], 'segment', z),
+        'event_type_mix': estimate_mix(samplers['events'][0], 'event_type', z),
+        'adoption_rates': estimate_adoption_rates(samplers['adoptions'][0], frameworks, len(customers), z),
+        'activity_metrics': estimate_activity_metrics(activity_sampler, duration_sampler, z)
+    }
+    approximations['issues'] = collect_distribution_issues(approximations)
+
+    references = {table: tracker.references for table, tracker in trackers.items()}
+    results = {
+        'dim_customers': validate_dim_customers(customers),
+        'dim_frameworks': validate_dim_frameworks(frameworks),
+        'primary_keys': validate_primary_keys(trackers),
+        'fact_invariants': validate_fact_invariants(invariants),
+        'foreign_keys': validate_foreign_keys(
+            customers, frameworks, [], [], [],
+            customer_ids=trackers['customers'].keys,
+            framework_ids=trackers['frameworks'].keys,
+            adoption_ids=trackers['adoptions'].keys,
+            event_customer_ids=references['events']['customer_id'],
+            adoption_customer_ids=references['adoptions']['customer_id'],
+            activity_customer_ids=references['activities']['customer_id'],
+            activity_adoption_ids=references['activities']['adoption_id'],
+            adoption_framework_ids=references['adoptions']['framework_id'],
+            activity_framework_ids=references['activities']['framework_id']),
+        'distributions': approximations
+    }
+
+    # Row counts only; the rows themselves are not kept
+    return {
+        'data_dir': data_dir,
+        'tables': row_counts,
+        'results': results,
+        'timings': {},
+        'partition_stats': partition_stats
+    }
+
+def print_estimates(title: str, estimates: Dict[str, Dict[str, Any]], percent: bool = True) -> None:
+    """Print a group of estimates with their intervals."""
+    status_icons = {'pass': '✅', 'fail': '⚠️', 'inconclusive': '❔', 'n/a': ''}
+    print(f"{title}:")
+    for name, result in estimates.items():
+        if percent:
+            value = f"{result['estimate']:.1%} (CI {result['ci_low']:.1%}-{result['ci_high']:.1%})"
+        else:
+            value = f"{result['estimate']:.1f} (CI {result['ci_low']:.1f}-{result['ci_high']:.1f})"
+        sample = f"n={result['sample_size']}/{result['population']}"
+        print(f"  {name}: {value} {sample} {status_icons[result['status']]}".rstrip())
+
+def print_approximate_report(approximations: Dict[str, Any]) -> None:
+    """Print the sample-based distribution estimates."""
+    print("\n" + "=" * 80)
+    print(f"🎲 APPROXIMATE DISTRIBUTION CHECKS ({approximations['confidence']:.0%} confidence)")
+    print("=" * 80)
+
+    print_estimates("Segment Mix", approximations['segment_mix'])
+    print_estimates("Event Type Mix", approximations['event_type_mix'])
+    print_estimates("Framework Adoption Rates (% of customers)", approximations['adoption_rates'], percent=False)
+
+    activity = approximations['activity_metrics']
+    print_estimates("Activity Rates", {
+        'automation_rate': activity['automation_rate'],
+        'success_rate': activity['success_rate']
+    })
+    print_estimates("Mean Duration by Activity Type (minutes)", activity['duration_by_type'], percent=False)
+
+    if approximations['issues']:
+        print(f"\n⚠️  Distribution Issues Found ({len(approximations['issues'])}):")
+        for issue in approximations['issues']:
+            print(f"  - {issue}")
+    else:
+        print("\n✅ All expected ranges within tolerance (or not excluded by the intervals)")
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Run sampling-based approximate data quality checks.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--sample-size', type=int, default=10000, help="Reservoir size per table (and per stratum)")
+    parser.add_argument('--confidence', type=float, default=0.95, help="Confidence level for the intervals")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Random seed for reproducible samples (cached file samples are reused only "
+                             "for the same seed)")
+    args = parser.parse_args(argv)
+
+    print("🚀 Running approximate data quality checks...")
+    run = run_approximate_checks(args.data_dir, args.sample_size, args.confidence, args.seed)
+
+    if not run['tables']['customers']:
+        print("❌ Could not load customer data. Exiting.")
+        return run
+
+    results = run['results']
+    print_quality_report([result for name, result in results.items() if name != 'distributions'])
+    print_approximate_report(results['distributions'])
+    print_partition_stats(run['partition_stats'])
+    return run
+
+if __name__ == "__main__":
+    finish_quality_run(main())
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Bulk-load the generated JSON into any DB-API (or SQLAlchemy) connection.
+
+Replaces hand-running the PUT / COPY INTO blocks of snowflake_setup.sql:
+1. Tables and their COPY INTO casts come from the setup script via
+   local_engine.parse_setup_sql, and are loaded in FOREIGN KEY order so
+   dimensions land before the facts that reference them
+2. Worker processes parse and cast the next shards (same casts and date
+   formats as COPY INTO) while the main process inserts the current one with
+   executemany in batches of --batch-size
+3. Bad values abort the table like ON_ERROR = 'ABORT_STATEMENT'
+4. Row counts in the target are reconciled against the rows read, and
+   throughput is reported per table
+
+Against Snowflake, pass a snowflake.connector (or SQLAlchemy) connection to
+bulk_load(); from the command line the loader runs against DuckDB or sqlite
+for local testing.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+from local_engine import DERIVED_SQL, SETUP_SQL, connect, parse_setup_sql, sqlite_type, strptime_format, table_sources
+from quality_checks import load_json_data
+
+DEFAULT_BATCH_SIZE = 5000
+
+# DB-API paramstyle -> placeholder for the i-th (0-based) column
+PLACEHOLDERS = {
+    'qmark': lambda i: '?',
+    'numeric': lambda i: f":{i + 1}",
+    'named': lambda i: f":c{i}",
+    'format': lambda i: '%s',
+    'pyformat': lambda i: '%s'
+}
+
+class LoadError(ValueError):
+    """A staged value could not be cast to its column type."""
+
+def load_order(schema: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Table keys ordered so every table comes after the tables its foreign keys reference."""
+    names = {definition['name']: table for table, definition in schema.items()}
+    parents = {
+        table: {names[parent] for _, parent, _ in definition['foreign_keys'] if parent in names and names[parent] != table}
+        for table, definition in schema.items()
+    }
+    ordered = []
+    remaining = list(schema)
+    while remaining:
+        ready = [table for table in remaining if parents[table] <= set(ordered)]
+        if not ready:
+            raise ValueError(f"Foreign key cycle between {', '.join(remaining)}")
+        ordered.extend(ready)
+        remaining = [table for table in remaining if table not in ready]
+    return ordered
+
+def cast_value(value: Any, cast_type: str, date_format: Optional[str]) -> Any:
+    """Client-side equivalent of one COPY INTO cast; raises ValueError on bad input."""
+    if value is None:
+        return None
+    if date_format:
+        return datetime.strptime(str(value), strptime_format(date_format)).date().isoformat()
+    base = cast_type.split('(')[0].upper()
+    if base == 'INTEGER':
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"{value!r} is not an integer")
+        number = int(value)
+        # Snowflake INTEGER is NUMBER(38,0)
+        if abs(number) >= 10 ** 38:
+            raise ValueError(f"{value!r} overflows INTEGER")
+        return number
+    if base in ('DECIMAL', 'NUMBER') and '(' in cast_type:
+        precision, scale = (int(part) for part in (cast_type.split('(')[1].rstrip(')') + ',0').split(',')[:2])
+        number = float(value)
+        if abs(round(number, scale)) >= 10 ** (precision - scale):
+            raise ValueError(f"{value!r} overflows {cast_type}")
+        return number
+    if base in ('DECIMAL', 'NUMBER', 'FLOAT'):
+        return float(value)
+    if base == 'BOOLEAN':
+        if isinstance(value, str):
+            if value.lower() not in ('true', 'false'):
+                raise ValueError(f"{value!r} is not a boolean")
+            return value.lower() == 'true'
+        return bool(value)
+    if base == 'VARCHAR' and '(' in cast_type:
+        text = str(value)
+        length = int(cast_type.split('(')[1].rstrip(')'))
+        if len(text) > length:
+            raise ValueError(f"{value!r} is longer than {cast_type}")
+        return text
+    return str(value)
+
+def prepare_shard(path: str, projections: List[Tuple[str, str, str, Optional[str]]]) -> Tuple[List[tuple], int]:
+    """Parse one JSON shard and cast every row; returns (rows, file bytes)."""
+    rows = []
+    for index, record in enumerate(load_json_data(path)):
+        values = []
+        for column, field, cast_type, date_format in projections:
+            try:
+                values.append(cast_value(record.get(field), cast_type, date_format))
+            except (TypeError, ValueError) as error:
+                raise LoadError(f"{os.path.basename(path)} row {index + 1}: {field} -> {column}: {error}") from None
+        rows.append(tuple(values))
+    return rows, os.path.getsize(path)
+
+def dbapi_connection(conn: Any) -> Any:
+    """The DB-API connection behind a SQLAlchemy Engine/Connection, or conn itself."""
+    if hasattr(conn, 'raw_connection'):
+        conn = conn.raw_connection()
+    elif hasattr(conn, 'exec_driver_sql'):
+        conn = conn.connection
+    return getattr(conn, 'driver_connection', None) or getattr(conn, 'dbapi_connection', None) or conn
+
+def driver_module(conn: Any) -> Any:
+    return sys.modules.get(type(conn).__module__.split('.')[0])
+
+def column_type(conn: Any, snowflake_type: str) -> str:
+    """Column type for CREATE TABLE: sqlite storage classes, Snowflake types elsewhere."""
+    return sqlite_type(snowflake_type) if getattr(driver_module(conn), '__name__', '') == 'sqlite3' else snowflake_type
+
+def count_rows(cursor: Any, table_name: str) -> int:
+    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+    return cursor.fetchone()[0]
+
+def create_tables(conn: Any, schema: Dict[str, Dict[str, Any]], order: List[str]) -> None:
+    """Drop (children first) and recreate (parents first) the tables, without constraints."""
+    cursor = conn.cursor()
+    for table in reversed(order):
+        cursor.execute(f"DROP TABLE IF EXISTS {schema[table]['name']}")
+    for table in order:
+        definition = schema[table]
+        columns = ', '.join(f"{column} {column_type(conn, kind)}" for column, kind in definition['columns'])
+        cursor.execute(f"CREATE TABLE {definition['name']} ({columns})")
+    conn.commit()
+
+def _shard_results(paths: List[str], projections: list, pool: Optional[ProcessPoolExecutor], lookahead: int):
+    """Prepared shards in order, keeping at most `lookahead` in flight."""
+    if pool is None:
+        for path in paths:
+            yield prepare_shard(path, projections)
+        return
+    pending = deque()
+    for path in paths:
+        pending.append(pool.submit(prepare_shard, path, projections))
+        if len(pending) >= lookahead:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def load_table(conn: Any, definition: Dict[str, Any], paths: List[str], batch_size: int,
+               paramstyle: str, pool: Optional[ProcessPoolExecutor] = None, lookahead: int = 2) -> Dict[str, Any]:
+    """Insert every shard of one table in executemany batches; returns load statistics."""
+    projections = definition['projections']
+    columns = ', '.join(column for column, _, _, _ in projections)
+    values = ', '.join(PLACEHOLDERS[paramstyle](i) for i in range(len(projections)))
+    sql = f"INSERT INTO {definition['name']} ({columns}) VALUES ({values})"
+    if paramstyle == 'named':
+        keys = [f"c{i}" for i in range(len(projections))]
+
+    cursor = conn.cursor()
+    before = count_rows(cursor, definition['name'])
+    start = time.perf_counter()
+    rows_read = bytes_read = batches = 0
+    try:
+        for rows, size in _shard_results(paths, projections, pool, lookahead):
+            for offset in range(0, len(rows), batch_size):
+                batch = rows[offset:offset + batch_size]
+                if paramstyle == 'named':
+                    batch = [dict(zip(keys, row)) for row in batch]
+                cursor.executemany(sql, batch)
+                batches += 1
+            rows_read += len(rows)
+            bytes_read += size
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    seconds = time.perf_counter() - start
+    loaded = count_rows(cursor, definition['name']) - before
+    return {
+        'table': definition['name'],
+        'files': len(paths),
+        'rows_read': rows_read,
+        'rows_loaded': loaded,
+        'reconciled': loaded == rows_read,
+        'batches': batches,
+        'seconds': seconds,
+        'rows_per_second': rows_read / seconds if seconds else 0.0,
+        'mb_per_second': bytes_read / 1e6 / seconds if seconds else 0.0
+    }
+
+def bulk_load(conn: Any, data_dir: str = '../data', batch_size: int = DEFAULT_BATCH_SIZE,
+              workers: Optional[int] = None, replace: bool = True, include_derived: bool = False,
+              paramstyle: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Load every table with data files into `conn`, parents before children.
+
+    With replace the tables are dropped and recreated from the setup DDL;
+    otherwise rows are appended to existing tables. workers = 1 parses shards
+    in-process.
+    """
+    conn = dbapi_connection(conn)
+    paramstyle = paramstyle or getattr(driver_module(conn), 'paramstyle', 'qmark')
+    if paramstyle not in PLACEHOLDERS:
+        raise ValueError(f"Unsupported paramstyle: {paramstyle}")
+    schema = parse_setup_sql(SETUP_SQL)
+    if include_derived:
+        schema.update(parse_setup_sql(DERIVED_SQL))
+    order = load_order(schema)
+    if replace:
+        create_tables(conn, schema, order)
+
+    workers = workers or min(4, os.cpu_count() or 1)
+    pool = None
+    if workers > 1:
+        context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    results = []
+    try:
+        for table in order:
+            paths = table_sources(data_dir, table)
+            if not paths:
+                continue
+            results.append(load_table(conn, schema[table], paths, batch_size, paramstyle, pool, workers + 1))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return results
+
+def print_load_report(results: List[Dict[str, Any]]) -> None:
+    print(f"\n{'table':<32} {'files':>5} {'rows read':>11} {'loaded':>11} {'seconds':>8} {'rows/s':>10} {'MB/s':>7}")
+    for result in results:
+        status = '' if result['reconciled'] else '  ❌ count mismatch'
+        print(f"{result['table']:<32} {result['files']:>5} {result['rows_read']:>11,} {result['rows_loaded']:>11,} "
+              f"{result['seconds']:>8.2f} {result['rows_per_second']:>10,.0f} {result['mb_per_second']:>7.1f}{status}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load the generated JSON files into a local DuckDB/sqlite database.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--engine', choices=['auto', 'duckdb', 'sqlite'], default='auto',
+                        help="Embedded engine (auto prefers duckdb, falls back to sqlite3)")
+    parser.add_argument('--database', default=':memory:', help="Database file to load into (default: in-memory)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Rows per executemany call")
+    parser.add_argument('--workers', type=int, default=None, help="Processes parsing shards ahead of the inserts")
+    parser.add_argument('--append', action='store_true', help="Append to existing tables instead of recreating them")
+    parser.add_argument('--derived', action='store_true', help="Also load the derived tables from derived_tables.sql")
+    args = parser.parse_args()
+
+    conn, engine = connect(args.engine, args.database)
+    print(f"🚚 Bulk loading {args.data_dir} into {engine} ({args.database}), batch size {args.batch_size:,}...")
+    start = time.perf_counter()
+    try:
+        results = bulk_load(conn, args.data_dir, args.batch_size, args.workers,
+                            replace=not args.append, include_derived=args.derived)
+    except LoadError as error:
+        print(f"❌ Load aborted: {error}")
+        sys.exit(1)
+    print_load_report(results)
+    total_rows = sum(result['rows_read'] for result in results)
+    print(f"\n⏱️  {total_rows:,} rows in {time.perf_counter() - start:.2f}s")
+    if not all(result['reconciled'] for result in results):
+        print("❌ Row counts do not reconcile")
+        sys.exit(1)
+    print("✅ Row counts reconcile for every table")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Declarative business rules shared by the generators and quality_checks.py.
+
+Each table's rules are a list of dicts in RULE_SPECS:
+1. range - numeric column within [min, max] (an infinite or missing bound is open)
+2. enum - column value in an allowed set
+3. conditional_range - numeric range that depends on another column (segment rules)
+4. date_format - column parses with a strptime format
+5. temporal_order - one date column strictly (or not) after another
+
+compile_rules turns a spec into column-wise predicates; evaluate_rules pulls
+the needed columns out of the rows in a single pass and runs every predicate
+over whole columns, returning the failing row positions per rule.
+"""
+
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+DATE_FORMAT = '%m/%d/%Y'
+
+# Segment definitions used to generate and validate DIM_CUSTOMERS
+SEGMENT_EMPLOYEE_RANGES = {
+    'startup': (1, 50),
+    'mid_market': (51, 500),
+    'enterprise': (501, 10000)
+}
+
+SEGMENT_REVENUE_RANGES = {
+    'startup': (100000, 5000000),
+    'mid_market': (5000000, 100000000),
+    'enterprise': (100000000, 1000000000)
+}
+
+SEGMENTS = list(SEGMENT_EMPLOYEE_RANGES)
+
+EVENT_TYPES = ['new', 'renewal', 'expansion', 'downgrade', 'churn']
+
+# Contracts under 12 months are unrealistic for compliance tools; there is no
+# upper bound, and churn events (which end the contract) are not checked
+CONTRACT_LENGTH_RANGES = {event_type: (12, float('inf')) for event_type in EVENT_TYPES if event_type != 'churn'}
+
+ADOPTION_STATUSES = ['active', 'completed', 'certified']
+
+# Expected adoption rate ranges (% of customers) for the widely adopted frameworks
+EXPECTED_ADOPTION_RATES = {
+    'SOC2_Type_I': (90, 98),     # Should be 95% ± variance
+    'SOC2_Type_II': (60, 80),    # Should be 70% ± variance
+    'NIST_CSF': (65, 85),        # Should be 75% ± variance
+    'ISO27001': (30, 50),        # Should be 40% ± variance
+    'GDPR': (25, 45),            # Should be 35% ± variance
+}
+
+# Category shares generate_compliance_activities draws FACT_COMPLIANCE_ACTIVITIES from
+ACTIVITY_TYPE_MIX = {'control_check': 0.50, 'questionnaire': 0.20, 'remediation': 0.15, 'training': 0.10, 'audit': 0.05}
+CONTROL_CATEGORY_MIX = {'access_control': 0.25, 'data_protection': 0.25, 'network_security': 0.20,
+                        'monitoring': 0.20, 'incident_response': 0.10}
+RISK_LEVEL_MIX = {'low': 0.40, 'medium': 0.30, 'high': 0.20, 'critical': 0.10}
+
+# Realistic average (or median) duration_minutes by activity type; these bound
+# a per-type aggregate, so they are checked by the activity validators rather
+# than as row rules in RULE_SPECS
+EXPECTED_DURATION_MINUTES = {
+    'control_check': (0, 150),
+    'audit': (200, float('inf'))
+}
+
+RULE_SPECS = {
+    'customers': [
+        {'name': 'segment_values', 'type': 'enum', 'column': 'segment', 'values': SEGMENTS},
+        {'name': 'employee_count_by_segment', 'type': 'conditional_range',
+         'column': 'employee_count', 'by': 'segment', 'ranges': SEGMENT_EMPLOYEE_RANGES},
+        {'name': 'annual_revenue_by_segment', 'type': 'conditional_range',
+         'column': 'annual_revenue', 'by': 'segment', 'ranges': SEGMENT_REVENUE_RANGES},
+        {'name': 'signup_date_format', 'type': 'date_format',
+         'column': 'signup_date', 'format': DATE_FORMAT}
+    ],
+    'events': [
+        {'name': 'event_type_values', 'type': 'enum', 'column': 'event_type', 'values': EVENT_TYPES},
+        {'name': 'contract_length_by_event_type', 'type': 'conditional_range',
+         'column': 'contract_length_months', 'by': 'event_type', 'ranges': CONTRACT_LENGTH_RANGES},
+        {'name': 'mrr_amount_range', 'type': 'range', 'column': 'mrr_amount', 'min': 0}
+    ],
+    'adoptions': [
+        {'name': 'status_values', 'type': 'enum', 'column': 'status', 'values': ADOPTION_STATUSES},
+        {'name': 'completion_after_start', 'type': 'temporal_order',
+         'before': 'start_date', 'after': 'completion_date', 'format': DATE_FORMAT, 'strict': True}
+    ],
+    'activities': [
+        {'name': 'activity_type_values', 'type': 'enum', 'column': 'activity_type', 'values': list(ACTIVITY_TYPE_MIX)},
+        {'name': 'control_category_values', 'type': 'enum', 'column': 'control_category',
+         'values': list(CONTROL_CATEGORY_MIX)},
+        {'name': 'risk_level_values', 'type': 'enum', 'column': 'risk_level', 'values': list(RISK_LEVEL_MIX)},
+        {'name': 'duration_minutes_range', 'type': 'range', 'column': 'duration_minutes', 'min': 0}
+    ]
+}
+
+Predicate = Callable[[Dict[str, List[Any]]], List[int]]
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def parse_dates(values: List[Any], fmt: str = DATE_FORMAT) -> List[Optional[datetime]]:
+    """Parse a date column, mapping unparseable values to None."""
+    parsed = []
+    cache = {}
+    for value in values:
+        if value not in cache:
+            try:
+                cache[value] = datetime.strptime(value, fmt)
+            except (TypeError, ValueError):
+                cache[value] = None
+        parsed.append(cache[value])
+    return parsed
+
+def _compile_range(rule: Dict[str, Any]) -> Tuple[List[str], Predicate]:
+    column, low, high = rule['column'], rule.get('min'), rule.get('max')
+
+    def predicate(columns: Dict[str, List[Any]]) -> List[int]:
+        return [i for i, value in enumerate(columns[column])
+                if not (_is_number(value)
+                        and (low is None or value >= low)
+                        and (high is None or value <= high))]
+    return [column], predicate
+
+def _compile_enum(rule: Dict[str, Any]) -> Tuple[List[str], Predicate]:
+    column, allowed = rule['column'], frozenset(rule['values'])
+
+    def predicate(columns: Dict[str, List[Any]]) -> List[int]:
+        return [i for i, value in enumerate(columns[column]) if value not in allowed]
+    return [column], predicate
+
+def _compile_conditional_range(rule: Dict[str, Any]) -> Tuple[List[str], Predicate]:
+    column, by, ranges = rule['column'], rule['by'], rule['ranges']
+
+    def predicate(columns: Dict[str, List[Any]]) -> List[int]:
+        # Rows whose condition value has no configured range are not checked
+        failing = []
+        for i, (group, value) in enumerate(zip(columns[by], columns[column])):
+            bounds = ranges.get(group)
+            if bounds is not None and not (_is_number(value) and bounds[0] <= value <= bounds[1]):
+                failing.append(i)
+        return failing
+    return [by, column], predicate
+
+def _compile_date_format(rule: Dict[str, Any]) -> Tuple[List[str], Predicate]:
+    column, fmt = rule['column'], rule.get('format', DATE_FORMAT)
+
+    def predicate(columns: Dict[str, List[Any]]) -> List[int]:
+        return [i for i, value in enumerate(parse_dates(columns[column], fmt)) if value is None]
+    return [column], predicate
+
+def _compile_temporal_order(rule: Dict[str, Any]) -> Tuple[List[str], Predicate]:
+    before, after = rule['before'], rule['after']
+    fmt, strict = rule.get('format', DATE_FORMAT), rule.get('strict', True)
+
+    def predicate(columns: Dict[str, List[Any]]) -> List[int]:
+        # Unparseable dates count as violations, like the hand-written checks
+        failing = []
+        pairs = zip(parse_dates(columns[before], fmt), parse_dates(columns[after], fmt))
+        for i, (first, second) in enumerate(pairs):
+            if first is None or second is None or second < first or (strict and second == first):
+                failing.append(i)
+        return failing
+    return [before, after], predicate
+
+RULE_COMPILERS = {
+    'range': _compile_range,
+    'enum': _compile_enum,
+    'conditional_range': _compile_conditional_range,
+    'date_format': _compile_date_format,
+    'temporal_order': _compile_temporal_order
+}
+
+def compile_rules(rules: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Compile a rule spec into column-wise predicates and the columns they read."""
+    compiled = []
+    needed = []
+    for rule in rules:
+        if rule['type'] not in RULE_COMPILERS:
+            raise ValueError(f"Unknown rule type '{rule['type']}' in rule '{rule['name']}'")
+        columns, predicate = RULE_COMPILERS[rule['type']](rule)
+        compiled.append((rule['name'], predicate))
+        for column in columns:
+            if column not in needed:
+                needed.append(column)
+    return {'columns': needed, 'predicates': compiled}
+
+COMPILED_RULES = {table: compile_rules(rules) for table, rules in RULE_SPECS.items()}
+
+def extract_columns(rows: List[Dict[str, Any]], names: List[str]) -> Dict[str, List[Any]]:
+    """Transpose the named columns out of a list of rows in one pass."""
+    columns = {name: [] for name in names}
+    appenders = [(name, columns[name].append) for name in names]
+    for row in rows:
+        get = row.get
+        for name, append in appenders:
+            append(get(name))
+    return columns
+
+def evaluate_rules(table: str, rows: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """Evaluate a table's rules in bulk; returns failing row positions per rule name."""
+    compiled = COMPILED_RULES[table]
+    columns = extract_columns(rows, compiled['columns'])
+    return {name: predicate(columns) for name, predicate in compiled['predicates']}
+
+def _sql_literal(value: Any) -> str:
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return str(value)
+
+def _out_of_bounds_sql(column: str, low: Any, high: Any) -> List[str]:
+    # SQL has no infinity literal, so infinite bounds are left open
+    conditions = [f"{column} IS NULL"]
+    if low is not None and low != float('-inf'):
+        conditions.append(f"{column} < {low}")
+    if high is not None and high != float('inf'):
+        conditions.append(f"{column} > {high}")
+    return conditions
+
+def rule_violation_sql(rule: Dict[str, Any]) -> str:
+    """
+    Boolean SQL expression that is true for rows violating a rule, written
+    against the typed warehouse tables (dates already cast, so an unparseable
+    date is NULL).
+    """
+    kind = rule['type']
+    if kind == 'range':
+        column = rule['column']
+        return '(' + ' OR '.join(_out_of_bounds_sql(column, rule.get('min'), rule.get('max'))) + ')'
+    if kind == 'enum':
+        values = ', '.join(_sql_literal(value) for value in rule['values'])
+        return f"({rule['column']} IS NULL OR {rule['column']} NOT IN ({values}))"
+    if kind == 'conditional_range':
+        column, by = rule['column'], rule['by']
+        branches = [
+            f"({by} = {_sql_literal(group)} AND ({' OR '.join(_out_of_bounds_sql(column, low, high))}))"
+            for group, (low, high) in rule['ranges'].items()
+        ]
+        return '(' + ' OR '.join(branches) + ')'
+    if kind == 'date_format':
+        return f"({rule['column']} IS NULL)"
+    if kind == 'temporal_order':
+        before, after = rule['before'], rule['after']
+        operator = '<=' if rule.get('strict', True) else '<'
+        return f"({before} IS NULL OR {after} IS NULL OR {after} {operator} {before})"
+    raise ValueError(f"Unknown rule type '{kind}' in rule '{rule['name']}'")
+
+def rules_by_name(table: str) -> Dict[str, Dict[str, Any]]:
+    """A table's rule specs keyed by rule name."""
+    return {rule['name']: rule for rule in RULE_SPECS[table]}
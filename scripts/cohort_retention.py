@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Signup-cohort retention matrix with net and gross revenue retention.
+
+Customers are grouped by signup month (DIM_CUSTOMERS.signup_date) and
+segment. For every month since signup, FACT_COHORT_RETENTION holds how many
+of the cohort's customers still pay (logo retention) and how much of their
+starting MRR remains, both uncapped (NRR) and capped at each customer's
+starting MRR (GRR, which ignores expansion).
+
+Events are sorted once by customer and date; each customer's events are then
+swept forward month end by month end, so the whole matrix comes from one
+ordered pass instead of a cohort x event self-join. MRR is normalized by
+billing period exactly as in revenue_snapshots.py. A customer enters the
+cohort base from the first month end after their first subscription event;
+their starting MRR is that event's MRR.
+"""
+
+import argparse
+import json
+import os
+from datetime import date, timedelta
+from itertools import groupby
+from typing import List, Dict, Any, Optional
+
+from quality_checks import load_json_data, load_table
+from revenue_snapshots import format_day, month_start, next_month, normalized_mrr, parse_day
+from sketches import table_shards
+
+COHORT_TABLE = 'FACT_COHORT_RETENTION'
+
+def _ratio(numerator: float, denominator: float) -> Optional[float]:
+    return round(numerator / denominator, 4) if denominator else None
+
+def cohort_retention(events: List[Dict[str, Any]], customers: List[Dict[str, Any]],
+                     as_of: Optional[date] = None) -> List[Dict[str, Any]]:
+    """Cohort x segment x months-since-signup retention rows, measured at month ends up to as_of."""
+    as_of = as_of or date.today()
+    customer_lookup = {c['customer_id']: c for c in customers}
+    cells = {}
+
+    ordered = sorted(events, key=lambda e: (e['customer_id'], parse_day(e['event_date']), e['event_id']))
+    for customer_id, customer_events in groupby(ordered, key=lambda e: e['customer_id']):
+        customer = customer_lookup.get(customer_id)
+        if customer is None:
+            continue
+        customer_events = [(parse_day(e['event_date']), normalized_mrr(e)) for e in customer_events]
+        cohort = month_start(parse_day(customer['signup_date']))
+        first_day, starting_mrr = customer_events[0]
+
+        # Sweep month ends forward, advancing through the customer's events
+        position, current_mrr = 0, 0.0
+        month, months_since_signup = cohort, 0
+        while month <= as_of:
+            measured = min(next_month(month) - timedelta(days=1), as_of)
+            while position < len(customer_events) and customer_events[position][0] <= measured:
+                current_mrr = customer_events[position][1]
+                position += 1
+            if first_day <= measured:
+                key = (cohort, customer['segment'], months_since_signup)
+                cell = cells.setdefault(key, [0, 0, 0.0, 0.0, 0.0])
+                cell[0] += 1
+                cell[1] += 1 if current_mrr > 0 else 0
+                cell[2] += starting_mrr
+                cell[3] += current_mrr
+                cell[4] += min(current_mrr, starting_mrr)
+            month = next_month(month)
+            months_since_signup += 1
+
+    rows = []
+    for (cohort, segment, months_since_signup), cell in sorted(cells.items()):
+        cohort_customers, retained_customers, starting_mrr, retained_mrr, capped_mrr = cell
+        period = cohort
+        for _ in range(months_since_signup):
+            period = next_month(period)
+        rows.append({
+            'cohort_month': format_day(cohort),
+            'segment': segment,
+            'months_since_signup': months_since_signup,
+            'period_month': format_day(period),
+            'cohort_customers': cohort_customers,
+            'retained_customers': retained_customers,
+            'starting_mrr': round(starting_mrr, 2),
+            'retained_mrr': round(retained_mrr, 2),
+            'gross_retained_mrr': round(capped_mrr, 2),
+            'logo_retention': _ratio(retained_customers, cohort_customers),
+            'net_revenue_retention': _ratio(retained_mrr, starting_mrr),
+            'gross_revenue_retention': _ratio(capped_mrr, starting_mrr)
+        })
+    return rows
+
+def build_cohort_retention(data_dir: str = '../data', as_of: Optional[date] = None,
+                           events: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """Compute FACT_COHORT_RETENTION and write it to <data_dir>."""
+    customers = load_table(data_dir, 'customers')
+    if events is None:
+        events = [event for path in table_shards(data_dir, 'events') for event in load_json_data(path)]
+    rows = cohort_retention(events, customers, as_of)
+    with open(os.path.join(data_dir, f"{COHORT_TABLE}.json"), 'w') as f:
+        json.dump(rows, f, indent=2)
+    return rows
+
+def print_retention_summary(rows: List[Dict[str, Any]], checkpoints=(1, 6, 12, 24)) -> None:
+    """Portfolio-wide logo, net and gross retention at a few months since signup."""
+    print(f"\n{'month':>6} {'customers':>10} {'logo':>8} {'NRR':>8} {'GRR':>8}")
+    for checkpoint in checkpoints:
+        matching = [row for row in rows if row['months_since_signup'] == checkpoint]
+        if not matching:
+            continue
+        base = sum(row['cohort_customers'] for row in matching)
+        starting = sum(row['starting_mrr'] for row in matching)
+        logo = sum(row['retained_customers'] for row in matching) / base
+        nrr = sum(row['retained_mrr'] for row in matching) / starting
+        grr = sum(row['gross_retained_mrr'] for row in matching) / starting
+        print(f"{checkpoint:>6} {base:>10} {logo:>8.1%} {nrr:>8.1%} {grr:>8.1%}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute signup-cohort retention with NRR and GRR.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--as-of', default=None, help="Last measurement day as MM/DD/YYYY (default: today)")
+    args = parser.parse_args()
+
+    print(f"👥 Building {COHORT_TABLE}...")
+    rows = build_cohort_retention(args.data_dir, parse_day(args.as_of) if args.as_of else None)
+    cohorts = len({(row['cohort_month'], row['segment']) for row in rows})
+    print(f"💾 Saved {len(rows):,} rows for {cohorts} cohort/segment pairs to {args.data_dir}/{COHORT_TABLE}.json")
+    print_retention_summary(rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Pre-flight the COPY INTO casts locally before anything is PUT to a stage.
+
+A multi-GB COPY INTO with ON_ERROR = 'ABORT_STATEMENT' fails on the first
+bad value (a state_province longer than VARCHAR(2), a date that is not
+MM/DD/YYYY, a number that overflows its DECIMAL). This tool applies the same
+projections to every output shard first:
+1. The `$1:field::TYPE` and TO_DATE projections and NOT NULL columns are
+   read from the setup SQL with local_engine.parse_setup_sql
+2. Shards are validated in parallel worker processes with the loader's
+   client-side casts (bulk_loader.cast_value)
+3. Every failing row is reported with its file, row number, source field,
+   target column, value and reason - not just the first one
+
+Exit code is 1 when any row would be rejected, so it can gate the upload.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from bulk_loader import cast_value
+from local_engine import DERIVED_SQL, SETUP_SQL, parse_setup_sql, table_sources
+from quality_checks import ENCODED_SUFFIX
+
+# Failures kept per shard; the per-shard count is always exact
+MAX_FAILURES_PER_SHARD = 50
+
+def validate_shard(path: str, definition: Dict[str, Any],
+                   max_failures: int = MAX_FAILURES_PER_SHARD) -> Dict[str, Any]:
+    """Apply every projection to every row of one shard and collect the rows COPY INTO would reject."""
+    not_null = set(definition['not_null'])
+    failures = []
+    failing_rows = 0
+    if path.endswith(ENCODED_SUFFIX):
+        return {'path': path, 'rows': 0, 'failing_rows': 0, 'failing_files': 1, 'bytes': os.path.getsize(path),
+                'failures': [{'file': os.path.basename(path), 'row': None, 'field': None, 'column': None,
+                              'value': None, 'error': "dictionary-encoded: run encoded_output.py --decode first"}]}
+    try:
+        # Parsed here rather than with load_json_data, which reports and skips unreadable files
+        with open(path, 'r') as f:
+            records = json.load(f)
+    except (OSError, ValueError) as error:
+        return {'path': path, 'rows': 0, 'failing_rows': 0, 'failing_files': 1, 'bytes': 0,
+                'failures': [{'file': os.path.basename(path), 'row': None, 'field': None, 'column': None,
+                              'value': None, 'error': f"unreadable JSON: {error}"}]}
+    for index, record in enumerate(records):
+        row_failed = False
+        for column, field, cast_type, date_format in definition['projections']:
+            value = record.get(field) if isinstance(record, dict) else None
+            error = None
+            if value is None:
+                if column in not_null:
+                    present = isinstance(record, dict) and field in record
+                    error = "NULL in NOT NULL column" if present else "missing field for NOT NULL column"
+            else:
+                try:
+                    cast_value(value, cast_type, date_format)
+                except (TypeError, ValueError) as cast_error:
+                    error = str(cast_error)
+            if error is None:
+                continue
+            row_failed = True
+            if len(failures) < max_failures:
+                failures.append({'file': os.path.basename(path), 'row': index + 1, 'field': field,
+                                 'column': column, 'value': value, 'error': error})
+        failing_rows += row_failed
+    return {'path': path, 'rows': len(records), 'failing_rows': failing_rows, 'failing_files': 0,
+            'bytes': os.path.getsize(path), 'failures': failures}
+
+def preflight(data_dir: str = '../data', workers: Optional[int] = None, include_derived: bool = False,
+              tables: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Validate every shard of every table; returns per-table totals and sample failures."""
+    schema = parse_setup_sql(SETUP_SQL)
+    if include_derived:
+        schema.update(parse_setup_sql(DERIVED_SQL))
+    selected = [table for table in schema if not tables or table in tables or schema[table]['name'] in tables]
+
+    jobs = [(table, path) for table in selected for path in table_sources(data_dir, table)]
+    workers = workers or min(len(jobs), os.cpu_count() or 1) or 1
+    if workers > 1 and len(jobs) > 1:
+        context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(validate_shard, path, schema[table]) for table, path in jobs]
+            shard_results = [future.result() for future in futures]
+    else:
+        shard_results = [validate_shard(path, schema[table]) for table, path in jobs]
+
+    report = {}
+    for table in selected:
+        report[table] = {'table': schema[table]['name'], 'files': 0, 'rows': 0, 'failing_rows': 0, 'failing_files': 0,
+                         'bytes': 0, 'failures': []}
+    for (table, _), result in zip(jobs, shard_results):
+        entry = report[table]
+        entry['files'] += 1
+        for key in ('rows', 'failing_rows', 'failing_files', 'bytes'):
+            entry[key] += result[key]
+        entry['failures'].extend(result['failures'])
+    return report
+
+def print_preflight_report(report: Dict[str, Dict[str, Any]], samples: int = 5) -> None:
+    print(f"\n{'table':<32} {'files':>5} {'unreadable':>10} {'rows':>11} {'rejected':>9}")
+    for entry in report.values():
+        if entry['files'] == 0:
+            print(f"{entry['table']:<32} {'-':>5} {'-':>10} {'-':>11} {'-':>9}  ⚠️  no data files (nothing to PUT)")
+            continue
+        status = '✅' if entry['failing_rows'] == 0 and entry['failing_files'] == 0 else '❌'
+        print(f"{entry['table']:<32} {entry['files']:>5} {entry['failing_files']:>10,} {entry['rows']:>11,} "
+              f"{entry['failing_rows']:>9,}  {status}")
+        for failure in entry['failures'][:samples]:
+            location = f"{failure['file']} row {failure['row']}" if failure['row'] else failure['file']
+            target = f" {failure['field']} -> {failure['column']} = {failure['value']!r}:" if failure['field'] else ''
+            print(f"      {location}:{target} {failure['error']}")
+        if entry['failing_rows'] + entry['failing_files'] > samples:
+            print(f"      ... {entry['failing_rows'] + entry['failing_files'] - samples:,} more failures")
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate the COPY INTO casts locally before uploading any file.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--derived', action='store_true', help="Also validate the derived tables from derived_tables.sql")
+    parser.add_argument('--tables', nargs='*', default=None, help="Only these tables (e.g. DIM_CUSTOMERS events)")
+    parser.add_argument('--samples', type=int, default=5, help="Rejected rows to print per table")
+    parser.add_argument('--json-report', default=None, help="Also write every collected failure to this JSON file")
+    args = parser.parse_args()
+
+    print(f"🛫 Pre-flighting COPY INTO casts for {args.data_dir}...")
+    start = time.perf_counter()
+    report = preflight(args.data_dir, args.workers, args.derived, args.tables)
+    print_preflight_report(report, args.samples)
+    total_rows = sum(entry['rows'] for entry in report.values())
+    rejected = sum(entry['failing_rows'] for entry in report.values())
+    unreadable = sum(entry['failing_files'] for entry in report.values())
+    print(f"\n⏱️  {total_rows:,} rows checked in {time.perf_counter() - start:.2f}s")
+
+    if args.json_report:
+        with open(args.json_report, 'w') as f:
+            json.dump({'rows_checked': total_rows, 'rows_rejected': rejected, 'files_unreadable': unreadable,
+                       'tables': report}, f, indent=2)
+        print(f"💾 Saved report to {args.json_report}")
+
+    if unreadable:
+        print(f"❌ {unreadable:,} files cannot be read - fix or decode them before PUT / COPY INTO")
+    if rejected:
+        print(f"❌ {rejected:,} rows would be rejected - fix them before PUT / COPY INTO")
+    if unreadable or rejected:
+        sys.exit(1)
+    print("✅ Every row passes the COPY INTO casts - safe to upload")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Delimited (CSV/TSV) output for the fast COPY INTO path.
+
+Snowflake loads delimited text straight into the table columns, while every
+JSON row goes through VARIANT parsing and a `$1:field::TYPE` projection per
+column. With --delimited csv|tsv the generators also write a delimited copy
+next to each JSON file (DIM_CUSTOMERS.csv, FACT_.../2024/03/2024-03.csv):
+1. Columns are in the order of the table DDL in snowflake_setup.sql (read
+   with local_engine.parse_setup_sql), with a header row, so COPY INTO maps
+   them by position without a transformation
+2. Dates are ISO (YYYY-MM-DD), booleans TRUE/FALSE and NULL is \\N, so an
+   empty string stays an empty string
+3. load_sql emits CREATE FILE FORMAT, PUT and column-positional COPY INTO
+   statements for the files that exist
+
+The JSON files stay the source for QA, indexes and manifests; the delimited
+copy is only for loading. Run with --benchmark to compare the local encode
+throughput of both formats.
+"""
+
+import argparse
+import csv
+import functools
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from bulk_loader import load_order
+from dataset_diff import stage_location, table_location
+from encoded_output import plain_rows
+from local_engine import DERIVED_SQL, SETUP_SQL, parse_setup_sql, strptime_format, table_sources
+from quality_checks import ENCODED_SUFFIX, load_json_data
+
+DELIMITED_FORMATS = {
+    'csv': {'delimiter': ',', 'suffix': '.csv', 'file_format': 'CSV_FORMAT'},
+    'tsv': {'delimiter': '\t', 'suffix': '.tsv', 'file_format': 'TSV_FORMAT'}
+}
+
+NULL_MARKER = '\\N'
+
+@functools.lru_cache(maxsize=None)
+def table_definitions() -> Dict[str, Dict[str, Any]]:
+    """Bronze and derived table definitions, keyed like parse_setup_sql."""
+    definitions = parse_setup_sql(SETUP_SQL)
+    definitions.update(parse_setup_sql(DERIVED_SQL))
+    return definitions
+
+def delimited_path(json_path: str, fmt: str) -> str:
+    """Delimited copy of a (plain or encoded) JSON data file."""
+    for suffix in (ENCODED_SUFFIX, '.json'):
+        if json_path.endswith(suffix):
+            return json_path[:-len(suffix)] + DELIMITED_FORMATS[fmt]['suffix']
+    raise ValueError(f"{json_path} is not a JSON data file")
+
+def delimited_paths(data_dir: str, definition: Dict[str, Any], fmt: str) -> List[str]:
+    """Delimited files of a table: every file under <TABLE>/ or the single <TABLE>.csv."""
+    base = os.path.join(data_dir, definition['name'])
+    suffix = DELIMITED_FORMATS[fmt]['suffix']
+    if os.path.isdir(base):
+        return sorted(glob.glob(os.path.join(base, '**', '*' + suffix), recursive=True))
+    return [base + suffix] if os.path.exists(base + suffix) else []
+
+def delimited_format(data_dir: str, table: str) -> Optional[str]:
+    """Format of a table's existing delimited copy, if it has one."""
+    for fmt in DELIMITED_FORMATS:
+        if delimited_paths(data_dir, table_definitions()[table], fmt):
+            return fmt
+    return None
+
+def _date_converter(date_format: str) -> Callable[[Any], str]:
+    pattern = strptime_format(date_format)
+
+    def convert(value):
+        text = str(value)
+        # Fast path for the generators' MM/DD/YYYY
+        if date_format == 'MM/DD/YYYY' and len(text) == 10 and text[2] == '/' and text[5] == '/':
+            return f"{text[6:]}-{text[:2]}-{text[3:5]}"
+        try:
+            return datetime.strptime(text, pattern).date().isoformat()
+        except ValueError:
+            # Written as is, so COPY INTO rejects it like the JSON load would
+            return text
+    return convert
+
+def _integer(value: Any) -> str:
+    return str(int(value)) if isinstance(value, float) and value.is_integer() else str(value)
+
+def _boolean(value: Any) -> str:
+    return ('TRUE' if value else 'FALSE') if isinstance(value, bool) else str(value)
+
+def column_converters(definition: Dict[str, Any]) -> List[Tuple[str, Callable[[Any], str]]]:
+    """(source field, value -> text) per column, in DDL order."""
+    converters = []
+    for _, field, cast_type, date_format in definition['projections']:
+        base = cast_type.split('(')[0].upper()
+        if date_format:
+            converters.append((field, _date_converter(date_format)))
+        elif base == 'INTEGER':
+            converters.append((field, _integer))
+        elif base == 'BOOLEAN':
+            converters.append((field, _boolean))
+        else:
+            converters.append((field, str))
+    return converters
+
+class DelimitedWriter:
+    """Writes rows of one table as a delimited file with a header row."""
+
+    def __init__(self, path: str, table: str, fmt: str = 'csv'):
+        definition = table_definitions()[table]
+        self.path = path
+        self.rows = 0
+        self._converters = column_converters(definition)
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.writer(self._file, delimiter=DELIMITED_FORMATS[fmt]['delimiter'], lineterminator='\n')
+        self._writer.writerow([column for column, _ in definition['columns']])
+
+    def __enter__(self) -> 'DelimitedWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        values = []
+        for field, convert in self._converters:
+            value = row.get(field)
+            values.append(NULL_MARKER if value is None else convert(value))
+        self._writer.writerow(values)
+        self.rows += 1
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.write(row)
+
+    def close(self) -> None:
+        self._file.close()
+
+def write_delimited(path: str, table: str, rows: Iterable[Dict[str, Any]], fmt: str = 'csv') -> int:
+    """Write rows as a delimited file in DDL column order; returns the row count."""
+    with DelimitedWriter(path, table, fmt) as writer:
+        writer.write_rows(rows)
+    return writer.rows
+
+def delimited_rows(path: str, table: str, rows: Iterable[Dict[str, Any]], fmt: str = 'csv') -> Iterator[Dict[str, Any]]:
+    """Pass rows through while writing them to a delimited file, so one stream feeds both formats."""
+    with DelimitedWriter(path, table, fmt) as writer:
+        for row in rows:
+            writer.write(row)
+            yield row
+
+def file_format_ddl(fmt: str) -> str:
+    options = DELIMITED_FORMATS[fmt]
+    delimiter = '\\t' if options['delimiter'] == '\t' else options['delimiter']
+    return (f"CREATE OR REPLACE FILE FORMAT {options['file_format']}\n"
+            f"TYPE = 'CSV'\n"
+            f"FIELD_DELIMITER = '{delimiter}'\n"
+            f"SKIP_HEADER = 1\n"
+            f"FIELD_OPTIONALLY_ENCLOSED_BY = '\"'\n"
+            f"ESCAPE_UNENCLOSED_FIELD = NONE\n"
+            f"NULL_IF = ('\\\\N')\n"
+            f"EMPTY_FIELD_AS_NULL = FALSE\n"
+            f"DATE_FORMAT = 'YYYY-MM-DD'\n"
+            f"ERROR_ON_COLUMN_COUNT_MISMATCH = TRUE\n"
+            f"COMPRESSION = 'AUTO';")
+
+def copy_statement(definition: Dict[str, Any], files: List[str], fmt: str) -> str:
+    """Column-positional COPY INTO: no SELECT, file columns map to table columns in order."""
+    location, relative_files = table_location(files)
+    names = ', '.join(f"'{relative}'" for relative in relative_files)
+    columns = ', '.join(column for column, _ in definition['columns'])
+    return (f"-- Columns by position: {columns}\n"
+            f"COPY INTO {definition['name']}\nFROM {location}\nFILES = ({names})\n"
+            f"FILE_FORMAT = (FORMAT_NAME = {DELIMITED_FORMATS[fmt]['file_format']})\n"
+            f"ON_ERROR = 'ABORT_STATEMENT';")
+
+def load_sql(data_dir: str = '../data', fmt: str = 'csv', tables: Optional[List[str]] = None,
+             include_derived: bool = False, local_path: str = 'data') -> str:
+    """CREATE FILE FORMAT, PUT and COPY INTO statements for the delimited files in data_dir."""
+    schema = parse_setup_sql(SETUP_SQL)
+    if include_derived:
+        schema.update(parse_setup_sql(DERIVED_SQL))
+    lines = [f"-- Delimited ({fmt.upper()}) load generated {datetime.now().isoformat(timespec='seconds')}",
+             file_format_ddl(fmt)]
+    for table in load_order(schema):
+        definition = schema[table]
+        if tables and table not in tables and definition['name'] not in tables:
+            continue
+        paths = delimited_paths(data_dir, definition, fmt)
+        if not paths:
+            lines.append(f"\n-- {definition['name']} has no {fmt.upper()} files: run csv_output.py --write first")
+            continue
+        relative = [os.path.relpath(path, data_dir).replace(os.sep, '/') for path in paths]
+        lines.append(f"\n-- {definition['name']}: {len(relative)} file(s)")
+        for path in relative:
+            lines.append(f"PUT file://{local_path}/{path} {stage_location(path)} OVERWRITE=TRUE;")
+        lines.append(copy_statement(definition, relative, fmt))
+    return '\n'.join(lines) + '\n'
+
+def convert_table(data_dir: str, table: str, fmt: str) -> List[str]:
+    """Write the delimited copy of every JSON data file of a table; returns the files written."""
+    definition = table_definitions()[table]
+    base = os.path.join(data_dir, definition['name'])
+    for stale in glob.glob(os.path.join(glob.escape(base), '**', '*.[ct]sv'), recursive=True) + \
+            glob.glob(glob.escape(base) + '.[ct]sv'):
+        os.remove(stale)
+    written = []
+    for path in table_sources(data_dir, table):
+        output = delimited_path(path, fmt)
+        write_delimited(output, table, load_json_data(path), fmt)
+        written.append(output)
+    return written
+
+def compare_throughput(data_dir: str, tables: List[str], fmt: str = 'csv', repeat: int = 3) -> List[Dict[str, Any]]:
+    """Best of repeat timings of writing each table as indented JSON (the generators' output) and as delimited text."""
+    results = []
+    for table in tables:
+        rows = list(plain_rows(row for path in table_sources(data_dir, table) for row in load_json_data(path)))
+        if not rows:
+            continue
+        timings = {}
+        for name in ('json', fmt):
+            handle, temporary = tempfile.mkstemp(suffix='.tmp', dir=data_dir)
+            os.close(handle)
+            try:
+                seconds = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    if name == 'json':
+                        with open(temporary, 'w') as f:
+                            json.dump(rows, f, indent=2)
+                    else:
+                        write_delimited(temporary, table, rows, fmt)
+                    seconds.append(time.perf_counter() - start)
+                timings[name] = (min(seconds), os.path.getsize(temporary))
+            finally:
+                os.remove(temporary)
+        results.append({'table': table_definitions()[table]['name'], 'rows': len(rows),
+                        'json_seconds': timings['json'][0], 'json_bytes': timings['json'][1],
+                        'delimited_seconds': timings[fmt][0], 'delimited_bytes': timings[fmt][1]})
+    return results
+
+def print_throughput(results: List[Dict[str, Any]], fmt: str) -> None:
+    label = fmt.upper()
+    print(f"\n{'table':<34} {'rows':>8} {'JSON MB':>8} {label + ' MB':>7} {'JSON rows/s':>12} {label + ' rows/s':>11} {'speedup':>8}")
+    for result in results:
+        json_rate = result['rows'] / result['json_seconds']
+        delimited_rate = result['rows'] / result['delimited_seconds']
+        print(f"{result['table']:<34} {result['rows']:>8,} {result['json_bytes'] / 1e6:>8.2f} "
+              f"{result['delimited_bytes'] / 1e6:>7.2f} {json_rate:>12,.0f} {delimited_rate:>11,.0f} "
+              f"{result['json_seconds'] / result['delimited_seconds']:>7.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Write CSV/TSV copies of the generated tables and the SQL that loads them.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--format', choices=sorted(DELIMITED_FORMATS), default='csv', help="Delimited format")
+    parser.add_argument('--tables', default=None, help="Comma-separated tables (default: all)")
+    parser.add_argument('--derived', action='store_true', help="Include the derived tables from derived_tables.sql")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--write', action='store_true', help="Write the delimited copy of the existing JSON files")
+    mode.add_argument('--benchmark', action='store_true', help="Compare JSON and delimited encode throughput")
+    parser.add_argument('--repeat', type=int, default=3, help="Benchmark runs per format (the best is reported)")
+    parser.add_argument('--local-path', default='data', help="Local directory used in PUT file:// paths")
+    parser.add_argument('--sql-output', default=None, help="Write the load SQL to this file (default: print it)")
+    args = parser.parse_args()
+
+    schema = parse_setup_sql(SETUP_SQL)
+    if args.derived:
+        schema.update(parse_setup_sql(DERIVED_SQL))
+    tables = [table.strip() for table in args.tables.split(',') if table.strip()] if args.tables else list(schema)
+    unknown = [table for table in tables if table not in schema]
+    if unknown:
+        parser.error(f"unknown tables {', '.join(unknown)} (choose from {', '.join(schema)})")
+
+    if args.benchmark:
+        print(f"⏱️  Encoding tables in {args.data_dir} as JSON and {args.format.upper()}...")
+        print_throughput(compare_throughput(args.data_dir, tables, args.format, args.repeat), args.format)
+        return
+
+    if args.write:
+        for table in tables:
+            paths = convert_table(args.data_dir, table, args.format)
+            print(f"📝 {schema[table]['name']}: {len(paths)} {args.format.upper()} file(s)")
+
+    sql = load_sql(args.data_dir, args.format, tables, args.derived, args.local_path)
+    if args.sql_output:
+        with open(args.sql_output, 'w') as f:
+            f.write(sql)
+        print(f"💾 Saved load SQL to {args.sql_output}")
+    elif not args.write:
+        sys.stdout.write(sql)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Denormalized per-customer snapshot (DIM_CUSTOMER_SNAPSHOT) built alongside the facts.
+
+One wide row per customer: the DIM_CUSTOMERS profile plus the customer's
+final state from each fact table, so questions like "enterprise customers
+with 90%+ automation" or "current tier of churned accounts" are a single
+table scan instead of joins and aggregation over every fact:
+1. events - current tier, billing period, MRR/ARR, churn flag and date,
+   event counts from FACT_SUBSCRIPTION_EVENTS
+2. adoptions - framework counts by status, adopted framework names,
+   automation level, hours saved and audit score from FACT_FRAMEWORK_ADOPTIONS
+3. activities - activity volume, automation and success rates and last
+   activity date from FACT_COMPLIANCE_ACTIVITIES
+
+Each generator feeds its rows into a CustomerSnapshotAccumulator for its
+own source and rewrites only that source's columns, keeping the columns
+the other generators wrote. Running this script rebuilds the whole table
+from existing fact files instead.
+"""
+
+import argparse
+import json
+import os
+from typing import List, Dict, Any, Optional
+
+from quality_checks import load_json_data, load_table
+from revenue_snapshots import normalized_mrr
+from sketches import table_shards
+
+SNAPSHOT_TABLE = 'DIM_CUSTOMER_SNAPSHOT'
+
+PROFILE_COLUMNS = ['customer_id', 'company_name', 'industry', 'segment', 'compliance_maturity',
+                   'employee_count', 'signup_date']
+
+def _date_key(value: str) -> tuple:
+    # MM/DD/YYYY -> (YYYY, MM, DD) so dates compare chronologically
+    return (value[6:], value[:2], value[3:5])
+
+def _average(total: float, count: int) -> Optional[float]:
+    return round(total / count, 1) if count else None
+
+def _rate(part: int, whole: int) -> Optional[float]:
+    return round(100.0 * part / whole, 1) if whole else None
+
+def _new_events_state() -> Dict[str, Any]:
+    return {'first': None, 'last': None, 'count': 0, 'expansions': 0, 'downgrades': 0}
+
+def _add_event(state: Dict[str, Any], event: Dict[str, Any], frameworks: Dict[int, str]) -> None:
+    key = (_date_key(event['event_date']), event['event_id'])
+    if state['first'] is None or key < state['first'][0]:
+        state['first'] = (key, event)
+    if state['last'] is None or key > state['last'][0]:
+        state['last'] = (key, event)
+    state['count'] += 1
+    state['expansions'] += event['event_type'] == 'expansion'
+    state['downgrades'] += event['event_type'] == 'downgrade'
+
+def _event_columns(state: Dict[str, Any]) -> Dict[str, Any]:
+    last = state['last'][1] if state['last'] else None
+    churned = last is not None and last['event_type'] == 'churn'
+    return {
+        'current_tier': last['product_tier'] if last else None,
+        'current_billing_period': last['billing_period'] if last else None,
+        'current_mrr': last['mrr_amount'] if last else 0,
+        # Annualized like FACT_MRR_DAILY (calculate_annualized_amount), so the two reconcile
+        'current_arr': round(normalized_mrr(last) * 12) if last else 0,
+        'is_churned': churned,
+        'churn_date': last['event_date'] if churned else None,
+        'first_subscription_date': state['first'][1]['event_date'] if state['first'] else None,
+        'last_event_date': last['event_date'] if last else None,
+        'last_event_type': last['event_type'] if last else None,
+        'subscription_event_count': state['count'],
+        'expansion_count': state['expansions'],
+        'downgrade_count': state['downgrades']
+    }
+
+def _new_adoptions_state() -> Dict[str, Any]:
+    return {'statuses': {}, 'names': set(), 'automation': [0, 0, None], 'hours_saved': 0,
+            'implementation_cost': 0, 'audit': [0, 0]}
+
+def _add_adoption(state: Dict[str, Any], adoption: Dict[str, Any], frameworks: Dict[int, str]) -> None:
+    statuses = state['statuses']
+    statuses[adoption['status']] = statuses.get(adoption['status'], 0) + 1
+    state['names'].add(frameworks.get(adoption['framework_id'], str(adoption['framework_id'])))
+    automation = state['automation']
+    automation[0] += adoption['automation_level']
+    automation[1] += 1
+    automation[2] = max(automation[2] or 0, adoption['automation_level'])
+    state['hours_saved'] += adoption['hours_saved']
+    state['implementation_cost'] += adoption['implementation_cost']
+    if adoption.get('audit_score') is not None:
+        state['audit'][0] += adoption['audit_score']
+        state['audit'][1] += 1
+
+def _adoption_columns(state: Dict[str, Any]) -> Dict[str, Any]:
+    statuses = state['statuses']
+    return {
+        'frameworks_adopted': sum(statuses.values()),
+        'active_frameworks': statuses.get('active', 0),
+        'completed_frameworks': statuses.get('completed', 0),
+        'certified_frameworks': statuses.get('certified', 0),
+        'adopted_framework_names': ', '.join(sorted(state['names'])) or None,
+        'avg_automation_level': _average(state['automation'][0], state['automation'][1]),
+        'max_automation_level': state['automation'][2],
+        'total_hours_saved': state['hours_saved'],
+        'total_implementation_cost': state['implementation_cost'],
+        'avg_audit_score': _average(state['audit'][0], state['audit'][1])
+    }
+
+def _new_activities_state() -> Dict[str, Any]:
+    return {'count': 0, 'automated': 0, 'successful': 0, 'minutes': 0, 'last': None}
+
+def _add_activity(state: Dict[str, Any], activity: Dict[str, Any], frameworks: Dict[int, str]) -> None:
+    state['count'] += 1
+    state['automated'] += bool(activity['automated_flag'])
+    state['successful'] += bool(activity['success_flag'])
+    state['minutes'] += activity['duration_minutes']
+    if state['last'] is None or _date_key(activity['activity_date']) > _date_key(state['last']):
+        state['last'] = activity['activity_date']
+
+def _activity_columns(state: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'activity_count': state['count'],
+        'automated_activities': state['automated'],
+        'successful_activities': state['successful'],
+        'activity_automation_rate': _rate(state['automated'], state['count']),
+        'activity_success_rate': _rate(state['successful'], state['count']),
+        'total_activity_minutes': state['minutes'],
+        'last_activity_date': state['last']
+    }
+
+# Source fact table -> (empty per-customer state, add one row, state -> snapshot columns)
+SNAPSHOT_SOURCES = {
+    'events': (_new_events_state, _add_event, _event_columns),
+    'adoptions': (_new_adoptions_state, _add_adoption, _adoption_columns),
+    'activities': (_new_activities_state, _add_activity, _activity_columns)
+}
+
+def snapshot_columns() -> List[str]:
+    """Every DIM_CUSTOMER_SNAPSHOT column in table order."""
+    columns = list(PROFILE_COLUMNS)
+    for new_state, _, finalize in SNAPSHOT_SOURCES.values():
+        columns.extend(finalize(new_state()))
+    return columns
+
+class CustomerSnapshotAccumulator:
+    """Per-customer final state from one fact table: add fact rows, then read snapshot columns."""
+
+    def __init__(self, source: str, frameworks: Optional[List[Dict[str, Any]]] = None):
+        self.source = source
+        self._new_state, self._add, self._finalize = SNAPSHOT_SOURCES[source]
+        self._framework_names = {f['framework_id']: f['framework_name'] for f in frameworks or []}
+        self.customers = {}
+
+    def add(self, row: Dict[str, Any]) -> None:
+        state = self.customers.get(row['customer_id'])
+        if state is None:
+            state = self.customers[row['customer_id']] = self._new_state()
+        self._add(state, row, self._framework_names)
+
+    def add_rows(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.add(row)
+
+    def columns(self, customer_id: int) -> Dict[str, Any]:
+        """Snapshot columns for one customer (defaults when they have no rows)."""
+        state = self.customers.get(customer_id)
+        return self._finalize(state if state is not None else self._new_state())
+
+def write_customer_snapshot(accumulators: List[CustomerSnapshotAccumulator], customers: List[Dict[str, Any]],
+                            data_dir: str = '../data') -> int:
+    """
+    Rewrite <data_dir>/DIM_CUSTOMER_SNAPSHOT.json; returns the row count.
+
+    Columns from sources without an accumulator are carried over from the
+    existing file, or left at their defaults if there is none.
+    """
+    path = os.path.join(data_dir, f"{SNAPSHOT_TABLE}.json")
+    previous = {row['customer_id']: row for row in load_json_data(path)} if os.path.exists(path) else {}
+    by_source = {accumulator.source: accumulator for accumulator in accumulators}
+
+    rows = []
+    for customer in customers:
+        customer_id = customer['customer_id']
+        row = {column: customer.get(column) for column in PROFILE_COLUMNS}
+        for source, (new_state, _, finalize) in SNAPSHOT_SOURCES.items():
+            if source in by_source:
+                row.update(by_source[source].columns(customer_id))
+            else:
+                defaults = finalize(new_state())
+                kept = previous.get(customer_id, {})
+                row.update({column: kept.get(column, default) for column, default in defaults.items()})
+        rows.append(row)
+
+    with open(path, 'w') as f:
+        json.dump(rows, f, indent=2)
+    return len(rows)
+
+def rebuild_customer_snapshot(data_dir: str = '../data', output_dir: Optional[str] = None) -> int:
+    """Rebuild DIM_CUSTOMER_SNAPSHOT from existing fact files, one shard at a time."""
+    customers = load_table(data_dir, 'customers')
+    frameworks = load_json_data(os.path.join(data_dir, 'DIM_COMPLIANCE_FRAMEWORKS.json'))
+    accumulators = []
+    for source in SNAPSHOT_SOURCES:
+        shards = table_shards(data_dir, source)
+        if not shards:
+            print(f"  ⚠️  No {source} data found - leaving its snapshot columns at defaults")
+        accumulator = CustomerSnapshotAccumulator(source, frameworks)
+        for shard_path in shards:
+            accumulator.add_rows(load_json_data(shard_path))
+        accumulators.append(accumulator)
+    return write_customer_snapshot(accumulators, customers, output_dir or data_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the denormalized customer snapshot from existing fact files.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--output-dir', default=None, help="Where to write the snapshot (default: --data-dir)")
+    args = parser.parse_args()
+
+    print(f"🧾 Rebuilding {SNAPSHOT_TABLE}...")
+    count = rebuild_customer_snapshot(args.data_dir, args.output_dir)
+    print(f"  {SNAPSHOT_TABLE}: {count:,} rows, {len(snapshot_columns())} columns")
+    print("🎉 Customer snapshot complete!")
+
+if __name__ == "__main__":
+    main()
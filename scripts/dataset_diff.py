@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Diff two dataset versions with Merkle partition hashes and emit a minimal reload plan.
+
+Regenerating after a small change used to mean re-PUTting and reloading
+every table. Instead, each version is described by a manifest:
+1. Every table is split into partitions - one per month of its date column
+   (PARTITION_COLUMNS), or one per data file for tables without one - and
+   each partition's rows are hashed in file order. A file holding a single
+   month is hashed by its bytes instead, and when its zone map
+   (zone_maps.py) already shows that, it is not parsed at all
+2. Partition hashes are the leaves of a per-table Merkle tree, and the table
+   roots are the leaves of the dataset root, so unchanged versions and
+   unchanged tables are recognized from a single hash
+3. Tables whose roots differ are diffed leaf by leaf into added, changed and
+   removed partitions
+
+The reload plan only touches the changed partitions, with one strategy per
+table:
+- copy: only new partitions in new files - PUT them and COPY INTO those files
+- replace: files hold exactly one month (FACT_MRR_DAILY/, partitioned facts) - delete the
+  changed months and re-COPY their files
+- merge: a date-partitioned table with a primary key - re-PUT the file, MERGE
+  the changed months from the stage and delete rows that disappeared
+- reload: anything else (small dimensions and aggregates) - truncate and
+  re-COPY the table
+
+Save the manifest of what was loaded with --write-manifest, then pass it as
+--base after the next generation run.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+from bulk_loader import load_order
+from incremental_checks import PARTITION_DATE_COLUMNS, hash_file, hash_rows, month_key
+from local_engine import DERIVED_SQL, SETUP_SQL, parse_setup_sql, table_sources
+from quality_checks import load_json_data
+from zone_maps import load_zone_map
+
+# Bump when partition hashing changes; manifests of another format cannot be diffed
+MANIFEST_FORMAT = 2
+
+STAGE = 'PHANTOM_SEC_DATA_STAGE'
+FILE_FORMAT = 'JSON_FORMAT'
+
+# Table key -> MM/DD/YYYY column whose month partitions the table
+PARTITION_COLUMNS = dict(PARTITION_DATE_COLUMNS, customers='signup_date', fact_mrr_daily='snapshot_date')
+
+def sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def merkle_root(leaves: List[str]) -> str:
+    """Root of a binary Merkle tree over leaf hashes (an odd node is carried up unchanged)."""
+    if not leaves:
+        return sha256('')
+    level = list(leaves)
+    while len(level) > 1:
+        paired = [sha256(level[i] + level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+def partition_leaves(partitions: Dict[str, Dict[str, Any]]) -> List[str]:
+    # Keys are part of the leaf so moving rows between partitions changes the root
+    return [sha256(f"{key}:{partitions[key]['hash']}") for key in sorted(partitions)]
+
+def single_month(zone_map: Optional[Dict[str, Any]], column: str) -> Optional[str]:
+    """YYYY-MM when a zone map shows every row of its file falls in one month of `column`."""
+    if zone_map is None or column not in zone_map['columns'] or column in zone_map['invalid_dates']:
+        return None
+    stats = zone_map['columns'][column]
+    if stats['nulls'] or stats['min'] is None or stats['min'][:7] != stats['max'][:7]:
+        return None
+    return stats['min'][:7]
+
+def table_manifest(data_dir: str, table: str, definition: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Hash one table's files and partitions; None when it has no data files."""
+    paths = table_sources(data_dir, table)
+    if not paths:
+        return None
+    column = PARTITION_COLUMNS.get(table)
+    files = {}
+    slices = {}
+    for path in paths:
+        relative = os.path.relpath(path, data_dir).replace(os.sep, '/')
+        file_hash = hash_file(path)
+        zone_map = load_zone_map(path) if column else None
+        month = single_month(zone_map, column)
+        if month:
+            # The zone map proves the whole file is one partition: no need to parse it
+            row_count = zone_map['row_count']
+            slices.setdefault(month, []).append((relative, file_hash, row_count))
+            files[relative] = {'hash': file_hash, 'bytes': os.path.getsize(path), 'rows': row_count,
+                               'partitions': [month]}
+            continue
+        rows = load_json_data(path)
+        if column:
+            by_month = {}
+            for row in rows:
+                by_month.setdefault(month_key(row.get(column)), []).append(row)
+        else:
+            by_month = {relative: rows}
+        if len(by_month) == 1 and 'invalid' not in by_month:
+            # Same hash as the zone map path above, whichever one a version took
+            key = next(iter(by_month))
+            slices.setdefault(key, []).append((relative, file_hash, len(rows)))
+        else:
+            for key, month_rows in by_month.items():
+                slices.setdefault(key, []).append((relative, hash_rows(month_rows), len(month_rows)))
+        files[relative] = {'hash': file_hash, 'bytes': os.path.getsize(path), 'rows': len(rows),
+                           'partitions': sorted(by_month)}
+
+    partitions = {}
+    for key, parts in slices.items():
+        partitions[key] = {
+            'hash': parts[0][1] if len(parts) == 1 else merkle_root([part_hash for _, part_hash, _ in parts]),
+            'rows': sum(count for _, _, count in parts),
+            'files': [relative for relative, _, _ in parts]
+        }
+    return {
+        'name': definition['name'],
+        'partition_column': column,
+        'root': merkle_root(partition_leaves(partitions)),
+        'rows': sum(entry['rows'] for entry in files.values()),
+        'bytes': sum(entry['bytes'] for entry in files.values()),
+        'files': files,
+        'partitions': partitions
+    }
+
+def build_manifest(data_dir: str = '../data', include_derived: bool = False) -> Dict[str, Any]:
+    """Merkle manifest of every table with data files under data_dir."""
+    schema = load_schema(include_derived)
+    tables = {}
+    for table, definition in schema.items():
+        manifest = table_manifest(data_dir, table, definition)
+        if manifest is not None:
+            tables[table] = manifest
+    return {
+        'format': MANIFEST_FORMAT,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'data_dir': os.path.abspath(data_dir),
+        'root': merkle_root([sha256(f"{table}:{tables[table]['root']}") for table in sorted(tables)]),
+        'tables': tables
+    }
+
+def load_manifest(path: str, include_derived: bool = False) -> Dict[str, Any]:
+    """A saved manifest file, or a fresh manifest of a data directory."""
+    if os.path.isdir(path):
+        return build_manifest(path, include_derived)
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != MANIFEST_FORMAT:
+        raise ValueError(f"{path} is not a format {MANIFEST_FORMAT} dataset manifest")
+    return manifest
+
+def save_manifest(manifest: Dict[str, Any], path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+def load_schema(include_derived: bool = False) -> Dict[str, Dict[str, Any]]:
+    schema = parse_setup_sql(SETUP_SQL)
+    if include_derived:
+        schema.update(parse_setup_sql(DERIVED_SQL))
+    return schema
+
+def choose_strategy(base: Optional[Dict[str, Any]], target: Dict[str, Any], definition: Dict[str, Any],
+                    added: List[str], changed: List[str], removed: List[str]) -> str:
+    """Cheapest load strategy that reproduces the target partitions exactly (see module docstring)."""
+    base_files = base['files'] if base else {}
+    if not changed and not removed and all(
+            relative not in base_files for key in added for relative in target['partitions'][key]['files']):
+        return 'copy'
+    if not target['partition_column'] or 'invalid' in added + changed + removed:
+        return 'reload'
+    if definition['primary_key']:
+        return 'merge'
+    file_aligned = all(len(entry['partitions']) == 1
+                       for entry in list(target['files'].values()) + list(base_files.values()))
+    return 'replace' if file_aligned else 'reload'
+
+def diff_manifests(base: Dict[str, Any], target: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-table changes between two manifests, in foreign key load order."""
+    schema = load_schema(include_derived=True)
+    results = []
+    if base['root'] == target['root']:
+        return results
+    for table in load_order(schema):
+        old, new = base['tables'].get(table), target['tables'].get(table)
+        if old is None and new is None:
+            continue
+        if old is not None and new is not None and old['root'] == new['root']:
+            continue
+        if new is None:
+            results.append({'table': table, 'name': old['name'], 'status': 'removed', 'strategy': None,
+                            'added': [], 'changed': [], 'removed': sorted(old['partitions']),
+                            'put_files': [], 'remove_files': sorted(old['files']),
+                            'rows_changed': 0, 'rows_total': 0, 'bytes_put': 0, 'bytes_total': 0})
+            continue
+        old_partitions = old['partitions'] if old else {}
+        added = sorted(key for key in new['partitions'] if key not in old_partitions)
+        changed = sorted(key for key in new['partitions']
+                         if key in old_partitions and old_partitions[key]['hash'] != new['partitions'][key]['hash'])
+        removed = sorted(key for key in old_partitions if key not in new['partitions'])
+        old_files = old['files'] if old else {}
+        touched = {relative for key in added + changed for relative in new['partitions'][key]['files']}
+        put_files = sorted(relative for relative in touched
+                           if relative not in old_files or old_files[relative]['hash'] != new['files'][relative]['hash'])
+        results.append({
+            'table': table,
+            'name': new['name'],
+            'status': 'added' if old is None else 'changed',
+            'strategy': choose_strategy(old, new, schema[table], added, changed, removed),
+            'added': added,
+            'changed': changed,
+            'removed': removed,
+            'put_files': put_files,
+            'remove_files': sorted(relative for relative in old_files if relative not in new['files']),
+            'rows_changed': sum(new['partitions'][key]['rows'] for key in added + changed),
+            'rows_total': new['rows'],
+            'bytes_put': sum(new['files'][relative]['bytes'] for relative in put_files),
+            'bytes_total': new['bytes']
+        })
+    return results
+
+def stage_location(relative: str) -> str:
+    """Stage path a data file is PUT to: shard directories keep their folder."""
+    folder = os.path.dirname(relative)
+    return f"@{STAGE}/{folder}/" if folder else f"@{STAGE}"
+
+def table_location(files: List[str]) -> Tuple[str, List[str]]:
+    """Stage folder holding a table's data files, and the files' paths relative to it."""
+    folder = files[0].split('/')[0] if '/' in files[0] else ''
+    if not folder:
+        return f"@{STAGE}", files
+    return f"@{STAGE}/{folder}/", [relative[len(folder) + 1:] for relative in files]
+
+def projection_list(definition: Dict[str, Any], aliases: bool = False, indent: str = '    ') -> str:
+    expressions = []
+    for column, field, cast_type, date_format in definition['projections']:
+        expression = f"TO_DATE($1:{field}::VARCHAR, '{date_format}')" if date_format else f"$1:{field}::{cast_type}"
+        expressions.append(f"{expression} AS {column}" if aliases else expression)
+    return f",\n{indent}".join(expressions)
+
+def month_literals(keys: List[str]) -> str:
+    return ', '.join(f"'{key}-01'" for key in keys)
+
+def copy_statement(definition: Dict[str, Any], files: List[str], force: bool = False) -> str:
+    # Month directories sit below the table folder, so FILES are paths relative to it
+    location, relative_files = table_location(files)
+    names = ', '.join(f"'{relative}'" for relative in relative_files)
+    return (f"COPY INTO {definition['name']}\nFROM (\n  SELECT\n    {projection_list(definition)}\n"
+            f"  FROM {location}\n)\nFILES = ({names})\nFILE_FORMAT = (FORMAT_NAME = {FILE_FORMAT})\n"
+            f"ON_ERROR = 'ABORT_STATEMENT'" + ("\nFORCE = TRUE;" if force else ";"))
+
+def staged_source(files: List[str]) -> str:
+    """Stage reference for a SELECT over some data files of one table."""
+    location, _ = table_location(files)
+    if location == f"@{STAGE}" and len(files) == 1:
+        return f"@{STAGE}/{files[0]} (FILE_FORMAT => '{FILE_FORMAT}')"
+    pattern = '|'.join(os.path.basename(relative).replace('.', '[.]') for relative in files)
+    return f"{location} (FILE_FORMAT => '{FILE_FORMAT}', PATTERN => '.*/({pattern})')"
+
+def merge_statements(definition: Dict[str, Any], change: Dict[str, Any], target: Dict[str, Any]) -> List[str]:
+    name = definition['name']
+    key = definition['primary_key']
+    column = target['partition_column']
+    key_type = dict(definition['columns'])[key]
+    key_field = next(field for target_column, field, _, _ in definition['projections'] if target_column == key)
+    columns = [target_column for target_column, _, _, _ in definition['projections']]
+    statements = []
+    upserted = change['added'] + change['changed']
+    if upserted:
+        files = sorted({relative for month in upserted for relative in target['partitions'][month]['files']})
+        updates = ',\n    '.join(f"{c} = src.{c}" for c in columns if c != key)
+        statements.append(
+            f"MERGE INTO {name} USING (\n  SELECT * FROM (\n    SELECT\n      {projection_list(definition, True, ' ' * 6)}\n"
+            f"    FROM {staged_source(files)}\n  )\n  WHERE DATE_TRUNC('MONTH', {column}) IN ({month_literals(upserted)})\n"
+            f") src\nON {name}.{key} = src.{key}\nWHEN MATCHED THEN UPDATE SET\n    {updates}\n"
+            f"WHEN NOT MATCHED THEN INSERT ({', '.join(columns)})\n"
+            f"    VALUES ({', '.join(f'src.{c}' for c in columns)});")
+    vacated = change['changed'] + change['removed']
+    if vacated:
+        # Rows of changed or removed months whose key is no longer anywhere in the table's files
+        statements.append(
+            f"DELETE FROM {name}\nWHERE DATE_TRUNC('MONTH', {column}) IN ({month_literals(vacated)})\n"
+            f"  AND {key} NOT IN (SELECT $1:{key_field}::{key_type} FROM {staged_source(sorted(target['files']))});")
+    return statements
+
+def reload_plan(changes: List[Dict[str, Any]], base: Dict[str, Any], target: Dict[str, Any],
+                local_path: str = 'data') -> str:
+    """Snowflake SQL that brings tables loaded from `base` to `target`, touching only changed partitions."""
+    schema = load_schema(include_derived=True)
+    lines = [f"-- Reload plan generated {datetime.now().isoformat(timespec='seconds')}",
+             f"-- base root   {base['root']}", f"-- target root {target['root']}"]
+    if not changes:
+        lines.append("-- Datasets are identical: nothing to PUT or load")
+    for change in changes:
+        definition = schema[change['table']]
+        new = target['tables'].get(change['table'])
+        lines.append(f"\n-- {change['name']}: {change['status']}, strategy {change['strategy']} "
+                     f"(+{len(change['added'])} ~{len(change['changed'])} -{len(change['removed'])} partitions)")
+        for relative in change['remove_files']:
+            lines.append(f"REMOVE @{STAGE}/{relative};")
+        if new is None:
+            lines.append(f"-- {change['name']} no longer has data files; its rows are left in place")
+            continue
+        for relative in change['put_files']:
+            lines.append(f"PUT file://{local_path}/{relative} {stage_location(relative)} OVERWRITE=TRUE;")
+        if change['status'] == 'added':
+            lines.append(f"-- {change['name']} is new: run its CREATE TABLE first")
+        strategy = change['strategy']
+        if strategy == 'copy':
+            files = sorted({f for key in change['added'] for f in new['partitions'][key]['files']})
+            lines.append(copy_statement(definition, files))
+        elif strategy == 'replace':
+            months = change['changed'] + change['removed']
+            if months:
+                lines.append(f"DELETE FROM {change['name']} WHERE DATE_TRUNC('MONTH', {new['partition_column']}) "
+                             f"IN ({month_literals(months)});")
+            files = sorted({f for key in change['added'] + change['changed'] for f in new['partitions'][key]['files']})
+            if files:
+                lines.append(copy_statement(definition, files, force=True))
+        elif strategy == 'merge':
+            lines.extend(merge_statements(definition, change, new))
+        else:
+            lines.append(f"TRUNCATE TABLE {change['name']};")
+            lines.append(copy_statement(definition, sorted(new['files']), force=True))
+    return '\n'.join(lines) + '\n'
+
+def print_diff_report(changes: List[Dict[str, Any]], base: Dict[str, Any], target: Dict[str, Any]) -> None:
+    if not changes:
+        print(f"✅ Identical datasets (root {target['root'][:12]})")
+        return
+    print(f"\n{'table':<32} {'strategy':<8} {'+':>4} {'~':>4} {'-':>4} {'rows to load':>14} {'MB to PUT':>12}")
+    for change in changes:
+        print(f"{change['name']:<32} {change['strategy'] or '-':<8} {len(change['added']):>4} {len(change['changed']):>4} "
+              f"{len(change['removed']):>4} {change['rows_changed']:>6,}/{change['rows_total']:<7,} "
+              f"{change['bytes_put'] / 1e6:>5.1f}/{change['bytes_total'] / 1e6:<6.1f}")
+    unchanged = len(set(base['tables']) & set(target['tables'])) - sum(c['status'] == 'changed' for c in changes)
+    total_bytes = sum(table['bytes'] for table in target['tables'].values())
+    put_bytes = sum(change['bytes_put'] for change in changes)
+    print(f"\n  {unchanged} tables unchanged; uploading {put_bytes / 1e6:.1f} of {total_bytes / 1e6:.1f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff dataset versions by Merkle partition hashes and plan a minimal reload.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the new version's JSON files")
+    parser.add_argument('--base', default=None, help="Manifest (or data directory) of the version already loaded")
+    parser.add_argument('--derived', action='store_true', help="Include the derived tables from derived_tables.sql")
+    parser.add_argument('--write-manifest', default=None, help="Save the new version's manifest to this file")
+    parser.add_argument('--sql-output', default=None, help="Write the reload plan to this file (default: print it)")
+    parser.add_argument('--local-path', default='data', help="Local directory used in PUT file:// paths")
+    args = parser.parse_args()
+
+    print(f"🌳 Hashing partitions of {args.data_dir}...")
+    target = build_manifest(args.data_dir, args.derived)
+    print(f"  {len(target['tables'])} tables, {sum(len(t['partitions']) for t in target['tables'].values()):,} "
+          f"partitions, root {target['root'][:12]}")
+    if args.write_manifest:
+        save_manifest(target, args.write_manifest)
+        print(f"💾 Saved manifest to {args.write_manifest}")
+    if not args.base:
+        return
+
+    try:
+        base = load_manifest(args.base, args.derived)
+    except (OSError, ValueError) as error:
+        print(f"❌ Could not read base {args.base}: {error}")
+        sys.exit(1)
+    changes = diff_manifests(base, target)
+    print_diff_report(changes, base, target)
+    plan = reload_plan(changes, base, target, args.local_path)
+    if args.sql_output:
+        with open(args.sql_output, 'w') as f:
+            f.write(plan)
+        print(f"💾 Saved reload plan to {args.sql_output}")
+    else:
+        print(f"\n{plan}")
+
+if __name__ == "__main__":
+    main()
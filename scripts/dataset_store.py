@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Versioned dataset store with atomic publish.
+
+The generators rewrite ../data/*.json in place, so a loader or QA run
+reading at the same time can see a half-written file, and only one dataset
+(one scale factor) exists at a time. Published versions live side by side
+instead, and are never modified once published:
+
+    <root>/<dataset>/CURRENT            -> name of the published version
+    <root>/<dataset>/v0003/MANIFEST.json   Merkle manifest (dataset_diff.py)
+    <root>/<dataset>/v0003/DIM_CUSTOMERS.json, FACT_MRR_DAILY/2024-01.json, ...
+
+1. publish copies a finished data directory into a private staging
+   directory, hashes it into MANIFEST.json and fsyncs everything
+2. The staging directory is renamed to the next version number (a rename
+   is atomic, and fails if a concurrent publisher took the number first)
+3. CURRENT is replaced atomically, so readers switch from one complete
+   version to the next and never see a mix of the two
+
+A version directory keeps the ../data layout, so every tool reads it with
+--data-dir "$(python dataset_store.py current --dataset NAME)". Readers in
+Python can hold a version with pinned_version(); prune never deletes the
+current version or a version with a live pin. Moving CURRENT, pinning and
+pruning each hold the dataset's lock file, so none of them acts on a
+version another process is switching, pinning or deleting at that moment.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from dataset_diff import build_manifest, save_manifest
+from incremental_checks import hash_file
+
+DEFAULT_ROOT = '../datasets'
+MANIFEST_NAME = 'MANIFEST.json'
+CURRENT_NAME = 'CURRENT'
+PINS_DIR = '.pins'
+LOCK_NAME = '.lock'
+LOCK_TIMEOUT_SECONDS = 60.0
+VERSION_PREFIX = 'v'
+
+def dataset_path(root: str, dataset: str) -> str:
+    return os.path.join(root, dataset)
+
+def version_number(version: str) -> int:
+    return int(version[len(VERSION_PREFIX):])
+
+def list_versions(root: str, dataset: str) -> List[str]:
+    """Published versions of a dataset, oldest first."""
+    path = dataset_path(root, dataset)
+    if not os.path.isdir(path):
+        return []
+    names = [name for name in os.listdir(path)
+             if name.startswith(VERSION_PREFIX) and name[len(VERSION_PREFIX):].isdigit()
+             and os.path.isfile(os.path.join(path, name, MANIFEST_NAME))]
+    return sorted(names, key=version_number)
+
+def current_version(root: str, dataset: str) -> Optional[str]:
+    try:
+        with open(os.path.join(dataset_path(root, dataset), CURRENT_NAME), 'r') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def version_path(root: str, dataset: str, version: Optional[str] = None) -> str:
+    """Directory of a version (default: the current one)."""
+    version = version or current_version(root, dataset)
+    if version is None:
+        raise FileNotFoundError(f"Dataset {dataset} has no published version in {root}")
+    path = os.path.join(dataset_path(root, dataset), version)
+    if not os.path.isfile(os.path.join(path, MANIFEST_NAME)):
+        raise FileNotFoundError(f"{path} is not a published version")
+    return path
+
+def read_manifest(root: str, dataset: str, version: Optional[str] = None) -> Dict[str, Any]:
+    with open(os.path.join(version_path(root, dataset, version), MANIFEST_NAME), 'r') as f:
+        return json.load(f)
+
+def _fsync_tree(path: str) -> None:
+    for directory, _, files in os.walk(path):
+        for name in files:
+            with open(os.path.join(directory, name), 'rb') as f:
+                os.fsync(f.fileno())
+        _fsync_directory(directory)
+
+def _fsync_directory(path: str) -> None:
+    # Directory fsync persists renames; not supported on every platform
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+@contextmanager
+def dataset_lock(root: str, dataset: str, timeout: float = LOCK_TIMEOUT_SECONDS):
+    """Exclusive lock on a dataset's CURRENT pointer and pins (an O_EXCL lock file holding our pid)."""
+    path = os.path.join(dataset_path(root, dataset), LOCK_NAME)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                with open(path, 'r') as f:
+                    holder = int(f.read().strip() or 0)
+            except (FileNotFoundError, ValueError):
+                holder = 0
+            # A lock left behind by a process that died is broken; one being written (no pid yet) is not
+            if holder and not _pid_alive(holder):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{path} is held by process {holder or 'unknown'}")
+            time.sleep(0.05)
+    try:
+        os.write(fd, str(os.getpid()).encode('utf-8'))
+        os.close(fd)
+        yield
+    finally:
+        os.remove(path)
+
+def set_current(root: str, dataset: str, version: str) -> None:
+    """Atomically point CURRENT at a published version (callers hold dataset_lock)."""
+    version_path(root, dataset, version)
+    path = dataset_path(root, dataset)
+    temporary = os.path.join(path, f".{CURRENT_NAME}.{uuid.uuid4().hex}")
+    with open(temporary, 'w') as f:
+        f.write(version + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, os.path.join(path, CURRENT_NAME))
+    _fsync_directory(path)
+
+def publish(source_dir: str, root: str = DEFAULT_ROOT, dataset: str = 'default', label: Optional[str] = None,
+            include_derived: bool = True, make_current: bool = True) -> str:
+    """Copy a finished data directory into the store as the next version; returns the version name."""
+    path = dataset_path(root, dataset)
+    os.makedirs(path, exist_ok=True)
+    staging = os.path.join(path, f".staging-{uuid.uuid4().hex}")
+    try:
+        # Copy rather than hard link: the generators rewrite their outputs in place
+        shutil.copytree(source_dir, staging, ignore=shutil.ignore_patterns('.*'))
+        manifest = build_manifest(staging, include_derived)
+        manifest.update({'dataset': dataset, 'label': label, 'data_dir': None, 'source_dir': os.path.abspath(source_dir),
+                         'published_at': datetime.now().isoformat(timespec='seconds')})
+        _fsync_tree(staging)
+
+        while True:
+            versions = list_versions(root, dataset)
+            number = version_number(versions[-1]) + 1 if versions else 1
+            version = f"{VERSION_PREFIX}{number:04d}"
+            manifest['version'] = version
+            save_manifest(manifest, os.path.join(staging, MANIFEST_NAME))
+            try:
+                os.rename(staging, os.path.join(path, version))
+                break
+            except OSError:
+                # Another publisher took this number first
+                if not os.path.isdir(os.path.join(path, version)):
+                    raise
+        _fsync_directory(path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    if make_current:
+        # Check and switch under the lock: a slower concurrent publisher must
+        # not move CURRENT back to an older version
+        with dataset_lock(root, dataset):
+            current = current_version(root, dataset)
+            if current is None or version_number(version) > version_number(current):
+                set_current(root, dataset, version)
+    return version
+
+def verify_version(root: str, dataset: str, version: Optional[str] = None) -> List[str]:
+    """Files of a version that are missing or differ from its manifest."""
+    path = version_path(root, dataset, version)
+    manifest = read_manifest(root, dataset, version)
+    problems = []
+    for table in manifest['tables'].values():
+        for relative, entry in table['files'].items():
+            file_path = os.path.join(path, relative)
+            if not os.path.exists(file_path):
+                problems.append(f"{relative}: missing")
+            elif hash_file(file_path) != entry['hash']:
+                problems.append(f"{relative}: content differs from manifest")
+    return problems
+
+def _pin_path(root: str, dataset: str, version: str) -> str:
+    return os.path.join(dataset_path(root, dataset), PINS_DIR, f"{version}.{os.getpid()}.{uuid.uuid4().hex}")
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def pinned_versions(root: str, dataset: str) -> Dict[str, int]:
+    """Versions with live pins -> number of pins; pins of dead processes are cleaned up."""
+    pins_dir = os.path.join(dataset_path(root, dataset), PINS_DIR)
+    pinned = {}
+    if not os.path.isdir(pins_dir):
+        return pinned
+    for name in os.listdir(pins_dir):
+        version, pid, _ = name.split('.')
+        if _pid_alive(int(pid)):
+            pinned[version] = pinned.get(version, 0) + 1
+        else:
+            os.remove(os.path.join(pins_dir, name))
+    return pinned
+
+@contextmanager
+def pinned_version(root: str = DEFAULT_ROOT, dataset: str = 'default', version: Optional[str] = None):
+    """
+    Resolve a version once and keep it from being pruned while in use.
+
+    Yields the version directory; every table read inside the block comes
+    from the same published snapshot, whatever is published meanwhile.
+    """
+    # Resolve and pin under the lock, so prune cannot delete the version in between
+    with dataset_lock(root, dataset):
+        version = version or current_version(root, dataset)
+        if version is None:
+            raise FileNotFoundError(f"Dataset {dataset} has no published version in {root}")
+        pin = _pin_path(root, dataset, version)
+        os.makedirs(os.path.dirname(pin), exist_ok=True)
+        open(pin, 'w').close()
+        try:
+            path = version_path(root, dataset, version)
+        except FileNotFoundError:
+            os.remove(pin)
+            raise
+    try:
+        yield path
+    finally:
+        os.remove(pin)
+
+def prune(root: str, dataset: str, keep: int = 3) -> List[str]:
+    """Delete all but the newest `keep` versions, never the current or a pinned one; returns removed names."""
+    removed = []
+    doomed = []
+    with dataset_lock(root, dataset):
+        current = current_version(root, dataset)
+        pinned = pinned_versions(root, dataset)
+        versions = list_versions(root, dataset)
+        for version in versions[:max(len(versions) - keep, 0)]:
+            if version == current or version in pinned:
+                continue
+            # Rename first so a reader never sees a partially deleted version
+            path = os.path.join(dataset_path(root, dataset), version)
+            doomed.append(os.path.join(dataset_path(root, dataset), f".deleting-{version}-{uuid.uuid4().hex}"))
+            os.rename(path, doomed[-1])
+            removed.append(version)
+    # Renamed versions are invisible to readers, so the slow part runs without the lock
+    for path in doomed:
+        shutil.rmtree(path)
+    return removed
+
+def print_versions(root: str, dataset: str) -> None:
+    current = current_version(root, dataset)
+    pinned = pinned_versions(root, dataset)
+    print(f"\n{'version':<8} {'published':<20} {'label':<12} {'tables':>6} {'rows':>12} {'MB':>8}  root")
+    for version in list_versions(root, dataset):
+        manifest = read_manifest(root, dataset, version)
+        rows = sum(table['rows'] for table in manifest['tables'].values())
+        size = sum(table['bytes'] for table in manifest['tables'].values())
+        flags = (' ← current' if version == current else '') + (f" ({pinned[version]} pinned)" if version in pinned else '')
+        print(f"{version:<8} {manifest['published_at']:<20} {manifest.get('label') or '-':<12} "
+              f"{len(manifest['tables']):>6} {rows:>12,} {size / 1e6:>8.1f}  {manifest['root'][:12]}{flags}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish and read immutable, versioned copies of the generated dataset.")
+    parser.add_argument('action', choices=['publish', 'list', 'current', 'use', 'verify', 'prune'],
+                        help="publish a data directory, list versions, print the current version's path, "
+                             "point CURRENT at --version, verify hashes, or prune old versions")
+    parser.add_argument('--root', default=DEFAULT_ROOT, help="Store root directory")
+    parser.add_argument('--dataset', default='default', help="Dataset name, e.g. one per scale factor")
+    parser.add_argument('--data-dir', default='../data', help="Directory to publish")
+    parser.add_argument('--label', default=None, help="Free-form label stored in the manifest (e.g. sf10)")
+    parser.add_argument('--version', default=None, help="Version for use/verify (default: current)")
+    parser.add_argument('--no-switch', action='store_true', help="Publish without making it the current version")
+    parser.add_argument('--keep', type=int, default=3, help="Versions kept by prune")
+    args = parser.parse_args()
+
+    try:
+        if args.action == 'publish':
+            print(f"📦 Publishing {args.data_dir} to {args.root}/{args.dataset}...")
+            version = publish(args.data_dir, args.root, args.dataset, args.label, make_current=not args.no_switch)
+            manifest = read_manifest(args.root, args.dataset, version)
+            print(f"  {version}: {len(manifest['tables'])} tables, root {manifest['root'][:12]}")
+            print(f"✅ Published {version}" + ('' if args.no_switch else ' and made it current'))
+        elif args.action == 'list':
+            print_versions(args.root, args.dataset)
+        elif args.action == 'current':
+            # Only the path, so it can be used as --data-dir "$(...)"
+            print(version_path(args.root, args.dataset, args.version))
+        elif args.action == 'use':
+            if not args.version:
+                parser.error("use requires --version")
+            with dataset_lock(args.root, args.dataset):
+                set_current(args.root, args.dataset, args.version)
+            print(f"✅ {args.dataset} now reads {args.version}")
+        elif args.action == 'verify':
+            problems = verify_version(args.root, args.dataset, args.version)
+            for problem in problems:
+                print(f"  ❌ {problem}")
+            if problems:
+                sys.exit(1)
+            print("✅ Every file matches the manifest")
+        else:
+            removed = prune(args.root, args.dataset, args.keep)
+            print(f"🧹 Removed {', '.join(removed) if removed else 'nothing'}")
+    except (FileNotFoundError, TimeoutError) as error:
+        print(f"❌ {error}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Dictionary-encoded output with bit-packed flags, decoded lazily.
+
+Low-cardinality strings (event_type, activity_type, segment, ...) repeat on
+every row, as do the keys of every JSON object. An encoded data file
+('<TABLE>.enc.json', or '<MONTH>.enc.json' in a partitioned table) stores
+instead:
+1. One dictionary per categorical column (CATEGORICAL_COLUMNS); rows hold
+   the value's index in it
+2. The boolean columns of a table (FLAG_COLUMNS) packed into one integer,
+   two bits per flag (false, true, null)
+3. Rows as positional arrays in a fixed column order, so keys appear once
+
+quality_checks.load_json_data returns an EncodedTable for these files. Its
+rows are read-only mappings that decode a field only when it is accessed,
+so existing checks, the local engine and zone maps read them unchanged;
+column() and codes() decode (or skip decoding) a whole column at once.
+
+Snowflake only reads plain JSON: run with --decode before uploading. The
+row-offset index cannot point into an encoded file, so row_index.py scans
+its columns instead. Without --encode/--decode, the script compares size and
+parse time of both encodings.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import tempfile
+import time
+from collections.abc import Mapping, Sequence
+from typing import List, Dict, Any, Iterable, Iterator
+
+from quality_checks import ENCODED_SUFFIX, TABLE_FILES, load_json_data, table_paths
+
+ENCODED_FORMAT = 1
+FLAGS_FIELD = '_flags'
+
+CATEGORICAL_COLUMNS = {
+    'customers': ['segment', 'industry', 'country', 'state_province', 'compliance_maturity', 'primary_cloud_provider'],
+    'events': ['event_type', 'product_tier', 'billing_period', 'sales_channel', 'payment_method'],
+    'adoptions': ['status'],
+    'activities': ['activity_type', 'control_category', 'risk_level']
+}
+
+FLAG_COLUMNS = {
+    'activities': ['automated_flag', 'success_flag', 'evidence_collected']
+}
+
+# Two bits per flag
+FLAG_VALUES = (False, True, None)
+FLAG_CODES = {False: 0, True: 1, None: 2}
+
+def encode_rows(table: str, rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Encoded payload of a table's rows.
+
+    Column order is that of the first row; a field missing from a row
+    decodes as null.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return {'format': ENCODED_FORMAT, 'table': table, 'fields': [], 'stored': [],
+                'dictionaries': {}, 'flags': [], 'rows': []}
+    fields = list(first)
+    flags = [column for column in FLAG_COLUMNS.get(table, []) if column in fields]
+    categoricals = [column for column in CATEGORICAL_COLUMNS.get(table, []) if column in fields]
+    stored = [field for field in fields if field not in flags] + ([FLAGS_FIELD] if flags else [])
+    dictionaries = {column: [] for column in categoricals}
+    codes = {column: {} for column in categoricals}
+
+    encoded = []
+    for row in itertools.chain([first], rows):
+        values = []
+        for field in stored:
+            if field == FLAGS_FIELD:
+                mask = 0
+                for i, column in enumerate(flags):
+                    mask |= FLAG_CODES[row.get(column)] << (2 * i)
+                values.append(mask)
+                continue
+            value = row.get(field)
+            if field in codes and value is not None:
+                column_codes = codes[field]
+                if value not in column_codes:
+                    column_codes[value] = len(dictionaries[field])
+                    dictionaries[field].append(value)
+                value = column_codes[value]
+            values.append(value)
+        encoded.append(values)
+    return {'format': ENCODED_FORMAT, 'table': table, 'fields': fields, 'stored': stored,
+            'dictionaries': dictionaries, 'flags': flags, 'rows': encoded}
+
+def write_encoded(path: str, table: str, rows: Iterable[Dict[str, Any]]) -> int:
+    """Write rows as an encoded data file; returns the row count."""
+    payload = encode_rows(table, rows)
+    with open(path, 'w') as f:
+        json.dump(payload, f, separators=(',', ':'))
+    return len(payload['rows'])
+
+class EncodedRow(Mapping):
+    """Read-only row of an EncodedTable; fields are decoded on access."""
+
+    __slots__ = ('_getters', '_fields', '_values')
+
+    def __init__(self, getters: Dict[str, Any], fields: List[str], values: list):
+        self._getters = getters
+        self._fields = fields
+        self._values = values
+
+    def __getitem__(self, field: str) -> Any:
+        return self._getters[field](self._values)
+
+    def get(self, field: str, default: Any = None) -> Any:
+        getter = self._getters.get(field)
+        return default if getter is None else getter(self._values)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+class EncodedTable(Sequence):
+    """Rows of an encoded data file, decoded lazily."""
+
+    def __init__(self, payload: Dict[str, Any]):
+        if payload.get('format') != ENCODED_FORMAT:
+            raise ValueError(f"Unsupported encoded format {payload.get('format')}")
+        self.table = payload['table']
+        self.fields = payload['fields']
+        self.dictionaries = payload['dictionaries']
+        self.flags = payload['flags']
+        self._rows = payload['rows']
+        self._positions = {field: i for i, field in enumerate(payload['stored'])}
+        self._getters = {field: self._getter(field) for field in self.fields}
+
+    @classmethod
+    def load(cls, path: str) -> 'EncodedTable':
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def _getter(self, field: str):
+        if field in self.flags:
+            index, shift = self._positions[FLAGS_FIELD], 2 * self.flags.index(field)
+            return lambda values: FLAG_VALUES[(values[index] >> shift) & 3]
+        index = self._positions[field]
+        dictionary = self.dictionaries.get(field)
+        if dictionary is None:
+            return lambda values: values[index]
+        return lambda values: None if values[index] is None else dictionary[values[index]]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [EncodedRow(self._getters, self.fields, values) for values in self._rows[i]]
+        return EncodedRow(self._getters, self.fields, self._rows[i])
+
+    def __iter__(self) -> Iterator[EncodedRow]:
+        getters, fields = self._getters, self.fields
+        for values in self._rows:
+            yield EncodedRow(getters, fields, values)
+
+    def codes(self, field: str) -> List[Any]:
+        """Raw dictionary codes of a categorical column, without decoding (e.g. to group by)."""
+        if field not in self.dictionaries:
+            raise KeyError(f"{field} is not dictionary-encoded")
+        index = self._positions[field]
+        return [values[index] for values in self._rows]
+
+    def column(self, field: str) -> List[Any]:
+        """Decoded values of one column."""
+        getter = self._getters[field]
+        return [getter(values) for values in self._rows]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Every row decoded into a plain dict."""
+        getters = [(field, self._getters[field]) for field in self.fields]
+        return [{field: getter(values) for field, getter in getters} for values in self._rows]
+
+def plain_rows(rows: Iterable[Mapping]) -> Iterator[Dict[str, Any]]:
+    """Rows as plain dicts (EncodedRows decoded), for writers that serialize them."""
+    for row in rows:
+        yield row if isinstance(row, dict) else dict(row)
+
+def compare_encodings(data_dir: str, tables: List[str]) -> List[Dict[str, Any]]:
+    """Size and parse time of each table as JSON and encoded (encoded into a temporary file)."""
+    results = []
+    for table in tables:
+        for path in table_paths(data_dir, TABLE_FILES[table]):
+            start = time.perf_counter()
+            rows = load_json_data(path)
+            json_seconds = time.perf_counter() - start
+            handle, temporary = tempfile.mkstemp(suffix=ENCODED_SUFFIX, dir=data_dir)
+            os.close(handle)
+            try:
+                start = time.perf_counter()
+                write_encoded(temporary, table, rows)
+                encode_seconds = time.perf_counter() - start
+                start = time.perf_counter()
+                encoded = EncodedTable.load(temporary)
+                lazy_seconds = time.perf_counter() - start
+                start = time.perf_counter()
+                decoded = encoded.to_dicts()
+                decode_seconds = time.perf_counter() - start
+                encoded_bytes = os.path.getsize(temporary)
+            finally:
+                os.remove(temporary)
+            results.append({
+                'file': os.path.relpath(path, data_dir),
+                'rows': len(rows),
+                'json_bytes': os.path.getsize(path),
+                'encoded_bytes': encoded_bytes,
+                'json_load_seconds': json_seconds,
+                'encode_seconds': encode_seconds,
+                'encoded_load_seconds': lazy_seconds,
+                'full_decode_seconds': decode_seconds,
+                'round_trip': decoded == [dict(row) for row in rows]
+            })
+    return results
+
+def print_comparison(results: List[Dict[str, Any]]) -> None:
+    print(f"\n{'file':<36} {'rows':>8} {'JSON MB':>8} {'enc MB':>7} {'size':>6} "
+          f"{'json.load':>10} {'enc load':>9} {'+decode':>8}  round trip")
+    for result in results:
+        print(f"{result['file']:<36} {result['rows']:>8,} {result['json_bytes'] / 1e6:>8.2f} "
+              f"{result['encoded_bytes'] / 1e6:>7.2f} {result['encoded_bytes'] / result['json_bytes']:>6.0%} "
+              f"{result['json_load_seconds'] * 1e3:>8.1f}ms {result['encoded_load_seconds'] * 1e3:>7.1f}ms "
+              f"{result['full_decode_seconds'] * 1e3:>6.1f}ms  {'✅' if result['round_trip'] else '❌'}")
+
+def main():
+    # fact_partitions writes encoded files itself, so import it here to avoid a cycle
+    from csv_output import delimited_format
+    from fact_partitions import is_partitioned, write_fact_table
+    from quality_checks import load_table
+
+    parser = argparse.ArgumentParser(description="Convert tables to or from the dictionary-encoded format, or compare both.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--tables', default=','.join(CATEGORICAL_COLUMNS), help="Comma-separated tables")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--encode', action='store_true', help="Rewrite the tables as encoded files")
+    mode.add_argument('--decode', action='store_true', help="Rewrite encoded tables as plain JSON (before uploading)")
+    args = parser.parse_args()
+
+    tables = [table.strip() for table in args.tables.split(',') if table.strip()]
+    unknown = [table for table in tables if table not in CATEGORICAL_COLUMNS]
+    if unknown:
+        parser.error(f"unknown tables {', '.join(unknown)} (choose from {', '.join(CATEGORICAL_COLUMNS)})")
+
+    if not (args.encode or args.decode):
+        print(f"📦 Comparing JSON and encoded files in {args.data_dir}...")
+        print_comparison(compare_encodings(args.data_dir, tables))
+        return
+
+    for table in tables:
+        rows = load_table(args.data_dir, table)
+        partitioned = table != 'customers' and is_partitioned(args.data_dir, table)
+        paths = write_fact_table(args.data_dir, table, rows, partitioned, encoded=args.encode,
+                                 delimited=delimited_format(args.data_dir, table))
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"🗜️  {TABLE_FILES[table]}: {len(rows):,} rows {'encoded' if args.encode else 'decoded'} "
+              f"into {len(paths)} file(s), {size / 1e6:.2f} MB")
+
+if __name__ == "__main__":
+    main()
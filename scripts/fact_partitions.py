@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Month-partitioned fact output and the Snowflake SQL that loads it.
+
+FACT_SUBSCRIPTION_EVENTS, FACT_FRAMEWORK_ADOPTIONS and FACT_COMPLIANCE_ACTIVITIES
+are normally one file each. In partitioned mode (the generators' --partitioned
+flag, or --partition here for existing files) every fact is split by month of
+its date column (PARTITION_DATE_COLUMNS) into year/month directories:
+
+    FACT_SUBSCRIPTION_EVENTS/2024/03/2024-03.json   (+ .rowidx, .sketch, .zonemap)
+
+1. Every reader lists <TABLE>/ recursively (quality_checks.table_paths), so
+   QA, the local engine, zone maps and dataset manifests work unchanged;
+   each file holds one month, so dataset_diff.py reloads changed months with
+   its replace strategy
+2. partition_sql emits the PUT and COPY INTO statements for a range of
+   months, so an incremental load only uploads and scans those months. Each
+   file becomes its own micro-partitions, so month filters on the native
+   tables prune too
+3. It also emits an external table per fact whose partition column is
+   computed from the year/month directories in METADATA$FILENAME, so
+   time-bounded queries read only the matching months' files
+"""
+
+import argparse
+import glob
+import itertools
+import json
+import os
+import shutil
+import sys
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+from csv_output import DELIMITED_FORMATS, delimited_format, delimited_path, delimited_rows
+from dataset_diff import FILE_FORMAT, copy_statement, stage_location
+from encoded_output import plain_rows, write_encoded
+from incremental_checks import PARTITION_DATE_COLUMNS, month_key
+from local_engine import SETUP_SQL, parse_setup_sql
+from quality_checks import ENCODED_SUFFIX, TABLE_FILES, load_table, table_paths
+from row_index import INDEX_COLUMNS, write_indexed_json
+from sketches import SketchAccumulator, write_sketch_sidecar
+from sort_order import DEFAULT_RUN_ROWS, SORT_ORDERS, ExternalSorter, ordered_rows, sort_key
+from zone_maps import ZONE_MAP_TABLES, ZoneMapAccumulator, write_zone_map
+
+FACT_TABLES = list(PARTITION_DATE_COLUMNS)
+
+# Rows whose date column is missing or malformed go to their own directory
+INVALID_PARTITION = 'invalid'
+
+# External tables cannot read internal stages; this one must point at
+# cloud storage holding the same layout as the internal stage
+EXTERNAL_STAGE = 'PHANTOM_SEC_EXTERNAL_STAGE'
+PARTITION_COLUMN = 'partition_month'
+# Only the data files: partition directories also hold .rowidx, .sketch and
+# .zonemap sidecars and may hold .csv/.tsv copies
+EXTERNAL_FILE_PATTERN = '.*[.]json'
+
+def table_dir(data_dir: str, table: str) -> str:
+    return os.path.join(data_dir, os.path.splitext(TABLE_FILES[table])[0])
+
+def partition_path(data_dir: str, table: str, month: str, suffix: str = '.json') -> str:
+    """Data file of one month (YYYY-MM) of a partitioned fact table."""
+    if month == INVALID_PARTITION:
+        return os.path.join(table_dir(data_dir, table), INVALID_PARTITION, f"{INVALID_PARTITION}{suffix}")
+    year, month_number = month.split('-')
+    return os.path.join(table_dir(data_dir, table), year, month_number, f"{month}{suffix}")
+
+def is_partitioned(data_dir: str, table: str) -> bool:
+    return os.path.isdir(table_dir(data_dir, table))
+
+def is_encoded(data_dir: str, table: str) -> bool:
+    return any(path.endswith(ENCODED_SUFFIX) for path in table_paths(data_dir, TABLE_FILES[table]))
+
+def observed_rows(rows: Iterable[Dict[str, Any]], accumulators: List[Any]) -> Iterator[Dict[str, Any]]:
+    """Pass rows through unchanged, feeding each one to the accumulators on the way."""
+    for row in rows:
+        for accumulator in accumulators:
+            accumulator.add(row)
+        yield row
+
+def write_data_file(path: str, table: str, rows: Iterable[Dict[str, Any]], sort_order: str = 'generated',
+                    delimited: Optional[str] = None) -> None:
+    """
+    Write one data file in sort_order with its sidecars.
+
+    rows may be any iterable (such as a merge of sorted runs); it is read once.
+    Paths ending in ENCODED_SUFFIX are written dictionary-encoded and get no
+    row index (its byte offsets are only meaningful for plain JSON).
+    delimited ('csv' or 'tsv') also writes a delimited copy for loading.
+    """
+    # Sorted runs spill next to the output and are streamed into the file;
+    # rows read from an encoded file are decoded one at a time on the way
+    ordered = ordered_rows(table, plain_rows(rows), sort_order, temp_dir=os.path.dirname(path))
+    # Sketches let dataset-level QA merge files without rescanning, and the
+    # zone map lets readers skip files outside a date window or customer;
+    # neither depends on row order, so both are built as the rows stream past
+    sketches = SketchAccumulator(table)
+    zone_map = ZoneMapAccumulator(table) if table in ZONE_MAP_TABLES else None
+    ordered = observed_rows(ordered, [sketches] + ([zone_map] if zone_map else []))
+    if delimited:
+        ordered = delimited_rows(delimited_path(path, delimited), table, ordered, delimited)
+    if path.endswith(ENCODED_SUFFIX):
+        write_encoded(path, table, ordered)
+    elif table in INDEX_COLUMNS:
+        write_indexed_json(path, ordered, table)
+    else:
+        with open(path, 'w') as f:
+            json.dump(list(ordered), f, indent=2)
+    write_sketch_sidecar(path, table, built=sketches.result())
+    if zone_map:
+        write_zone_map(path, table, zone_map=zone_map.zone_map())
+
+def split_by_month(table: str, rows: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Rows grouped by YYYY-MM of the table's date column, keeping file order within a month."""
+    date_column = PARTITION_DATE_COLUMNS[table]
+    by_month = {}
+    for row in rows:
+        by_month.setdefault(month_key(row.get(date_column)), []).append(row)
+    return by_month
+
+def remove_table_files(data_dir: str, table: str) -> None:
+    """Remove every layout of a fact table: its partition directory, single files, sidecars and delimited copies."""
+    base = table_dir(data_dir, table)
+    shutil.rmtree(base, ignore_errors=True)
+    # Single files of either encoding, their sidecars and delimited copies
+    stale = glob.glob(glob.escape(base) + '.json*') + glob.glob(glob.escape(base) + ENCODED_SUFFIX + '*')
+    stale += [base + options['suffix'] for options in DELIMITED_FORMATS.values() if os.path.exists(base + options['suffix'])]
+    for path in stale:
+        os.remove(path)
+
+class FactTableWriter:
+    """
+    A fact table written from batches of rows as they are generated.
+
+    In generation order the rows are kept and written on close(). Any other
+    sort order hands each batch straight to an ExternalSorter, which spills a
+    sorted run to disk every run_rows rows, so the table is never held in
+    memory; partitioned tables sort on month first and each month's file is
+    written as the merge reaches it.
+    """
+
+    def __init__(self, data_dir: str, table: str, partitioned: bool = False, sort_order: str = 'generated',
+                 encoded: bool = False, delimited: Optional[str] = None, run_rows: int = DEFAULT_RUN_ROWS):
+        self.data_dir = data_dir
+        self.table = table
+        self.partitioned = partitioned
+        self.encoded = encoded
+        self.delimited = delimited
+        self.row_count = 0
+        key = sort_key(table, sort_order)
+        if key is None:
+            self.rows = []
+            self.sorter = None
+        else:
+            self.rows = None
+            if partitioned:
+                date_column = PARTITION_DATE_COLUMNS[table]
+                order_key = key
+                key = lambda row: (month_key(row.get(date_column)),) + order_key(row)
+            self.sorter = ExternalSorter(key, run_rows, data_dir)
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        if self.sorter is None:
+            before = len(self.rows)
+            self.rows.extend(rows)
+            self.row_count += len(self.rows) - before
+        else:
+            # Runs are spilled as JSON, so rows read from an encoded file are decoded first
+            before = self.sorter.rows
+            self.sorter.extend(plain_rows(rows))
+            self.row_count += self.sorter.rows - before
+
+    def _data_files(self) -> Iterator[tuple]:
+        # (path, rows in output order) for every data file, in file order
+        suffix = ENCODED_SUFFIX if self.encoded else '.json'
+        rows = self.rows if self.sorter is None else self.sorter.sorted_rows()
+        if not self.partitioned:
+            yield table_dir(self.data_dir, self.table) + suffix, rows
+        elif self.sorter is None:
+            for month, month_rows in sorted(split_by_month(self.table, rows).items()):
+                yield partition_path(self.data_dir, self.table, month, suffix), month_rows
+        else:
+            date_column = PARTITION_DATE_COLUMNS[self.table]
+            for month, month_rows in itertools.groupby(rows, key=lambda row: month_key(row.get(date_column))):
+                yield partition_path(self.data_dir, self.table, month, suffix), month_rows
+
+    def close(self) -> List[str]:
+        """Write the table, replacing any previous layout; returns the data files written."""
+        remove_table_files(self.data_dir, self.table)
+        written = []
+        try:
+            for path, rows in self._data_files():
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                write_data_file(path, self.table, rows, 'generated', self.delimited)
+                written.append(path)
+        finally:
+            if self.sorter is not None:
+                self.sorter.close()
+        self.rows = None
+        return written
+
+def write_fact_table(data_dir: str, table: str, rows: Iterable[Dict[str, Any]], partitioned: bool = False,
+                     sort_order: str = 'generated', encoded: bool = False,
+                     delimited: Optional[str] = None) -> List[str]:
+    """
+    Write a fact table as one file or as month partitions; returns the data files written.
+
+    sort_order (sort_order.SORT_ORDERS) applies within each data file,
+    encoded writes dictionary-encoded files (encoded_output.py) and
+    delimited adds a CSV or TSV copy of each (csv_output.py). Every other
+    layout is removed first: readers prefer <TABLE>/ over <TABLE>.json, and
+    months that no longer have rows must not linger.
+    """
+    writer = FactTableWriter(data_dir, table, partitioned, sort_order, encoded, delimited)
+    writer.add_rows(rows)
+    return writer.close()
+
+def partition_months(data_dir: str, table: str) -> Dict[str, str]:
+    """YYYY-MM -> data file path relative to data_dir, for a partitioned table."""
+    months = {}
+    for path in table_paths(data_dir, TABLE_FILES[table]):
+        relative = os.path.relpath(path, data_dir).replace(os.sep, '/')
+        months[os.path.basename(path).split('.')[0]] = relative
+    return months
+
+def external_table_ddl(definition: Dict[str, Any], folder: str, external_stage: str = EXTERNAL_STAGE) -> str:
+    """CREATE EXTERNAL TABLE partitioned by the month directories of its files."""
+    # METADATA$FILENAME ends in .../YYYY/MM/YYYY-MM.json whatever the stage prefix
+    partition = (f"{PARTITION_COLUMN} DATE AS TRY_TO_DATE(SPLIT_PART(METADATA$FILENAME, '/', -3) || '-' || "
+                 f"SPLIT_PART(METADATA$FILENAME, '/', -2), 'YYYY-MM')")
+    columns = [partition]
+    for column, field, cast_type, date_format in definition['projections']:
+        expression = (f"TO_DATE(VALUE:{field}::VARCHAR, '{date_format}')" if date_format
+                      else f"VALUE:{field}::{cast_type}")
+        columns.append(f"{column} {dict(definition['columns'])[column]} AS ({expression})")
+    column_list = ',\n  '.join(columns)
+    return (f"CREATE OR REPLACE EXTERNAL TABLE EXT_{definition['name']} (\n  {column_list}\n)\n"
+            f"PARTITION BY ({PARTITION_COLUMN})\nLOCATION = @{external_stage}/{folder}/\n"
+            f"PATTERN = '{EXTERNAL_FILE_PATTERN}'\n"
+            f"FILE_FORMAT = (FORMAT_NAME = {FILE_FORMAT})\nAUTO_REFRESH = FALSE;")
+
+def partition_sql(data_dir: str = '../data', tables: Optional[List[str]] = None, first_month: Optional[str] = None,
+                  last_month: Optional[str] = None, local_path: str = 'data',
+                  external_stage: str = EXTERNAL_STAGE) -> str:
+    """PUT, COPY INTO and external table SQL for the partitioned fact tables, limited to a month range."""
+    schema = parse_setup_sql(SETUP_SQL)
+    lines = [f"-- Partitioned fact load generated {datetime.now().isoformat(timespec='seconds')}",
+             f"-- Months {first_month or 'first'} to {last_month or 'last'}"]
+    for table in tables or FACT_TABLES:
+        definition = schema[table]
+        if not is_partitioned(data_dir, table):
+            lines.append(f"\n-- {definition['name']} is not partitioned: run fact_partitions.py --partition first")
+            continue
+        months = partition_months(data_dir, table)
+        if any(relative.endswith(ENCODED_SUFFIX) for relative in months.values()):
+            lines.append(f"\n-- {definition['name']} is dictionary-encoded: run encoded_output.py --decode first")
+            continue
+        selected = [months[month] for month in sorted(months)
+                    if month == INVALID_PARTITION
+                    or ((first_month is None or month >= first_month) and (last_month is None or month <= last_month))]
+        folder = os.path.splitext(TABLE_FILES[table])[0]
+        lines.append(f"\n-- {definition['name']}: {len(selected)} of {len(months)} monthly partitions "
+                     f"on {PARTITION_DATE_COLUMNS[table].upper()}")
+        if not selected:
+            lines.append("-- No partitions in the requested months")
+        else:
+            for relative in selected:
+                lines.append(f"PUT file://{local_path}/{relative} {stage_location(relative)} OVERWRITE=TRUE;")
+            # COPY load metadata also skips files loaded before, so re-running is safe
+            lines.append(copy_statement(definition, selected))
+        lines.append(f"\n-- Time-bounded queries on EXT_{definition['name']} read only the months they filter on, e.g.\n"
+                     f"-- WHERE {PARTITION_COLUMN} BETWEEN '2024-01-01' AND '2024-03-01'")
+        lines.append(external_table_ddl(definition, folder, external_stage))
+        lines.append(f"ALTER EXTERNAL TABLE EXT_{definition['name']} REFRESH;")
+    return '\n'.join(lines) + '\n'
+
+def main():
+    parser = argparse.ArgumentParser(description="Partition the fact tables by month and generate the SQL that loads them.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--tables', default=','.join(FACT_TABLES), help="Comma-separated fact tables")
+    layout = parser.add_mutually_exclusive_group()
+    layout.add_argument('--partition', action='store_true', help="Rewrite the tables into year/month directories")
+    layout.add_argument('--unpartition', action='store_true', help="Rewrite partitioned tables back into single files")
+    parser.add_argument('--sort-order', choices=SORT_ORDERS, default=None,
+                        help="Rewrite the tables with rows in this order (keeps the layout unless combined with the above)")
+    parser.add_argument('--from', dest='first_month', default=None, help="First month to load as YYYY-MM")
+    parser.add_argument('--to', dest='last_month', default=None, help="Last month to load as YYYY-MM")
+    parser.add_argument('--local-path', default='data', help="Local directory used in PUT file:// paths")
+    parser.add_argument('--external-stage', default=EXTERNAL_STAGE, help="External stage the external tables read")
+    parser.add_argument('--sql-output', default=None, help="Write the SQL to this file (default: print it)")
+    args = parser.parse_args()
+
+    tables = [table.strip() for table in args.tables.split(',') if table.strip()]
+    unknown = [table for table in tables if table not in FACT_TABLES]
+    if unknown:
+        parser.error(f"unknown tables {', '.join(unknown)} (choose from {', '.join(FACT_TABLES)})")
+
+    rewrite = args.partition or args.unpartition or args.sort_order
+    if rewrite:
+        for table in tables:
+            partitioned = args.partition or (is_partitioned(args.data_dir, table) and not args.unpartition)
+            rows = load_table(args.data_dir, table)
+            # Rewrites keep the table's encoding (encoded_output.py changes it) and delimited copy
+            paths = write_fact_table(args.data_dir, table, rows, partitioned, args.sort_order or 'generated',
+                                     encoded=is_encoded(args.data_dir, table),
+                                     delimited=delimited_format(args.data_dir, table))
+            layout_name = f"{len(paths)} monthly partitions" if partitioned else "one file"
+            order = f", sorted by {args.sort_order}" if args.sort_order else ''
+            print(f"🗂️  {TABLE_FILES[table]}: {len(rows):,} rows as {layout_name}{order}")
+
+    sql = partition_sql(args.data_dir, tables, args.first_month, args.last_month, args.local_path, args.external_stage)
+    if args.sql_output:
+        with open(args.sql_output, 'w') as f:
+            f.write(sql)
+        print(f"💾 Saved load SQL to {args.sql_output}")
+    elif not rewrite:
+        sys.stdout.write(sql)
+
+if __name__ == "__main__":
+    main()
@@ -7,16 +7,23 @@ implementation and ongoing monitoring, with realistic temporal clustering
 and business logic.
 """
 
+import argparse
 import json
 import random
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Tuple
-import statistics
+
+from business_rules import ACTIVITY_TYPE_MIX, CONTROL_CATEGORY_MIX, EXPECTED_DURATION_MINUTES, RISK_LEVEL_MIX, evaluate_rules
+from csv_output import DELIMITED_FORMATS
+from customer_snapshot import CustomerSnapshotAccumulator, write_customer_snapshot
+from fact_partitions import FactTableWriter
+from quality_checks import activity_rule_issues, load_table
+from rollups import create_rollups, write_rollups
+from sort_order import SORT_ORDERS
 
 def load_customers() -> List[Dict[str, Any]]:
     """Load customer data."""
-    with open('../data/DIM_CUSTOMERS.json', 'r') as f:
-        return json.load(f)
+    return load_table('../data', 'customers')
 
 def load_frameworks() -> List[Dict[str, Any]]:
     """Load compliance frameworks data."""
@@ -25,8 +32,8 @@ def load_frameworks() -> List[Dict[str, Any]]:
 
 def load_framework_adoptions() -> List[Dict[str, Any]]:
     """Load framework adoptions data."""
-    with open('../data/FACT_FRAMEWORK_ADOPTIONS.json', 'r') as f:
-        return json.load(f)
+    # Also reads the month partitions of FACT_FRAMEWORK_ADOPTIONS/
+    return load_table('../data', 'adoptions')
 
 def parse_date(date_str: str) -> datetime:
     """Parse date from MM/DD/YYYY format."""
@@ -38,24 +45,15 @@ def format_date(date: datetime) -> str:
 
 def get_activity_type() -> str:
     """Get activity type based on realistic distribution."""
-    return random.choices(
-        ['control_check', 'questionnaire', 'remediation', 'training', 'audit'],
-        weights=[0.50, 0.20, 0.15, 0.10, 0.05]
-    )[0]
+    return random.choices(list(ACTIVITY_TYPE_MIX), weights=list(ACTIVITY_TYPE_MIX.values()))[0]
 
 def get_control_category() -> str:
     """Get control category based on realistic distribution."""
-    return random.choices(
-        ['access_control', 'data_protection', 'network_security', 'monitoring', 'incident_response'],
-        weights=[0.25, 0.25, 0.20, 0.20, 0.10]
-    )[0]
+    return random.choices(list(CONTROL_CATEGORY_MIX), weights=list(CONTROL_CATEGORY_MIX.values()))[0]
 
 def get_risk_level() -> str:
     """Get risk level based on realistic distribution."""
-    return random.choices(
-        ['low', 'medium', 'high', 'critical'],
-        weights=[0.40, 0.30, 0.20, 0.10]
-    )[0]
+    return random.choices(list(RISK_LEVEL_MIX), weights=list(RISK_LEVEL_MIX.values()))[0]
 
 def calculate_automation_rate(framework: Dict[str, Any], customer: Dict[str, Any]) -> float:
     """Calculate automation rate based on framework and customer maturity."""
@@ -254,14 +252,18 @@ def generate_activities_for_adoption(adoption: Dict[str, Any],
 
 def generate_compliance_activities(adoptions: List[Dict[str, Any]],
                                  frameworks: List[Dict[str, Any]],
-                                 customers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Generate all compliance activities."""
+                                 customers: List[Dict[str, Any]],
+                                 accumulators: List[Any]) -> int:
+    """
+    Generate all compliance activities, handing each adoption's batch to every
+    accumulator (rollups, customer snapshot, validation, the fact writer) so no
+    list of every activity is kept here; returns the activity count.
+    """
     
     # Create lookup dictionaries
     framework_lookup = {f['framework_id']: f for f in frameworks}
     customer_lookup = {c['customer_id']: c for c in customers}
     
-    all_activities = []
     activity_id_counter = 1
     
     print(f"Generating activities for {len(adoptions)} framework adoptions...")
@@ -274,146 +276,153 @@ def generate_compliance_activities(adoptions: List[Dict[str, Any]],
             activities, activity_id_counter = generate_activities_for_adoption(
                 adoption, framework, customer, activity_id_counter
             )
-            all_activities.extend(activities)
+            for accumulator in accumulators:
+                accumulator.add_rows(activities)
         
         if (i + 1) % 100 == 0:
             print(f"  Processed {i + 1}/{len(adoptions)} adoptions...")
     
-    return all_activities
+    return activity_id_counter - 1
 
-def validate_compliance_activities(activities: List[Dict[str, Any]],
-                                 adoptions: List[Dict[str, Any]],
-                                 customers: List[Dict[str, Any]],
-                                 frameworks: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Comprehensive validation of compliance activities data."""
-    issues = []
-    
-    # Basic metrics
-    total_activities = len(activities)
-    unique_customers = len(set(a['customer_id'] for a in activities))
-    unique_adoptions = len(set(a['adoption_id'] for a in activities))
-    
-    # Activity distribution analysis
-    activity_types = {}
-    control_categories = {}
-    risk_levels = {}
-    automation_stats = {'automated': 0, 'manual': 0}
-    success_stats = {'successful': 0, 'failed': 0}
-    evidence_stats = {'collected': 0, 'not_collected': 0}
-    
-    duration_by_type = {}
-    
-    for activity in activities:
-        # Activity type distribution
-        activity_type = activity.get('activity_type', 'unknown')
-        activity_types[activity_type] = activity_types.get(activity_type, 0) + 1
+class ActivityValidationAccumulator:
+    """Validation of compliance activities, accumulated batch by batch in one pass."""
+    
+    def __init__(self, adoptions: List[Dict[str, Any]],
+                 customers: List[Dict[str, Any]],
+                 frameworks: List[Dict[str, Any]]):
+        self.adoption_count = len(adoptions)
+        self.customer_count = len(customers)
+        self.total_activities = 0
+        self.customer_ids = set()
+        self.adoption_ids = set()
+        self.activity_types = {}
+        self.control_categories = {}
+        self.risk_levels = {}
+        self.automation_stats = {'automated': 0, 'manual': 0}
+        self.success_stats = {'successful': 0, 'failed': 0}
+        self.evidence_stats = {'collected': 0, 'not_collected': 0}
+        # Running totals per type, so durations are not kept per activity
+        self.duration_by_type = {}
+        self.temporal_issues = 0
+        self.violations = {}
         
-        # Control category distribution
-        control_category = activity.get('control_category', 'unknown')
-        control_categories[control_category] = control_categories.get(control_category, 0) + 1
+        # Each adoption's allowed activity window, parsed once (None if its dates don't parse)
+        self.windows = {}
+        for adoption in adoptions:
+            try:
+                start_date = parse_date(adoption['start_date'])
+                # Allow 90 days post-completion
+                end_date = parse_date(adoption['completion_date']) + timedelta(days=90)
+                self.windows[adoption['adoption_id']] = (start_date, end_date)
+            except (ValueError, TypeError):
+                self.windows[adoption['adoption_id']] = None
+    
+    def add_rows(self, activities: List[Dict[str, Any]]) -> None:
+        for activity in activities:
+            self.total_activities += 1
+            self.customer_ids.add(activity['customer_id'])
+            self.adoption_ids.add(activity['adoption_id'])
+            
+            # Activity type, control category and risk level distributions
+            activity_type = activity.get('activity_type', 'unknown')
+            self.activity_types[activity_type] = self.activity_types.get(activity_type, 0) + 1
+            control_category = activity.get('control_category', 'unknown')
+            self.control_categories[control_category] = self.control_categories.get(control_category, 0) + 1
+            risk_level = activity.get('risk_level', 'unknown')
+            self.risk_levels[risk_level] = self.risk_levels.get(risk_level, 0) + 1
+            
+            # Automation, success and evidence stats
+            self.automation_stats['automated' if activity.get('automated_flag', False) else 'manual'] += 1
+            self.success_stats['successful' if activity.get('success_flag', False) else 'failed'] += 1
+            self.evidence_stats['collected' if activity.get('evidence_collected', False) else 'not_collected'] += 1
+            
+            # Duration analysis by type
+            totals = self.duration_by_type.get(activity_type)
+            if totals is None:
+                totals = self.duration_by_type[activity_type] = [0, 0]
+            totals[0] += activity.get('duration_minutes', 0)
+            totals[1] += 1
+            
+            # Temporal validation against the adoption timeline
+            try:
+                activity_date = parse_date(activity.get('activity_date', '01/01/2020'))
+            except (ValueError, TypeError):
+                self.temporal_issues += 1
+                continue
+            adoption_id = activity.get('adoption_id')
+            if adoption_id in self.windows:
+                window = self.windows[adoption_id]
+                if window is None or not window[0] <= activity_date <= window[1]:
+                    self.temporal_issues += 1
         
-        # Risk level distribution
-        risk_level = activity.get('risk_level', 'unknown')
-        risk_levels[risk_level] = risk_levels.get(risk_level, 0) + 1
+        # Types, categories, risk levels and durations from the shared rule spec
+        for name, failing in evaluate_rules('activities', activities).items():
+            self.violations[name] = self.violations.get(name, 0) + len(failing)
+    
+    def result(self) -> Dict[str, Any]:
+        issues = []
+        total_activities = self.total_activities
         
-        # Automation stats
-        if activity.get('automated_flag', False):
-            automation_stats['automated'] += 1
-        else:
-            automation_stats['manual'] += 1
+        if self.temporal_issues > 0:
+            issues.append(f"{self.temporal_issues} activities have dates outside adoption timeline")
         
-        # Success stats
-        if activity.get('success_flag', False):
-            success_stats['successful'] += 1
-        else:
-            success_stats['failed'] += 1
+        issues.extend(activity_rule_issues(self.violations))
         
-        # Evidence stats
-        if activity.get('evidence_collected', False):
-            evidence_stats['collected'] += 1
-        else:
-            evidence_stats['not_collected'] += 1
+        # Foreign key validation
+        orphaned_activities = self.adoption_ids - set(self.windows)
         
-        # Duration analysis by type
-        duration = activity.get('duration_minutes', 0)
-        if activity_type not in duration_by_type:
-            duration_by_type[activity_type] = []
-        duration_by_type[activity_type].append(duration)
-    
-    # Temporal validation
-    temporal_issues = 0
-    for activity in activities:
-        try:
-            activity_date = parse_date(activity.get('activity_date', '01/01/2020'))
-            
-            # Find corresponding adoption
-            adoption_id = activity.get('adoption_id')
-            adoption = next((a for a in adoptions if a['adoption_id'] == adoption_id), None)
-            
-            if adoption:
-                start_date = parse_date(adoption['start_date'])
-                completion_date = parse_date(adoption['completion_date'])
-                # Allow 90 days post-completion
-                end_date = completion_date + timedelta(days=90)
-                
-                if activity_date < start_date or activity_date > end_date:
-                    temporal_issues += 1
-            
-        except (ValueError, TypeError):
-            temporal_issues += 1
-    
-    if temporal_issues > 0:
-        issues.append(f"{temporal_issues} activities have dates outside adoption timeline")
-    
-    # Foreign key validation
-    adoption_ids = {a['adoption_id'] for a in adoptions}
-    activity_adoption_ids = {a['adoption_id'] for a in activities}
-    orphaned_activities = activity_adoption_ids - adoption_ids
-    
-    if orphaned_activities:
-        issues.append(f"{len(orphaned_activities)} activities reference non-existent adoptions")
-    
-    # Business logic validation
-    automation_rate = automation_stats['automated'] / total_activities
-    success_rate = success_stats['successful'] / total_activities
-    evidence_rate = evidence_stats['collected'] / total_activities
-    
-    # Check for unrealistic rates
-    if automation_rate > 0.8:
-        issues.append(f"Automation rate too high: {automation_rate:.1%}")
-    if success_rate < 0.7 or success_rate > 0.95:
-        issues.append(f"Success rate outside expected range: {success_rate:.1%}")
-    
-    # Duration validation
-    duration_issues = 0
-    for activity_type, durations in duration_by_type.items():
-        if durations:
-            avg_duration = statistics.mean(durations)
+        if orphaned_activities:
+            issues.append(f"{len(orphaned_activities)} activities reference non-existent adoptions")
+        
+        # Business logic validation
+        automation_rate = self.automation_stats['automated'] / total_activities
+        success_rate = self.success_stats['successful'] / total_activities
+        evidence_rate = self.evidence_stats['collected'] / total_activities
+        
+        # Check for unrealistic rates
+        if automation_rate > 0.8:
+            issues.append(f"Automation rate too high: {automation_rate:.1%}")
+        if success_rate < 0.7 or success_rate > 0.95:
+            issues.append(f"Success rate outside expected range: {success_rate:.1%}")
+        
+        # Duration validation
+        average_durations = {activity_type: total / count
+                             for activity_type, (total, count) in self.duration_by_type.items()}
+        duration_issues = 0
+        for activity_type, avg_duration in average_durations.items():
             # Check for unrealistic averages
-            if activity_type == 'control_check' and avg_duration > 150:
-                duration_issues += 1
-            elif activity_type == 'audit' and avg_duration < 200:
+            low, high = EXPECTED_DURATION_MINUTES.get(activity_type, (0, float('inf')))
+            if not low <= avg_duration <= high:
                 duration_issues += 1
-    
-    if duration_issues > 0:
-        issues.append(f"{duration_issues} activity types have unrealistic average durations")
-    
-    return {
-        'total_activities': total_activities,
-        'unique_customers': unique_customers,
-        'unique_adoptions': unique_adoptions,
-        'activities_per_customer': total_activities / len(customers) if customers else 0,
-        'activities_per_adoption': total_activities / len(adoptions) if adoptions else 0,
-        'activity_types': activity_types,
-        'control_categories': control_categories,
-        'risk_levels': risk_levels,
-        'automation_rate': automation_rate,
-        'success_rate': success_rate,
-        'evidence_rate': evidence_rate,
-        'duration_by_type': {k: statistics.mean(v) for k, v in duration_by_type.items()},
-        'temporal_issues': temporal_issues,
-        'issues': issues
-    }
+        
+        if duration_issues > 0:
+            issues.append(f"{duration_issues} activity types have unrealistic average durations")
+        
+        return {
+            'total_activities': total_activities,
+            'unique_customers': len(self.customer_ids),
+            'unique_adoptions': len(self.adoption_ids),
+            'activities_per_customer': total_activities / self.customer_count if self.customer_count else 0,
+            'activities_per_adoption': total_activities / self.adoption_count if self.adoption_count else 0,
+            'activity_types': self.activity_types,
+            'control_categories': self.control_categories,
+            'risk_levels': self.risk_levels,
+            'automation_rate': automation_rate,
+            'success_rate': success_rate,
+            'evidence_rate': evidence_rate,
+            'duration_by_type': average_durations,
+            'temporal_issues': self.temporal_issues,
+            'issues': issues
+        }
+
+def validate_compliance_activities(activities: List[Dict[str, Any]],
+                                 adoptions: List[Dict[str, Any]],
+                                 customers: List[Dict[str, Any]],
+                                 frameworks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Comprehensive validation of compliance activities data."""
+    validation = ActivityValidationAccumulator(adoptions, customers, frameworks)
+    validation.add_rows(activities)
+    return validation.result()
 
 def print_validation_summary(validation: Dict[str, Any]) -> None:
     """Print comprehensive validation summary."""
@@ -460,6 +469,17 @@ def print_validation_summary(validation: Dict[str, Any]) -> None:
         print(f"\n✨ No data quality issues found!")
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate FACT_COMPLIANCE_ACTIVITIES for the generated framework adoptions.")
+    parser.add_argument('--partitioned', action='store_true',
+                        help="Write one file per month of activity_date under FACT_COMPLIANCE_ACTIVITIES/YYYY/MM/")
+    parser.add_argument('--sort-order', choices=SORT_ORDERS, default='generated',
+                        help="Row order of the output: generation order, date, customer, or clustered (month, then customer)")
+    parser.add_argument('--encoded', action='store_true',
+                        help="Write dictionary-encoded files (decode with encoded_output.py --decode before uploading)")
+    parser.add_argument('--delimited', choices=sorted(DELIMITED_FORMATS), default=None,
+                        help="Also write a CSV or TSV copy of each file for the fast COPY INTO path (csv_output.py)")
+    args = parser.parse_args()
+    
     print("🚀 Generating FACT_COMPLIANCE_ACTIVITIES data...")
     
     # Load dependencies
@@ -470,21 +490,35 @@ def main():
     
     print(f"Loaded: {len(customers)} customers, {len(frameworks)} frameworks, {len(adoptions)} adoptions")
     
-    # Generate activities
+    # Generate activities straight into the validation and the fact writer;
+    # with a sort order the writer spills sorted runs instead of keeping them
     print("\n🔄 Generating compliance activities...")
-    activities = generate_compliance_activities(adoptions, frameworks, customers)
-    print(f"Generated {len(activities):,} compliance activities")
+    rollups = create_rollups('activities', customers, frameworks)
+    snapshot = CustomerSnapshotAccumulator('activities')
+    validation = ActivityValidationAccumulator(adoptions, customers, frameworks)
+    writer = FactTableWriter('../data', 'activities', args.partitioned, args.sort_order, args.encoded, args.delimited)
+    count = generate_compliance_activities(adoptions, frameworks, customers, rollups + [snapshot, validation, writer])
+    print(f"Generated {count:,} compliance activities")
     
     # Validate
     print("\n✅ Validating compliance activities data...")
-    validation = validate_compliance_activities(activities, adoptions, customers, frameworks)
-    print_validation_summary(validation)
+    print_validation_summary(validation.result())
     
-    # Save data
+    # Save data - one file, or one file per month of activity_date with --partitioned
     output_file = '../data/FACT_COMPLIANCE_ACTIVITIES.json'
-    print(f"\n💾 Saving {len(activities):,} activities to {output_file}...")
-    with open(output_file, 'w') as f:
-        json.dump(activities, f, indent=2)
+    print(f"\n💾 Saving {count:,} activities to {output_file}...")
+    # Each data file gets its row index, sketch and zone map sidecars
+    written = writer.close()
+    if args.partitioned:
+        print(f"  {len(written)} monthly partitions under ../data/FACT_COMPLIANCE_ACTIVITIES/")
+    
+    # Rollups were accumulated during generation - no second pass over the activities
+    for name, count in write_rollups(rollups).items():
+        print(f"💾 Saved {count} rows to ../data/{name}.json")
+    
+    # Each customer's activity totals, also captured during generation
+    count = write_customer_snapshot([snapshot], customers)
+    print(f"💾 Saved {count} rows to ../data/DIM_CUSTOMER_SNAPSHOT.json")
     
     print("🎉 FACT_COMPLIANCE_ACTIVITIES generation complete!")
 
@@ -10,11 +10,15 @@ This script consolidates:
 5. Add comprehensive quality validation
 """
 
+import argparse
 import json
 import random
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 
+from business_rules import SEGMENT_EMPLOYEE_RANGES, SEGMENT_REVENUE_RANGES, evaluate_rules
+from csv_output import DELIMITED_FORMATS, delimited_path, write_delimited
+
 def load_data(filepath: str) -> List[Dict[str, Any]]:
     """Load customer data from JSON file."""
     with open(filepath, 'r') as f:
@@ -37,34 +41,17 @@ def expand_signup_dates_5_years(customers: List[Dict[str, Any]]) -> List[Dict[st
 def fix_employee_count_by_segment(customers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Fix employee counts to align with segment definitions."""
     for customer in customers:
-        segment = customer['segment']
-        
-        if segment == 'startup':
-            # 1-50 employees
-            customer['employee_count'] = random.randint(1, 50)
-        elif segment == 'mid_market':
-            # 51-500 employees
-            customer['employee_count'] = random.randint(51, 500)
-        else:  # enterprise
-            # 501-10,000 employees
-            customer['employee_count'] = random.randint(501, 10000)
+        # Unknown segments fall back to the enterprise range
+        low, high = SEGMENT_EMPLOYEE_RANGES.get(customer['segment'], SEGMENT_EMPLOYEE_RANGES['enterprise'])
+        customer['employee_count'] = random.randint(low, high)
     
     return customers
 
 def fix_revenue_by_segment(customers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Fix revenue ranges to align with segment definitions."""
     for customer in customers:
-        segment = customer['segment']
-        
-        if segment == 'startup':
-            # $100K - $5M annual revenue
-            customer['annual_revenue'] = random.randint(100000, 5000000)
-        elif segment == 'mid_market':
-            # $5M - $100M annual revenue
-            customer['annual_revenue'] = random.randint(5000000, 100000000)
-        else:  # enterprise
-            # $100M - $1B annual revenue
-            customer['annual_revenue'] = random.randint(100000000, 1000000000)
+        low, high = SEGMENT_REVENUE_RANGES.get(customer['segment'], SEGMENT_REVENUE_RANGES['enterprise'])
+        customer['annual_revenue'] = random.randint(low, high)
     
     return customers
 
@@ -89,31 +76,11 @@ def validate_customer_data(customers: List[Dict[str, Any]]) -> Dict[str, Any]:
         for segment, count in segment_counts.items()
     }
     
-    # Employee count validation by segment
-    employee_violations = 0
-    for customer in customers:
-        segment = customer['segment']
-        employee_count = customer['employee_count']
-        
-        if segment == 'startup' and not (1 <= employee_count <= 50):
-            employee_violations += 1
-        elif segment == 'mid_market' and not (51 <= employee_count <= 500):
-            employee_violations += 1
-        elif segment == 'enterprise' and not (501 <= employee_count <= 10000):
-            employee_violations += 1
-    
-    # Revenue validation by segment
-    revenue_violations = 0
-    for customer in customers:
-        segment = customer['segment']
-        revenue = customer['annual_revenue']
-        
-        if segment == 'startup' and not (100000 <= revenue <= 5000000):
-            revenue_violations += 1
-        elif segment == 'mid_market' and not (5000000 <= revenue <= 100000000):
-            revenue_violations += 1
-        elif segment == 'enterprise' and not (100000000 <= revenue <= 1000000000):
-            revenue_violations += 1
+    # Segment ranges and date formats from the shared rule spec
+    violations = evaluate_rules('customers', customers)
+    segment_violations = len(violations['segment_values'])
+    employee_violations = len(violations['employee_count_by_segment'])
+    revenue_violations = len(violations['annual_revenue_by_segment'])
     
     # Date range validation
     signup_dates = [datetime.strptime(c['signup_date'], '%m/%d/%Y') for c in customers]
@@ -130,6 +97,7 @@ def validate_customer_data(customers: List[Dict[str, Any]]) -> Dict[str, Any]:
         'total_customers': total_customers,
         'segment_distribution': segment_counts,
         'segment_percentages': segment_percentages,
+        'segment_violations': segment_violations,
         'employee_violations': employee_violations,
         'employee_violation_rate': (employee_violations / total_customers) * 100,
         'revenue_violations': revenue_violations,
@@ -165,15 +133,21 @@ def print_validation_summary(validation: Dict[str, Any]) -> None:
         print(f"  {industry}: {count} ({percentage:.1f}%)")
     
     print(f"\n✅ DATA QUALITY CHECKS:")
+    print(f"Unknown Segments: {validation['segment_violations']}")
     print(f"Employee Count Violations: {validation['employee_violations']} ({validation['employee_violation_rate']:.1f}%)")
     print(f"Revenue Range Violations: {validation['revenue_violations']} ({validation['revenue_violation_rate']:.1f}%)")
     
-    if validation['employee_violations'] == 0 and validation['revenue_violations'] == 0:
+    if validation['segment_violations'] == 0 and validation['employee_violations'] == 0 and validation['revenue_violations'] == 0:
         print("🎉 All business logic validations PASSED!")
     else:
         print("⚠️  Data quality issues detected")
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate DIM_CUSTOMERS from MOCK_DATA_ORIGINAL.json in the current directory.")
+    parser.add_argument('--delimited', choices=sorted(DELIMITED_FORMATS), default=None,
+                        help="Also write a CSV or TSV copy for the fast COPY INTO path (csv_output.py)")
+    args = parser.parse_args()
+
     print("🚀 Updating DIM_CUSTOMERS to 300 records with 5-year range...")
     
     # Load original data
@@ -204,6 +178,10 @@ def main():
     print(f"\n💾 Saving {len(customers)} customers to {output_file}...")
     with open(output_file, 'w') as f:
         json.dump(customers, f, indent=2)
+    if args.delimited:
+        delimited_file = delimited_path(output_file, args.delimited)
+        write_delimited(delimited_file, 'customers', customers, args.delimited)
+        print(f"💾 Saved {delimited_file}")
     
     print("🎉 DIM_CUSTOMERS update complete!")
     print(f"✨ Ready for FACT_SUBSCRIPTION_EVENTS generation with {len(customers)} customers")
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Generate the DIM_DATE calendar dimension.
+
+One row per day covering every date in the dataset, padded to whole
+calendar years so year, quarter and fiscal-period filters never hit a
+partial period. Each row carries precomputed calendar and fiscal
+attributes, so semantic view time filters ("Q4 2024", "FY2025",
+"business days in March") become a join on the date instead of date
+functions evaluated on every fact row:
+1. Calendar - year, quarter, month, ISO week, day of month/year/week
+2. Fiscal - fiscal year (named for the calendar year it ends in),
+   fiscal quarter and fiscal month for FISCAL_YEAR_START_MONTH
+3. Business days - weekend flag, US federal holidays (on their observed
+   weekday) and the resulting business-day flag
+
+date_key is the date as an integer YYYYMMDD for clients that prefer
+integer keys; the semantic views join on calendar_date.
+"""
+
+import argparse
+import calendar
+import json
+import os
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+from csv_output import DELIMITED_FORMATS, delimited_path, write_delimited
+from quality_checks import load_json_data
+from revenue_snapshots import format_day, parse_day
+from sketches import table_shards
+
+DATE_TABLE = 'DIM_DATE'
+
+# Fiscal year runs February - January; FY2025 ends in January 2025
+FISCAL_YEAR_START_MONTH = 2
+
+# Table key -> date columns that must fall inside the calendar
+DATE_COLUMNS = {
+    'customers': ['signup_date'],
+    'events': ['event_date'],
+    'adoptions': ['start_date', 'completion_date'],
+    'activities': ['activity_date']
+}
+
+def nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The nth given weekday (0 = Monday) of a month; n = -1 for the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year, month, calendar.monthrange(year, month)[1])
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+def us_federal_holidays(year: int) -> Dict[date, str]:
+    """Observed US federal holidays: Saturday holidays move to Friday, Sunday ones to Monday."""
+    fixed = [(date(year, 1, 1), "New Year's Day"), (date(year, 7, 4), 'Independence Day'),
+             (date(year, 11, 11), 'Veterans Day'), (date(year, 12, 25), 'Christmas Day')]
+    if year >= 2021:
+        fixed.append((date(year, 6, 19), 'Juneteenth'))
+    holidays = {}
+    for day, name in fixed:
+        if day.weekday() == 5:
+            holidays[day - timedelta(days=1)] = f"{name} (observed)"
+        elif day.weekday() == 6:
+            holidays[day + timedelta(days=1)] = f"{name} (observed)"
+        else:
+            holidays[day] = name
+    holidays[nth_weekday(year, 1, 0, 3)] = 'Martin Luther King Jr. Day'
+    holidays[nth_weekday(year, 2, 0, 3)] = "Presidents' Day"
+    holidays[nth_weekday(year, 5, 0, -1)] = 'Memorial Day'
+    holidays[nth_weekday(year, 9, 0, 1)] = 'Labor Day'
+    holidays[nth_weekday(year, 10, 0, 2)] = 'Columbus Day'
+    holidays[nth_weekday(year, 11, 3, 4)] = 'Thanksgiving Day'
+    return holidays
+
+def fiscal_period(day: date, start_month: int = FISCAL_YEAR_START_MONTH) -> Tuple[int, int, int]:
+    """(fiscal year, fiscal quarter, fiscal month) of a date."""
+    fiscal_month = (day.month - start_month) % 12 + 1
+    fiscal_year = day.year + (1 if start_month > 1 and day.month >= start_month else 0)
+    return fiscal_year, (fiscal_month - 1) // 3 + 1, fiscal_month
+
+def date_row(day: date, holidays: Dict[date, str], start_month: int = FISCAL_YEAR_START_MONTH) -> Dict[str, Any]:
+    quarter = (day.month - 1) // 3 + 1
+    iso_year, iso_week, iso_weekday = day.isocalendar()
+    fiscal_year, fiscal_quarter, fiscal_month = fiscal_period(day, start_month)
+    holiday = holidays.get(day)
+    is_weekend = iso_weekday >= 6
+    return {
+        'date_key': day.year * 10000 + day.month * 100 + day.day,
+        'calendar_date': format_day(day),
+        'year': day.year,
+        'quarter': quarter,
+        'quarter_name': f"Q{quarter} {day.year}",
+        'month': day.month,
+        'month_name': day.strftime('%B'),
+        'year_month': day.strftime('%Y-%m'),
+        'iso_year': iso_year,
+        'iso_week': iso_week,
+        'week_start_date': format_day(day - timedelta(days=iso_weekday - 1)),
+        'day_of_month': day.day,
+        'day_of_year': day.timetuple().tm_yday,
+        'day_of_week': iso_weekday,
+        'day_name': day.strftime('%A'),
+        'is_weekend': is_weekend,
+        'is_holiday': holiday is not None,
+        'holiday_name': holiday,
+        'is_business_day': not is_weekend and holiday is None,
+        'is_month_end': (day + timedelta(days=1)).day == 1,
+        'fiscal_year': fiscal_year,
+        'fiscal_quarter': fiscal_quarter,
+        'fiscal_quarter_name': f"FQ{fiscal_quarter} FY{fiscal_year}",
+        'fiscal_month': fiscal_month
+    }
+
+def generate_date_dimension(start: date, end: date,
+                            start_month: int = FISCAL_YEAR_START_MONTH) -> List[Dict[str, Any]]:
+    """One DIM_DATE row per day from start through end."""
+    holidays = {}
+    for year in range(start.year, end.year + 1):
+        holidays.update(us_federal_holidays(year))
+    rows = []
+    day = start
+    while day <= end:
+        rows.append(date_row(day, holidays, start_month))
+        day += timedelta(days=1)
+    return rows
+
+def dataset_date_range(data_dir: str = '../data') -> Optional[Tuple[date, date]]:
+    """Earliest and latest date in any dated column of the dataset, one shard at a time."""
+    earliest, latest = None, None
+    for table, columns in DATE_COLUMNS.items():
+        for path in table_shards(data_dir, table):
+            for row in load_json_data(path):
+                for column in columns:
+                    if not row.get(column):
+                        continue
+                    day = parse_day(row[column])
+                    earliest = day if earliest is None or day < earliest else earliest
+                    latest = day if latest is None or day > latest else latest
+    return (earliest, latest) if earliest else None
+
+def validate_date_dimension(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Contiguity and key checks for the generated calendar."""
+    days = [parse_day(row['calendar_date']) for row in rows]
+    gaps = sum(1 for a, b in zip(days, days[1:]) if (b - a).days != 1)
+    return {
+        'total_days': len(rows),
+        'first_date': rows[0]['calendar_date'] if rows else None,
+        'last_date': rows[-1]['calendar_date'] if rows else None,
+        'gaps': gaps,
+        'unique_keys': len({row['date_key'] for row in rows}) == len(rows),
+        'business_days': sum(row['is_business_day'] for row in rows),
+        'holidays': sum(row['is_holiday'] for row in rows)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the DIM_DATE calendar dimension covering the dataset.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--start', default=None, help="First date as MM/DD/YYYY (default: Jan 1 of the earliest dataset year)")
+    parser.add_argument('--end', default=None, help="Last date as MM/DD/YYYY (default: Dec 31 of the latest dataset year)")
+    parser.add_argument('--fiscal-start-month', type=int, default=FISCAL_YEAR_START_MONTH,
+                        help="Month the fiscal year starts in (1 = calendar year)")
+    parser.add_argument('--delimited', choices=sorted(DELIMITED_FORMATS), default=None,
+                        help="Also write a CSV or TSV copy for the fast COPY INTO path (csv_output.py)")
+    args = parser.parse_args()
+
+    print("🚀 Generating DIM_DATE...")
+    span = dataset_date_range(args.data_dir)
+    if span is None and not (args.start and args.end):
+        raise SystemExit(f"No dated rows found in {args.data_dir}; pass --start and --end")
+    start = parse_day(args.start) if args.start else date(span[0].year, 1, 1)
+    end = parse_day(args.end) if args.end else date(span[1].year, 12, 31)
+
+    rows = generate_date_dimension(start, end, args.fiscal_start_month)
+    validation = validate_date_dimension(rows)
+    print(f"  Days: {validation['total_days']:,} ({validation['first_date']} - {validation['last_date']})")
+    print(f"  Business days: {validation['business_days']:,}, holidays: {validation['holidays']}")
+    if validation['gaps'] or not validation['unique_keys']:
+        print(f"  ⚠️  {validation['gaps']} gaps, unique keys: {validation['unique_keys']}")
+
+    output_file = os.path.join(args.data_dir, f"{DATE_TABLE}.json")
+    with open(output_file, 'w') as f:
+        json.dump(rows, f, indent=2)
+    print(f"💾 Saved {len(rows):,} days to {output_file}")
+    if args.delimited:
+        delimited_file = delimited_path(output_file, args.delimited)
+        write_delimited(delimited_file, DATE_TABLE.lower(), rows, args.delimited)
+        print(f"💾 Saved {delimited_file}")
+    print("✨ DIM_DATE generation complete!")
+
+if __name__ == "__main__":
+    main()
@@ -6,15 +6,24 @@ This creates realistic framework adoption patterns based on customer industry,
 segment, and compliance maturity, following USA adoption patterns.
 """
 
+import argparse
 import json
 import random
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
+
+from business_rules import EXPECTED_ADOPTION_RATES, evaluate_rules
+from csv_output import DELIMITED_FORMATS
+from customer_snapshot import CustomerSnapshotAccumulator, write_customer_snapshot
+from fact_partitions import FactTableWriter
+from quality_checks import load_table
+from rollups import create_rollups, write_rollups
+from scd_history import ADOPTION_STATUS_TABLE, adoption_status_history, write_history
+from sort_order import SORT_ORDERS
 
 def load_customers() -> List[Dict[str, Any]]:
     """Load customer data."""
-    with open('../data/DIM_CUSTOMERS.json', 'r') as f:
-        return json.load(f)
+    return load_table('../data', 'customers')
 
 def load_frameworks() -> List[Dict[str, Any]]:
     """Load compliance frameworks data."""
@@ -186,6 +195,10 @@ def determine_status(completion_date: datetime) -> str:
         # Completed - decide between completed and certified
         return random.choices(['completed', 'certified'], weights=[0.67, 0.33])[0]
 
+def generate_certification_date(completion_date: datetime) -> datetime:
+    """Certification audit date for a certified adoption: 2-12 weeks after completion, never in the future."""
+    return min(completion_date + timedelta(days=random.randint(14, 84)), datetime.now())
+
 def calculate_audit_score(customer: Dict[str, Any], framework: Dict[str, Any]) -> int:
     """Calculate audit score based on customer maturity and framework complexity."""
     maturity = customer.get('compliance_maturity', 'intermediate')
@@ -276,14 +289,21 @@ def calculate_automation_level(customer: Dict[str, Any], framework: Dict[str, An
     return int(max(0, min(automation_level, 100)))  # Clamp to 0-100
 
 def generate_framework_adoptions(customers: List[Dict[str, Any]], 
-                                frameworks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Generate all framework adoption records."""
-    adoptions = []
+                                frameworks: List[Dict[str, Any]],
+                                accumulators: List[Any],
+                                status_history: Optional[List[Dict[str, Any]]] = None) -> int:
+    """
+    Generate all framework adoption records, handing each customer's batch to
+    every accumulator (rollups, customer snapshot, validation, the fact writer)
+    and appending its SCD2 status versions to status_history; returns the
+    adoption count.
+    """
     adoption_id_counter = 1
     
     for customer in customers:
         # Determine which frameworks this customer adopts
         customer_frameworks = determine_framework_adoptions_for_customer(customer, frameworks)
+        adoptions = []
         
         for framework in customer_frameworks:
             # Generate dates
@@ -304,90 +324,101 @@ def generate_framework_adoptions(customers: List[Dict[str, Any]],
             }
             
             adoptions.append(adoption)
+            if status_history is not None:
+                certified_date = None
+                if adoption['status'] == 'certified':
+                    certified_date = format_date(generate_certification_date(completion_date))
+                status_history.extend(adoption_status_history(adoption, certified_date))
             adoption_id_counter += 1
+        
+        for accumulator in accumulators:
+            accumulator.add_rows(adoptions)
     
-    return adoptions
+    return adoption_id_counter - 1
+
+class AdoptionValidationAccumulator:
+    """Validation of framework adoptions, accumulated batch by batch in one pass."""
+    
+    def __init__(self, customers: List[Dict[str, Any]], frameworks: List[Dict[str, Any]]):
+        self.customer_count = len(customers)
+        self.frameworks = frameworks
+        self.total_adoptions = 0
+        self.framework_counts = {}
+        self.status_counts = {}
+        self.customer_ids = set()
+        self.violations = {}
+    
+    def add_rows(self, adoptions: List[Dict[str, Any]]) -> None:
+        for adoption in adoptions:
+            self.total_adoptions += 1
+            framework_id = adoption['framework_id']
+            self.framework_counts[framework_id] = self.framework_counts.get(framework_id, 0) + 1
+            status = adoption['status']
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            self.customer_ids.add(adoption['customer_id'])
+        # Statuses and date order from the shared rule spec
+        for name, failing in evaluate_rules('adoptions', adoptions).items():
+            self.violations[name] = self.violations.get(name, 0) + len(failing)
+    
+    def result(self) -> Dict[str, Any]:
+        issues = []
+        total_customers = self.customer_count
+        
+        # Framework adoption rate analysis
+        framework_adoption_rates = {}
+        
+        for framework in self.frameworks:
+            framework_id = framework['framework_id']
+            framework_name = framework['framework_name']
+            count = self.framework_counts.get(framework_id, 0)
+            rate = (count / total_customers) * 100
+            framework_adoption_rates[framework_name] = {
+                'count': count,
+                'rate': rate,
+                'expected_min': 0,  # Will be set below
+                'expected_max': 100
+            }
+        
+        # Check expected adoption rates
+        for framework_name, (min_rate, max_rate) in EXPECTED_ADOPTION_RATES.items():
+            if framework_name in framework_adoption_rates:
+                actual_rate = framework_adoption_rates[framework_name]['rate']
+                framework_adoption_rates[framework_name]['expected_min'] = min_rate
+                framework_adoption_rates[framework_name]['expected_max'] = max_rate
+                
+                if actual_rate < min_rate or actual_rate > max_rate:
+                    issues.append(f"{framework_name} adoption rate {actual_rate:.1f}% outside expected range {min_rate}-{max_rate}%")
+        
+        temporal_issues = self.violations.get('completion_after_start', 0)
+        
+        if self.violations.get('status_values'):
+            issues.append(f"{self.violations['status_values']} adoptions have an unknown status")
+        
+        if temporal_issues > 0:
+            issues.append(f"{temporal_issues} adoptions have invalid date sequences")
+        
+        # Customer coverage
+        customers_with_adoptions = len(self.customer_ids)
+        if customers_with_adoptions < total_customers:
+            issues.append(f"{total_customers - customers_with_adoptions} customers have no framework adoptions")
+        
+        return {
+            'total_adoptions': self.total_adoptions,
+            'customers_with_adoptions': customers_with_adoptions,
+            'avg_adoptions_per_customer': self.total_adoptions / total_customers,
+            'framework_adoption_rates': framework_adoption_rates,
+            'status_distribution': self.status_counts,
+            'temporal_issues': temporal_issues,
+            'issues': issues
+        }
 
 def validate_framework_adoptions(adoptions: List[Dict[str, Any]], 
                                 customers: List[Dict[str, Any]], 
                                 frameworks: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Validate framework adoption data quality."""
-    issues = []
-    
-    # Framework adoption rate analysis
-    framework_counts = {}
-    for adoption in adoptions:
-        framework_id = adoption['framework_id']
-        framework_counts[framework_id] = framework_counts.get(framework_id, 0) + 1
-    
-    total_customers = len(customers)
-    framework_adoption_rates = {}
-    
-    for framework in frameworks:
-        framework_id = framework['framework_id']
-        framework_name = framework['framework_name']
-        count = framework_counts.get(framework_id, 0)
-        rate = (count / total_customers) * 100
-        framework_adoption_rates[framework_name] = {
-            'count': count,
-            'rate': rate,
-            'expected_min': 0,  # Will be set below
-            'expected_max': 100
-        }
-    
-    # Check expected adoption rates
-    expected_rates = {
-        'SOC2_Type_I': (90, 98),     # Should be 95% ± variance
-        'SOC2_Type_II': (60, 80),    # Should be 70% ± variance
-        'NIST_CSF': (65, 85),        # Should be 75% ± variance
-        'ISO27001': (30, 50),        # Should be 40% ± variance
-        'GDPR': (25, 45),            # Should be 35% ± variance
-    }
-    
-    for framework_name, (min_rate, max_rate) in expected_rates.items():
-        if framework_name in framework_adoption_rates:
-            actual_rate = framework_adoption_rates[framework_name]['rate']
-            framework_adoption_rates[framework_name]['expected_min'] = min_rate
-            framework_adoption_rates[framework_name]['expected_max'] = max_rate
-            
-            if actual_rate < min_rate or actual_rate > max_rate:
-                issues.append(f"{framework_name} adoption rate {actual_rate:.1f}% outside expected range {min_rate}-{max_rate}%")
-    
-    # Temporal validation
-    temporal_issues = 0
-    for adoption in adoptions:
-        try:
-            start_date = parse_date(adoption['start_date'])
-            completion_date = parse_date(adoption['completion_date'])
-            
-            if completion_date <= start_date:
-                temporal_issues += 1
-        except ValueError:
-            temporal_issues += 1
-    
-    if temporal_issues > 0:
-        issues.append(f"{temporal_issues} adoptions have invalid date sequences")
-    
-    # Customer coverage
-    customers_with_adoptions = len(set(a['customer_id'] for a in adoptions))
-    if customers_with_adoptions < total_customers:
-        issues.append(f"{total_customers - customers_with_adoptions} customers have no framework adoptions")
-    
-    # Status distribution
-    status_counts = {}
-    for adoption in adoptions:
-        status = adoption['status']
-        status_counts[status] = status_counts.get(status, 0) + 1
-    
-    return {
-        'total_adoptions': len(adoptions),
-        'customers_with_adoptions': customers_with_adoptions,
-        'avg_adoptions_per_customer': len(adoptions) / total_customers,
-        'framework_adoption_rates': framework_adoption_rates,
-        'status_distribution': status_counts,
-        'temporal_issues': temporal_issues,
-        'issues': issues
-    }
+    validation = AdoptionValidationAccumulator(customers, frameworks)
+    validation.add_rows(adoptions)
+    return validation.result()
 
 def print_validation_summary(validation: Dict[str, Any]) -> None:
     """Print comprehensive validation summary."""
@@ -425,6 +456,17 @@ def print_validation_summary(validation: Dict[str, Any]) -> None:
         print(f"\n✨ No data quality issues found!")
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate FACT_FRAMEWORK_ADOPTIONS for the generated customers and frameworks.")
+    parser.add_argument('--partitioned', action='store_true',
+                        help="Write one file per month of start_date under FACT_FRAMEWORK_ADOPTIONS/YYYY/MM/")
+    parser.add_argument('--sort-order', choices=SORT_ORDERS, default='generated',
+                        help="Row order of the output: generation order, date, customer, or clustered (month, then customer)")
+    parser.add_argument('--encoded', action='store_true',
+                        help="Write dictionary-encoded files (decode with encoded_output.py --decode before uploading)")
+    parser.add_argument('--delimited', choices=sorted(DELIMITED_FORMATS), default=None,
+                        help="Also write a CSV or TSV copy of each file for the fast COPY INTO path (csv_output.py)")
+    args = parser.parse_args()
+    
     print("🚀 Generating FACT_FRAMEWORK_ADOPTIONS data...")
     
     # Load dependencies
@@ -433,21 +475,41 @@ def main():
     frameworks = load_frameworks()
     print(f"Loaded {len(customers)} customers and {len(frameworks)} frameworks")
     
-    # Generate adoptions
+    # Generate adoptions straight into the validation and the fact writer;
+    # with a sort order the writer spills sorted runs instead of keeping them
     print("🔄 Generating framework adoption patterns...")
-    adoptions = generate_framework_adoptions(customers, frameworks)
-    print(f"Generated {len(adoptions)} framework adoptions")
+    rollups = create_rollups('adoptions', customers, frameworks)
+    snapshot = CustomerSnapshotAccumulator('adoptions', frameworks)
+    validation = AdoptionValidationAccumulator(customers, frameworks)
+    writer = FactTableWriter('../data', 'adoptions', args.partitioned, args.sort_order, args.encoded, args.delimited)
+    status_history = []
+    count = generate_framework_adoptions(customers, frameworks, rollups + [snapshot, validation, writer],
+                                         status_history)
+    print(f"Generated {count} framework adoptions")
     
     # Validate
     print("\n✅ Validating framework adoption data...")
-    validation = validate_framework_adoptions(adoptions, customers, frameworks)
-    print_validation_summary(validation)
+    print_validation_summary(validation.result())
     
-    # Save data
+    # Save data - one file, or one file per month of start_date with --partitioned
     output_file = '../data/FACT_FRAMEWORK_ADOPTIONS.json'
-    print(f"\n💾 Saving {len(adoptions)} adoptions to {output_file}...")
-    with open(output_file, 'w') as f:
-        json.dump(adoptions, f, indent=2)
+    print(f"\n💾 Saving {count} adoptions to {output_file}...")
+    # Each data file gets its row index, sketch and zone map sidecars
+    written = writer.close()
+    if args.partitioned:
+        print(f"  {len(written)} monthly partitions under ../data/FACT_FRAMEWORK_ADOPTIONS/")
+    
+    # Rollups were accumulated during generation - no second pass over the adoptions
+    for name, count in write_rollups(rollups).items():
+        print(f"💾 Saved {count} rows to ../data/{name}.json")
+    
+    # Each customer's adoption state, also captured during generation
+    count = write_customer_snapshot([snapshot], customers)
+    print(f"💾 Saved {count} rows to ../data/DIM_CUSTOMER_SNAPSHOT.json")
+    
+    # Status transitions are only known here - determine_status keeps just the final one
+    count = write_history(ADOPTION_STATUS_TABLE, status_history)
+    print(f"💾 Saved {count} status versions to ../data/{ADOPTION_STATUS_TABLE}.json")
     
     print("🎉 FACT_FRAMEWORK_ADOPTIONS generation complete!")
 
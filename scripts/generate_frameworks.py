@@ -6,9 +6,12 @@ This is static reference data with exactly 8 compliance frameworks
 that Phantom Sec customers typically adopt.
 """
 
+import argparse
 import json
 from typing import List, Dict, Any
 
+from csv_output import DELIMITED_FORMATS, delimited_path, write_delimited
+
 def generate_compliance_frameworks() -> List[Dict[str, Any]]:
     """Generate the 8 compliance framework records with all attributes."""
     
@@ -171,6 +174,11 @@ def print_framework_summary(frameworks: List[Dict[str, Any]]) -> None:
     print("- NIST_CSF: 75% of all companies")
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate DIM_COMPLIANCE_FRAMEWORKS in the current directory.")
+    parser.add_argument('--delimited', choices=sorted(DELIMITED_FORMATS), default=None,
+                        help="Also write a CSV or TSV copy for the fast COPY INTO path (csv_output.py)")
+    args = parser.parse_args()
+
     print("🏗️  Generating DIM_COMPLIANCE_FRAMEWORKS reference data...")
     
     # Generate frameworks
@@ -203,6 +211,10 @@ def main():
         json.dump(frameworks, f, indent=2)
     
     print(f"\n💾 Saved {len(frameworks)} frameworks to {output_file}")
+    if args.delimited:
+        delimited_file = delimited_path(output_file, args.delimited)
+        write_delimited(delimited_file, 'frameworks', frameworks, args.delimited)
+        print(f"💾 Saved {delimited_file}")
     print("✨ DIM_COMPLIANCE_FRAMEWORKS generation complete!")
 
 if __name__ == "__main__":
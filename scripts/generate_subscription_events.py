@@ -9,15 +9,25 @@ Updates:
 4. Maintain proper temporal flow and business logic
 """
 
-import json
+import argparse
 import random
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Tuple
 
+from business_rules import evaluate_rules
+from cohort_retention import build_cohort_retention
+from csv_output import DELIMITED_FORMATS
+from customer_snapshot import CustomerSnapshotAccumulator, write_customer_snapshot
+from fact_partitions import FactTableWriter
+from quality_checks import load_table
+from revenue_snapshots import build_revenue_snapshots
+from rollups import create_rollups, write_rollups
+from scd_history import CUSTOMER_TIER_TABLE, customer_tier_history, write_history
+from sort_order import SORT_ORDERS
+
 def load_customers() -> List[Dict[str, Any]]:
     """Load customer data from DIM_CUSTOMERS_300."""
-    with open('../data/DIM_CUSTOMERS.json', 'r') as f:
-        return json.load(f)
+    return load_table('../data', 'customers')
 
 def parse_date(date_str: str) -> datetime:
     """Parse date from MM/DD/YYYY format."""
@@ -282,95 +292,114 @@ def generate_subscription_lifecycle(customer: Dict[str, Any],
     
     return events, event_id_counter
 
-def validate_subscription_data_comprehensive(events: List[Dict[str, Any]], 
-                                           customers: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Comprehensive validation including contract length analysis."""
+class EventValidationAccumulator:
+    """Validation of subscription events, accumulated batch by batch in one pass."""
+    
+    def __init__(self, customers: List[Dict[str, Any]]):
+        self.customers = customers
+        self.total_events = 0
+        # Per customer: first event, first churn and last event as ((date, arrival), type);
+        # arrival order breaks date ties like a stable sort of the customer's events
+        self.timelines = {}
+        self.contract_lengths = {}
+        self.event_types = {}
+        self.billing_periods = {}
+        self.product_tiers = {}
+        self.total_mrr = 0
+        self.violations = {}
+    
+    def add_rows(self, events: List[Dict[str, Any]]) -> None:
+        for event in events:
+            key = (parse_date(event['event_date']), self.total_events)
+            self.total_events += 1
+            timeline = self.timelines.get(event['customer_id'])
+            if timeline is None:
+                timeline = self.timelines[event['customer_id']] = {'first': None, 'churn': None, 'last': None}
+            if timeline['first'] is None or key < timeline['first'][0]:
+                timeline['first'] = (key, event['event_type'])
+            if timeline['last'] is None or key > timeline['last']:
+                timeline['last'] = key
+            if event['event_type'] == 'churn' and (timeline['churn'] is None or key < timeline['churn']):
+                timeline['churn'] = key
+            
+            # Contract length analysis
+            if event['event_type'] != 'churn':  # Exclude churn events
+                length = event['contract_length_months']
+                self.contract_lengths[length] = self.contract_lengths.get(length, 0) + 1
+            
+            # Summary statistics
+            self.event_types[event['event_type']] = self.event_types.get(event['event_type'], 0) + 1
+            self.billing_periods[event['billing_period']] = self.billing_periods.get(event['billing_period'], 0) + 1
+            self.product_tiers[event['product_tier']] = self.product_tiers.get(event['product_tier'], 0) + 1
+            if event['event_type'] in ['new', 'renewal', 'expansion']:
+                self.total_mrr += event['mrr_amount']
+        
+        # Event types, contract lengths and MRR from the shared rule spec
+        for name, failing in evaluate_rules('events', events).items():
+            self.violations[name] = self.violations.get(name, 0) + len(failing)
     
-    # Group events by customer
-    events_by_customer = {}
-    for event in events:
-        customer_id = event['customer_id']
-        if customer_id not in events_by_customer:
-            events_by_customer[customer_id] = []
-        events_by_customer[customer_id].append(event)
-    
-    # Validation checks
-    issues = []
-    
-    # Check each customer has events
-    customer_ids = {c['customer_id'] for c in customers}
-    customers_with_events = set(events_by_customer.keys())
-    missing_customers = customer_ids - customers_with_events
-    
-    if missing_customers:
-        issues.append(f"{len(missing_customers)} customers have no events")
-    
-    # Check temporal order and first event is 'new'
-    for customer_id, customer_events in events_by_customer.items():
-        # Sort by date
-        sorted_events = sorted(customer_events, 
-                             key=lambda e: parse_date(e['event_date']))
+    def result(self) -> Dict[str, Any]:
+        issues = []
         
-        # Check first event is 'new'
-        if sorted_events[0]['event_type'] != 'new':
-            issues.append(f"Customer {customer_id} first event is not 'new'")
+        # Check each customer has events
+        customer_ids = {c['customer_id'] for c in self.customers}
+        missing_customers = customer_ids - set(self.timelines)
         
-        # Check no events after churn
-        churn_index = None
-        for i, event in enumerate(sorted_events):
-            if event['event_type'] == 'churn':
-                churn_index = i
-                break
+        if missing_customers:
+            issues.append(f"{len(missing_customers)} customers have no events")
         
-        if churn_index is not None and churn_index < len(sorted_events) - 1:
-            issues.append(f"Customer {customer_id} has events after churn")
-    
-    # Contract length analysis
-    contract_lengths = {}
-    for event in events:
-        if event['event_type'] != 'churn':  # Exclude churn events
-            length = event['contract_length_months']
-            contract_lengths[length] = contract_lengths.get(length, 0) + 1
-    
-    # Check for unrealistic contract lengths
-    unrealistic_contracts = 0
-    for event in events:
-        if event['event_type'] != 'churn':
-            length = event['contract_length_months']
-            if length < 12:  # Less than 12 months is unrealistic for compliance tools
-                unrealistic_contracts += 1
-    
-    if unrealistic_contracts > 0:
-        issues.append(f"{unrealistic_contracts} events have unrealistic contract lengths (<12 months)")
-    
-    # Calculate summary statistics
-    event_types = {}
-    billing_periods = {}
-    product_tiers = {}
-    total_mrr = 0
-    
-    for event in events:
-        event_types[event['event_type']] = event_types.get(event['event_type'], 0) + 1
-        billing_periods[event['billing_period']] = billing_periods.get(event['billing_period'], 0) + 1
-        product_tiers[event['product_tier']] = product_tiers.get(event['product_tier'], 0) + 1
+        # Check temporal order and first event is 'new'
+        for customer_id, timeline in self.timelines.items():
+            if timeline['first'][1] != 'new':
+                issues.append(f"Customer {customer_id} first event is not 'new'")
+            
+            # Check no events after churn
+            if timeline['churn'] is not None and timeline['churn'] < timeline['last']:
+                issues.append(f"Customer {customer_id} has events after churn")
         
-        if event['event_type'] in ['new', 'renewal', 'expansion']:
-            total_mrr += event['mrr_amount']
-    
-    return {
-        'total_events': len(events),
-        'customers_with_events': len(events_by_customer),
-        'avg_events_per_customer': len(events) / len(customers),
-        'event_types': event_types,
-        'billing_periods': billing_periods,
-        'product_tiers': product_tiers,
-        'contract_lengths': contract_lengths,
-        'unrealistic_contracts': unrealistic_contracts,
-        'total_mrr': total_mrr,
-        'issues': issues
-    }
+        unrealistic_contracts = self.violations.get('contract_length_by_event_type', 0)
+        
+        if self.violations.get('event_type_values'):
+            issues.append(f"{self.violations['event_type_values']} events have an unknown event_type")
+        
+        if unrealistic_contracts > 0:
+            issues.append(f"{unrealistic_contracts} events have unrealistic contract lengths (<12 months)")
+        
+        if self.violations.get('mrr_amount_range'):
+            issues.append(f"{self.violations['mrr_amount_range']} events have a missing or negative mrr_amount")
+        
+        return {
+            'total_events': self.total_events,
+            'customers_with_events': len(self.timelines),
+            'avg_events_per_customer': self.total_events / len(self.customers),
+            'event_types': self.event_types,
+            'billing_periods': self.billing_periods,
+            'product_tiers': self.product_tiers,
+            'contract_lengths': self.contract_lengths,
+            'unrealistic_contracts': unrealistic_contracts,
+            'total_mrr': self.total_mrr,
+            'issues': issues
+        }
+
+def validate_subscription_data_comprehensive(events: List[Dict[str, Any]], 
+                                           customers: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Comprehensive validation including contract length analysis."""
+    validation = EventValidationAccumulator(customers)
+    validation.add_rows(events)
+    return validation.result()
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate FACT_SUBSCRIPTION_EVENTS for the generated customers.")
+    parser.add_argument('--partitioned', action='store_true',
+                        help="Write one file per month of event_date under FACT_SUBSCRIPTION_EVENTS/YYYY/MM/")
+    parser.add_argument('--sort-order', choices=SORT_ORDERS, default='generated',
+                        help="Row order of the output: generation order, date, customer, or clustered (month, then customer)")
+    parser.add_argument('--encoded', action='store_true',
+                        help="Write dictionary-encoded files (decode with encoded_output.py --decode before uploading)")
+    parser.add_argument('--delimited', choices=sorted(DELIMITED_FORMATS), default=None,
+                        help="Also write a CSV or TSV copy of each file for the fast COPY INTO path (csv_output.py)")
+    args = parser.parse_args()
+    
     print("🚀 Generating FACT_SUBSCRIPTION_EVENTS with realistic contract lengths...")
     
     # Load customers
@@ -378,23 +407,30 @@ def main():
     customers = load_customers()
     print(f"Loaded {len(customers)} customers")
     
-    # Generate events
+    # Generate events straight into the validation and the fact writer;
+    # with a sort order the writer spills sorted runs instead of keeping them
     print("🔄 Generating subscription lifecycle events...")
-    all_events = []
     event_id_counter = 1
+    rollups = create_rollups('events', customers, [])
+    snapshot = CustomerSnapshotAccumulator('events')
+    validation = EventValidationAccumulator(customers)
+    writer = FactTableWriter('../data', 'events', args.partitioned, args.sort_order, args.encoded, args.delimited)
+    tier_history = []
     
     for i, customer in enumerate(customers):
         events, event_id_counter = generate_subscription_lifecycle(customer, event_id_counter)
-        all_events.extend(events)
+        for accumulator in rollups + [snapshot, validation, writer]:
+            accumulator.add_rows(events)
+        tier_history.extend(customer_tier_history(events))
         
         if (i + 1) % 50 == 0:
             print(f"  Processed {i + 1}/{len(customers)} customers...")
     
-    print(f"Generated {len(all_events)} total events")
+    print(f"Generated {writer.row_count} total events")
     
     # Validate
     print("\n✅ Validating subscription data...")
-    validation = validate_subscription_data_comprehensive(all_events, customers)
+    validation = validation.result()
     
     print(f"\n📊 SUBSCRIPTION EVENTS SUMMARY:")
     print(f"Total Events: {validation['total_events']}")
@@ -430,11 +466,33 @@ def main():
     else:
         print(f"\n✨ No data quality issues found!")
     
-    # Save data
+    # Save data - one file, or one file per month of event_date with --partitioned
     output_file = '../data/FACT_SUBSCRIPTION_EVENTS.json'
-    print(f"\n💾 Saving {len(all_events)} events to {output_file}...")
-    with open(output_file, 'w') as f:
-        json.dump(all_events, f, indent=2)
+    print(f"\n💾 Saving {writer.row_count} events to {output_file}...")
+    # In generation order the writer still holds the events for the snapshots
+    # below; otherwise they read back the files just written
+    all_events = writer.rows
+    # Each data file gets its row index, sketch and zone map sidecars
+    written = writer.close()
+    if args.partitioned:
+        print(f"  {len(written)} monthly partitions under ../data/FACT_SUBSCRIPTION_EVENTS/")
+    
+    # Rollups were accumulated during generation - no second pass over the events
+    for name, count in write_rollups(rollups).items():
+        print(f"💾 Saved {count} rows to ../data/{name}.json")
+    
+    # Each customer's final subscription state, also captured during generation
+    count = write_customer_snapshot([snapshot], customers)
+    print(f"💾 Saved {count} rows to ../data/DIM_CUSTOMER_SNAPSHOT.json")
+    count = write_history(CUSTOMER_TIER_TABLE, tier_history)
+    print(f"💾 Saved {count} tier versions to ../data/{CUSTOMER_TIER_TABLE}.json")
+    
+    # Regenerated events replace the old ones, so the snapshots are rebuilt in full
+    snapshots = build_revenue_snapshots('../data', events=all_events, full=True)
+    print(f"💾 Saved {snapshots['daily_rows_written']:,} daily MRR rows and "
+          f"{snapshots['bridge_months']} ARR bridge months")
+    cohort_rows = build_cohort_retention('../data', events=all_events)
+    print(f"💾 Saved {len(cohort_rows):,} cohort retention rows")
     
     print("🎉 FACT_SUBSCRIPTION_EVENTS generation complete!")
     print("📋 Contract lengths are now realistic for B2B SaaS compliance tools!")
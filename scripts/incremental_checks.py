@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+"""
+Incremental quality checks with per-partition result caching.
+
+Fact tables are split into partitions, either one per shard file when a
+table is stored as a directory of shards (e.g. FACT_COMPLIANCE_ACTIVITIES/part-00000.json)
+or one per calendar month of the table's date column when it is a single file.
+Each partition is reduced to a small mergeable accumulator (counts, id sets,
+earliest event per customer, per tier and billing period MRR moments and
+amount histograms) and cached under the partition's content hash.
+
+A rerun only rebuilds accumulators for new or changed partitions, merges them
+with the cached ones and derives the same global report as quality_checks.py.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+from datetime import datetime
+from typing import List, Dict, Any, Tuple, Optional
+
+from business_rules import evaluate_rules
+from quality_checks import (
+    TABLE_FILES,
+    activity_rule_issues,
+    calculate_annualized_amount,
+    finish_quality_run,
+    load_json_data,
+    load_table,
+    validate_dim_customers,
+    validate_dim_frameworks,
+    print_mrr_consistency,
+    print_quality_report,
+    table_paths
+)
+
+# Bump when accumulator contents change so stale cache entries are ignored
+ACCUMULATOR_VERSION = 4
+
+CACHE_DIR_NAME = '.qa_cache'
+
+# Date column used to split each single-file fact table into monthly partitions
+PARTITION_DATE_COLUMNS = {
+    'events': 'event_date',
+    'adoptions': 'start_date',
+    'activities': 'activity_date'
+}
+
+def month_key(date_str: Any) -> str:
+    """Return the YYYY-MM partition key of an MM/DD/YYYY date string."""
+    if isinstance(date_str, str) and len(date_str) == 10:
+        return f"{date_str[6:10]}-{date_str[0:2]}"
+    return 'invalid'
+
+def hash_rows(rows: List[Dict[str, Any]]) -> str:
+    """Content hash of a partition's rows as serialized in file order."""
+    # default=dict serializes lazily decoded rows of encoded files like plain dicts
+    payload = json.dumps(rows, separators=(',', ':'), default=dict)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def hash_file(filepath: str) -> str:
+    """Content hash of a shard file without parsing it."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def table_source(data_dir: str, table: str) -> Tuple[str, bool]:
+    """Return the table's shard directory or single file, and whether it is sharded."""
+    filename = TABLE_FILES[table]
+    shard_dir = os.path.join(data_dir, os.path.splitext(filename)[0])
+    if os.path.isdir(shard_dir):
+        return shard_dir, True
+    # The single file may be plain JSON or dictionary-encoded
+    paths = table_paths(data_dir, filename)
+    return (paths[0] if paths else os.path.join(data_dir, filename)), False
+
+def iter_partitions(data_dir: str, table: str) -> List[Tuple[str, str, Any]]:
+    """
+    List (partition_key, content_hash, rows_or_loader) for a fact table.
+
+    Sharded tables hash each shard file and defer parsing until a partition
+    actually needs to be scanned. Single-file tables are parsed once and split
+    by month of the table's date column.
+    """
+    source, sharded = table_source(data_dir, table)
+
+    if sharded:
+        partitions = []
+        for shard_path in table_paths(data_dir, TABLE_FILES[table]):
+            partitions.append((os.path.basename(shard_path), hash_file(shard_path),
+                               lambda path=shard_path: load_json_data(path)))
+        return partitions
+
+    rows = load_json_data(source)
+    date_column = PARTITION_DATE_COLUMNS[table]
+    by_month = {}
+    for row in rows:
+        by_month.setdefault(month_key(row.get(date_column)), []).append(row)
+
+    return [(key, hash_rows(month_rows), month_rows) for key, month_rows in sorted(by_month.items())]
+
+def add_billing_amount(billing: Dict[str, Any], event: Dict[str, Any]) -> None:
+    """Add one event's MRR to the per tier and billing period stats of the consistency check."""
+    tier = event.get('product_tier', 'unknown')
+    billing_period = event.get('billing_period', 'unknown')
+    mrr_amount = event.get('mrr_amount', 0)
+    annualized_amount = calculate_annualized_amount(mrr_amount, billing_period)
+
+    stats = billing.setdefault(tier, {}).setdefault(billing_period, {'count': 0, 'sum': 0, 'sum_sq': 0, 'amounts': {}})
+    stats['count'] += 1
+    stats['sum'] += annualized_amount
+    stats['sum_sq'] += annualized_amount * annualized_amount
+    # JSON object keys are strings; json.dumps keeps ints and floats apart on the way back
+    amount_key = json.dumps(mrr_amount)
+    stats['amounts'][amount_key] = stats['amounts'].get(amount_key, 0) + 1
+
+def accumulate_events(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reduce one partition of FACT_SUBSCRIPTION_EVENTS to a mergeable accumulator."""
+    event_types = {}
+    contract_lengths = {}
+    first_events = {}
+    mrr_billing = {}
+    violations = evaluate_rules('events', events)
+
+    for event in events:
+        event_type = event.get('event_type', 'unknown')
+        event_types[event_type] = event_types.get(event_type, 0) + 1
+
+        contract_length = event.get('contract_length_months', 0)
+        if event_type != 'churn':
+            key = str(contract_length)
+            contract_lengths[key] = contract_lengths.get(key, 0) + 1
+
+        # Earliest event per customer; ties keep the first row seen, like a stable sort
+        customer_key = str(event.get('customer_id'))
+        event_date = datetime.strptime(event.get('event_date', '01/01/2020'), '%m/%d/%Y').strftime('%Y-%m-%d')
+        if customer_key not in first_events or event_date < first_events[customer_key][0]:
+            first_events[customer_key] = [event_date, event_type]
+
+        # Churn and downgrades are excluded from the MRR billing consistency check
+        if event_type in ['new', 'renewal', 'expansion']:
+            add_billing_amount(mrr_billing, event)
+
+    return {
+        'row_count': len(events),
+        'event_types': event_types,
+        'contract_lengths': contract_lengths,
+        'unrealistic_contracts': len(violations['contract_length_by_event_type']),
+        'invalid_event_types': len(violations['event_type_values']),
+        'negative_mrr': len(violations['mrr_amount_range']),
+        'customer_ids': sorted({e.get('customer_id') for e in events}),
+        'first_events': first_events,
+        'mrr_billing': mrr_billing
+    }
+
+def accumulate_adoptions(adoptions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reduce one partition of FACT_FRAMEWORK_ADOPTIONS to a mergeable accumulator."""
+    framework_counts = {}
+    status_counts = {}
+    violations = evaluate_rules('adoptions', adoptions)
+
+    for adoption in adoptions:
+        framework_key = str(adoption.get('framework_id'))
+        framework_counts[framework_key] = framework_counts.get(framework_key, 0) + 1
+
+        status = adoption.get('status', 'unknown')
+        status_counts[status] = status_counts.get(status, 0) + 1
+
+    return {
+        'row_count': len(adoptions),
+        'framework_counts': framework_counts,
+        'status_counts': status_counts,
+        'invalid_statuses': len(violations['status_values']),
+        'temporal_issues': len(violations['completion_after_start']),
+        'customer_ids': sorted({a.get('customer_id') for a in adoptions}),
+        'adoption_ids': sorted({a.get('adoption_id') for a in adoptions}),
+        'framework_ids': sorted({a.get('framework_id') for a in adoptions})
+    }
+
+def accumulate_activities(activities: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reduce one partition of FACT_COMPLIANCE_ACTIVITIES to a mergeable accumulator."""
+    activity_types = {}
+    for activity in activities:
+        activity_type = activity.get('activity_type', 'unknown')
+        activity_types[activity_type] = activity_types.get(activity_type, 0) + 1
+
+    return {
+        'row_count': len(activities),
+        'activity_types': activity_types,
+        'rule_violations': {name: len(failing) for name, failing in evaluate_rules('activities', activities).items()},
+        'automated_count': sum(1 for a in activities if a.get('automated_flag', False)),
+        'successful_count': sum(1 for a in activities if a.get('success_flag', False)),
+        'customer_ids': sorted({a.get('customer_id') for a in activities}),
+        'adoption_ids': sorted({a.get('adoption_id') for a in activities}),
+        'framework_ids': sorted({a.get('framework_id') for a in activities})
+    }
+
+ACCUMULATORS = {
+    'events': accumulate_events,
+    'adoptions': accumulate_adoptions,
+    'activities': accumulate_activities
+}
+
+def merge_counts(target: Dict[str, int], source: Dict[str, int]) -> None:
+    """Add one count dictionary into another."""
+    for key, count in source.items():
+        target[key] = target.get(key, 0) + count
+
+def merge_billing_stats(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    """Merge per tier and billing period MRR stats: moments add up, histograms merge."""
+    for tier, periods in source.items():
+        for billing_period, stats in periods.items():
+            merged = target.setdefault(tier, {}).setdefault(billing_period,
+                                                            {'count': 0, 'sum': 0, 'sum_sq': 0, 'amounts': {}})
+            for moment in ('count', 'sum', 'sum_sq'):
+                merged[moment] += stats[moment]
+            merge_counts(merged['amounts'], stats['amounts'])
+
+def merge_accumulators(table: str, accumulators: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-partition accumulators of one table into a global accumulator."""
+    merged = {'row_count': 0}
+    id_sets = {}
+
+    for acc in accumulators:
+        for key, value in acc.items():
+            if key == 'first_events':
+                first_events = merged.setdefault('first_events', {})
+                for customer_key, (event_date, event_type) in value.items():
+                    if customer_key not in first_events or event_date < first_events[customer_key][0]:
+                        first_events[customer_key] = [event_date, event_type]
+            elif key == 'mrr_billing':
+                merge_billing_stats(merged.setdefault('mrr_billing', {}), value)
+            elif key.endswith('_ids'):
+                id_sets.setdefault(key, set()).update(value)
+            elif isinstance(value, dict):
+                merge_counts(merged.setdefault(key, {}), value)
+            else:
+                merged[key] = merged.get(key, 0) + value
+
+    merged.update(id_sets)
+    return merged
+
+def cache_path(data_dir: str, table: str) -> str:
+    """Location of a table's partition cache."""
+    return os.path.join(data_dir, CACHE_DIR_NAME, f"{table}.json")
+
+def load_cache(data_dir: str, table: str) -> Dict[str, Any]:
+    """Load a table's partition cache, discarding it if written by another accumulator version."""
+    try:
+        with open(cache_path(data_dir, table), 'r') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if cache.get('version') != ACCUMULATOR_VERSION:
+        return {}
+    return cache
+
+def save_cache(data_dir: str, table: str, partitions: Dict[str, Any], source_hash: Optional[str]) -> None:
+    """Persist a table's partition cache atomically."""
+    path = cache_path(data_dir, table)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': ACCUMULATOR_VERSION, 'source_hash': source_hash, 'partitions': partitions}, f)
+    os.replace(tmp_path, path)
+
+def accumulate_table(data_dir: str, table: str) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """
+    Build the global accumulator of a fact table, rescanning only partitions
+    whose content hash is not in the cache.
+
+    For single-file tables the whole file is hashed first; if it is unchanged
+    the cached partitions are reused without parsing the file at all.
+    """
+    cache = load_cache(data_dir, table)
+    cached = cache.get('partitions', {})
+    source, sharded = table_source(data_dir, table)
+    source_hash = None if sharded or not os.path.exists(source) else hash_file(source)
+
+    if source_hash and source_hash == cache.get('source_hash'):
+        stats = {'partitions': len(cached), 'scanned': 0, 'reused': len(cached)}
+        return merge_accumulators(table, [p['accumulator'] for p in cached.values()]), stats
+
+    partitions = {}
+    stats = {'partitions': 0, 'scanned': 0, 'reused': 0}
+
+    for key, content_hash, rows in iter_partitions(data_dir, table):
+        stats['partitions'] += 1
+        entry = cached.get(key)
+        if entry and entry['hash'] == content_hash:
+            partitions[key] = entry
+            stats['reused'] += 1
+            continue
+
+        if callable(rows):
+            rows = rows()
+        partitions[key] = {'hash': content_hash, 'accumulator': ACCUMULATORS[table](rows)}
+        stats['scanned'] += 1
+
+    # Partitions that disappeared are dropped from the cache as well
+    save_cache(data_dir, table, partitions, source_hash)
+    merged = merge_accumulators(table, [p['accumulator'] for p in partitions.values()])
+    return merged, stats
+
+def report_events(acc: Dict[str, Any], customer_ids: set, total_customers: int) -> Dict[str, Any]:
+    """Derive the FACT_SUBSCRIPTION_EVENTS validation from its merged accumulator."""
+    if not acc['row_count']:
+        return {'error': 'No subscription events data loaded'}
+
+    issues = []
+    missing_customers = customer_ids - acc['customer_ids']
+    if missing_customers:
+        issues.append(f"{len(missing_customers)} customers have no subscription events")
+
+    if acc['invalid_event_types'] > 0:
+        issues.append(f"{acc['invalid_event_types']} events have an unknown event_type")
+
+    if acc['unrealistic_contracts'] > 0:
+        issues.append(f"{acc['unrealistic_contracts']} events have unrealistic contract lengths (<12 months)")
+
+    if acc['negative_mrr'] > 0:
+        issues.append(f"{acc['negative_mrr']} events have a missing or negative mrr_amount")
+
+    invalid_first_events = sum(1 for _, event_type in acc['first_events'].values() if event_type != 'new')
+    if invalid_first_events > 0:
+        issues.append(f"{invalid_first_events} customers don't have 'new' as their first event")
+
+    return {
+        'table': 'FACT_SUBSCRIPTION_EVENTS',
+        'total_records': acc['row_count'],
+        'customers_with_events': len(acc['customer_ids']),
+        'avg_events_per_customer': acc['row_count'] / total_customers if total_customers else 0,
+        'event_types': acc['event_types'],
+        'contract_lengths': {int(k): v for k, v in acc['contract_lengths'].items()},
+        'unrealistic_contracts': acc['unrealistic_contracts'],
+        'invalid_event_types': acc['invalid_event_types'],
+        'negative_mrr': acc['negative_mrr'],
+        'issues': issues
+    }
+
+def amount_stats(moments: Dict[str, float], annualized: List[Tuple[float, int]]) -> Dict[str, Any]:
+    """count/mean/median/min/max/std_dev like the full check, from moments and a sorted (amount, count) histogram."""
+    count = moments['count']
+    mean = moments['sum'] / count
+    # Sample standard deviation from the sum of squares, as statistics.stdev computes it
+    variance = (moments['sum_sq'] - moments['sum'] * mean) / (count - 1) if count > 1 else 0
+    return {
+        'count': count,
+        'mean': mean,
+        'median': histogram_median(annualized, count),
+        'min': annualized[0][0],
+        'max': annualized[-1][0],
+        'std_dev': math.sqrt(max(variance, 0))
+    }
+
+def histogram_median(annualized: List[Tuple[float, int]], count: int) -> float:
+    """Median of a sorted (amount, count) histogram, averaging the middle pair for even counts."""
+    middle = []
+    seen = 0
+    for amount, amount_count in annualized:
+        # 0-based positions of the middle value(s): (count - 1) // 2 and count // 2
+        for position in {(count - 1) // 2, count // 2}:
+            if seen <= position < seen + amount_count:
+                middle.append(amount)
+        seen += amount_count
+    return sum(middle) / len(middle) if len(middle) > 1 else middle[0]
+
+def report_mrr_billing(acc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Derive the MRR billing consistency check from the merged per tier and
+    billing period stats: means and standard deviations from the moments,
+    medians and >3 std dev outliers from the amount histograms.
+
+    Histograms do not keep row ids, so outliers carry event_id and
+    customer_id None; everything else matches the full check.
+    """
+    results = {
+        'tier_consistency': {},
+        'billing_period_stats': {},
+        'outliers': [],
+        'issues': []
+    }
+
+    for tier, periods in acc.get('mrr_billing', {}).items():
+        tier_stats = {}
+        tier_moments = {'count': 0, 'sum': 0, 'sum_sq': 0}
+        tier_amounts = {}
+        by_period = {}
+        for billing_period, stats in periods.items():
+            annualized = {}
+            for amount_key, amount_count in stats['amounts'].items():
+                mrr_amount = json.loads(amount_key)
+                annualized_amount = calculate_annualized_amount(mrr_amount, billing_period)
+                annualized[annualized_amount] = annualized.get(annualized_amount, 0) + amount_count
+                by_period.setdefault(billing_period, []).append((mrr_amount, annualized_amount, amount_count))
+            tier_stats[billing_period] = amount_stats(stats, sorted(annualized.items()))
+            for moment in tier_moments:
+                tier_moments[moment] += stats[moment]
+            merge_counts(tier_amounts, annualized)
+
+        tier_overall = amount_stats(tier_moments, sorted(tier_amounts.items()))
+
+        # Check for consistency across billing periods
+        billing_means = [stats['mean'] for stats in tier_stats.values()]
+        mean_variance = 1.0
+        if len(billing_means) > 1:
+            mean_variance = max(billing_means) / min(billing_means) if min(billing_means) > 0 else 0
+            if mean_variance > 1.2:  # More than 20% variance is concerning
+                results['issues'].append(
+                    f"High variance in {tier} tier across billing periods: {mean_variance:.2f}x difference"
+                )
+
+        results['tier_consistency'][tier] = {
+            'overall': tier_overall,
+            'by_billing_period': tier_stats,
+            'billing_period_variance': mean_variance
+        }
+
+        # Outliers (amounts > 3 standard deviations from the tier mean)
+        mean_amount, std_amount = tier_overall['mean'], tier_overall['std_dev']
+        if tier_overall['count'] > 1 and std_amount > 0:
+            for billing_period, amounts in by_period.items():
+                for mrr_amount, annualized_amount, amount_count in amounts:
+                    z_score = abs(annualized_amount - mean_amount) / std_amount
+                    if z_score > 3:
+                        results['outliers'].extend({
+                            'event_id': None,
+                            'customer_id': None,
+                            'tier': tier,
+                            'billing_period': billing_period,
+                            'original_amount': mrr_amount,
+                            'annualized_amount': annualized_amount,
+                            'z_score': z_score,
+                            'tier_mean': mean_amount
+                        } for _ in range(amount_count))
+
+    if results['outliers']:
+        results['issues'].append(f"Found {len(results['outliers'])} outlier amounts (>3 std dev from tier mean)")
+
+    return results
+
+def report_adoptions(acc: Dict[str, Any], customer_ids: set, total_customers: int) -> Dict[str, Any]:
+    """Derive the FACT_FRAMEWORK_ADOPTIONS validation from its merged accumulator."""
+    if not acc['row_count']:
+        return {'error': 'No framework adoptions data loaded'}
+
+    issues = []
+    missing_customers = customer_ids - acc['customer_ids']
+    if missing_customers:
+        issues.append(f"{len(missing_customers)} customers have no framework adoptions")
+
+    if acc['invalid_statuses'] > 0:
+        issues.append(f"{acc['invalid_statuses']} adoptions have an unknown status")
+
+    if acc['temporal_issues'] > 0:
+        issues.append(f"{acc['temporal_issues']} adoptions have invalid date sequences")
+
+    return {
+        'table': 'FACT_FRAMEWORK_ADOPTIONS',
+        'total_records': acc['row_count'],
+        'customers_with_adoptions': len(acc['customer_ids']),
+        'avg_adoptions_per_customer': acc['row_count'] / total_customers if total_customers else 0,
+        'framework_counts': {int(k): v for k, v in acc['framework_counts'].items()},
+        'status_distribution': acc['status_counts'],
+        'invalid_statuses': acc['invalid_statuses'],
+        'temporal_issues': acc['temporal_issues'],
+        'issues': issues
+    }
+
+def report_activities(acc: Dict[str, Any], adoption_acc: Dict[str, Any], total_customers: int) -> Dict[str, Any]:
+    """Derive the FACT_COMPLIANCE_ACTIVITIES validation from its merged accumulator."""
+    total_activities = acc['row_count']
+    if not total_activities:
+        return {'error': 'No compliance activities data loaded'}
+
+    issues = []
+    automation_rate = acc['automated_count'] / total_activities
+    success_rate = acc['successful_count'] / total_activities
+
+    if automation_rate > 0.8:
+        issues.append(f"Automation rate unusually high: {automation_rate:.1%}")
+    if success_rate < 0.7 or success_rate > 0.95:
+        issues.append(f"Success rate outside expected range: {success_rate:.1%}")
+    issues.extend(activity_rule_issues(acc['rule_violations']))
+
+    orphaned_activities = acc['adoption_ids'] - adoption_acc.get('adoption_ids', set())
+    if orphaned_activities:
+        issues.append(f"{len(orphaned_activities)} activities reference non-existent adoptions")
+
+    total_adoptions = adoption_acc['row_count']
+    return {
+        'table': 'FACT_COMPLIANCE_ACTIVITIES',
+        'total_records': total_activities,
+        'unique_customers': len(acc['customer_ids']),
+        'unique_adoptions': len(acc['adoption_ids']),
+        'activities_per_customer': total_activities / total_customers if total_customers else 0,
+        'activities_per_adoption': total_activities / total_adoptions if total_adoptions else 0,
+        'activity_types': acc['activity_types'],
+        'automation_rate': automation_rate,
+        'success_rate': success_rate,
+        'rule_violations': acc['rule_violations'],
+        'issues': issues
+    }
+
+def report_foreign_keys(customer_ids: set, framework_ids: set,
+                        accs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Derive the foreign key validation from the merged id sets."""
+    issues = []
+    empty = set()
+    events, adoptions, activities = accs['events'], accs['adoptions'], accs['activities']
+
+    orphans = {
+        'orphaned_events': (events.get('customer_ids', empty) - customer_ids,
+                            "subscription events reference non-existent customers"),
+        'orphaned_adoptions': (adoptions.get('customer_ids', empty) - customer_ids,
+                               "framework adoptions reference non-existent customers"),
+        'orphaned_activity_customers': (activities.get('customer_ids', empty) - customer_ids,
+                                        "activities reference non-existent customers"),
+        'orphaned_adoption_frameworks': (adoptions.get('framework_ids', empty) - framework_ids,
+                                         "adoptions reference non-existent frameworks"),
+        'orphaned_activity_frameworks': (activities.get('framework_ids', empty) - framework_ids,
+                                         "activities reference non-existent frameworks"),
+        'orphaned_activity_adoptions': (activities.get('adoption_ids', empty) - adoptions.get('adoption_ids', empty),
+                                        "activities reference non-existent adoptions")
+    }
+
+    for orphaned, message in orphans.values():
+        if orphaned:
+            issues.append(f"{len(orphaned)} {message}")
+
+    if len(framework_ids) != 8:
+        issues.append(f"Framework IDs not sequential 1-8: {sorted(framework_ids)}")
+
+    result = {
+        'foreign_key_checks': 'All table relationships',
+        'customer_ids_in_customers': len(customer_ids),
+        'customer_ids_in_events': len(events.get('customer_ids', empty)),
+        'customer_ids_in_adoptions': len(adoptions.get('customer_ids', empty)),
+        'customer_ids_in_activities': len(activities.get('customer_ids', empty)),
+        'framework_ids': sorted(framework_ids),
+        'issues': issues
+    }
+    result.update({name: len(orphaned) for name, (orphaned, _) in orphans.items()})
+    return result
+
+def run_incremental_checks(data_dir: str = '../data') -> Dict[str, Any]:
+    """Run all table validations, scanning only new or changed fact partitions."""
+    customers = load_table(data_dir, 'customers')
+    frameworks = load_json_data(os.path.join(data_dir, TABLE_FILES['frameworks']))
+    customer_ids = {c.get('customer_id') for c in customers}
+    framework_ids = {f.get('framework_id') for f in frameworks}
+
+    accs = {}
+    partition_stats = {}
+    for table in ACCUMULATORS:
+        accs[table], partition_stats[table] = accumulate_table(data_dir, table)
+
+    results = {
+        'dim_customers': validate_dim_customers(customers),
+        'dim_frameworks': validate_dim_frameworks(frameworks),
+        'fact_subscription_events': report_events(accs['events'], customer_ids, len(customers)),
+        'fact_framework_adoptions': report_adoptions(accs['adoptions'], customer_ids, len(customers)),
+        'fact_compliance_activities': report_activities(accs['activities'], accs['adoptions'], len(customers)),
+        'foreign_keys': report_foreign_keys(customer_ids, framework_ids, accs),
+        'mrr_billing_consistency': report_mrr_billing(accs['events'])
+    }
+
+    return {
+        'data_dir': data_dir,
+        'tables': {'customers': len(customers), 'frameworks': len(frameworks),
+                   **{table: acc['row_count'] for table, acc in accs.items()}},
+        'results': results,
+        'timings': {},
+        'partition_stats': partition_stats
+    }
+
+def print_partition_stats(partition_stats: Dict[str, Dict[str, int]]) -> None:
+    """Print how many partitions were rescanned versus reused from cache."""
+    print("\n🗂️  PARTITION CACHE")
+    print("-" * 30)
+    for table, stats in partition_stats.items():
+        print(f"  {table}: {stats['scanned']} scanned, {stats['reused']} reused "
+              f"({stats['partitions']} partitions)")
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Run incremental data quality checks with partition caching.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    args = parser.parse_args(argv)
+
+    print("🚀 Running incremental data quality checks...")
+    run = run_incremental_checks(args.data_dir)
+
+    if not run['tables']['customers']:
+        print("❌ Could not load customer data. Exiting.")
+        return run
+
+    validations = [result for name, result in run['results'].items() if name != 'mrr_billing_consistency']
+    print_quality_report(validations)
+    print_mrr_consistency(run['results']['mrr_billing_consistency'])
+    print_partition_stats(run['partition_stats'])
+    return run
+
+if __name__ == "__main__":
+    finish_quality_run(main())
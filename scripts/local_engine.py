@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Embedded SQL engine stand-in for the Snowflake Bronze layer.
+
+Reads the CREATE TABLE definitions and COPY INTO projections from
+queries/snowflake_setup.sql, creates the same tables in DuckDB (or the
+standard-library sqlite3 when duckdb is not installed) and loads the
+generated JSON files with the same per-column casts and date formats.
+"""
+
+import os
+import re
+from typing import List, Dict, Any, Optional, Tuple
+
+from quality_checks import ENCODED_SUFFIX, TABLE_FILES, load_json_data, table_paths
+from rollups import ROLLUP_SPECS
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+SETUP_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'queries', 'snowflake_setup.sql')
+DERIVED_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'queries', 'derived_tables.sql')
+
+# Snowflake table name -> table key used by the checks
+SNOWFLAKE_TABLES = {os.path.splitext(filename)[0]: table for table, filename in TABLE_FILES.items()}
+
+CREATE_TABLE_PATTERN = re.compile(r'CREATE OR REPLACE TABLE (\w+) \((.*?)\n\);', re.S)
+COPY_INTO_PATTERN = re.compile(r'COPY INTO (\w+)\s+FROM \(\s*SELECT(.*?)\bFROM @', re.S)
+CAST_PATTERN = re.compile(r'^\$1:(\w+)::(\w+(?:\(\d+(?:,\d+)?\))?)$')
+FOREIGN_KEY_PATTERN = re.compile(r'^FOREIGN KEY \((\w+)\) REFERENCES (\w+)\((\w+)\)$')
+TO_DATE_PATTERN = re.compile(r"^TO_DATE\(\$1:(\w+)::VARCHAR, '([^']+)'\)$")
+
+# Derived tables aggregated over customers -> additive columns that grow with the data
+DERIVED_MEASURES = {
+    **{name: [column for column, _, _ in spec['measures']] for name, spec in ROLLUP_SPECS.items()},
+    'FACT_ARR_BRIDGE': ['starting_arr', 'new_arr', 'reactivation_arr', 'expansion_arr', 'contraction_arr',
+                        'churned_arr', 'ending_arr', 'starting_customers', 'new_customers',
+                        'churned_customers', 'ending_customers'],
+    'FACT_COHORT_RETENTION': ['cohort_customers', 'retained_customers', 'starting_mrr', 'retained_mrr',
+                              'gross_retained_mrr']
+}
+
+# Snowflake date format elements -> strptime directives
+DATE_FORMAT_ELEMENTS = [('YYYY', '%Y'), ('MM', '%m'), ('DD', '%d')]
+
+def parse_setup_sql(sql_path: str = SETUP_SQL) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse table definitions and load projections from the Snowflake setup script.
+
+    Returns {table_key: {'name', 'columns': [(column, type)], 'primary_key',
+    'not_null': [column], 'foreign_keys': [(column, parent_table, parent_column)],
+    'projections': [(column, source_field, cast_type, date_format)]}}. COPY INTO projections
+    are positional, so each one is paired with the target column in the same
+    position (e.g. $1:state_province loads headquarters_state).
+    """
+    with open(sql_path, 'r') as f:
+        sql = f.read()
+
+    tables = {}
+    for name, body in CREATE_TABLE_PATTERN.findall(sql):
+        columns = []
+        primary_key = None
+        not_null = []
+        foreign_keys = []
+        for line in body.split('\n'):
+            line = line.strip().rstrip(',')
+            foreign_key = FOREIGN_KEY_PATTERN.match(line)
+            if foreign_key:
+                foreign_keys.append(foreign_key.groups())
+                continue
+            if not line or line.startswith('PRIMARY KEY'):
+                continue
+            parts = line.split()
+            columns.append((parts[0], parts[1]))
+            if 'PRIMARY KEY' in line:
+                primary_key = parts[0]
+            if 'NOT NULL' in line or 'PRIMARY KEY' in line:
+                not_null.append(parts[0])
+        tables[SNOWFLAKE_TABLES.get(name, name.lower())] = {
+            'name': name, 'columns': columns, 'primary_key': primary_key, 'not_null': not_null,
+            'foreign_keys': foreign_keys, 'projections': []
+        }
+
+    for name, select_list in COPY_INTO_PATTERN.findall(sql):
+        table = tables[SNOWFLAKE_TABLES.get(name, name.lower())]
+        expressions = [expr.strip() for expr in select_list.strip().split(',\n')]
+        if len(expressions) != len(table['columns']):
+            raise ValueError(f"COPY INTO {name} projects {len(expressions)} values for {len(table['columns'])} columns")
+        for (column, column_type), expression in zip(table['columns'], expressions):
+            date_match = TO_DATE_PATTERN.match(expression)
+            cast_match = CAST_PATTERN.match(expression)
+            if date_match:
+                table['projections'].append((column, date_match.group(1), 'DATE', date_match.group(2)))
+            elif cast_match:
+                table['projections'].append((column, cast_match.group(1), cast_match.group(2), None))
+            else:
+                raise ValueError(f"Unsupported COPY INTO projection for {name}.{column}: {expression}")
+    return tables
+
+def strptime_format(snowflake_format: str) -> str:
+    """Translate a Snowflake date format such as MM/DD/YYYY to strptime directives."""
+    fmt = snowflake_format
+    for element, directive in DATE_FORMAT_ELEMENTS:
+        fmt = fmt.replace(element, directive)
+    return fmt
+
+def sqlite_type(snowflake_type: str) -> str:
+    """Storage type for a Snowflake column type in sqlite."""
+    base = snowflake_type.split('(')[0].upper()
+    if base in ('INTEGER', 'BOOLEAN'):
+        return 'INTEGER'
+    if base in ('DECIMAL', 'NUMBER', 'FLOAT'):
+        return 'REAL'
+    return 'TEXT'
+
+def sqlite_date_expression(value: str, snowflake_format: str) -> str:
+    """
+    ISO date from a fixed-width formatted string, NULL when the value does not
+    match the format (sqlite has no strptime).
+    """
+    pattern = snowflake_format
+    for element in ('YYYY', 'MM', 'DD'):
+        pattern = pattern.replace(element, '[0-9]' * len(element))
+    parts = []
+    for element in ('YYYY', 'MM', 'DD'):
+        position = snowflake_format.index(element) + 1
+        parts.append(f"substr({value}, {position}, {len(element)})")
+    iso_date = " || '-' || ".join(parts)
+    return (f"CASE WHEN length({value}) = {len(snowflake_format)} AND {value} GLOB '{pattern}' "
+            f"THEN {iso_date} END")
+
+def cast_expression(engine: str, value: str, cast_type: str, date_format: Optional[str]) -> str:
+    """Engine-specific expression applying one COPY INTO cast to a staged value."""
+    if date_format:
+        if engine == 'duckdb':
+            return f"CAST(TRY_STRPTIME({value}, '{strptime_format(date_format)}') AS DATE)"
+        return sqlite_date_expression(value, date_format)
+    if engine == 'duckdb':
+        return f"CAST({value} AS {cast_type})"
+    return f"CAST({value} AS {sqlite_type(cast_type)})"
+
+class SqliteMedian:
+    """MEDIAN aggregate for sqlite connections."""
+
+    def __init__(self):
+        self.values = []
+
+    def step(self, value):
+        if value is not None:
+            self.values.append(value)
+
+    def finalize(self):
+        if not self.values:
+            return None
+        values = sorted(self.values)
+        middle = len(values) // 2
+        if len(values) % 2:
+            return values[middle]
+        return (values[middle - 1] + values[middle]) / 2
+
+def connect(engine: str = 'auto', database: str = ':memory:') -> Tuple[Any, str]:
+    """
+    Open a connection ('auto' prefers duckdb and falls back to sqlite3).
+
+    The default in-memory database suits QA runs; pass a file path for
+    datasets too large to hold in memory (e.g. high benchmark scale factors).
+    """
+    if engine in ('auto', 'duckdb') and duckdb is not None:
+        return duckdb.connect(database), 'duckdb'
+    if engine == 'duckdb':
+        raise RuntimeError("duckdb is not installed (pip install duckdb) - use --engine sqlite")
+    import sqlite3
+    conn = sqlite3.connect(database)
+    # Semantic view metrics use MEDIAN, which sqlite lacks
+    conn.create_aggregate('MEDIAN', 1, SqliteMedian)
+    return conn, 'sqlite'
+
+def table_sources(data_dir: str, table: str) -> List[str]:
+    """JSON files for a table: every shard of <TABLE>/ or the single <TABLE>.json."""
+    # Derived tables are keyed by their lowercased Snowflake name
+    return table_paths(data_dir, TABLE_FILES.get(table, f"{table.upper()}.json"))
+
+def create_tables(conn: Any, engine: str, schema: Dict[str, Dict[str, Any]]) -> None:
+    """Create the Bronze tables (without constraints, so QA can see violations)."""
+    for definition in schema.values():
+        if engine == 'duckdb':
+            columns = ', '.join(f"{column} {column_type}" for column, column_type in definition['columns'])
+        else:
+            columns = ', '.join(f"{column} {sqlite_type(column_type)}" for column, column_type in definition['columns'])
+        conn.execute(f"DROP TABLE IF EXISTS {definition['name']}")
+        conn.execute(f"CREATE TABLE {definition['name']} ({columns})")
+
+def load_table(conn: Any, engine: str, definition: Dict[str, Any], paths: List[str]) -> int:
+    """Stage raw JSON values and insert them into the typed table through the casts."""
+    projections = definition['projections']
+    fields = [field for _, field, _, _ in projections]
+    staging = f"STG_{definition['name']}"
+    select_list = ', '.join(
+        cast_expression(engine, field, cast_type, date_format)
+        for _, field, cast_type, date_format in projections
+    )
+    target_columns = ', '.join(column for column, _, _, _ in projections)
+
+    # read_json only reads plain JSON; encoded files go through the row-by-row path
+    if engine == 'duckdb' and not any(path.endswith(ENCODED_SUFFIX) for path in paths):
+        # read_json with every field typed VARCHAR so the casts match COPY INTO
+        columns = '{' + ', '.join(f"'{field}': 'VARCHAR'" for field in fields) + '}'
+        files = '[' + ', '.join("'" + path.replace("'", "''") + "'" for path in paths) + ']'
+        conn.execute(f"CREATE OR REPLACE TEMP TABLE {staging} AS "
+                     f"SELECT * FROM read_json({files}, format = 'array', columns = {columns})")
+    else:
+        conn.execute(f"DROP TABLE IF EXISTS {staging}")
+        conn.execute(f"CREATE TEMP TABLE {staging} ({', '.join(fields)})")
+        placeholders = ', '.join('?' for _ in fields)
+        for path in paths:
+            rows = load_json_data(path)
+            conn.executemany(f"INSERT INTO {staging} VALUES ({placeholders})",
+                             [tuple(row.get(field) for field in fields) for row in rows])
+
+    conn.execute(f"INSERT INTO {definition['name']} ({target_columns}) SELECT {select_list} FROM {staging}")
+    conn.execute(f"DROP TABLE {staging}")
+    if engine == 'sqlite' and definition['primary_key']:
+        # Plain (non-unique) index so key lookups in FK checks don't scan,
+        # while duplicate keys still load and stay visible to QA
+        conn.execute(f"CREATE INDEX IF NOT EXISTS IX_{definition['name']} "
+                     f"ON {definition['name']} ({definition['primary_key']})")
+    return conn.execute(f"SELECT COUNT(*) FROM {definition['name']}").fetchone()[0]
+
+def window_sources(data_dir: str, table: str, date_range: Optional[Tuple[str, str]] = None) -> List[str]:
+    """table_sources, minus the shards whose zone maps rule out the inclusive ISO date_range."""
+    if date_range is None:
+        return table_sources(data_dir, table)
+    from zone_maps import prune_shards
+    return prune_shards(data_dir, table, *date_range)[0]
+
+def load_dataset(data_dir: str = '../data', engine: str = 'auto', sql_path: str = SETUP_SQL,
+                 database: str = ':memory:', date_range: Optional[Tuple[str, str]] = None) -> Tuple[Any, str, Dict[str, int]]:
+    """
+    Create and load every Bronze table; returns (connection, engine, row counts).
+
+    With date_range, fact shards outside the window are not read.
+    """
+    schema = parse_setup_sql(sql_path)
+    conn, engine = connect(engine, database)
+    create_tables(conn, engine, schema)
+    row_counts = {}
+    for table, definition in schema.items():
+        paths = window_sources(data_dir, table, date_range)
+        row_counts[table] = load_table(conn, engine, definition, paths) if paths else 0
+    return conn, engine, row_counts
+
+def load_derived_tables(conn: Any, engine: str, data_dir: str = '../data', sql_path: str = DERIVED_SQL,
+                        date_range: Optional[Tuple[str, str]] = None) -> Dict[str, int]:
+    """Create the derived tables and load those whose files exist; missing ones stay empty."""
+    schema = parse_setup_sql(sql_path)
+    create_tables(conn, engine, schema)
+    row_counts = {}
+    for table, definition in schema.items():
+        paths = window_sources(data_dir, table, date_range)
+        row_counts[table] = load_table(conn, engine, definition, paths) if paths else 0
+    return row_counts
+
+def scale_dataset(conn: Any, schema: Dict[str, Dict[str, Any]], factor: int,
+                  reference_tables: Tuple[str, ...] = ('frameworks',),
+                  derived: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, int]:
+    """
+    Grow a loaded dataset to `factor` times its size in place.
+
+    Every non-reference table is cloned factor - 1 times. Each copy offsets its
+    primary key, and any foreign key into another cloned table, by that
+    table's max key, so copy k is a self-consistent replica of the original.
+    Reference data such as the framework catalog is shared by all copies.
+
+    With derived (the parsed derived table DDL, already loaded), the derived
+    tables are grown to match: per-customer tables are cloned with the same
+    key offsets, and the additive DERIVED_MEASURES of the rollups, ARR
+    bridge and cohort retention are multiplied by the factor.
+    """
+    scaled = {table: definition for table, definition in schema.items() if table not in reference_tables}
+    offsets = {}
+    for definition in scaled.values():
+        key = definition['primary_key']
+        offsets[definition['name']] = conn.execute(f"SELECT COALESCE(MAX({key}), 0) FROM {definition['name']}").fetchone()[0]
+
+    if factor > 1:
+        conn.execute("DROP TABLE IF EXISTS SCALE_COPIES")
+        conn.execute("CREATE TEMP TABLE SCALE_COPIES (k INTEGER)")
+        conn.executemany("INSERT INTO SCALE_COPIES VALUES (?)", [(k,) for k in range(1, factor)])
+        for definition in list(scaled.values()) + list((derived or {}).values()):
+            name = definition['name']
+            parents = {column: parent for column, parent, _ in definition['foreign_keys'] if parent in offsets}
+            if name in DERIVED_MEASURES:
+                assignments = ', '.join(f"{column} = {column} * {factor}" for column in DERIVED_MEASURES[name])
+                conn.execute(f"UPDATE {name} SET {assignments}")
+                continue
+            if name not in offsets and not parents:
+                # Calendar and other shared derived tables
+                continue
+            select_list = []
+            for column, _ in definition['columns']:
+                if column == definition['primary_key'] and name in offsets:
+                    select_list.append(f"{column} + copies.k * {offsets[name]}")
+                elif column in parents:
+                    select_list.append(f"{column} + copies.k * {offsets[parents[column]]}")
+                else:
+                    select_list.append(column)
+            columns = ', '.join(column for column, _ in definition['columns'])
+            conn.execute(f"INSERT INTO {name} ({columns}) "
+                         f"SELECT {', '.join(select_list)} FROM {name} CROSS JOIN SCALE_COPIES copies")
+        conn.execute("DROP TABLE SCALE_COPIES")
+
+    return {table: conn.execute(f"SELECT COUNT(*) FROM {definition['name']}").fetchone()[0]
+            for table, definition in schema.items()}
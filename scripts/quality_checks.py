@@ -8,17 +8,34 @@ This script validates:
 3. FACT_SUBSCRIPTION_EVENTS - Temporal consistency, contract lengths, business rules
 4. Foreign key relationships between tables
 5. Cross-table data consistency
+
+Checks are registered in CHECK_REGISTRY with the tables and derived indexes
+they need; run_quality_checks loads and indexes each table once and runs the
+checks concurrently.
 """
 
+import argparse
+import glob
 import json
+import multiprocessing
+import os
 import sys
 import statistics
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional, Set
+
+from business_rules import evaluate_rules, parse_dates
 
 def load_json_data(filepath: str) -> List[Dict[str, Any]]:
-    """Load JSON data with error handling."""
+    """Load JSON data with error handling; dictionary-encoded files load as a lazily decoded EncodedTable."""
     try:
+        if filepath.endswith(ENCODED_SUFFIX):
+            # encoded_output imports this module
+            from encoded_output import EncodedTable
+            return EncodedTable.load(filepath)
         with open(filepath, 'r') as f:
             return json.load(f)
     except FileNotFoundError:
@@ -28,6 +45,13 @@ def load_json_data(filepath: str) -> List[Dict[str, Any]]:
         print(f"❌ JSON decode error in {filepath}: {e}")
         return []
 
+def group_by_key(rows: List[Dict[str, Any]], key: str) -> Dict[Any, List[Dict[str, Any]]]:
+    """Group rows by the value of a single column, preserving row order."""
+    groups = {}
+    for row in rows:
+        groups.setdefault(row.get(key), []).append(row)
+    return groups
+
 def validate_dim_customers(customers: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Validate DIM_CUSTOMERS table."""
     if not customers:
@@ -40,40 +64,20 @@ def validate_dim_customers(customers: List[Dict[str, Any]]) -> Dict[str, Any]:
     
     # Segment distribution
     segment_counts = {}
-    employee_violations = 0
-    revenue_violations = 0
-    
     for customer in customers:
-        # Segment tracking
         segment = customer.get('segment', 'unknown')
         segment_counts[segment] = segment_counts.get(segment, 0) + 1
-        
-        # Employee count validation
-        employee_count = customer.get('employee_count', 0)
-        if segment == 'startup' and not (1 <= employee_count <= 50):
-            employee_violations += 1
-        elif segment == 'mid_market' and not (51 <= employee_count <= 500):
-            employee_violations += 1
-        elif segment == 'enterprise' and not (501 <= employee_count <= 10000):
-            employee_violations += 1
-        
-        # Revenue validation
-        revenue = customer.get('annual_revenue', 0)
-        if segment == 'startup' and not (100000 <= revenue <= 5000000):
-            revenue_violations += 1
-        elif segment == 'mid_market' and not (5000000 <= revenue <= 100000000):
-            revenue_violations += 1
-        elif segment == 'enterprise' and not (100000000 <= revenue <= 1000000000):
-            revenue_violations += 1
+    
+    # Segment ranges and date formats from the shared rule spec
+    violations = evaluate_rules('customers', customers)
+    segment_violations = len(violations['segment_values'])
+    employee_violations = len(violations['employee_count_by_segment'])
+    revenue_violations = len(violations['annual_revenue_by_segment'])
     
     # Date range validation
-    signup_dates = []
-    for customer in customers:
-        try:
-            date_str = customer.get('signup_date', '')
-            signup_dates.append(datetime.strptime(date_str, '%m/%d/%Y'))
-        except ValueError:
-            issues.append(f"Invalid date format: {customer.get('signup_date', 'missing')}")
+    for i in violations['signup_date_format']:
+        issues.append(f"Invalid date format: {customers[i].get('signup_date', 'missing')}")
+    signup_dates = [d for d in parse_dates([c.get('signup_date') for c in customers]) if d is not None]
     
     if signup_dates:
         min_date = min(signup_dates)
@@ -84,6 +88,9 @@ def validate_dim_customers(customers: List[Dict[str, Any]]) -> Dict[str, Any]:
         date_span_years = 0
     
     # Add issues
+    if segment_violations > 0:
+        issues.append(f"{segment_violations} customers have an unknown segment")
+    
     if employee_violations > 0:
         issues.append(f"{employee_violations} customers have invalid employee counts for their segment")
     
@@ -97,6 +104,7 @@ def validate_dim_customers(customers: List[Dict[str, Any]]) -> Dict[str, Any]:
         'table': 'DIM_CUSTOMERS',
         'total_records': total_customers,
         'segment_distribution': segment_counts,
+        'segment_violations': segment_violations,
         'employee_violations': employee_violations,
         'revenue_violations': revenue_violations,
         'date_range': {
@@ -107,16 +115,23 @@ def validate_dim_customers(customers: List[Dict[str, Any]]) -> Dict[str, Any]:
         'issues': issues
     }
 
+EXPECTED_FRAMEWORKS = {
+    'SOC2_Type_I', 'SOC2_Type_II', 'ISO27001', 'HIPAA', 
+    'GDPR', 'PCI_DSS', 'FedRAMP', 'NIST_CSF'
+}
+
+FRAMEWORK_REQUIRED_FIELDS = [
+    'framework_id', 'framework_name', 'framework_category', 
+    'complexity_score', 'avg_completion_days', 'certification_cost_usd'
+]
+
 def validate_dim_frameworks(frameworks: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Validate DIM_COMPLIANCE_FRAMEWORKS table."""
     if not frameworks:
         return {'error': 'No framework data loaded'}
     
     issues = []
-    expected_frameworks = {
-        'SOC2_Type_I', 'SOC2_Type_II', 'ISO27001', 'HIPAA', 
-        'GDPR', 'PCI_DSS', 'FedRAMP', 'NIST_CSF'
-    }
+    expected_frameworks = EXPECTED_FRAMEWORKS
     
     # Check count
     if len(frameworks) != 8:
@@ -134,10 +149,7 @@ def validate_dim_frameworks(frameworks: List[Dict[str, Any]]) -> Dict[str, Any]:
         issues.append(f"Unexpected frameworks: {', '.join(extra_frameworks)}")
     
     # Check required fields
-    required_fields = [
-        'framework_id', 'framework_name', 'framework_category', 
-        'complexity_score', 'avg_completion_days', 'certification_cost_usd'
-    ]
+    required_fields = FRAMEWORK_REQUIRED_FIELDS
     
     for framework in frameworks:
         for field in required_fields:
@@ -152,7 +164,9 @@ def validate_dim_frameworks(frameworks: List[Dict[str, Any]]) -> Dict[str, Any]:
         'issues': issues
     }
 
-def validate_fact_subscription_events(events: List[Dict[str, Any]], customers: List[Dict[str, Any]]) -> Dict[str, Any]:
+def validate_fact_subscription_events(events: List[Dict[str, Any]], customers: List[Dict[str, Any]],
+                                      customer_ids: Optional[Set[Any]] = None,
+                                      events_by_customer: Optional[Dict[Any, List[Dict[str, Any]]]] = None) -> Dict[str, Any]:
     """Validate FACT_SUBSCRIPTION_EVENTS table."""
     if not events:
         return {'error': 'No subscription events data loaded'}
@@ -160,40 +174,42 @@ def validate_fact_subscription_events(events: List[Dict[str, Any]], customers: L
     issues = []
     
     # Group events by customer
-    events_by_customer = {}
-    for event in events:
-        customer_id = event.get('customer_id')
-        if customer_id not in events_by_customer:
-            events_by_customer[customer_id] = []
-        events_by_customer[customer_id].append(event)
+    if events_by_customer is None:
+        events_by_customer = group_by_key(events, 'customer_id')
     
     # Check all customers have events
-    customer_ids = {c.get('customer_id') for c in customers}
+    if customer_ids is None:
+        customer_ids = {c.get('customer_id') for c in customers}
     customers_with_events = set(events_by_customer.keys())
     missing_customers = customer_ids - customers_with_events
     
     if missing_customers:
         issues.append(f"{len(missing_customers)} customers have no subscription events")
     
-    # Contract length validation
-    unrealistic_contracts = 0
+    # Contract length distribution
     contract_lengths = {}
     
     for event in events:
         contract_length = event.get('contract_length_months', 0)
-        
-        # Count contract lengths
         if event.get('event_type') != 'churn':
             contract_lengths[contract_length] = contract_lengths.get(contract_length, 0) + 1
-        
-        # Check for unrealistic lengths
-        if contract_length > 0 and contract_length < 12:
-            unrealistic_contracts += 1
+    
+    # Event types, contract lengths and MRR from the shared rule spec
+    violations = evaluate_rules('events', events)
+    unrealistic_contracts = len(violations['contract_length_by_event_type'])
+    invalid_event_types = len(violations['event_type_values'])
+    negative_mrr = len(violations['mrr_amount_range'])
+    
+    if invalid_event_types > 0:
+        issues.append(f"{invalid_event_types} events have an unknown event_type")
     
     if unrealistic_contracts > 0:
         issues.append(f"{unrealistic_contracts} events have unrealistic contract lengths (<12 months)")
     
-    # Event type validation
+    if negative_mrr > 0:
+        issues.append(f"{negative_mrr} events have a missing or negative mrr_amount")
+    
+    # Event type distribution
     event_types = {}
     for event in events:
         event_type = event.get('event_type', 'unknown')
@@ -218,12 +234,16 @@ def validate_fact_subscription_events(events: List[Dict[str, Any]], customers: L
         'event_types': event_types,
         'contract_lengths': contract_lengths,
         'unrealistic_contracts': unrealistic_contracts,
+        'invalid_event_types': invalid_event_types,
+        'negative_mrr': negative_mrr,
         'issues': issues
     }
 
 def validate_fact_framework_adoptions(adoptions: List[Dict[str, Any]], 
                                      customers: List[Dict[str, Any]], 
-                                     frameworks: List[Dict[str, Any]]) -> Dict[str, Any]:
+                                     frameworks: List[Dict[str, Any]],
+                                     customer_ids: Optional[Set[Any]] = None,
+                                     adoption_customer_ids: Optional[Set[Any]] = None) -> Dict[str, Any]:
     """Validate FACT_FRAMEWORK_ADOPTIONS table."""
     if not adoptions:
         return {'error': 'No framework adoptions data loaded'}
@@ -231,8 +251,11 @@ def validate_fact_framework_adoptions(adoptions: List[Dict[str, Any]],
     issues = []
     
     # Check all customers have adoptions
-    customer_ids = {c.get('customer_id') for c in customers}
-    customers_with_adoptions = {a.get('customer_id') for a in adoptions}
+    if customer_ids is None:
+        customer_ids = {c.get('customer_id') for c in customers}
+    if adoption_customer_ids is None:
+        adoption_customer_ids = {a.get('customer_id') for a in adoptions}
+    customers_with_adoptions = adoption_customer_ids
     missing_customers = customer_ids - customers_with_adoptions
     
     if missing_customers:
@@ -250,17 +273,13 @@ def validate_fact_framework_adoptions(adoptions: List[Dict[str, Any]],
         status = adoption.get('status', 'unknown')
         status_counts[status] = status_counts.get(status, 0) + 1
     
-    # Temporal validation
-    temporal_issues = 0
-    for adoption in adoptions:
-        try:
-            start_date = datetime.strptime(adoption.get('start_date', '01/01/2020'), '%m/%d/%Y')
-            completion_date = datetime.strptime(adoption.get('completion_date', '01/01/2020'), '%m/%d/%Y')
-            
-            if completion_date <= start_date:
-                temporal_issues += 1
-        except ValueError:
-            temporal_issues += 1
+    # Statuses and date order from the shared rule spec
+    violations = evaluate_rules('adoptions', adoptions)
+    invalid_statuses = len(violations['status_values'])
+    temporal_issues = len(violations['completion_after_start'])
+    
+    if invalid_statuses > 0:
+        issues.append(f"{invalid_statuses} adoptions have an unknown status")
     
     if temporal_issues > 0:
         issues.append(f"{temporal_issues} adoptions have invalid date sequences")
@@ -272,24 +291,46 @@ def validate_fact_framework_adoptions(adoptions: List[Dict[str, Any]],
         'avg_adoptions_per_customer': len(adoptions) / len(customers) if customers else 0,
         'framework_counts': framework_counts,
         'status_distribution': status_counts,
+        'invalid_statuses': invalid_statuses,
         'temporal_issues': temporal_issues,
         'issues': issues
     }
 
+# Issue text per activity rule in business_rules.RULE_SPECS, shared by every check mode
+ACTIVITY_RULE_ISSUES = {
+    'activity_type_values': "activities have an unknown activity_type",
+    'control_category_values': "activities have an unknown control_category",
+    'risk_level_values': "activities have an unknown risk_level",
+    'duration_minutes_range': "activities have a missing or negative duration_minutes"
+}
+
+def activity_rule_issues(rule_violations: Dict[str, int]) -> List[str]:
+    """Issues for the activity rules with violations, given the violation count per rule."""
+    return [f"{rule_violations[name]} {message}"
+            for name, message in ACTIVITY_RULE_ISSUES.items() if rule_violations.get(name)]
+
 def validate_fact_compliance_activities(activities: List[Dict[str, Any]],
                                        adoptions: List[Dict[str, Any]],
                                        customers: List[Dict[str, Any]],
-                                       frameworks: List[Dict[str, Any]]) -> Dict[str, Any]:
+                                       frameworks: List[Dict[str, Any]],
+                                       adoption_ids: Optional[Set[Any]] = None,
+                                       activity_customer_ids: Optional[Set[Any]] = None,
+                                       activity_adoption_ids: Optional[Set[Any]] = None) -> Dict[str, Any]:
     """Validate FACT_COMPLIANCE_ACTIVITIES table."""
     if not activities:
         return {'error': 'No compliance activities data loaded'}
     
     issues = []
     
+    if activity_customer_ids is None:
+        activity_customer_ids = {a.get('customer_id') for a in activities}
+    if activity_adoption_ids is None:
+        activity_adoption_ids = {a.get('adoption_id') for a in activities}
+    
     # Basic metrics
     total_activities = len(activities)
-    unique_customers = len(set(a.get('customer_id') for a in activities))
-    unique_adoptions = len(set(a.get('adoption_id') for a in activities))
+    unique_customers = len(activity_customer_ids)
+    unique_adoptions = len(activity_adoption_ids)
     
     # Activity type distribution
     activity_types = {}
@@ -310,9 +351,13 @@ def validate_fact_compliance_activities(activities: List[Dict[str, Any]],
     if success_rate < 0.7 or success_rate > 0.95:
         issues.append(f"Success rate outside expected range: {success_rate:.1%}")
     
+    # Activity types, categories, risk levels and durations from the shared rule spec
+    rule_violations = {name: len(failing) for name, failing in evaluate_rules('activities', activities).items()}
+    issues.extend(activity_rule_issues(rule_violations))
+    
     # Foreign key validation
-    adoption_ids = {a.get('adoption_id') for a in adoptions}
-    activity_adoption_ids = {a.get('adoption_id') for a in activities}
+    if adoption_ids is None:
+        adoption_ids = {a.get('adoption_id') for a in adoptions}
     orphaned_activities = activity_adoption_ids - adoption_ids
     
     if orphaned_activities:
@@ -328,6 +373,7 @@ def validate_fact_compliance_activities(activities: List[Dict[str, Any]],
         'activity_types': activity_types,
         'automation_rate': automation_rate,
         'success_rate': success_rate,
+        'rule_violations': rule_violations,
         'issues': issues
     }
 
@@ -335,50 +381,68 @@ def validate_foreign_keys(customers: List[Dict[str, Any]],
                          frameworks: List[Dict[str, Any]], 
                          events: List[Dict[str, Any]],
                          adoptions: List[Dict[str, Any]],
-                         activities: List[Dict[str, Any]]) -> Dict[str, Any]:
+                         activities: List[Dict[str, Any]],
+                         customer_ids: Optional[Set[Any]] = None,
+                         framework_ids: Optional[Set[Any]] = None,
+                         adoption_ids: Optional[Set[Any]] = None,
+                         event_customer_ids: Optional[Set[Any]] = None,
+                         adoption_customer_ids: Optional[Set[Any]] = None,
+                         activity_customer_ids: Optional[Set[Any]] = None,
+                         activity_adoption_ids: Optional[Set[Any]] = None,
+                         adoption_framework_ids: Optional[Set[Any]] = None,
+                         activity_framework_ids: Optional[Set[Any]] = None) -> Dict[str, Any]:
     """Validate foreign key relationships between tables."""
     issues = []
     
     # Customer IDs in events should exist in customers
-    customer_ids = {c.get('customer_id') for c in customers}
-    event_customer_ids = {e.get('customer_id') for e in events}
+    if customer_ids is None:
+        customer_ids = {c.get('customer_id') for c in customers}
+    if event_customer_ids is None:
+        event_customer_ids = {e.get('customer_id') for e in events}
     orphaned_events = event_customer_ids - customer_ids
     
     if orphaned_events:
         issues.append(f"{len(orphaned_events)} subscription events reference non-existent customers")
     
     # Customer IDs in adoptions should exist in customers
-    adoption_customer_ids = {a.get('customer_id') for a in adoptions}
+    if adoption_customer_ids is None:
+        adoption_customer_ids = {a.get('customer_id') for a in adoptions}
     orphaned_adoptions = adoption_customer_ids - customer_ids
     
     if orphaned_adoptions:
         issues.append(f"{len(orphaned_adoptions)} framework adoptions reference non-existent customers")
     
     # Customer IDs in activities should exist in customers
-    activity_customer_ids = {a.get('customer_id') for a in activities}
+    if activity_customer_ids is None:
+        activity_customer_ids = {a.get('customer_id') for a in activities}
     orphaned_activity_customers = activity_customer_ids - customer_ids
     
     if orphaned_activity_customers:
         issues.append(f"{len(orphaned_activity_customers)} activities reference non-existent customers")
     
     # Framework IDs in adoptions should exist in frameworks
-    framework_ids = {f.get('framework_id') for f in frameworks}
-    adoption_framework_ids = {a.get('framework_id') for a in adoptions}
+    if framework_ids is None:
+        framework_ids = {f.get('framework_id') for f in frameworks}
+    if adoption_framework_ids is None:
+        adoption_framework_ids = {a.get('framework_id') for a in adoptions}
     orphaned_adoption_frameworks = adoption_framework_ids - framework_ids
     
     if orphaned_adoption_frameworks:
         issues.append(f"{len(orphaned_adoption_frameworks)} adoptions reference non-existent frameworks")
     
     # Framework IDs in activities should exist in frameworks
-    activity_framework_ids = {a.get('framework_id') for a in activities}
+    if activity_framework_ids is None:
+        activity_framework_ids = {a.get('framework_id') for a in activities}
     orphaned_activity_frameworks = activity_framework_ids - framework_ids
     
     if orphaned_activity_frameworks:
         issues.append(f"{len(orphaned_activity_frameworks)} activities reference non-existent frameworks")
     
     # Adoption IDs in activities should exist in adoptions
-    adoption_ids = {a.get('adoption_id') for a in adoptions}
-    activity_adoption_ids = {a.get('adoption_id') for a in activities}
+    if adoption_ids is None:
+        adoption_ids = {a.get('adoption_id') for a in adoptions}
+    if activity_adoption_ids is None:
+        activity_adoption_ids = {a.get('adoption_id') for a in activities}
     orphaned_activity_adoptions = activity_adoption_ids - adoption_ids
     
     if orphaned_activity_adoptions:
@@ -538,6 +602,217 @@ def validate_mrr_billing_consistency(events: List[Dict[str, Any]]) -> Dict[str,
     
     return results
 
+# Source files for every table a check can declare, relative to the data directory
+TABLE_FILES = {
+    'customers': 'DIM_CUSTOMERS.json',
+    'frameworks': 'DIM_COMPLIANCE_FRAMEWORKS.json',
+    'events': 'FACT_SUBSCRIPTION_EVENTS.json',
+    'adoptions': 'FACT_FRAMEWORK_ADOPTIONS.json',
+    'activities': 'FACT_COMPLIANCE_ACTIVITIES.json'
+}
+
+# Dictionary-encoded data files (encoded_output.py) replace '.json' with this
+ENCODED_SUFFIX = '.enc.json'
+
+def table_paths(data_dir: str, filename: str) -> List[str]:
+    """
+    Data files of a table: every shard under <TABLE>/ (month directories
+    included), or the single file - plain JSON or dictionary-encoded.
+    """
+    shard_dir = os.path.join(data_dir, os.path.splitext(filename)[0])
+    if os.path.isdir(shard_dir):
+        return sorted(glob.glob(os.path.join(shard_dir, '**', '*.json'), recursive=True))
+    for single_file in (os.path.join(data_dir, filename), shard_dir + ENCODED_SUFFIX):
+        if os.path.exists(single_file):
+            return [single_file]
+    return []
+
+def load_table(data_dir: str, table: str) -> List[Dict[str, Any]]:
+    """All rows of a table, whether it is one file or sharded."""
+    paths = table_paths(data_dir, TABLE_FILES[table])
+    if not paths:
+        # Reports the missing file the same way a single-file read does
+        return load_json_data(os.path.join(data_dir, TABLE_FILES[table]))
+    return [row for path in paths for row in load_json_data(path)]
+
+# Derived indexes shared between checks: name -> (source table, column, kind)
+INDEX_SPECS = {
+    'customer_ids': ('customers', 'customer_id', 'set'),
+    'framework_ids': ('frameworks', 'framework_id', 'set'),
+    'adoption_ids': ('adoptions', 'adoption_id', 'set'),
+    'event_customer_ids': ('events', 'customer_id', 'set'),
+    'adoption_customer_ids': ('adoptions', 'customer_id', 'set'),
+    'activity_customer_ids': ('activities', 'customer_id', 'set'),
+    'activity_adoption_ids': ('activities', 'adoption_id', 'set'),
+    'adoption_framework_ids': ('adoptions', 'framework_id', 'set'),
+    'activity_framework_ids': ('activities', 'framework_id', 'set'),
+    'events_by_customer': ('events', 'customer_id', 'group')
+}
+
+# Check registry: each check names the tables it takes positionally and the
+# derived indexes it takes as keyword arguments.
+CHECK_REGISTRY = [
+    {
+        'name': 'dim_customers',
+        'func': validate_dim_customers,
+        'tables': ['customers'],
+        'indexes': []
+    },
+    {
+        'name': 'dim_frameworks',
+        'func': validate_dim_frameworks,
+        'tables': ['frameworks'],
+        'indexes': []
+    },
+    {
+        'name': 'fact_subscription_events',
+        'func': validate_fact_subscription_events,
+        'tables': ['events', 'customers'],
+        'indexes': ['customer_ids', 'events_by_customer']
+    },
+    {
+        'name': 'fact_framework_adoptions',
+        'func': validate_fact_framework_adoptions,
+        'tables': ['adoptions', 'customers', 'frameworks'],
+        'indexes': ['customer_ids', 'adoption_customer_ids']
+    },
+    {
+        'name': 'fact_compliance_activities',
+        'func': validate_fact_compliance_activities,
+        'tables': ['activities', 'adoptions', 'customers', 'frameworks'],
+        'indexes': ['adoption_ids', 'activity_customer_ids', 'activity_adoption_ids']
+    },
+    {
+        'name': 'foreign_keys',
+        'func': validate_foreign_keys,
+        'tables': ['customers', 'frameworks', 'events', 'adoptions', 'activities'],
+        'indexes': ['customer_ids', 'framework_ids', 'adoption_ids', 'event_customer_ids',
+                    'adoption_customer_ids', 'activity_customer_ids', 'activity_adoption_ids',
+                    'adoption_framework_ids', 'activity_framework_ids']
+    },
+    {
+        'name': 'mrr_billing_consistency',
+        'func': validate_mrr_billing_consistency,
+        'tables': ['events'],
+        'indexes': []
+    }
+]
+
+CHECKS_BY_NAME = {spec['name']: spec for spec in CHECK_REGISTRY}
+
+# Check inputs staged in the parent before a fork-based pool starts, so workers
+# inherit the loaded tables instead of receiving pickled copies.
+_SHARED_INPUTS = {}
+
+def build_index(rows: List[Dict[str, Any]], column: str, kind: str) -> Any:
+    """Build a derived index over one column of a loaded table."""
+    if kind == 'group':
+        return group_by_key(rows, column)
+    return {row.get(column) for row in rows}
+
+def run_registered_check(name: str, tables: Optional[List[Any]] = None,
+                         indexes: Optional[Dict[str, Any]] = None,
+                         trace_memory: bool = False) -> Tuple[str, Dict[str, Any], float, Optional[int]]:
+    """
+    Run a single registered check and time it (process pool entry point).
+    
+    With trace_memory, the peak Python heap allocated while the check runs is
+    measured with tracemalloc (this slows the check down, so it is opt-in).
+    """
+    if tables is None:
+        tables, indexes = _SHARED_INPUTS[name]
+    func = CHECKS_BY_NAME[name]['func']
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func(*tables, **indexes)
+        elapsed = time.perf_counter() - start
+        peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return name, result, elapsed, peak_memory
+
+def run_quality_checks(data_dir: str = '../data',
+                       check_names: Optional[List[str]] = None,
+                       workers: Optional[int] = None,
+                       trace_memory: bool = False) -> Dict[str, Any]:
+    """
+    Run registered checks as a small DAG: tables -> derived indexes -> checks.
+    
+    Each table and each derived index is built once in the parent process and
+    only the inputs a check declares are handed to it (inherited through fork
+    where available, pickled otherwise). Checks are independent of each other,
+    so they run concurrently in a process pool; workers=1 runs them inline.
+    
+    Each result is annotated with its wall time, the rows of its input tables
+    (rows_scanned) and, with trace_memory, its peak traced memory.
+    """
+    specs = [CHECKS_BY_NAME[name] for name in check_names] if check_names else CHECK_REGISTRY
+    timings = {}
+    
+    # Stage 1: load every table needed by any selected check exactly once
+    tables = {}
+    for spec in specs:
+        for table in spec['tables']:
+            if table not in tables:
+                start = time.perf_counter()
+                tables[table] = load_table(data_dir, table)
+                timings[f'load:{table}'] = time.perf_counter() - start
+    
+    # Stage 2: build each shared index exactly once
+    indexes = {}
+    for spec in specs:
+        for index_name in spec['indexes']:
+            if index_name not in indexes:
+                table, column, kind = INDEX_SPECS[index_name]
+                start = time.perf_counter()
+                indexes[index_name] = build_index(tables[table], column, kind)
+                timings[f'index:{index_name}'] = time.perf_counter() - start
+    
+    # Stage 3: run independent checks concurrently
+    results = {}
+    jobs = [
+        (spec['name'],
+         [tables[t] for t in spec['tables']],
+         {i: indexes[i] for i in spec['indexes']})
+        for spec in specs
+    ]
+    
+    if workers == 1 or len(jobs) == 1:
+        completed = [run_registered_check(*job, trace_memory=trace_memory) for job in jobs]
+    elif 'fork' in multiprocessing.get_all_start_methods():
+        _SHARED_INPUTS.clear()
+        _SHARED_INPUTS.update({name: (args, kwargs) for name, args, kwargs in jobs})
+        try:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context('fork')) as pool:
+                futures = [pool.submit(run_registered_check, name, trace_memory=trace_memory)
+                           for name, _, _ in jobs]
+                completed = [future.result() for future in futures]
+        finally:
+            _SHARED_INPUTS.clear()
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_registered_check, *job, trace_memory=trace_memory) for job in jobs]
+            completed = [future.result() for future in futures]
+    
+    for name, result, elapsed, peak_memory in completed:
+        result['check_name'] = name
+        result['elapsed_seconds'] = elapsed
+        result['rows_scanned'] = sum(len(tables[t]) for t in CHECKS_BY_NAME[name]['tables'])
+        result['peak_memory_bytes'] = peak_memory
+        results[name] = result
+        timings[f'check:{name}'] = elapsed
+    
+    return {
+        'data_dir': data_dir,
+        'tables': tables,
+        'results': results,
+        'timings': timings
+    }
+
 def print_quality_report(validations: List[Dict[str, Any]]) -> None:
     """Print comprehensive quality report."""
     
@@ -579,6 +854,9 @@ def print_quality_report(validations: List[Dict[str, Any]]) -> None:
             date_range = validation['date_range']
             print(f"Date Range: {date_range['min_date']} to {date_range['max_date']} ({date_range['span_years']:.1f} years)")
         
+        if 'elapsed_seconds' in validation:
+            print(f"Check Time: {validation['elapsed_seconds'] * 1000:.1f} ms")
+        
         # Print issues
         if issues:
             print(f"\n⚠️  Issues Found ({len(issues)}):")
@@ -597,44 +875,8 @@ def print_quality_report(validations: List[Dict[str, Any]]) -> None:
         print(f"⚠️  {total_issues} total issues found across all tables")
         print("🔧 Issues should be resolved before proceeding to Snowflake")
 
-def main():
-    """Run comprehensive quality checks on all data."""
-    
-    print("🚀 Running comprehensive data quality checks...")
-    
-    # Load all data files
-    print("\n📖 Loading data files...")
-    customers = load_json_data('../data/DIM_CUSTOMERS.json')
-    frameworks = load_json_data('../data/DIM_COMPLIANCE_FRAMEWORKS.json')
-    events = load_json_data('../data/FACT_SUBSCRIPTION_EVENTS.json')
-    adoptions = load_json_data('../data/FACT_FRAMEWORK_ADOPTIONS.json')
-    activities = load_json_data('../data/FACT_COMPLIANCE_ACTIVITIES.json')
-    
-    if not customers:
-        print("❌ Could not load customer data. Exiting.")
-        sys.exit(1)
-    
-    print(f"Loaded: {len(customers)} customers, {len(frameworks)} frameworks, {len(events)} events, {len(adoptions)} adoptions, {len(activities)} activities")
-    
-    # Run validations
-    print("\n🔍 Running quality validations...")
-    validations = []
-    
-    validations.append(validate_dim_customers(customers))
-    validations.append(validate_dim_frameworks(frameworks))
-    validations.append(validate_fact_subscription_events(events, customers))
-    validations.append(validate_fact_framework_adoptions(adoptions, customers, frameworks))
-    validations.append(validate_fact_compliance_activities(activities, adoptions, customers, frameworks))
-    validations.append(validate_foreign_keys(customers, frameworks, events, adoptions, activities))
-    
-    # Run MRR billing validation
-    print("\n💰 Running MRR billing consistency validation...")
-    mrr_validation = validate_mrr_billing_consistency(events)
-    
-    # Print report
-    print_quality_report(validations)
-    
-    # Print MRR validation summary
+def print_mrr_consistency(mrr_validation: Dict[str, Any]) -> None:
+    """Print the MRR billing consistency summary."""
     print("\n" + "=" * 80)
     print("💰 MRR BILLING CONSISTENCY VALIDATION")
     print("=" * 80)
@@ -660,5 +902,181 @@ def main():
     else:
         print("\n✅ No extreme outliers detected in financial data")
 
+def print_check_timings(timings: Dict[str, float]) -> None:
+    """Print per-stage and per-check wall times from the scheduler."""
+    print("\n⏱️  CHECK TIMINGS")
+    print("-" * 30)
+    for stage, elapsed in timings.items():
+        print(f"  {stage}: {elapsed * 1000:.1f} ms")
+
+# Exit codes, so a scheduler can gate Snowflake loads on the QA run
+EXIT_PASS = 0
+EXIT_ISSUES = 1
+EXIT_LOAD_FAILURE = 2
+
+def check_status(result: Dict[str, Any]) -> str:
+    """'error' when a check had no data, 'issues' when it found any, else 'pass'."""
+    if 'error' in result:
+        return 'error'
+    return 'issues' if result.get('issues') else 'pass'
+
+def build_quality_report(run: Dict[str, Any], data_dir: str) -> Dict[str, Any]:
+    """
+    Machine-readable report for a run_quality_checks result: per-table row
+    counts and load times, each check's status, issues, rows scanned, wall
+    time and peak memory, plus the overall status and exit code.
+    
+    The alternate check modes return runs of the same shape, with row counts
+    in place of the loaded rows.
+    """
+    tables = {
+        table: {
+            'file': TABLE_FILES.get(table, f"{table.upper()}.json"),
+            'rows': rows if isinstance(rows, int) else len(rows),
+            'load_seconds': run['timings'].get(f'load:{table}')
+        }
+        for table, rows in run['tables'].items()
+    }
+    
+    checks = {}
+    for name, result in run['results'].items():
+        metrics = {k: v for k, v in result.items()
+                   if k not in ('check_name', 'elapsed_seconds', 'rows_scanned', 'peak_memory_bytes', 'issues')}
+        checks[name] = {
+            'status': check_status(result),
+            'issues': result.get('issues', []),
+            'rows_scanned': result.get('rows_scanned'),
+            'wall_seconds': result.get('elapsed_seconds'),
+            'peak_memory_bytes': result.get('peak_memory_bytes'),
+            'metrics': metrics
+        }
+    
+    total_issues = sum(len(check['issues']) for check in checks.values())
+    if any(info['rows'] == 0 for info in tables.values()) or any(c['status'] == 'error' for c in checks.values()):
+        status, exit_code = 'load_failure', EXIT_LOAD_FAILURE
+    elif total_issues:
+        status, exit_code = 'issues', EXIT_ISSUES
+    else:
+        status, exit_code = 'pass', EXIT_PASS
+    
+    check_seconds = sum(check['wall_seconds'] or 0 for check in checks.values())
+    rows_scanned = sum(check['rows_scanned'] or 0 for check in checks.values())
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'data_dir': os.path.abspath(data_dir),
+        'status': status,
+        'exit_code': exit_code,
+        'total_issues': total_issues,
+        'rows_scanned': rows_scanned,
+        'rows_per_second': rows_scanned / check_seconds if check_seconds else None,
+        'tables': tables,
+        'checks': checks,
+        'timings': run['timings']
+    }
+
+def write_quality_report(report: Dict[str, Any], path: str) -> None:
+    """Write the JSON report to a file, or to stdout for '-'."""
+    if path == '-':
+        json.dump(report, sys.stdout, indent=2, default=str)
+        print()
+        return
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+
+def finish_quality_run(run: Dict[str, Any], json_report: Optional[str] = None, text_out: Any = None) -> None:
+    """Write the run's JSON report if requested and exit with its status code."""
+    report = build_quality_report(run, run['data_dir'])
+    if text_out is not None:
+        sys.stdout = text_out
+    if json_report:
+        write_quality_report(report, json_report)
+    sys.exit(report['exit_code'])
+
+def main():
+    """Run comprehensive quality checks on all data."""
+    parser = argparse.ArgumentParser(description="Run data quality checks on the Phantom Sec POC tables.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Process pool size for independent checks (1 runs checks inline; "
+                             "full runs only)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only rescan fact partitions that changed since the last run")
+    parser.add_argument('--approximate', action='store_true',
+                        help="Check distributions on samples with confidence intervals and keys exactly; "
+                             "per-file summaries are cached, so reruns only read new or changed files "
+                             "(see approximate_checks.py for sampling options)")
+    parser.add_argument('--sketches', action='store_true',
+                        help="Summarize distributions from per-shard sketch sidecars "
+                             "(see sketches.py)")
+    parser.add_argument('--zone-maps', action='store_true',
+                        help="Check row counts, NOT NULL columns and date formats from per-shard "
+                             "zone map sidecars (see zone_maps.py)")
+    parser.add_argument('--sql', action='store_true',
+                        help="Push checks down as SQL in an embedded engine "
+                             "(see sql_checks.py for --engine and --emit-sql)")
+    parser.add_argument('--json-report', default=None, metavar='PATH',
+                        help="Also write a machine-readable JSON report ('-' prints only the JSON to stdout)")
+    args, extra_args = parser.parse_known_args()
+    
+    modes = [flag for flag, enabled in (('--incremental', args.incremental), ('--approximate', args.approximate),
+                                        ('--sketches', args.sketches), ('--zone-maps', args.zone_maps),
+                                        ('--sql', args.sql)) if enabled]
+    if modes and args.workers is not None:
+        # Only the full run schedules checks on a process pool
+        parser.error(f"--workers cannot be combined with {modes[0]}")
+    
+    json_only = args.json_report == '-'
+    text_out = None
+    if json_only:
+        # Keep stdout clean for the JSON document
+        sys.stdout, text_out = open(os.devnull, 'w'), sys.stdout
+    
+    # Alternate modes live in their own scripts; forward the remaining options
+    # and report their runs through the same JSON report and exit codes
+    if modes:
+        if args.approximate:
+            from approximate_checks import main as mode_main
+        elif args.sketches:
+            from sketches import main as mode_main
+        elif args.zone_maps:
+            from zone_maps import main as mode_main
+        elif args.sql:
+            from sql_checks import main as mode_main
+        else:
+            from incremental_checks import main as mode_main
+        run = mode_main(['--data-dir', args.data_dir] + extra_args)
+        if run is None:
+            # --emit-sql only prints the check SQL
+            return
+        finish_quality_run(run, args.json_report, text_out)
+    if extra_args:
+        parser.error(f"unrecognized arguments: {' '.join(extra_args)}")
+    
+    print("🚀 Running comprehensive data quality checks...")
+    
+    # Load tables, build shared indexes, and run checks
+    print("\n📖 Loading data files and running quality validations...")
+    run = run_quality_checks(args.data_dir, workers=args.workers, trace_memory=args.json_report is not None)
+    tables = run['tables']
+    results = run['results']
+    
+    if not tables['customers']:
+        print("❌ Could not load customer data. Exiting.")
+        finish_quality_run(run, args.json_report, text_out)
+    
+    print(f"Loaded: {len(tables['customers'])} customers, {len(tables['frameworks'])} frameworks, {len(tables['events'])} events, {len(tables['adoptions'])} adoptions, {len(tables['activities'])} activities")
+    
+    validations = [result for name, result in results.items() if name != 'mrr_billing_consistency']
+    mrr_validation = results['mrr_billing_consistency']
+    
+    # Print report
+    print_quality_report(validations)
+    
+    print_mrr_consistency(mrr_validation)
+    
+    print_check_timings(run['timings'])
+    
+    finish_quality_run(run, args.json_report, text_out)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
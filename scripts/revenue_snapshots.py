@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Daily MRR snapshots and a monthly ARR bridge derived from subscription events.
+
+Every subscription event sets a customer's contract amount from its event
+date until the customer's next event (churn sets it to zero). Amounts are
+normalized to monthly recurring revenue with calculate_annualized_amount,
+the same billing-period rules the MRR consistency check uses.
+
+1. FACT_MRR_DAILY - one row per customer per day with MRR > 0, written as
+   monthly shards (FACT_MRR_DAILY/YYYY-MM.json) by sweeping each customer's
+   sorted step function across the month
+2. FACT_ARR_BRIDGE - one row per month: starting ARR, new, reactivation,
+   expansion, contraction, churn and ending ARR, from each customer's MRR
+   at consecutive month ends
+
+Per-customer step functions are cached with a fingerprint of the events they
+were built from. When events are appended, only the new events are applied
+and only the month shards from the earliest affected date onwards are
+rewritten; any other change to the event file triggers a full rebuild.
+"""
+
+import argparse
+import bisect
+import glob
+import hashlib
+import json
+import os
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+from business_rules import DATE_FORMAT
+from incremental_checks import CACHE_DIR_NAME
+from quality_checks import calculate_annualized_amount, load_json_data
+from sketches import table_shards
+from zone_maps import write_zone_map
+
+# Bump when the step function or output layout changes so stale state is ignored
+SNAPSHOT_VERSION = 1
+
+DAILY_TABLE = 'FACT_MRR_DAILY'
+BRIDGE_TABLE = 'FACT_ARR_BRIDGE'
+STATE_FILE = 'revenue_snapshots.json'
+
+def normalized_mrr(event: Dict[str, Any]) -> float:
+    """Monthly recurring revenue of an event's contract amount."""
+    return round(calculate_annualized_amount(event['mrr_amount'], event['billing_period']) / 12, 2)
+
+def parse_day(value: str) -> date:
+    return datetime.strptime(value, DATE_FORMAT).date()
+
+def format_day(day: date) -> str:
+    return day.strftime(DATE_FORMAT)
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+def next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+def event_key(event: Dict[str, Any]) -> str:
+    return f"{event['event_id']}|{event['customer_id']}|{event['event_date']}|{event['mrr_amount']}|{event['billing_period']}"
+
+def fingerprint(events: List[Dict[str, Any]]) -> str:
+    """Order-independent hash of the events the step functions were built from."""
+    digest = hashlib.sha256()
+    for key in sorted(event_key(event) for event in events):
+        digest.update(key.encode('utf-8'))
+    return digest.hexdigest()
+
+def apply_events(steps: Dict[str, List[list]], events: List[Dict[str, Any]]) -> None:
+    """
+    Insert events into per-customer step functions.
+
+    A step is [ordinal day, event_id, mrr, event_type, product_tier], kept
+    sorted by (day, event_id) so the last event of a day wins.
+    """
+    for event in events:
+        step = [parse_day(event['event_date']).toordinal(), event['event_id'],
+                normalized_mrr(event), event['event_type'], event['product_tier']]
+        bisect.insort(steps.setdefault(str(event['customer_id']), []), step)
+
+def mrr_on(customer_steps: List[list], ordinal: int) -> float:
+    """MRR in effect at the end of a day (0 before the first event)."""
+    index = bisect.bisect_right(customer_steps, [ordinal, float('inf')]) - 1
+    return customer_steps[index][2] if index >= 0 else 0.0
+
+def daily_rows(steps: Dict[str, List[list]], start: date, end: date) -> List[Dict[str, Any]]:
+    """Customer-day rows with MRR > 0 for days in [start, end), ordered by day then customer."""
+    first, last = start.toordinal(), end.toordinal()
+    rows = []
+    for customer_id, customer_steps in steps.items():
+        for i, (day, event_id, mrr, _, product_tier) in enumerate(customer_steps):
+            segment_end = customer_steps[i + 1][0] if i + 1 < len(customer_steps) else last
+            if mrr <= 0 or segment_end <= first or day >= last:
+                continue
+            for ordinal in range(max(day, first), min(segment_end, last)):
+                rows.append({
+                    'snapshot_date': ordinal,
+                    'customer_id': int(customer_id),
+                    'event_id': event_id,
+                    'product_tier': product_tier,
+                    'mrr_amount': mrr,
+                    'arr_amount': round(mrr * 12, 2)
+                })
+    rows.sort(key=lambda row: (row['snapshot_date'], row['customer_id']))
+    for row in rows:
+        row['snapshot_date'] = format_day(date.fromordinal(row['snapshot_date']))
+    return rows
+
+def arr_bridge(steps: Dict[str, List[list]], first_month: date, as_of: date) -> List[Dict[str, Any]]:
+    """Monthly ARR movements between consecutive month ends, up to as_of."""
+    rows = []
+    month = first_month
+    while month <= as_of:
+        opening = month.toordinal() - 1
+        closing = min(next_month(month), as_of + timedelta(days=1)).toordinal() - 1
+        row = {
+            'bridge_month': format_day(month),
+            'starting_arr': 0.0, 'new_arr': 0.0, 'reactivation_arr': 0.0, 'expansion_arr': 0.0,
+            'contraction_arr': 0.0, 'churned_arr': 0.0, 'ending_arr': 0.0,
+            'starting_customers': 0, 'new_customers': 0, 'churned_customers': 0, 'ending_customers': 0
+        }
+        for customer_steps in steps.values():
+            before, after = mrr_on(customer_steps, opening) * 12, mrr_on(customer_steps, closing) * 12
+            if before > 0:
+                row['starting_customers'] += 1
+            if after > 0:
+                row['ending_customers'] += 1
+            if before == 0 and after > 0:
+                # Reactivation if the customer paid at any point before this month
+                paid_before = any(step[0] <= opening and step[2] > 0 for step in customer_steps)
+                row['reactivation_arr' if paid_before else 'new_arr'] += after
+                row['new_customers'] += 0 if paid_before else 1
+            elif before > 0 and after == 0:
+                row['churned_arr'] += before
+                row['churned_customers'] += 1
+            elif after > before:
+                row['expansion_arr'] += after - before
+            elif after < before:
+                row['contraction_arr'] += before - after
+            row['starting_arr'] += before
+            row['ending_arr'] += after
+        rows.append({key: round(value, 2) if isinstance(value, float) else value for key, value in row.items()})
+        month = next_month(month)
+    return rows
+
+def state_path(data_dir: str) -> str:
+    return os.path.join(data_dir, CACHE_DIR_NAME, STATE_FILE)
+
+def load_state(data_dir: str) -> Dict[str, Any]:
+    try:
+        with open(state_path(data_dir), 'r') as f:
+            state = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return state if state.get('version') == SNAPSHOT_VERSION else {}
+
+def save_state(data_dir: str, state: Dict[str, Any]) -> None:
+    path = state_path(data_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def write_daily_shards(steps: Dict[str, List[list]], data_dir: str, from_month: date, as_of: date) -> int:
+    """Rewrite monthly FACT_MRR_DAILY shards from from_month through as_of; returns rows written."""
+    shard_dir = os.path.join(data_dir, DAILY_TABLE)
+    os.makedirs(shard_dir, exist_ok=True)
+    # Shards (and their zone maps) past as_of are stale if the snapshot window shrank
+    for path in glob.glob(os.path.join(shard_dir, '*.json*')):
+        if os.path.basename(path)[:7] > as_of.strftime('%Y-%m'):
+            os.remove(path)
+
+    written = 0
+    month = from_month
+    while month <= as_of:
+        rows = daily_rows(steps, month, min(next_month(month), as_of + timedelta(days=1)))
+        shard_path = os.path.join(shard_dir, f"{month.strftime('%Y-%m')}.json")
+        with open(shard_path, 'w') as f:
+            json.dump(rows, f, separators=(',', ':'))
+        write_zone_map(shard_path, 'fact_mrr_daily', rows)
+        written += len(rows)
+        month = next_month(month)
+    return written
+
+def build_revenue_snapshots(data_dir: str = '../data', as_of: Optional[date] = None,
+                            events: Optional[List[Dict[str, Any]]] = None, full: bool = False) -> Dict[str, Any]:
+    """
+    Build or incrementally update FACT_MRR_DAILY and FACT_ARR_BRIDGE.
+
+    Pass `events` to skip reading FACT_SUBSCRIPTION_EVENTS (the generator
+    hands over the rows it just wrote).
+    """
+    as_of = as_of or date.today()
+    if events is None:
+        events = [event for path in table_shards(data_dir, 'events') for event in load_json_data(path)]
+    if not events:
+        raise ValueError(f"No subscription events found in {data_dir}")
+
+    state = {} if full else load_state(data_dir)
+    shard_dir = os.path.join(data_dir, DAILY_TABLE)
+    known = [event for event in events if event['event_id'] <= state.get('max_event_id', 0)]
+    appended = [event for event in events if event['event_id'] > state.get('max_event_id', 0)]
+    reusable = (
+        state
+        and os.path.isdir(shard_dir)
+        and parse_day(state['as_of']) <= as_of
+        and len(known) == state['event_count']
+        and fingerprint(known) == state['fingerprint']
+    )
+
+    if reusable:
+        steps = state['steps']
+        apply_events(steps, appended)
+        # Days after the previous as_of are new; appended events may also back-date changes
+        dirty = [parse_day(state['as_of']) + timedelta(days=1)] + [parse_day(e['event_date']) for e in appended]
+        from_month = month_start(min(dirty))
+        mode = 'incremental'
+    else:
+        steps = {}
+        apply_events(steps, events)
+        from_month = month_start(min(parse_day(e['event_date']) for e in events))
+        if os.path.isdir(shard_dir):
+            for path in glob.glob(os.path.join(shard_dir, '*.json*')):
+                os.remove(path)
+        mode = 'full'
+
+    rows_written = write_daily_shards(steps, data_dir, from_month, as_of)
+
+    first_month = month_start(min(date.fromordinal(s[0][0]) for s in steps.values()))
+    bridge = arr_bridge(steps, first_month, as_of)
+    with open(os.path.join(data_dir, f"{BRIDGE_TABLE}.json"), 'w') as f:
+        json.dump(bridge, f, indent=2)
+
+    save_state(data_dir, {
+        'version': SNAPSHOT_VERSION,
+        'as_of': format_day(as_of),
+        'max_event_id': max(event['event_id'] for event in events),
+        'event_count': len(events),
+        'fingerprint': fingerprint(events),
+        'steps': steps
+    })
+    return {
+        'mode': mode,
+        'appended_events': len(appended) if reusable else len(events),
+        'rewritten_from': format_day(from_month),
+        'daily_rows_written': rows_written,
+        'bridge_months': len(bridge),
+        'ending_arr': bridge[-1]['ending_arr'] if bridge else 0.0
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Build daily MRR snapshots and the monthly ARR bridge from subscription events.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--as-of', default=None, help="Last snapshot day as MM/DD/YYYY (default: today)")
+    parser.add_argument('--full', action='store_true', help="Ignore cached state and rebuild every shard")
+    args = parser.parse_args()
+
+    print("📅 Building FACT_MRR_DAILY and FACT_ARR_BRIDGE...")
+    summary = build_revenue_snapshots(args.data_dir, parse_day(args.as_of) if args.as_of else None, full=args.full)
+    print(f"  Mode: {summary['mode']} ({summary['appended_events']} events applied)")
+    print(f"  Daily rows written: {summary['daily_rows_written']:,} (months from {summary['rewritten_from']})")
+    print(f"  Bridge months: {summary['bridge_months']}, ending ARR: ${summary['ending_arr']:,.2f}")
+    print("🎉 Revenue snapshots complete!")
+
+if __name__ == "__main__":
+    main()
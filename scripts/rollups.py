@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Pre-aggregated rollup tables built alongside the raw facts.
+
+Each rollup in ROLLUP_SPECS is a GROUP BY over one fact table at a grain
+common executive questions ask for:
+1. AGG_SUBSCRIPTIONS_MONTHLY - month x segment x product tier
+2. AGG_ADOPTIONS_FRAMEWORK_INDUSTRY - framework x industry x maturity
+3. AGG_ACTIVITIES_WEEKLY - week x framework x activity type
+
+Grain columns are declared as strings: 'field' reads the fact row,
+'customers.segment' / 'frameworks.framework_name' follow the row's foreign
+key into a dimension, and 'month(date_field)' / 'week(date_field)' truncate
+a date. Measures are additive (counts and sums, with averages stored as
+sum + count), so any coarser grain can be re-aggregated from a rollup.
+
+The generators feed rows into a RollupAccumulator as they produce them, so
+the rollups come out of the same pass as the fact file. Running this script
+rebuilds them from existing fact files instead.
+"""
+
+import argparse
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Callable, Optional
+
+from business_rules import DATE_FORMAT
+from quality_checks import load_json_data, load_table
+from sketches import table_shards
+
+# Same multipliers as the semantic views' ARR metric (unknown periods count as monthly)
+ARR_MULTIPLIERS = {'monthly': 12, 'quarterly': 4, 'annual': 1, 'upfront': 1}
+
+# Derived per-row values available to 'sum' measures
+DERIVED_VALUES = {
+    'arr': lambda row: row['mrr_amount'] * ARR_MULTIPLIERS.get(row['billing_period'], 12),
+    'contract_value': lambda row: row['mrr_amount'] * row['contract_length_months']
+}
+
+# Dimension tables reachable from a fact row: lookup name -> foreign key column
+LOOKUP_KEYS = {'customers': 'customer_id', 'frameworks': 'framework_id'}
+
+ROLLUP_SPECS = {
+    'AGG_SUBSCRIPTIONS_MONTHLY': {
+        'source': 'events',
+        'grain': [
+            ('event_month', 'month(event_date)'),
+            ('segment', 'customers.segment'),
+            ('product_tier', 'product_tier')
+        ],
+        'measures': [
+            ('event_count', 'count', None),
+            ('new_events', 'count_if', ('event_type', 'new')),
+            ('expansion_events', 'count_if', ('event_type', 'expansion')),
+            ('churn_events', 'count_if', ('event_type', 'churn')),
+            ('total_mrr', 'sum', 'mrr_amount'),
+            ('total_arr', 'sum', 'arr'),
+            ('new_arr', 'sum_if', ('arr', 'event_type', 'new')),
+            ('expansion_arr', 'sum_if', ('arr', 'event_type', 'expansion')),
+            ('churned_arr', 'sum_if', ('arr', 'event_type', 'churn')),
+            ('total_contract_value', 'sum', 'contract_value'),
+            ('total_contract_months', 'sum', 'contract_length_months')
+        ]
+    },
+    'AGG_ADOPTIONS_FRAMEWORK_INDUSTRY': {
+        'source': 'adoptions',
+        'grain': [
+            ('framework_id', 'framework_id'),
+            ('framework_name', 'frameworks.framework_name'),
+            ('industry', 'customers.industry'),
+            ('compliance_maturity', 'customers.compliance_maturity')
+        ],
+        'measures': [
+            ('adoption_count', 'count', None),
+            ('certified_count', 'count_if', ('status', 'certified')),
+            ('completed_count', 'count_if', ('status', 'completed')),
+            ('total_hours_saved', 'sum', 'hours_saved'),
+            ('total_implementation_cost', 'sum', 'implementation_cost'),
+            ('total_automation_level', 'sum', 'automation_level'),
+            ('total_audit_score', 'sum', 'audit_score'),
+            ('audit_score_count', 'count_present', 'audit_score')
+        ]
+    },
+    'AGG_ACTIVITIES_WEEKLY': {
+        'source': 'activities',
+        'grain': [
+            ('activity_week', 'week(activity_date)'),
+            ('framework_id', 'framework_id'),
+            ('framework_name', 'frameworks.framework_name'),
+            ('activity_type', 'activity_type')
+        ],
+        'measures': [
+            ('activity_count', 'count', None),
+            ('automated_count', 'count_if', ('automated_flag', True)),
+            ('successful_count', 'count_if', ('success_flag', True)),
+            ('evidence_count', 'count_if', ('evidence_collected', True)),
+            ('total_duration_minutes', 'sum', 'duration_minutes')
+        ]
+    }
+}
+
+DATE_TRUNCATION_PATTERN = re.compile(r'^(month|week)\((\w+)\)$')
+
+def _truncate_date(unit: str) -> Callable[[str], str]:
+    cache = {}
+    def truncate(value: str) -> str:
+        if value not in cache:
+            date = datetime.strptime(value, DATE_FORMAT)
+            start = date.replace(day=1) if unit == 'month' else date - timedelta(days=date.weekday())
+            cache[value] = start.strftime(DATE_FORMAT)
+        return cache[value]
+    return truncate
+
+def compile_grain_column(source: str, lookups: Dict[str, Dict[Any, Dict[str, Any]]]) -> Callable[[Dict[str, Any]], Any]:
+    """Turn a grain column declaration into a row -> value function."""
+    truncation = DATE_TRUNCATION_PATTERN.match(source)
+    if truncation:
+        unit, field = truncation.groups()
+        truncate = _truncate_date(unit)
+        return lambda row: truncate(row[field])
+    if '.' in source:
+        lookup, field = source.split('.')
+        table, key = lookups[lookup], LOOKUP_KEYS[lookup]
+        return lambda row: table.get(row[key], {}).get(field)
+    return lambda row: row.get(source)
+
+def _row_value(name: str) -> Callable[[Dict[str, Any]], Any]:
+    return DERIVED_VALUES.get(name) or (lambda row: row.get(name))
+
+def compile_measure(kind: str, argument: Any) -> Callable[[Dict[str, Any]], Any]:
+    """Turn a measure declaration into a row -> increment function."""
+    if kind == 'count':
+        return lambda row: 1
+    if kind == 'count_if':
+        field, expected = argument
+        return lambda row: 1 if row.get(field) == expected else 0
+    if kind == 'count_present':
+        return lambda row: 0 if row.get(argument) is None else 1
+    if kind == 'sum':
+        value = _row_value(argument)
+        return lambda row: value(row) or 0
+    if kind == 'sum_if':
+        name, field, expected = argument
+        value = _row_value(name)
+        return lambda row: (value(row) or 0) if row.get(field) == expected else 0
+    raise ValueError(f"Unknown rollup measure kind: {kind}")
+
+class RollupAccumulator:
+    """Streaming GROUP BY for one rollup: add fact rows, then read aggregate rows."""
+
+    def __init__(self, name: str, lookups: Dict[str, Dict[Any, Dict[str, Any]]]):
+        spec = ROLLUP_SPECS[name]
+        self.name = name
+        self.source = spec['source']
+        self.grain_columns = [column for column, _ in spec['grain']]
+        self.measure_columns = [column for column, _, _ in spec['measures']]
+        self._key_functions = [compile_grain_column(source, lookups) for _, source in spec['grain']]
+        self._measure_functions = [compile_measure(kind, argument) for _, kind, argument in spec['measures']]
+        self.groups = {}
+
+    def add(self, row: Dict[str, Any]) -> None:
+        key = tuple(function(row) for function in self._key_functions)
+        totals = self.groups.get(key)
+        if totals is None:
+            totals = self.groups[key] = [0] * len(self._measure_functions)
+        for i, function in enumerate(self._measure_functions):
+            totals[i] += function(row)
+
+    def add_rows(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.add(row)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Aggregate rows in grain order."""
+        def sort_key(item):
+            return tuple((value is None, _sortable(value)) for value in item[0])
+        return [
+            {**dict(zip(self.grain_columns, key)), **dict(zip(self.measure_columns, totals))}
+            for key, totals in sorted(self.groups.items(), key=sort_key)
+        ]
+
+def _sortable(value: Any) -> Any:
+    # Dates sort chronologically rather than as MM/DD/YYYY strings
+    if isinstance(value, str) and len(value) == 10 and value[2] == '/' and value[5] == '/':
+        return (value[6:], value[:2], value[3:5])
+    return (value,) if value is not None else ('',)
+
+def build_lookups(customers: List[Dict[str, Any]], frameworks: List[Dict[str, Any]]) -> Dict[str, Dict[Any, Dict[str, Any]]]:
+    return {
+        'customers': {c['customer_id']: c for c in customers},
+        'frameworks': {f['framework_id']: f for f in frameworks}
+    }
+
+def create_rollups(source: str, customers: List[Dict[str, Any]],
+                   frameworks: List[Dict[str, Any]]) -> List[RollupAccumulator]:
+    """Accumulators for every rollup built from the given fact table."""
+    lookups = build_lookups(customers, frameworks)
+    return [RollupAccumulator(name, lookups) for name, spec in ROLLUP_SPECS.items() if spec['source'] == source]
+
+def write_rollups(rollups: List[RollupAccumulator], data_dir: str = '../data') -> Dict[str, int]:
+    """Write each rollup to <data_dir>/<NAME>.json; returns row counts."""
+    counts = {}
+    for rollup in rollups:
+        rows = rollup.rows()
+        with open(os.path.join(data_dir, f"{rollup.name}.json"), 'w') as f:
+            json.dump(rows, f, indent=2)
+        counts[rollup.name] = len(rows)
+    return counts
+
+def rebuild_rollups(data_dir: str = '../data', output_dir: Optional[str] = None) -> Dict[str, int]:
+    """Rebuild every rollup from existing fact files, one shard at a time."""
+    customers = load_table(data_dir, 'customers')
+    frameworks = load_json_data(os.path.join(data_dir, 'DIM_COMPLIANCE_FRAMEWORKS.json'))
+    counts = {}
+    for source in sorted({spec['source'] for spec in ROLLUP_SPECS.values()}):
+        rollups = create_rollups(source, customers, frameworks)
+        shards = table_shards(data_dir, source)
+        if not shards:
+            print(f"  ⚠️  No {source} data found - skipping {', '.join(r.name for r in rollups)}")
+            continue
+        for shard_path in shards:
+            rows = load_json_data(shard_path)
+            for rollup in rollups:
+                rollup.add_rows(rows)
+        counts.update(write_rollups(rollups, output_dir or data_dir))
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the pre-aggregated rollup tables from existing fact files.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--output-dir', default=None, help="Where to write the rollups (default: --data-dir)")
+    args = parser.parse_args()
+
+    print("🧮 Rebuilding rollup tables...")
+    counts = rebuild_rollups(args.data_dir, args.output_dir)
+    for name, count in counts.items():
+        print(f"  {name}: {count:,} rows")
+    print("🎉 Rollups complete!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Row-offset indexes and a memory-mapped random-access reader for the fact files.
+
+Looking up one customer's events or one adoption's activities used to mean
+json.load of the whole file. Each fact output now gets a '<file>.rowidx'
+sidecar mapping customer_id / adoption_id to byte ranges of the JSON file:
+1. The generators write the file through write_indexed_json, which emits
+   exactly the bytes json.dump(rows, f, indent=2) would and records where
+   every row starts and ends - no second pass
+2. Consecutive rows with the same key share one range, so an adoption's
+   activities (written together) are a single slice
+3. The sidecar is binary: a small JSON header, then per column a sorted
+   array of (key, start, end) records that RowIndexReader binary-searches
+   through mmap without loading the index
+
+A lookup is a bisect over the mapped records plus json.loads of just the
+matching slices of the memory-mapped data file. Indexes record the size
+and modification time of their data file and refuse to read a file that
+changed since. Dictionary-encoded files (encoded_output.py) have no byte
+offsets to index; lookups fall back to a column scan of their EncodedTable.
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import List, Dict, Any, Iterable, Tuple
+
+from encoded_output import EncodedTable
+from quality_checks import ENCODED_SUFFIX, load_json_data
+from sketches import table_shards
+
+INDEX_SUFFIX = '.rowidx'
+INDEX_MAGIC = b'ROWIDX1\n'
+
+# (key, start byte, end byte) of one run of rows
+RECORD = struct.Struct('<qQQ')
+HEADER_LENGTH = struct.Struct('<I')
+
+# Fact table -> columns indexed for random access
+INDEX_COLUMNS = {
+    'events': ['customer_id'],
+    'adoptions': ['customer_id', 'adoption_id'],
+    'activities': ['customer_id', 'adoption_id']
+}
+
+def index_path(data_path: str) -> str:
+    """Sidecar location for a data file or shard."""
+    return data_path + INDEX_SUFFIX
+
+def _add_run(runs: Dict[str, List[List[int]]], columns: List[str], row: Dict[str, Any], start: int, end: int,
+             previous: Dict[str, Any]) -> None:
+    for column in columns:
+        key = row.get(column)
+        if key is None:
+            continue
+        column_runs = runs[column]
+        # Extend the last run when this row continues it (same key, adjacent row)
+        if previous.get(column) == key and column_runs and column_runs[-1][0] == key:
+            column_runs[-1][2] = end
+        else:
+            column_runs.append([key, start, end])
+        previous[column] = key
+
+def write_index(data_path: str, runs: Dict[str, List[List[int]]], row_count: int) -> None:
+    """Write the binary sidecar for data_path from per-column (key, start, end) runs."""
+    stat = os.stat(data_path)
+    header = {'rows': row_count, 'source_size': stat.st_size, 'source_mtime_ns': stat.st_mtime_ns, 'columns': {}}
+    offset = 0
+    for column, column_runs in runs.items():
+        column_runs.sort()
+        header['columns'][column] = {'offset': offset, 'count': len(column_runs)}
+        offset += len(column_runs) * RECORD.size
+    encoded = json.dumps(header).encode('utf-8')
+    with open(index_path(data_path), 'wb') as f:
+        f.write(INDEX_MAGIC)
+        f.write(HEADER_LENGTH.pack(len(encoded)))
+        f.write(encoded)
+        for column_runs in runs.values():
+            f.write(b''.join(RECORD.pack(*run) for run in column_runs))
+
+def write_indexed_json(data_path: str, rows: Iterable[Dict[str, Any]], table: str) -> int:
+    """
+    Write rows like json.dump(rows, f, indent=2) and index them; returns the row count.
+
+    Rows may be any iterable (e.g. a merge of sorted runs) and are streamed
+    to the file. They are ASCII-encoded (json's default ensure_ascii), so
+    character and byte offsets agree.
+    """
+    columns = INDEX_COLUMNS[table]
+    runs = {column: [] for column in columns}
+    previous = {}
+    count = 0
+    with open(data_path, 'w') as f:
+        chunk = ['[']
+        position = 1
+        for row in rows:
+            text = ('\n  ' if count == 0 else ',\n  ') + json.dumps(row, indent=2).replace('\n', '\n  ')
+            start = position + (3 if count == 0 else 4)
+            position += len(text)
+            _add_run(runs, columns, row, start, position, previous)
+            chunk.append(text)
+            count += 1
+            if len(chunk) >= 10000:
+                f.write(''.join(chunk))
+                chunk = []
+        chunk.append('\n]' if count else ']')
+        f.write(''.join(chunk))
+    write_index(data_path, runs, count)
+    return count
+
+def build_row_index(data_path: str, table: str) -> int:
+    """Index an existing JSON array file of any formatting; returns the row count."""
+    if data_path.endswith(ENCODED_SUFFIX):
+        raise ValueError(f"{data_path} is dictionary-encoded: run encoded_output.py --decode to index it")
+    with open(data_path, 'rb') as f:
+        # latin-1 maps bytes 1:1 to characters, so decoder positions are byte offsets
+        text = f.read().decode('latin-1')
+    decoder = json.JSONDecoder()
+    columns = INDEX_COLUMNS[table]
+    runs = {column: [] for column in columns}
+    previous = {}
+    position = text.index('[') + 1
+    count = 0
+    while True:
+        while position < len(text) and text[position] in ' \t\r\n,':
+            position += 1
+        if position >= len(text) or text[position] == ']':
+            break
+        row, end = decoder.raw_decode(text, position)
+        _add_run(runs, columns, row, position, end, previous)
+        position = end
+        count += 1
+    write_index(data_path, runs, count)
+    return count
+
+class RowIndexReader:
+    """Random access to one indexed JSON file by customer_id / adoption_id."""
+
+    def __init__(self, data_path: str):
+        self.data_path = data_path
+        with open(index_path(data_path), 'rb') as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._index[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise ValueError(f"{index_path(data_path)} is not a row index")
+        start = len(INDEX_MAGIC) + HEADER_LENGTH.size
+        (length,) = HEADER_LENGTH.unpack_from(self._index, len(INDEX_MAGIC))
+        self.header = json.loads(self._index[start:start + length])
+        self._records_start = start + length
+        stat = os.stat(data_path)
+        if (stat.st_size, stat.st_mtime_ns) != (self.header['source_size'], self.header['source_mtime_ns']):
+            raise ValueError(f"{index_path(data_path)} is stale: {data_path} changed after it was indexed")
+        with open(data_path, 'rb') as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b''
+        self._views = {column: _RecordView(self._index, self._records_start + entry['offset'], entry['count'])
+                       for column, entry in self.header['columns'].items()}
+
+    def __enter__(self) -> 'RowIndexReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._index.close()
+
+    def ranges(self, column: str, key: int) -> List[Tuple[int, int]]:
+        """Byte ranges holding rows with column == key, in file order."""
+        if column not in self._views:
+            raise KeyError(f"{self.data_path} has no index on {column}")
+        view = self._views[column]
+        i = bisect.bisect_left(view, key)
+        ranges = []
+        while i < len(view) and view.key(i) == key:
+            ranges.append(view.span(i))
+            i += 1
+        return ranges
+
+    def rows(self, column: str, key: int) -> List[Dict[str, Any]]:
+        """Every row with column == key, parsing only their byte ranges."""
+        rows = []
+        for start, end in self.ranges(column, key):
+            rows.extend(json.loads(b'[' + self._data[start:end] + b']'))
+        return rows
+
+class EncodedScanReader:
+    """RowIndexReader stand-in for a dictionary-encoded file: scans one decoded column per lookup."""
+
+    def __init__(self, data_path: str):
+        self.data_path = data_path
+        self._table = EncodedTable.load(data_path)
+
+    def __enter__(self) -> 'EncodedScanReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        pass
+
+    def rows(self, column: str, key: int) -> List[Dict[str, Any]]:
+        """Every row with column == key, decoding only the matching rows."""
+        if column not in self._table.fields:
+            raise KeyError(f"{self.data_path} has no column {column}")
+        matches = [i for i, value in enumerate(self._table.column(column)) if value == key]
+        return [dict(self._table[i]) for i in matches]
+
+class _RecordView:
+    """Sequence of the keys of one column's mapped records, for bisect."""
+
+    def __init__(self, buffer: mmap.mmap, offset: int, count: int):
+        self._buffer = buffer
+        self._offset = offset
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> int:
+        return self.key(i)
+
+    def key(self, i: int) -> int:
+        return RECORD.unpack_from(self._buffer, self._offset + i * RECORD.size)[0]
+
+    def span(self, i: int) -> Tuple[int, int]:
+        _, start, end = RECORD.unpack_from(self._buffer, self._offset + i * RECORD.size)
+        return start, end
+
+def open_table(data_dir: str, table: str) -> List[Any]:
+    """
+    Readers for every data file of a fact table, building missing or stale
+    indexes; dictionary-encoded files get an EncodedScanReader instead.
+    """
+    readers = []
+    for path in table_shards(data_dir, table):
+        if path.endswith(ENCODED_SUFFIX):
+            readers.append(EncodedScanReader(path))
+            continue
+        try:
+            readers.append(RowIndexReader(path))
+        except (OSError, ValueError):
+            build_row_index(path, table)
+            readers.append(RowIndexReader(path))
+    return readers
+
+def lookup(data_dir: str, table: str, column: str, key: int) -> List[Dict[str, Any]]:
+    """One entity's rows from every data file of a table."""
+    rows = []
+    for reader in open_table(data_dir, table):
+        with reader:
+            rows.extend(reader.rows(column, key))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Build row-offset indexes and fetch one entity's fact rows.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--rebuild', action='store_true', help="Rebuild the index of every fact file")
+    parser.add_argument('--table', choices=sorted(INDEX_COLUMNS), default='events', help="Fact table to read")
+    parser.add_argument('--customer-id', type=int, default=None, help="Fetch this customer's rows")
+    parser.add_argument('--adoption-id', type=int, default=None, help="Fetch this adoption's rows")
+    parser.add_argument('--compare', action='store_true', help="Time the lookup against json.load of the whole table")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        for table in INDEX_COLUMNS:
+            for path in table_shards(args.data_dir, table):
+                if path.endswith(ENCODED_SUFFIX):
+                    print(f"⏭️  Skipped {path} (dictionary-encoded)")
+                    continue
+                count = build_row_index(path, table)
+                print(f"🗂️  Indexed {count:,} rows of {path}")
+
+    if args.customer_id is None and args.adoption_id is None:
+        return
+    column, key = ('adoption_id', args.adoption_id) if args.adoption_id is not None else ('customer_id', args.customer_id)
+    readers = open_table(args.data_dir, args.table)
+    start = time.perf_counter()
+    rows = [row for reader in readers for row in reader.rows(column, key)]
+    lookup_seconds = time.perf_counter() - start
+    for reader in readers:
+        reader.close()
+    print(json.dumps(rows, indent=2))
+    print(f"\n🔎 {len(rows)} {args.table} rows for {column} {key} in {lookup_seconds * 1e6:,.0f} µs", file=sys.stderr)
+
+    if args.compare:
+        start = time.perf_counter()
+        full = [row for path in table_shards(args.data_dir, args.table) for row in load_json_data(path)
+                if row.get(column) == key]
+        scan_seconds = time.perf_counter() - start
+        same = '✅ same rows' if full == rows else '❌ rows differ'
+        print(f"📚 Full json.load scan: {scan_seconds * 1e3:,.1f} ms ({scan_seconds / lookup_seconds:,.0f}x slower), {same}",
+              file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Slowly changing dimension (Type 2) history emitted by the generators.
+
+The fact files only keep each adoption's final status and imply tier
+changes through subscription events, so "how many adoptions were active on
+06/30/2023?" needs the history reconstructed. The generators know every
+transition as they create it and write it out as SCD2 rows instead:
+1. DIM_ADOPTION_STATUS_HISTORY - one version per adoption status
+   (active -> completed -> certified)
+2. DIM_CUSTOMER_TIER_HISTORY - one version per change of a customer's
+   product tier or subscription status (active / churned)
+
+Each version is valid from valid_from (inclusive) to valid_to (exclusive);
+the current version has valid_to = HIGH_DATE and is_current = True, so an
+as-of query is the single range predicate
+valid_from <= day AND valid_to > day.
+
+Run with --as-of MM/DD/YYYY for the same point-in-time answers locally
+(adoptions by status, customers by tier and status on that day), e.g. to
+check what the semantic views return for that filter.
+"""
+
+import argparse
+import json
+import os
+from collections import Counter
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from business_rules import DATE_FORMAT
+from quality_checks import load_json_data
+
+ADOPTION_STATUS_TABLE = 'DIM_ADOPTION_STATUS_HISTORY'
+CUSTOMER_TIER_TABLE = 'DIM_CUSTOMER_TIER_HISTORY'
+
+# valid_to of the current version
+HIGH_DATE = '12/31/9999'
+
+def _date_key(value: str) -> tuple:
+    return (value[6:], value[:2], value[3:5])
+
+def close_versions(versions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Number versions and set valid_to from the next version's valid_from.
+
+    Versions must be in change order; a version superseded on the day it
+    started is dropped so no zero-length versions are written.
+    """
+    kept = []
+    for version in versions:
+        if kept and kept[-1]['valid_from'] == version['valid_from']:
+            kept.pop()
+        kept.append(version)
+    for i, version in enumerate(kept):
+        last = i == len(kept) - 1
+        version['version'] = i + 1
+        version['valid_to'] = HIGH_DATE if last else kept[i + 1]['valid_from']
+        version['is_current'] = last
+    return kept
+
+def adoption_status_history(adoption: Dict[str, Any], certified_date: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Status versions of one adoption; certified_date is required for certified adoptions."""
+    base = {'adoption_id': adoption['adoption_id'], 'customer_id': adoption['customer_id'],
+            'framework_id': adoption['framework_id']}
+    versions = [dict(base, status='active', valid_from=adoption['start_date'])]
+    if adoption['status'] in ('completed', 'certified'):
+        versions.append(dict(base, status='completed', valid_from=adoption['completion_date']))
+    if adoption['status'] == 'certified':
+        if certified_date is None:
+            raise ValueError(f"Adoption {adoption['adoption_id']} is certified but has no certification date")
+        versions.append(dict(base, status='certified', valid_from=certified_date))
+    return close_versions(versions)
+
+def customer_tier_history(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Tier/status versions of one customer from their subscription events."""
+    versions = []
+    for event in sorted(events, key=lambda e: (_date_key(e['event_date']), e['event_id'])):
+        status = 'churned' if event['event_type'] == 'churn' else 'active'
+        if versions and (versions[-1]['product_tier'], versions[-1]['subscription_status']) == (event['product_tier'], status):
+            continue
+        versions.append({
+            'customer_id': event['customer_id'],
+            'product_tier': event['product_tier'],
+            'subscription_status': status,
+            'change_event_id': event['event_id'],
+            'change_event_type': event['event_type'],
+            'valid_from': event['event_date']
+        })
+    return close_versions(versions)
+
+def versions_as_of(rows: List[Dict[str, Any]], day: datetime) -> List[Dict[str, Any]]:
+    """Versions in effect on a day: valid_from <= day < valid_to."""
+    key = _date_key(day.strftime(DATE_FORMAT))
+    return [row for row in rows if _date_key(row['valid_from']) <= key < _date_key(row['valid_to'])]
+
+def write_history(table: str, rows: List[Dict[str, Any]], data_dir: str = '../data') -> int:
+    """Write one history table to <data_dir>/<TABLE>.json; returns the row count."""
+    with open(os.path.join(data_dir, f"{table}.json"), 'w') as f:
+        json.dump(rows, f, indent=2)
+    return len(rows)
+
+def point_in_time_counts(data_dir: str, day: datetime) -> Dict[str, Counter]:
+    """Adoptions per status and customers per (tier, status) in effect on a day."""
+    adoptions = versions_as_of(load_json_data(os.path.join(data_dir, f"{ADOPTION_STATUS_TABLE}.json")), day)
+    tiers = versions_as_of(load_json_data(os.path.join(data_dir, f"{CUSTOMER_TIER_TABLE}.json")), day)
+    return {
+        'adoption_status': Counter(row['status'] for row in adoptions),
+        'customer_tier': Counter((row['product_tier'], row['subscription_status']) for row in tiers)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Point-in-time adoption statuses and customer tiers from the SCD2 history tables.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--as-of', required=True, help="Day as MM/DD/YYYY")
+    args = parser.parse_args()
+
+    day = datetime.strptime(args.as_of, DATE_FORMAT)
+    counts = point_in_time_counts(args.data_dir, day)
+    print(f"📅 As of {args.as_of}")
+    print(f"\nAdoptions by status ({sum(counts['adoption_status'].values()):,}):")
+    for status, count in sorted(counts['adoption_status'].items()):
+        print(f"  {status}: {count:,}")
+    print(f"\nCustomers by tier ({sum(counts['customer_tier'].values()):,}):")
+    for (tier, status), count in sorted(counts['customer_tier'].items()):
+        print(f"  {tier} ({status}): {count:,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Scale-factor benchmark for the three semantic views.
+
+Loads the generated data into a local engine (local_engine.py), grows it to
+each scale factor by cloning customers and their facts with key offsets, and
+runs the README's sample business questions compiled from the semantic view
+definitions (semantic_views.py). For every question and scale factor it
+records query latency and the rows read by the tables the query touches, so
+data-shape changes that will slow Cortex Analyst down show up before shipping.
+
+With --baseline, latencies are compared against a previous --json-report and
+the run exits non-zero when any question slows down beyond --max-slowdown.
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+from local_engine import DERIVED_SQL, load_dataset, load_derived_tables, parse_setup_sql, scale_dataset
+from semantic_views import compile_query, load_semantic_views
+
+FINANCIAL = 'PHANTOM_SEC_FINANCIAL_ANALYTICS'
+COMPLIANCE = 'PHANTOM_SEC_COMPLIANCE_OPERATIONS'
+CUSTOMER_SUCCESS = 'PHANTOM_SEC_CUSTOMER_SUCCESS_ANALYTICS'
+
+# README sample questions expressed as semantic view requests
+BUSINESS_QUESTIONS = [
+    {
+        'id': 'arr_2024_by_segment',
+        'question': "What was our total ARR for 2024 and how does it break down by customer segment?",
+        'view': FINANCIAL,
+        'metrics': ['subscriptions.arr'],
+        'dimensions': ['customers.segment'],
+        'filters': ["subscriptions.event_date >= '2024-01-01'", "subscriptions.event_date <= '2024-12-31'"]
+    },
+    {
+        'id': 'mrr_by_sales_channel',
+        'question': "Which sales channels are driving the highest MRR growth?",
+        'view': FINANCIAL,
+        'metrics': ['subscriptions.total_mrr', 'subscriptions.expansion_arr'],
+        'dimensions': ['subscriptions.sales_channel'],
+        'filters': []
+    },
+    {
+        'id': 'enterprise_contract_value',
+        'question': "What's our average contract value for enterprise customers?",
+        'view': FINANCIAL,
+        'metrics': ['subscriptions.average_contract_value', 'subscriptions.median_mrr'],
+        'dimensions': [],
+        'filters': ["customers.segment = 'enterprise'"]
+    },
+    {
+        'id': 'soc2_automation',
+        'question': "How many SOC2 implementations do we have and what's the average automation level?",
+        'view': COMPLIANCE,
+        'metrics': ['adoptions.total_adoptions', 'adoptions.average_automation_level'],
+        'dimensions': ['frameworks.framework_name'],
+        'filters': ["frameworks.framework_name LIKE 'SOC2%'"]
+    },
+    {
+        'id': 'hours_saved_by_framework',
+        'question': "Which compliance frameworks show the best ROI in terms of hours saved?",
+        'view': COMPLIANCE,
+        'metrics': ['adoptions.total_hours_saved', 'adoptions.total_cost'],
+        'dimensions': ['frameworks.framework_name'],
+        'filters': []
+    },
+    {
+        'id': 'certification_by_maturity',
+        'question': "What's our certification success rate by customer maturity level?",
+        'view': COMPLIANCE,
+        'metrics': ['adoptions.total_adoptions', 'adoptions.average_audit_score'],
+        'dimensions': ['customers.compliance_maturity', 'adoptions.status'],
+        'filters': []
+    },
+    {
+        'id': 'activity_mix_by_risk',
+        'question': "How is compliance work split across activity types and risk levels?",
+        'view': COMPLIANCE,
+        'metrics': ['activities.total_activities', 'activities.average_duration'],
+        'dimensions': ['activities.activity_type', 'activities.risk_level'],
+        'filters': []
+    },
+    {
+        'id': 'customers_and_mrr_by_segment',
+        'question': "How many customers do we have in each segment and what's their total MRR?",
+        'view': CUSTOMER_SUCCESS,
+        'metrics': ['customers.total_customers', 'subscriptions.total_mrr'],
+        'dimensions': ['customers.segment'],
+        'filters': []
+    },
+    {
+        'id': 'automation_by_segment',
+        'question': "What's the relationship between automation levels and customer revenue?",
+        'view': CUSTOMER_SUCCESS,
+        'metrics': ['adoptions.average_automation_level', 'subscriptions.average_mrr'],
+        'dimensions': ['customers.segment'],
+        'filters': []
+    },
+    {
+        'id': 'hours_saved_by_segment',
+        'question': "Which customer segments achieve the most time savings from our platform?",
+        'view': CUSTOMER_SUCCESS,
+        'metrics': ['adoptions.total_hours_saved'],
+        'dimensions': ['customers.segment'],
+        'filters': []
+    },
+    {
+        'id': 'total_value_delivered',
+        'question': "What's the total value delivered to customers across all implementations?",
+        'view': CUSTOMER_SUCCESS,
+        'metrics': ['adoptions.total_hours_saved', 'activities.total_activities', 'subscriptions.total_mrr'],
+        'dimensions': [],
+        'filters': []
+    }
+]
+
+def table_columns(schema: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Physical table name -> column names, for qualifying metric expressions."""
+    return {definition['name']: [column for column, _ in definition['columns']] for definition in schema.values()}
+
+def compile_questions(views: Dict[str, Dict[str, Any]], columns: Dict[str, List[str]],
+                      questions: List[Dict[str, Any]] = BUSINESS_QUESTIONS) -> List[Dict[str, Any]]:
+    """Attach the compiled SQL to each business question."""
+    compiled = []
+    for question in questions:
+        sql = compile_query(views[question['view']], question['metrics'], question['dimensions'],
+                            question['filters'], columns)
+        compiled.append(dict(question, sql=sql))
+    return compiled
+
+def rows_read(sql: str, table_rows: Dict[str, int]) -> int:
+    """Rows in every table instance the query reads (each FROM/JOIN is a full scan locally)."""
+    return sum(rows * len(re.findall(rf'\b{name} AS\b', sql)) for name, rows in table_rows.items())
+
+def time_query(conn: Any, sql: str, repeat: int) -> Dict[str, Any]:
+    """Run a query `repeat` times; latency in milliseconds."""
+    latencies = []
+    result_rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result_rows = len(conn.execute(sql).fetchall())
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {
+        'min_ms': min(latencies),
+        'median_ms': statistics.median(latencies),
+        'max_ms': max(latencies),
+        'result_rows': result_rows
+    }
+
+def run_benchmark(data_dir: str = '../data', scale_factors: List[int] = (1, 10),
+                  engine: str = 'auto', repeat: int = 3, database: str = ':memory:',
+                  date_range: Optional[Tuple[str, str]] = None) -> Dict[str, Any]:
+    """
+    Load once, then grow the dataset through each scale factor and time every question.
+
+    With date_range, fact shards whose zone maps fall outside the window are not loaded.
+    Each factor is held in the database at once, so factors past 10 need a
+    database file rather than memory.
+    """
+    schema = parse_setup_sql()
+    derived = parse_setup_sql(DERIVED_SQL)
+    # Views also read the derived tables (MRR snapshots, ARR bridge, cohorts, rollups)
+    tables = {**schema, **derived}
+    questions = compile_questions(load_semantic_views(), table_columns(tables))
+
+    start = time.perf_counter()
+    conn, engine, _ = load_dataset(data_dir, engine, database=database, date_range=date_range)
+    load_derived_tables(conn, engine, data_dir, date_range=date_range)
+    load_seconds = time.perf_counter() - start
+
+    runs = []
+    current = 1
+    for factor in sorted(scale_factors):
+        if factor % current:
+            raise ValueError(f"Scale factor {factor} is not a multiple of {current}; use multiples such as 1,10,100")
+        start = time.perf_counter()
+        # Derived tables were built from the unscaled facts, so they grow with them
+        row_counts = scale_dataset(conn, schema, factor // current, derived=derived)
+        row_counts.update({table: conn.execute(f"SELECT COUNT(*) FROM {definition['name']}").fetchone()[0]
+                           for table, definition in derived.items()})
+        scale_seconds = time.perf_counter() - start
+        current = factor
+
+        table_rows = {tables[table]['name']: rows for table, rows in row_counts.items()}
+        results = []
+        for question in questions:
+            timing = time_query(conn, question['sql'], repeat)
+            timing['rows_read'] = rows_read(question['sql'], table_rows)
+            results.append({'id': question['id'], 'view': question['view'], **timing})
+        runs.append({
+            'scale_factor': factor,
+            'scale_seconds': scale_seconds,
+            'table_rows': row_counts,
+            'questions': results
+        })
+
+    return {
+        'engine': engine,
+        'load_seconds': load_seconds,
+        'date_range': list(date_range) if date_range else None,
+        'repeat': repeat,
+        'questions': [{'id': q['id'], 'question': q['question'], 'view': q['view'], 'sql': q['sql']}
+                      for q in questions],
+        'runs': runs
+    }
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], max_slowdown: float) -> List[str]:
+    """Questions whose median latency grew beyond max_slowdown at the same scale factor."""
+    previous = {
+        (run['scale_factor'], question['id']): question['median_ms']
+        for run in baseline.get('runs', []) for question in run['questions']
+    }
+    regressions = []
+    for run in report['runs']:
+        for question in run['questions']:
+            before = previous.get((run['scale_factor'], question['id']))
+            if before and question['median_ms'] > before * max_slowdown:
+                regressions.append(
+                    f"{question['id']} @ {run['scale_factor']}x: {before:.1f} ms -> {question['median_ms']:.1f} ms"
+                )
+    return regressions
+
+def print_benchmark_report(report: Dict[str, Any]) -> None:
+    print("📈 SEMANTIC VIEW SCALE-FACTOR BENCHMARK")
+    print("=" * 80)
+    print(f"Engine: {report['engine']} (initial load {report['load_seconds']:.2f}s, "
+          f"median of {report['repeat']} runs)")
+
+    for run in report['runs']:
+        rows = ', '.join(f"{table} {count:,}" for table, count in run['table_rows'].items())
+        print(f"\n📊 {run['scale_factor']}x  (scaled in {run['scale_seconds']:.2f}s: {rows})")
+        print("-" * 80)
+        print(f"{'question':<32} {'median ms':>10} {'max ms':>10} {'rows read':>14} {'ms/M rows':>10}")
+        for question in run['questions']:
+            per_million = question['median_ms'] / (question['rows_read'] / 1e6) if question['rows_read'] else 0
+            print(f"{question['id']:<32} {question['median_ms']:>10.1f} {question['max_ms']:>10.1f} "
+                  f"{question['rows_read']:>14,} {per_million:>10.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the semantic view business questions at several scale factors.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--scale-factors', default='1,10',
+                        help="Comma-separated scale factors, each a multiple of the previous "
+                             "(use --database for 100 and up)")
+    parser.add_argument('--engine', choices=['auto', 'duckdb', 'sqlite'], default='auto',
+                        help="Embedded engine (auto prefers duckdb, falls back to sqlite3)")
+    parser.add_argument('--database', default=':memory:',
+                        help="Database file for large scale factors (default: in memory)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per question (median is reported)")
+    parser.add_argument('--from', dest='start', default=None,
+                        help="Only load fact shards whose zone maps reach this YYYY-MM-DD date")
+    parser.add_argument('--to', dest='end', default=None,
+                        help="Only load fact shards whose zone maps start by this YYYY-MM-DD date")
+    parser.add_argument('--show-sql', action='store_true', help="Print the compiled SQL for each question")
+    parser.add_argument('--json-report', default=None, metavar='PATH', help="Write the results as JSON")
+    parser.add_argument('--baseline', default=None, metavar='PATH',
+                        help="Previous --json-report to compare median latencies against")
+    parser.add_argument('--max-slowdown', type=float, default=1.5,
+                        help="Allowed median latency ratio against the baseline")
+    args = parser.parse_args()
+
+    scale_factors = [int(factor) for factor in args.scale_factors.split(',')]
+    date_range = (args.start, args.end) if args.start or args.end else None
+    report = run_benchmark(args.data_dir, scale_factors, args.engine, args.repeat, args.database, date_range)
+
+    if args.show_sql:
+        for question in report['questions']:
+            print(f"-- {question['id']}: {question['question']}\n{question['sql']};\n")
+    print_benchmark_report(report)
+
+    if args.json_report:
+        with open(args.json_report, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = compare_to_baseline(report, json.load(f), args.max_slowdown)
+        if regressions:
+            print(f"\n⚠️  {len(regressions)} queries slowed down more than {args.max_slowdown:.1f}x:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("\n✅ No latency regressions against the baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Parse the Snowflake semantic view definitions and compile queries over them.
+
+parse_semantic_view reads one queries/semantic_view_*.sql file into its
+TABLES, RELATIONSHIPS, FACTS, DIMENSIONS and METRICS blocks. compile_query
+turns a request for metrics by dimensions (with optional filters) into plain
+SQL over the Bronze tables, the way Cortex Analyst would:
+1. Metrics are grouped by the logical table they belong to
+2. Each group aggregates from its own table, joined many-to-one along the
+   declared relationships to reach the requested dimensions and filters
+3. Groups are joined back together on the dimensions
+
+The generated SQL only uses the table aliases declared in the view, so it
+runs unchanged in Snowflake, DuckDB and sqlite.
+"""
+
+import glob
+import os
+import re
+from typing import List, Dict, Any, Optional, Tuple
+
+QUERIES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'queries')
+
+BLOCK_KEYWORDS = ['TABLES', 'RELATIONSHIPS', 'FACTS', 'DIMENSIONS', 'METRICS']
+CLAUSE_KEYWORDS = ['PRIMARY KEY', 'WITH SYNONYMS', 'COMMENT']
+
+VIEW_NAME_PATTERN = re.compile(r'CREATE OR REPLACE SEMANTIC VIEW (\w+)')
+TABLE_ENTRY_PATTERN = re.compile(r'^(\w+) AS (\w+)$')
+RELATIONSHIP_PATTERN = re.compile(r'^(\w+) AS\s+(\w+) \(([\w, ]+)\) REFERENCES (\w+)$')
+NAMED_EXPRESSION_PATTERN = re.compile(r'^(\w+)\.(\w+) AS\s+(.+)$', re.S)
+PRIMARY_KEY_PATTERN = re.compile(r'PRIMARY KEY \(([\w, ]+)\)')
+IDENTIFIER_PATTERN = re.compile(r'(?<![\w.])([a-z_][a-z0-9_]*)\b(?!\s*\()')
+
+def scan(text: str):
+    """Yield (index, char, depth) for characters outside string literals."""
+    depth = 0
+    in_quote = False
+    for index, char in enumerate(text):
+        if in_quote:
+            if char == "'":
+                in_quote = False
+            continue
+        if char == "'":
+            in_quote = True
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        yield index, char, depth
+
+def strip_comments(sql: str) -> str:
+    """Remove -- comments that are outside string literals."""
+    lines = []
+    for line in sql.split('\n'):
+        cut = len(line)
+        for index, char, _ in scan(line):
+            if char == '-' and line[index:index + 2] == '--':
+                cut = index
+                break
+        lines.append(line[:cut])
+    return '\n'.join(lines)
+
+def find_block(sql: str, keyword: str) -> Optional[str]:
+    """Body of a top-level `KEYWORD ( ... )` block, or None when absent."""
+    match = re.search(rf'\b{keyword}\s*\(', sql)
+    if match is None:
+        return None
+    start = match.end()
+    for index, char, depth in scan(sql[start:]):
+        if char == ')' and depth < 0:
+            return sql[start:start + index]
+    raise ValueError(f"Unbalanced parentheses in {keyword} block")
+
+def split_top_level(text: str, separator: str = ',') -> List[str]:
+    """Split on separators outside parentheses and string literals."""
+    parts = []
+    last = 0
+    for index, char, depth in scan(text):
+        if char == separator and depth == 0:
+            parts.append(text[last:index].strip())
+            last = index + 1
+    parts.append(text[last:].strip())
+    return [part for part in parts if part]
+
+def split_clauses(entry: str) -> Tuple[str, Dict[str, str]]:
+    """Split an entry into its head and trailing PRIMARY KEY/WITH SYNONYMS/COMMENT clauses."""
+    positions = []
+    for index, char, depth in scan(entry):
+        if depth != 0 or not char.isalpha() or (index and entry[index - 1].isalnum()):
+            continue
+        for keyword in CLAUSE_KEYWORDS:
+            if entry.startswith(keyword, index):
+                positions.append((index, keyword))
+    if not positions:
+        return entry.strip(), {}
+    head = entry[:positions[0][0]].strip()
+    clauses = {}
+    for i, (index, keyword) in enumerate(positions):
+        end = positions[i + 1][0] if i + 1 < len(positions) else len(entry)
+        clauses[keyword] = entry[index + len(keyword):end].strip().lstrip('=').strip()
+    return head, clauses
+
+def _synonyms(clause: Optional[str]) -> List[str]:
+    return re.findall(r"'([^']*)'", clause) if clause else []
+
+def _comment(clause: Optional[str]) -> Optional[str]:
+    if not clause:
+        return None
+    match = re.match(r"'((?:[^']|'')*)'", clause)
+    return match.group(1).replace("''", "'") if match else None
+
+def parse_semantic_view(path: str) -> Dict[str, Any]:
+    """Parse one CREATE SEMANTIC VIEW script."""
+    with open(path, 'r') as f:
+        sql = strip_comments(f.read())
+
+    name_match = VIEW_NAME_PATTERN.search(sql)
+    view = {
+        'name': name_match.group(1) if name_match else os.path.splitext(os.path.basename(path))[0],
+        'path': path,
+        'tables': {},
+        'relationships': [],
+        'facts': {},
+        'dimensions': {},
+        'metrics': {}
+    }
+
+    for entry in split_top_level(find_block(sql, 'TABLES') or ''):
+        head, clauses = split_clauses(entry)
+        match = TABLE_ENTRY_PATTERN.match(' '.join(head.split()))
+        if not match:
+            raise ValueError(f"Unrecognized TABLES entry in {path}: {head}")
+        alias, table = match.groups()
+        key_match = PRIMARY_KEY_PATTERN.search('PRIMARY KEY ' + clauses.get('PRIMARY KEY', ''))
+        view['tables'][alias] = {
+            'table': table,
+            'primary_key': [c.strip() for c in key_match.group(1).split(',')] if key_match else [],
+            'synonyms': _synonyms(clauses.get('WITH SYNONYMS')),
+            'comment': _comment(clauses.get('COMMENT'))
+        }
+
+    for entry in split_top_level(find_block(sql, 'RELATIONSHIPS') or ''):
+        match = RELATIONSHIP_PATTERN.match(' '.join(entry.split()))
+        if not match:
+            raise ValueError(f"Unrecognized RELATIONSHIPS entry in {path}: {entry}")
+        name, child, columns, parent = match.groups()
+        view['relationships'].append({
+            'name': name,
+            'child': child,
+            'columns': [c.strip() for c in columns.split(',')],
+            'parent': parent
+        })
+
+    for block in ('FACTS', 'DIMENSIONS', 'METRICS'):
+        for entry in split_top_level(find_block(sql, block) or ''):
+            head, clauses = split_clauses(entry)
+            match = NAMED_EXPRESSION_PATTERN.match(head)
+            if not match:
+                raise ValueError(f"Unrecognized {block} entry in {path}: {head}")
+            table, name, expression = match.groups()
+            view[block.lower()][f"{table}.{name}"] = {
+                'table': table,
+                'name': name,
+                'expression': ' '.join(expression.split()),
+                'synonyms': _synonyms(clauses.get('WITH SYNONYMS')),
+                'comment': _comment(clauses.get('COMMENT'))
+            }
+    return view
+
+def load_semantic_views(queries_dir: str = QUERIES_DIR) -> Dict[str, Dict[str, Any]]:
+    """Every semantic view in the queries directory, keyed by view name."""
+    views = {}
+    for path in sorted(glob.glob(os.path.join(queries_dir, 'semantic_view_*.sql'))):
+        view = parse_semantic_view(path)
+        views[view['name']] = view
+    return views
+
+def join_path(view: Dict[str, Any], base: str, target: str) -> Optional[List[Dict[str, Any]]]:
+    """Relationships leading many-to-one from base to target (breadth-first)."""
+    if base == target:
+        return []
+    frontier = [(base, [])]
+    seen = {base}
+    while frontier:
+        alias, path = frontier.pop(0)
+        for relationship in view['relationships']:
+            if relationship['child'] == alias and relationship['parent'] not in seen:
+                next_path = path + [relationship]
+                if relationship['parent'] == target:
+                    return next_path
+                seen.add(relationship['parent'])
+                frontier.append((relationship['parent'], next_path))
+    return None
+
+def reachable_tables(view: Dict[str, Any], base: str) -> List[str]:
+    """Logical tables whose dimensions can be used with metrics of `base`."""
+    return [alias for alias in view['tables'] if join_path(view, base, alias) is not None]
+
+def qualify_expression(expression: str, alias: str, columns: List[str]) -> str:
+    """Prefix bare column references with the metric's table alias."""
+    column_set = set(columns)
+    parts = re.split(r"('(?:[^']|'')*')", expression)
+    for i in range(0, len(parts), 2):
+        parts[i] = IDENTIFIER_PATTERN.sub(
+            lambda m: f"{alias}.{m.group(1)}" if m.group(1) in column_set else m.group(1), parts[i]
+        )
+    return ''.join(parts)
+
+def referenced_tables(expression: str, view: Dict[str, Any]) -> List[str]:
+    """Logical tables referenced as alias.column in an expression."""
+    aliases = []
+    for alias in re.findall(r'\b(\w+)\.\w+', expression):
+        if alias in view['tables'] and alias not in aliases:
+            aliases.append(alias)
+    return aliases
+
+def output_name(qualified_name: str) -> str:
+    return qualified_name.split('.')[-1]
+
+def _from_clause(view: Dict[str, Any], base: str, needed: List[str]) -> str:
+    joined = [base]
+    clause = f"{view['tables'][base]['table']} AS {base}"
+    for alias in needed:
+        path = join_path(view, base, alias)
+        if path is None:
+            raise ValueError(f"{alias} is not reachable from {base} in {view['name']}")
+        for relationship in path:
+            parent = relationship['parent']
+            if parent in joined:
+                continue
+            keys = view['tables'][parent]['primary_key']
+            condition = ' AND '.join(
+                f"{relationship['child']}.{column} = {parent}.{key}"
+                for column, key in zip(relationship['columns'], keys)
+            )
+            clause += f" LEFT JOIN {view['tables'][parent]['table']} AS {parent} ON {condition}"
+            joined.append(parent)
+    return clause
+
+def compile_query(view: Dict[str, Any], metrics: List[str], dimensions: Optional[List[str]] = None,
+                  filters: Optional[List[str]] = None, table_columns: Optional[Dict[str, List[str]]] = None,
+                  order_by_first_metric: bool = True, limit: Optional[int] = None) -> str:
+    """
+    SQL for metrics by dimensions over a semantic view.
+
+    table_columns maps physical table names to their columns, so bare column
+    references in metric expressions can be qualified; filters are SQL
+    predicates written against the view's table aliases.
+    """
+    dimensions = dimensions or []
+    filters = filters or []
+    table_columns = table_columns or {}
+    for name in metrics:
+        if name not in view['metrics']:
+            raise KeyError(f"Unknown metric {name} in {view['name']}")
+    for name in dimensions:
+        if name not in view['dimensions']:
+            raise KeyError(f"Unknown dimension {name} in {view['name']}")
+
+    # Group metrics by the logical table they aggregate over
+    groups = {}
+    for name in metrics:
+        groups.setdefault(view['metrics'][name]['table'], []).append(name)
+
+    dimension_outputs = [(view['dimensions'][name]['expression'], output_name(name)) for name in dimensions]
+    filter_tables = [alias for predicate in filters for alias in referenced_tables(predicate, view)]
+
+    subqueries = []
+    for base, names in groups.items():
+        columns = table_columns.get(view['tables'][base]['table'], [])
+        metric_outputs = [
+            (qualify_expression(view['metrics'][name]['expression'], base, columns), output_name(name))
+            for name in names
+        ]
+        needed = []
+        for expression, _ in dimension_outputs + metric_outputs:
+            needed.extend(referenced_tables(expression, view))
+        needed.extend(filter_tables)
+        needed = [alias for i, alias in enumerate(needed) if alias != base and alias not in needed[:i]]
+
+        select_list = ', '.join(f"{expression} AS {alias}" for expression, alias in dimension_outputs + metric_outputs)
+        sql = f"SELECT {select_list} FROM {_from_clause(view, base, needed)}"
+        if filters:
+            sql += " WHERE " + ' AND '.join(f"({predicate})" for predicate in filters)
+        if dimension_outputs:
+            sql += " GROUP BY " + ', '.join(expression for expression, _ in dimension_outputs)
+        subqueries.append((sql, [alias for _, alias in metric_outputs]))
+
+    dimension_aliases = [alias for _, alias in dimension_outputs]
+    if len(subqueries) == 1:
+        sql = subqueries[0][0]
+    else:
+        # Aggregate each table at its own grain, then join on the dimensions
+        select_list = [f"g0.{alias}" for alias in dimension_aliases]
+        from_clause = ''
+        for i, (subquery, metric_aliases) in enumerate(subqueries):
+            select_list.extend(f"g{i}.{alias}" for alias in metric_aliases)
+            if i == 0:
+                from_clause = f"({subquery}) g0"
+            elif dimension_aliases:
+                condition = ' AND '.join(f"g0.{alias} = g{i}.{alias}" for alias in dimension_aliases)
+                from_clause += f" LEFT JOIN ({subquery}) g{i} ON {condition}"
+            else:
+                from_clause += f" CROSS JOIN ({subquery}) g{i}"
+        sql = f"SELECT {', '.join(select_list)} FROM {from_clause}"
+
+    if dimension_aliases and order_by_first_metric:
+        sql += f" ORDER BY {output_name(metrics[0])} DESC"
+    if limit:
+        sql += f" LIMIT {limit}"
+    return sql
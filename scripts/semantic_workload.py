@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Concurrent workload generator for the three semantic views.
+
+Enumerates the metric x dimension x time-filter query space of every view
+(semantic_views.py), samples a reproducible workload of parameterized queries
+from it and replays the workload from thread pools of increasing size against
+a local engine loaded with the generated data (local_engine.py). Reports
+p50/p95/p99 latency and throughput per concurrency level, plus the join
+shapes whose tail latency degrades most as concurrency grows - a stand-in for
+many executives asking the agent questions at once.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Tuple
+
+from local_engine import DERIVED_SQL, connect, load_dataset, load_derived_tables, parse_setup_sql, scale_dataset
+from semantic_views import compile_query, load_semantic_views, reachable_tables
+
+TIME_WINDOW_YEARS = range(2021, 2025)
+PERCENTILES = [50, 95, 99]
+TABLE_REFERENCE_PATTERN = re.compile(r'(?:FROM|JOIN) \w+ AS (\w+)')
+
+def time_windows(years=TIME_WINDOW_YEARS) -> List[Tuple[str, str, str]]:
+    """(label, start, end-exclusive) for whole years and quarters."""
+    windows = []
+    for year in years:
+        windows.append((f"{year}", f"{year}-01-01", f"{year + 1}-01-01"))
+        for quarter in range(4):
+            start_month = quarter * 3 + 1
+            end = f"{year}-{start_month + 3:02d}-01" if quarter < 3 else f"{year + 1}-01-01"
+            windows.append((f"{year}-Q{quarter + 1}", f"{year}-{start_month:02d}-01", end))
+    return windows
+
+def date_columns(schema: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Physical table name -> DATE columns."""
+    return {
+        definition['name']: [column for column, column_type in definition['columns'] if column_type == 'DATE']
+        for definition in schema.values()
+    }
+
+def query_space(view: Dict[str, Any], dates: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+    """Every valid (metric, dimension, time dimension) combination of a view."""
+    def is_date(name):
+        alias, column = name.split('.')
+        return column in dates.get(view['tables'][alias]['table'], [])
+
+    space = []
+    for metric, definition in view['metrics'].items():
+        reachable = set(reachable_tables(view, definition['table']))
+        usable = [name for name in view['dimensions'] if name.split('.')[0] in reachable]
+        group_by = [None] + [name for name in usable if not is_date(name)]
+        time_dimensions = [None] + [name for name in usable if is_date(name)]
+        for dimension in group_by:
+            for time_dimension in time_dimensions:
+                space.append({'metric': metric, 'dimension': dimension, 'time_dimension': time_dimension})
+    return space
+
+def generate_workload(views: Dict[str, Dict[str, Any]], schema: Dict[str, Dict[str, Any]],
+                      count: int = 1000, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Sample `count` parameterized queries uniformly from all views' query spaces.
+
+    Time filters are bound as parameters, so queries sharing a metric,
+    dimension and time dimension share one SQL template.
+    """
+    rng = random.Random(seed)
+    columns = {definition['name']: [column for column, _ in definition['columns']] for definition in schema.values()}
+    dates = date_columns(schema)
+    windows = time_windows()
+
+    space = [
+        dict(combination, view=name)
+        for name, view in sorted(views.items())
+        for combination in query_space(view, dates)
+    ]
+    templates = {}
+    workload = []
+    for i in range(count):
+        combination = rng.choice(space)
+        key = (combination['view'], combination['metric'], combination['dimension'], combination['time_dimension'])
+        if key not in templates:
+            view = views[combination['view']]
+            dimensions = [combination['dimension']] if combination['dimension'] else []
+            filters = []
+            if combination['time_dimension']:
+                expression = view['dimensions'][combination['time_dimension']]['expression']
+                filters = [f"{expression} >= ?", f"{expression} < ?"]
+            sql = compile_query(view, [combination['metric']], dimensions, filters, columns)
+            templates[key] = {
+                'sql': sql,
+                'shape': '+'.join(sorted(set(TABLE_REFERENCE_PATTERN.findall(sql))))
+            }
+        label, params = 'all time', ()
+        if combination['time_dimension']:
+            label, start, end = rng.choice(windows)
+            params = (start, end)
+        workload.append({
+            'id': i,
+            'view': combination['view'],
+            'metric': combination['metric'],
+            'dimension': combination['dimension'],
+            'time_filter': f"{combination['time_dimension']} in {label}" if combination['time_dimension'] else None,
+            'sql': templates[key]['sql'],
+            'params': params,
+            'shape': templates[key]['shape']
+        })
+    return workload
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(p / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    summary = {f'p{p}_ms': percentile(ordered, p) for p in PERCENTILES}
+    summary['mean_ms'] = sum(ordered) / len(ordered) if ordered else 0.0
+    return summary
+
+def run_workload(workload: List[Dict[str, Any]], engine: str, conn: Any, database: str,
+                 threads: int) -> Dict[str, Any]:
+    """
+    Replay the workload from a pool of `threads` workers.
+
+    duckdb workers share the loaded database through per-thread cursors;
+    sqlite connections are thread-bound, so each worker opens its own
+    connection to the on-disk database.
+    """
+    local = threading.local()
+
+    def worker_connection():
+        # Released with the thread-local storage when the pool shuts down
+        if not hasattr(local, 'conn'):
+            local.conn = conn.cursor() if engine == 'duckdb' else connect('sqlite', database)[0]
+        return local.conn
+
+    def execute(query):
+        cursor = worker_connection()
+        start = time.perf_counter()
+        try:
+            cursor.execute(query['sql'], query['params']).fetchall()
+            error = None
+        except Exception as e:
+            error = str(e)
+        return query, (time.perf_counter() - start) * 1000, error
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(execute, workload))
+    wall_seconds = time.perf_counter() - start
+
+    by_shape = {}
+    errors = []
+    for query, latency, error in results:
+        if error:
+            errors.append({'id': query['id'], 'sql': query['sql'], 'error': error})
+            continue
+        by_shape.setdefault(query['shape'], []).append(latency)
+
+    latencies = [latency for _, latency, error in results if not error]
+    return {
+        'threads': threads,
+        'queries': len(workload),
+        'wall_seconds': wall_seconds,
+        'throughput_qps': len(workload) / wall_seconds if wall_seconds else 0.0,
+        **latency_summary(latencies),
+        'shapes': {shape: dict(latency_summary(values), queries=len(values)) for shape, values in by_shape.items()},
+        'errors': errors
+    }
+
+def degradation(runs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Join shapes ranked by p95 growth from the lowest to the highest concurrency."""
+    if len(runs) < 2:
+        return []
+    first, last = runs[0], runs[-1]
+    ranked = []
+    for shape, stats in last['shapes'].items():
+        baseline = first['shapes'].get(shape)
+        if baseline and baseline['p95_ms'] > 0:
+            ranked.append({
+                'shape': shape,
+                'queries': stats['queries'],
+                f"p95_ms_{first['threads']}_threads": baseline['p95_ms'],
+                f"p95_ms_{last['threads']}_threads": stats['p95_ms'],
+                'slowdown': stats['p95_ms'] / baseline['p95_ms']
+            })
+    return sorted(ranked, key=lambda item: item['slowdown'], reverse=True)
+
+def print_workload_report(report: Dict[str, Any], top: int = 10) -> None:
+    print("👥 SEMANTIC VIEW CONCURRENT WORKLOAD")
+    print("=" * 80)
+    print(f"Engine: {report['engine']} at {report['scale_factor']}x, {report['queries']:,} queries "
+          f"from {report['templates']} templates (query space {report['query_space']:,})")
+
+    print(f"\n{'threads':>8} {'qps':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'errors':>8}")
+    for run in report['runs']:
+        print(f"{run['threads']:>8} {run['throughput_qps']:>10.1f} {run['p50_ms']:>10.1f} "
+              f"{run['p95_ms']:>10.1f} {run['p99_ms']:>10.1f} {len(run['errors']):>8}")
+
+    if report['degradation']:
+        first, last = report['runs'][0]['threads'], report['runs'][-1]['threads']
+        print(f"\n🐢 Join shapes degrading most under concurrency (p95, {first} -> {last} threads)")
+        print("-" * 80)
+        for item in report['degradation'][:top]:
+            print(f"  {item['shape']:<40} {item[f'p95_ms_{first}_threads']:>9.1f} ms -> "
+                  f"{item[f'p95_ms_{last}_threads']:>9.1f} ms ({item['slowdown']:.1f}x, {item['queries']} queries)")
+
+    for run in report['runs']:
+        for error in run['errors'][:3]:
+            print(f"\n❌ Query {error['id']} failed at {run['threads']} threads: {error['error']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a generated semantic view workload concurrently.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--engine', choices=['auto', 'duckdb', 'sqlite'], default='auto',
+                        help="Embedded engine (auto prefers duckdb, falls back to sqlite3)")
+    parser.add_argument('--database', default=None,
+                        help="Database file to load into (default: a temporary file)")
+    parser.add_argument('--scale-factor', type=int, default=1, help="Grow the loaded data this many times")
+    parser.add_argument('--queries', type=int, default=1000, help="Number of queries in the workload")
+    parser.add_argument('--threads', default='1,4,16', help="Comma-separated thread pool sizes to replay with")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for workload sampling")
+    parser.add_argument('--json-report', default=None, metavar='PATH', help="Write the results as JSON")
+    args = parser.parse_args()
+
+    schema = parse_setup_sql()
+    # Rollup view tables are typed from the derived table DDL
+    query_schema = {**schema, **parse_setup_sql(DERIVED_SQL)}
+    views = load_semantic_views()
+    workload = generate_workload(views, query_schema, args.queries, args.seed)
+
+    database = args.database
+    temporary = database is None
+    if temporary:
+        handle, database = tempfile.mkstemp(suffix='.db', prefix='semantic_workload_')
+        os.close(handle)
+        os.remove(database)
+
+    try:
+        conn, engine, _ = load_dataset(args.data_dir, args.engine, database=database)
+        load_derived_tables(conn, engine, args.data_dir)
+        if args.scale_factor > 1:
+            # Derived tables were built from the unscaled facts, so they grow with them
+            scale_dataset(conn, schema, args.scale_factor, derived=parse_setup_sql(DERIVED_SQL))
+        conn.commit()
+
+        runs = [run_workload(workload, engine, conn, database, int(threads)) for threads in args.threads.split(',')]
+        conn.close()
+    finally:
+        if temporary:
+            for path in (database, database + '.wal'):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    report = {
+        'engine': engine,
+        'scale_factor': args.scale_factor,
+        'queries': len(workload),
+        'templates': len({query['sql'] for query in workload}),
+        'query_space': sum(len(query_space(view, date_columns(query_schema))) for view in views.values()),
+        'runs': runs,
+        'degradation': degradation(runs)
+    }
+    print_workload_report(report)
+
+    if args.json_report:
+        with open(args.json_report, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+"""
+Mergeable sketches for dataset-level distribution checks.
+
+Three small, serializable sketches replace the exact sets and lists the
+quality checks build today:
+1. HyperLogLog - distinct counts (unique customers/adoptions per table)
+2. t-digest - quantiles of duration_minutes by activity type and of mrr_amount
+3. Count-min - frequencies of categorical columns (activity_type, control_category, ...)
+
+Each output file or shard gets a sidecar '<shard>.sketch' holding its
+sketches as JSON. Dataset-level QA merges the sidecars instead of rescanning
+the rows, and sketch_checks turns the merged sketches into issues: distinct
+customers per table against DIM_CUSTOMERS within the HLL error bound,
+activity category shares against the generated mix, and median activity
+durations against the expected thresholds.
+"""
+
+import argparse
+import array
+import base64
+import bisect
+import hashlib
+import json
+import math
+import os
+import zlib
+from typing import List, Dict, Any, Iterable, Optional
+
+from business_rules import ACTIVITY_TYPE_MIX, CONTROL_CATEGORY_MIX, EXPECTED_DURATION_MINUTES, RISK_LEVEL_MIX
+from quality_checks import TABLE_FILES, finish_quality_run, load_json_data, print_quality_report, table_paths
+
+SIDECAR_SUFFIX = '.sketch'
+
+def hash64(value: Any) -> int:
+    """Stable 64-bit hash of a value's string form."""
+    digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8)
+    return int.from_bytes(digest.digest(), 'big')
+
+def pack_bytes(data: bytes) -> str:
+    """Compress and base64-encode a sketch's raw buffer for JSON sidecars."""
+    return base64.b64encode(zlib.compress(data)).decode('ascii')
+
+def unpack_bytes(text: str) -> bytes:
+    """Inverse of pack_bytes."""
+    return zlib.decompress(base64.b64decode(text))
+
+class HyperLogLog:
+    """HyperLogLog distinct counter with 2**precision registers."""
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: Any) -> None:
+        h = hash64(value)
+        index = h >> (64 - self.precision)
+        remaining = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def count(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        # Linear counting is more accurate while many registers are still empty
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return raw
+
+    def relative_error(self) -> float:
+        """Standard error of count() relative to the true distinct count."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'type': 'hll',
+            'precision': self.precision,
+            'registers': pack_bytes(bytes(self.registers))
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HyperLogLog':
+        sketch = cls(data['precision'])
+        sketch.registers = bytearray(unpack_bytes(data['registers']))
+        return sketch
+
+class TDigest:
+    """Merging t-digest for streaming quantile estimates."""
+
+    def __init__(self, compression: float = 100):
+        self.compression = compression
+        self.means = []
+        self.weights = []
+        self.buffer = []
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        self.buffer.append((float(value), weight))
+        self.total += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self.buffer) >= 20 * self.compression:
+            self._compress()
+
+    def _compress(self) -> None:
+        points = sorted(list(zip(self.means, self.weights)) + self.buffer)
+        self.buffer = []
+        if not points:
+            return
+        means, weights = [], []
+        cumulative = 0.0
+        current_mean, current_weight = points[0]
+        for mean, weight in points[1:]:
+            proposed = current_weight + weight
+            q = (cumulative + proposed / 2) / self.total
+            # Centroids near the tails stay small, so extreme quantiles stay accurate
+            limit = 4 * self.total * q * (1 - q) / self.compression
+            if proposed <= max(limit, 1.0):
+                current_mean += (mean - current_mean) * weight / proposed
+                current_weight = proposed
+            else:
+                means.append(current_mean)
+                weights.append(current_weight)
+                cumulative += current_weight
+                current_mean, current_weight = mean, weight
+        means.append(current_mean)
+        weights.append(current_weight)
+        self.means, self.weights = means, weights
+
+    def merge(self, other: 'TDigest') -> None:
+        other._compress()
+        self.buffer.extend(zip(other.means, other.weights))
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def quantile(self, q: float) -> Optional[float]:
+        self._compress()
+        if not self.means:
+            return None
+        if len(self.means) == 1:
+            return self.means[0]
+        target = q * self.total
+        # Interpolate between centroid midpoints, anchored at the observed min/max
+        cumulative = 0.0
+        positions = []
+        for weight in self.weights:
+            positions.append(cumulative + weight / 2)
+            cumulative += weight
+        if target <= positions[0]:
+            return self.min + (self.means[0] - self.min) * (target / positions[0] if positions[0] else 0)
+        if target >= positions[-1]:
+            tail = self.total - positions[-1]
+            return self.means[-1] + (self.max - self.means[-1]) * ((target - positions[-1]) / tail if tail else 0)
+        i = bisect.bisect_right(positions, target)
+        left, right = positions[i - 1], positions[i]
+        fraction = (target - left) / (right - left)
+        return self.means[i - 1] + (self.means[i] - self.means[i - 1]) * fraction
+
+    def mean(self) -> Optional[float]:
+        self._compress()
+        if not self.total:
+            return None
+        return sum(m * w for m, w in zip(self.means, self.weights)) / self.total
+
+    def to_dict(self) -> Dict[str, Any]:
+        self._compress()
+        return {
+            'type': 'tdigest',
+            'compression': self.compression,
+            'min': self.min if self.total else None,
+            'max': self.max if self.total else None,
+            'centroids': [[m, w] for m, w in zip(self.means, self.weights)]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TDigest':
+        sketch = cls(data['compression'])
+        sketch.means = [c[0] for c in data['centroids']]
+        sketch.weights = [c[1] for c in data['centroids']]
+        sketch.total = sum(sketch.weights)
+        if data['min'] is not None:
+            sketch.min, sketch.max = data['min'], data['max']
+        return sketch
+
+class CountMinSketch:
+    """
+    Count-min sketch for categorical frequencies.
+
+    Up to max_keys distinct keys are remembered so the categories of
+    low-cardinality columns can be listed without a separate scan.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4, max_keys: int = 64):
+        self.width = width
+        self.depth = depth
+        self.max_keys = max_keys
+        self.table = [array.array('Q', [0]) * width for _ in range(depth)]
+        self.keys = set()
+        self.total = 0
+        self._slot_cache = {}
+
+    def _slots(self, key: Any) -> List[int]:
+        slots = self._slot_cache.get(key)
+        if slots is None:
+            # Double hashing derives all rows from one 64-bit hash
+            h = hash64(key)
+            h1, h2 = h >> 32, (h & 0xFFFFFFFF) | 1
+            slots = [(h1 + row * h2) % self.width for row in range(self.depth)]
+            if len(self._slot_cache) < 4096:
+                self._slot_cache[key] = slots
+        return slots
+
+    def add(self, key: Any, count: int = 1) -> None:
+        for row, slot in enumerate(self._slots(key)):
+            self.table[row][slot] += count
+        self.total += count
+        if len(self.keys) < self.max_keys:
+            self.keys.add(str(key))
+
+    def estimate(self, key: Any) -> int:
+        return min(self.table[row][slot] for row, slot in enumerate(self._slots(key)))
+
+    def frequencies(self) -> Dict[str, int]:
+        return {key: self.estimate(key) for key in sorted(self.keys)}
+
+    def merge(self, other: 'CountMinSketch') -> None:
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge count-min sketches with different dimensions")
+        for row in range(self.depth):
+            self.table[row] = array.array('Q', (a + b for a, b in zip(self.table[row], other.table[row])))
+        self.total += other.total
+        for key in sorted(other.keys):
+            if len(self.keys) >= self.max_keys:
+                break
+            self.keys.add(key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'type': 'countmin',
+            'width': self.width,
+            'depth': self.depth,
+            'max_keys': self.max_keys,
+            'total': self.total,
+            'keys': sorted(self.keys),
+            'table': [pack_bytes(row.tobytes()) for row in self.table]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CountMinSketch':
+        sketch = cls(data['width'], data['depth'], data['max_keys'])
+        sketch.table = [array.array('Q', unpack_bytes(row)) for row in data['table']]
+        sketch.total = data['total']
+        sketch.keys = set(data['keys'])
+        return sketch
+
+SKETCH_TYPES = {
+    'hll': HyperLogLog,
+    'tdigest': TDigest,
+    'countmin': CountMinSketch
+}
+
+# Sketches kept per table: name -> (sketch type, column, optional group-by column)
+TABLE_SKETCHES = {
+    'customers': {
+        'distinct_customers': ('hll', 'customer_id', None),
+        'segment_frequency': ('countmin', 'segment', None)
+    },
+    'events': {
+        'distinct_customers': ('hll', 'customer_id', None),
+        'mrr_amount': ('tdigest', 'mrr_amount', None),
+        'mrr_amount_by_tier': ('tdigest', 'mrr_amount', 'product_tier'),
+        'event_type_frequency': ('countmin', 'event_type', None)
+    },
+    'adoptions': {
+        'distinct_customers': ('hll', 'customer_id', None),
+        'distinct_adoptions': ('hll', 'adoption_id', None),
+        'status_frequency': ('countmin', 'status', None)
+    },
+    'activities': {
+        'distinct_customers': ('hll', 'customer_id', None),
+        'distinct_adoptions': ('hll', 'adoption_id', None),
+        'duration_by_type': ('tdigest', 'duration_minutes', 'activity_type'),
+        'activity_type_frequency': ('countmin', 'activity_type', None),
+        'control_category_frequency': ('countmin', 'control_category', None),
+        'risk_level_frequency': ('countmin', 'risk_level', None)
+    }
+}
+
+# Count-min sketches checked against a generated mix: (table, sketch) -> expected shares
+EXPECTED_MIX = {
+    ('activities', 'activity_type_frequency'): ACTIVITY_TYPE_MIX,
+    ('activities', 'control_category_frequency'): CONTROL_CATEGORY_MIX,
+    ('activities', 'risk_level_frequency'): RISK_LEVEL_MIX
+}
+
+# Absolute share difference tolerated between a category's frequency and its expected share
+MIX_TOLERANCE = 0.05
+
+# HLL estimates may differ from the true count by this many standard errors
+HLL_ERROR_SIGMAS = 3
+
+class SketchAccumulator:
+    """Every configured sketch for one table (or shard), fed rows as they stream past."""
+
+    def __init__(self, table: str):
+        self.table = table
+        self.specs = TABLE_SKETCHES[table]
+        self.row_count = 0
+        self.sketches = {}
+        for name, (kind, _, group_by) in self.specs.items():
+            self.sketches[name] = {} if group_by else SKETCH_TYPES[kind]()
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.row_count += 1
+        for name, (kind, column, group_by) in self.specs.items():
+            value = row.get(column)
+            if value is None:
+                continue
+            target = self.sketches[name]
+            if group_by:
+                group = str(row.get(group_by, 'unknown'))
+                if group not in target:
+                    target[group] = SKETCH_TYPES[kind]()
+                target = target[group]
+            target.add(value)
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.add(row)
+
+    def result(self) -> Dict[str, Any]:
+        return {'table': self.table, 'row_count': self.row_count, 'sketches': self.sketches}
+
+def build_table_sketches(table: str, rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build every configured sketch for one table (or shard) in a single pass."""
+    accumulator = SketchAccumulator(table)
+    accumulator.add_rows(rows)
+    return accumulator.result()
+
+def serialize_sketches(built: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert built sketches to a JSON-serializable dict."""
+    sketches = {}
+    for name, sketch in built['sketches'].items():
+        if isinstance(sketch, dict):
+            sketches[name] = {group: s.to_dict() for group, s in sketch.items()}
+        else:
+            sketches[name] = sketch.to_dict()
+    return {'table': built['table'], 'row_count': built['row_count'], 'sketches': sketches}
+
+def deserialize_sketches(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild sketch objects from a sidecar dict."""
+    sketches = {}
+    for name, sketch in data['sketches'].items():
+        if 'type' in sketch:
+            sketches[name] = SKETCH_TYPES[sketch['type']].from_dict(sketch)
+        else:
+            sketches[name] = {group: SKETCH_TYPES[s['type']].from_dict(s) for group, s in sketch.items()}
+    return {'table': data['table'], 'row_count': data['row_count'], 'sketches': sketches}
+
+def copy_sketch(sketch: Any) -> Any:
+    """Independent copy of a sketch via its serialized form."""
+    data = sketch.to_dict()
+    return SKETCH_TYPES[data['type']].from_dict(data)
+
+def merge_table_sketches(parts: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Merge the sketches of several shards of the same table."""
+    if not parts:
+        return None
+    merged = deserialize_sketches(serialize_sketches(parts[0]))
+    for part in parts[1:]:
+        merged['row_count'] += part['row_count']
+        for name, sketch in part['sketches'].items():
+            if isinstance(sketch, dict):
+                groups = merged['sketches'][name]
+                for group, s in sketch.items():
+                    if group in groups:
+                        groups[group].merge(s)
+                    else:
+                        groups[group] = copy_sketch(s)
+            else:
+                merged['sketches'][name].merge(sketch)
+    return merged
+
+def sidecar_path(shard_path: str) -> str:
+    """Sidecar location for a data file or shard."""
+    return shard_path + SIDECAR_SUFFIX
+
+def table_shards(data_dir: str, table: str) -> List[str]:
+    """Data files of a table: every shard of a shard directory, or the single file."""
+    return table_paths(data_dir, TABLE_FILES[table])
+
+def write_sketch_sidecar(shard_path: str, table: str, rows: Optional[List[Dict[str, Any]]] = None,
+                         built: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build sketches for one shard (unless already built) and write them next to it."""
+    if built is None:
+        if rows is None:
+            rows = load_json_data(shard_path)
+        built = build_table_sketches(table, rows)
+    with open(sidecar_path(shard_path), 'w') as f:
+        json.dump(serialize_sketches(built), f)
+    return built
+
+def load_dataset_sketches(data_dir: str, build_missing: bool = True) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Merge every table's shard sidecars, building any that are missing or stale."""
+    dataset = {}
+    for table in TABLE_SKETCHES:
+        parts = []
+        for shard_path in table_shards(data_dir, table):
+            sidecar = sidecar_path(shard_path)
+            fresh = os.path.exists(sidecar) and os.path.getmtime(sidecar) >= os.path.getmtime(shard_path)
+            if fresh:
+                with open(sidecar, 'r') as f:
+                    parts.append(deserialize_sketches(json.load(f)))
+            elif build_missing:
+                parts.append(write_sketch_sidecar(shard_path, table))
+        dataset[table] = merge_table_sketches(parts)
+    return dataset
+
+def summarize_dataset_sketches(dataset: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Derive the QA metrics that the exact checks compute from sets and lists."""
+    summary = {}
+    for table, merged in dataset.items():
+        if merged is None:
+            continue
+        table_summary = {'row_count': merged['row_count']}
+        for name, sketch in merged['sketches'].items():
+            if isinstance(sketch, HyperLogLog):
+                table_summary[name] = round(sketch.count())
+            elif isinstance(sketch, CountMinSketch):
+                table_summary[name] = sketch.frequencies()
+            elif isinstance(sketch, TDigest):
+                table_summary[name] = {'p50': sketch.quantile(0.5), 'p95': sketch.quantile(0.95),
+                                       'mean': sketch.mean()}
+            else:
+                table_summary[name] = {
+                    group: {'p50': s.quantile(0.5), 'p95': s.quantile(0.95), 'mean': s.mean()}
+                    for group, s in sorted(sketch.items())
+                }
+        summary[table] = table_summary
+    return summary
+
+def sketch_checks(dataset: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Check the merged sketches against DIM_CUSTOMERS, the generated activity mix and the duration thresholds."""
+    customers = dataset['customers']['row_count'] if dataset.get('customers') else 0
+
+    # Every customer has events, adoptions and activities, and no table may reference unknown ones
+    distinct = {'table': 'DISTINCT CUSTOMERS (HyperLogLog)', 'customers': customers, 'estimates': {}, 'issues': []}
+    for table, merged in dataset.items():
+        if merged is None:
+            continue
+        sketch = merged['sketches']['distinct_customers']
+        estimate = round(sketch.count())
+        bound = HLL_ERROR_SIGMAS * sketch.relative_error()
+        distinct['estimates'][table] = estimate
+        if abs(estimate - customers) > bound * customers:
+            distinct['issues'].append(f"{TABLE_FILES[table]} has ~{estimate:,} distinct customers, "
+                                      f"DIM_CUSTOMERS has {customers:,} (HLL bound ±{bound:.1%})")
+
+    mix = {'table': 'ACTIVITY MIX (count-min)', 'shares': {}, 'issues': []}
+    for (table, name), expected in EXPECTED_MIX.items():
+        merged = dataset.get(table)
+        if merged is None or not merged['sketches'][name].total:
+            continue
+        sketch = merged['sketches'][name]
+        shares = {key: count / sketch.total for key, count in sketch.frequencies().items()}
+        mix['shares'][name] = shares
+        column = TABLE_SKETCHES[table][name][1]
+        for key in sorted(set(shares) | set(expected)):
+            share, target = shares.get(key, 0.0), expected.get(key, 0.0)
+            if abs(share - target) > MIX_TOLERANCE:
+                mix['issues'].append(f"{column} '{key}' is {share:.1%} of activities, "
+                                     f"expected {target:.0%} ± {MIX_TOLERANCE:.0%}")
+
+    durations = {'table': 'ACTIVITY DURATIONS (t-digest)', 'medians': {}, 'issues': []}
+    by_type = dataset['activities']['sketches']['duration_by_type'] if dataset.get('activities') else {}
+    for activity_type, (low, high) in EXPECTED_DURATION_MINUTES.items():
+        digest = by_type.get(activity_type)
+        if digest is None:
+            continue
+        median = digest.quantile(0.5)
+        durations['medians'][activity_type] = median
+        if not low <= median <= high:
+            expected = f"{low}-{high} min" if high != math.inf else f">= {low} min"
+            durations['issues'].append(f"Median {activity_type} duration {median:.0f} min, expected {expected}")
+
+    return {'distinct_customers': distinct, 'activity_mix': mix, 'duration_quantiles': durations}
+
+def print_sketch_summary(summary: Dict[str, Any]) -> None:
+    """Print the sketch-derived dataset metrics."""
+    print("📐 SKETCH-BASED DATASET SUMMARY")
+    print("=" * 80)
+    for table, metrics in summary.items():
+        print(f"\n📊 {TABLE_FILES[table]}")
+        print("-" * 50)
+        for name, value in metrics.items():
+            if isinstance(value, dict):
+                print(f"{name}:")
+                for key, item in value.items():
+                    if isinstance(item, dict):
+                        print(f"  {key}: p50={item['p50']:.1f} p95={item['p95']:.1f} mean={item['mean']:.1f}")
+                    else:
+                        print(f"  {key}: {item}")
+            else:
+                print(f"{name}: {value:,}")
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Build and merge per-shard sketches for dataset-level QA.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--rebuild', action='store_true', help="Rebuild every sidecar before merging")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        for table in TABLE_SKETCHES:
+            for shard_path in table_shards(args.data_dir, table):
+                write_sketch_sidecar(shard_path, table)
+
+    dataset = load_dataset_sketches(args.data_dir)
+    run = {
+        'data_dir': args.data_dir,
+        'tables': {table: merged['row_count'] if merged else 0 for table, merged in dataset.items()},
+        'results': {},
+        'timings': {}
+    }
+    if dataset['customers'] is None:
+        print("❌ Could not load customer data. Exiting.")
+        return run
+
+    print_sketch_summary(summarize_dataset_sketches(dataset))
+    run['results'] = sketch_checks(dataset)
+    print()
+    print_quality_report(list(run['results'].values()))
+    return run
+
+if __name__ == "__main__":
+    finish_quality_run(main())
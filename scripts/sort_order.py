@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Sort orders for the fact output, implemented as an external merge sort.
+
+Activities are generated adoption by adoption and events customer by
+customer, so dates are scattered across the file and Snowflake cannot prune
+micro-partitions on them after a load. The fact writers take a sort order:
+- generated: generation order (the default)
+- date: by the table's date column
+- customer: by customer_id, then date
+- clustered: by month of the date column, then customer_id and date, which
+  keeps month pruning and groups each customer's rows within a month
+
+The sort itself never holds more than one run in memory:
+1. ExternalSorter.add buffers rows and, every run_rows rows, sorts the buffer
+   and spills it to a temporary NDJSON run file
+2. sorted_rows() merges the runs with a heap (heapq.merge), reading one row
+   per run at a time, and streams the result to the writer
+The generators feed their batches to fact_partitions.FactTableWriter as they
+are generated, which adds them straight to an ExternalSorter, so runs spill
+while generation is still going and no full list of the table is kept.
+Ties are broken by the table's id column, so every order is deterministic.
+"""
+
+import argparse
+import heapq
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional
+
+from incremental_checks import PARTITION_DATE_COLUMNS
+from quality_checks import load_table
+
+SORT_ORDERS = ['generated', 'date', 'customer', 'clustered']
+DEFAULT_RUN_ROWS = 100000
+
+ID_COLUMNS = {
+    'events': 'event_id',
+    'adoptions': 'adoption_id',
+    'activities': 'activity_id'
+}
+
+def date_key(value: Any) -> str:
+    """YYYYMMDD of an MM/DD/YYYY date; missing or malformed dates sort last."""
+    if isinstance(value, str) and len(value) == 10:
+        return value[6:10] + value[0:2] + value[3:5]
+    return '99999999'
+
+def sort_key(table: str, order: str) -> Optional[Callable[[Dict[str, Any]], tuple]]:
+    """Key function of a sort order, or None for generation order."""
+    if order == 'generated':
+        return None
+    date_column = PARTITION_DATE_COLUMNS[table]
+    id_column = ID_COLUMNS[table]
+    if order == 'date':
+        return lambda row: (date_key(row.get(date_column)), row.get(id_column) or 0)
+    if order == 'customer':
+        return lambda row: (row.get('customer_id') or 0, date_key(row.get(date_column)), row.get(id_column) or 0)
+    if order == 'clustered':
+        def clustered(row):
+            day = date_key(row.get(date_column))
+            return day[:6], row.get('customer_id') or 0, day, row.get(id_column) or 0
+        return clustered
+    raise ValueError(f"Unknown sort order {order} (choose from {', '.join(SORT_ORDERS)})")
+
+class ExternalSorter:
+    """Bounded-memory sort: sorted runs spilled to disk, merged with a heap."""
+
+    def __init__(self, key: Callable[[Dict[str, Any]], tuple], run_rows: int = DEFAULT_RUN_ROWS,
+                 temp_dir: Optional[str] = None):
+        self.key = key
+        self.run_rows = run_rows
+        self.temp_dir = temp_dir
+        self.buffer = []
+        self.runs = []
+        self.rows = 0
+        self._run_dir = None
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.buffer.append(row)
+        self.rows += 1
+        if len(self.buffer) >= self.run_rows:
+            self._spill()
+
+    def extend(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.add(row)
+
+    def _spill(self) -> None:
+        if self._run_dir is None:
+            self._run_dir = tempfile.mkdtemp(prefix='.sort-runs-', dir=self.temp_dir)
+        self.buffer.sort(key=self.key)
+        path = os.path.join(self._run_dir, f"run-{len(self.runs):05d}.ndjson")
+        with open(path, 'w') as f:
+            f.writelines(json.dumps(row) + '\n' for row in self.buffer)
+        self.runs.append(path)
+        self.buffer = []
+
+    def _read_run(self, path: str) -> Iterator[Dict[str, Any]]:
+        with open(path, 'r') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def sorted_rows(self) -> Iterator[Dict[str, Any]]:
+        """Every added row in key order; run files are removed once consumed."""
+        try:
+            if not self.runs:
+                # Everything fit in one run: no need to touch the disk
+                self.buffer.sort(key=self.key)
+                yield from self.buffer
+                return
+            if self.buffer:
+                self._spill()
+            yield from heapq.merge(*(self._read_run(path) for path in self.runs), key=self.key)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.buffer = []
+        if self._run_dir:
+            shutil.rmtree(self._run_dir, ignore_errors=True)
+            self._run_dir = None
+        self.runs = []
+
+def ordered_rows(table: str, rows: Iterable[Dict[str, Any]], order: str = 'generated',
+                 run_rows: int = DEFAULT_RUN_ROWS, temp_dir: Optional[str] = None) -> Iterable[Dict[str, Any]]:
+    """Rows in the requested order, sorted externally unless the order is 'generated'."""
+    key = sort_key(table, order)
+    if key is None:
+        return rows
+    sorter = ExternalSorter(key, run_rows, temp_dir)
+    sorter.extend(rows)
+    return sorter.sorted_rows()
+
+def clustering_ratio(table: str, rows: List[Dict[str, Any]], rows_per_block: int = 1000) -> float:
+    """
+    Average fraction of months a block of consecutive rows spans, as a pruning proxy.
+
+    A block stands in for a micro-partition: 1/months is perfectly clustered
+    (each block holds one month), 1.0 means every block spans every month.
+    """
+    date_column = PARTITION_DATE_COLUMNS[table]
+    months = {date_key(row.get(date_column))[:6] for row in rows}
+    if not rows or not months:
+        return 0.0
+    spans = []
+    for start in range(0, len(rows), rows_per_block):
+        block = rows[start:start + rows_per_block]
+        spans.append(len({date_key(row.get(date_column))[:6] for row in block}) / len(months))
+    return sum(spans) / len(spans)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare fact sort orders: external sort time and date clustering.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--table', choices=sorted(ID_COLUMNS), default='activities', help="Fact table to sort")
+    parser.add_argument('--run-rows', type=int, default=DEFAULT_RUN_ROWS, help="Rows per sorted run kept in memory")
+    args = parser.parse_args()
+
+    rows = load_table(args.data_dir, args.table)
+    print(f"🔀 Sorting {len(rows):,} {args.table} rows in runs of {args.run_rows:,}")
+    print(f"\n{'order':<10} {'runs':>5} {'seconds':>8} {'month span per 1k rows':>23}")
+    for order in SORT_ORDERS:
+        key = sort_key(args.table, order)
+        start = time.perf_counter()
+        if key is None:
+            result, runs = rows, 0
+        else:
+            sorter = ExternalSorter(key, args.run_rows, args.data_dir)
+            sorter.extend(rows)
+            runs = len(sorter.runs) + (1 if sorter.buffer else 0)
+            result = list(sorter.sorted_rows())
+        seconds = time.perf_counter() - start
+        print(f"{order:<10} {runs:>5} {seconds:>8.2f} {clustering_ratio(args.table, result):>22.1%}")
+
+if __name__ == "__main__":
+    main()
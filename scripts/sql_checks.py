@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+Quality checks pushed down as SQL.
+
+Every check in quality_checks.CHECK_REGISTRY has a SQL counterpart here that
+aggregates inside the engine and returns only summary rows, so the data never
+has to be pulled into Python:
+1. Segment values, employee/revenue violations and signup date range (from business_rules)
+2. Missing customers, event types, contract lengths and MRR (from business_rules),
+   first-event-is-new and events after churn
+3. Adoption coverage, status values and mix, and start/completion ordering
+4. Activity mix, automation/success rates and orphaned adoptions
+5. Orphaned foreign keys across all tables
+6. MRR billing consistency (per tier and billing period moments and
+   medians) and >3 std dev outliers
+
+The SQL is generated per dialect: duckdb and sqlite run locally against the
+tables loaded by local_engine.py, and --emit-sql snowflake prints the same
+checks for the Bronze schema so QA can run where the data lives.
+"""
+
+import argparse
+import math
+import time
+from typing import List, Dict, Any, Optional
+
+from business_rules import rule_violation_sql, rules_by_name
+from local_engine import load_dataset
+from quality_checks import (
+    ACTIVITY_RULE_ISSUES, EXPECTED_FRAMEWORKS, FRAMEWORK_REQUIRED_FIELDS,
+    activity_rule_issues, finish_quality_run, print_quality_report, print_mrr_consistency, print_check_timings
+)
+
+CUSTOMERS = 'DIM_CUSTOMERS'
+FRAMEWORKS = 'DIM_COMPLIANCE_FRAMEWORKS'
+EVENTS = 'FACT_SUBSCRIPTION_EVENTS'
+ADOPTIONS = 'FACT_FRAMEWORK_ADOPTIONS'
+ACTIVITIES = 'FACT_COMPLIANCE_ACTIVITIES'
+
+DIALECTS = {
+    'duckdb': {'day_diff': "DATE_DIFF('day', {start}, {end})"},
+    'sqlite': {'day_diff': "CAST(JULIANDAY({end}) - JULIANDAY({start}) AS INTEGER)"},
+    'snowflake': {'day_diff': "DATEDIFF(day, {start}, {end})"}
+}
+
+# Mirrors quality_checks.calculate_annualized_amount
+ANNUALIZATION_FACTORS = {'monthly': 12, 'quarterly': 4, 'annual': 1, 'upfront': 0.5}
+
+# (result key, child table, child column, parent table, parent column, issue text)
+FOREIGN_KEYS = [
+    ('orphaned_events', EVENTS, 'customer_id', CUSTOMERS, 'customer_id',
+     "subscription events reference non-existent customers"),
+    ('orphaned_adoptions', ADOPTIONS, 'customer_id', CUSTOMERS, 'customer_id',
+     "framework adoptions reference non-existent customers"),
+    ('orphaned_activity_customers', ACTIVITIES, 'customer_id', CUSTOMERS, 'customer_id',
+     "activities reference non-existent customers"),
+    ('orphaned_adoption_frameworks', ADOPTIONS, 'framework_id', FRAMEWORKS, 'framework_id',
+     "adoptions reference non-existent frameworks"),
+    ('orphaned_activity_frameworks', ACTIVITIES, 'framework_id', FRAMEWORKS, 'framework_id',
+     "activities reference non-existent frameworks"),
+    ('orphaned_activity_adoptions', ACTIVITIES, 'adoption_id', ADOPTIONS, 'adoption_id',
+     "activities reference non-existent adoptions")
+]
+
+def count_if(condition: str) -> str:
+    """Portable conditional count (COUNT_IF/FILTER are not available everywhere)."""
+    return f"SUM(CASE WHEN {condition} THEN 1 ELSE 0 END)"
+
+def orphan_count_sql(child: str, column: str, parent: str, parent_column: str) -> str:
+    """Distinct child key values with no matching parent row."""
+    return (f"SELECT COUNT(DISTINCT c.{column}) FROM {child} c "
+            f"WHERE c.{column} IS NOT NULL AND NOT EXISTS "
+            f"(SELECT 1 FROM {parent} p WHERE p.{parent_column} = c.{column})")
+
+def distribution_sql(table: str, column: str, order_key: str, where: str = '', default: str = "'unknown'") -> str:
+    """Value counts in first-appearance order, like the dict counters in quality_checks."""
+    where_clause = f" WHERE {where}" if where else ''
+    return (f"SELECT COALESCE({column}, {default}) AS bucket, COUNT(*) AS n FROM {table}{where_clause} "
+            f"GROUP BY COALESCE({column}, {default}) ORDER BY MIN({order_key})")
+
+def annualized_sql(amount: str = 'mrr_amount', period: str = 'billing_period') -> str:
+    branches = ' '.join(f"WHEN '{name}' THEN {amount} * {float(factor)}"
+                        for name, factor in ANNUALIZATION_FACTORS.items())
+    return f"CASE {period} {branches} ELSE {amount} * 1.0 END"
+
+# ---------------------------------------------------------------------------
+# Per-check SQL and result assembly
+# ---------------------------------------------------------------------------
+
+def dim_customers_sql(dialect: Dict[str, str]) -> Dict[str, str]:
+    rules = rules_by_name('customers')
+    day_diff = dialect['day_diff'].format(start='MIN(signup_date)', end='MAX(signup_date)')
+    return {
+        'summary': (
+            f"SELECT COUNT(*), "
+            f"{count_if(rule_violation_sql(rules['segment_values']))}, "
+            f"{count_if(rule_violation_sql(rules['employee_count_by_segment']))}, "
+            f"{count_if(rule_violation_sql(rules['annual_revenue_by_segment']))}, "
+            f"{count_if(rule_violation_sql(rules['signup_date_format']))}, "
+            f"MIN(signup_date), MAX(signup_date), {day_diff} "
+            f"FROM {CUSTOMERS}"
+        ),
+        'segments': distribution_sql(CUSTOMERS, 'segment', 'customer_id')
+    }
+
+def dim_customers_result(rows: Dict[str, List[tuple]]) -> Dict[str, Any]:
+    (total, segment_violations, employee_violations, revenue_violations, invalid_dates,
+     min_date, max_date, span_days) = rows['summary'][0]
+    if not total:
+        return {'error': 'No customer data loaded'}
+    segment_violations = segment_violations or 0
+    employee_violations = employee_violations or 0
+    revenue_violations = revenue_violations or 0
+    date_span_years = (span_days or 0) / 365
+
+    issues = []
+    if invalid_dates:
+        issues.append(f"{invalid_dates} customers have an invalid signup_date")
+    if segment_violations > 0:
+        issues.append(f"{segment_violations} customers have an unknown segment")
+    if employee_violations > 0:
+        issues.append(f"{employee_violations} customers have invalid employee counts for their segment")
+    if revenue_violations > 0:
+        issues.append(f"{revenue_violations} customers have invalid revenue for their segment")
+    if date_span_years < 4:
+        issues.append(f"Date range is too narrow: {date_span_years:.1f} years (expected ~5 years)")
+
+    return {
+        'table': 'DIM_CUSTOMERS',
+        'total_records': total,
+        'segment_distribution': dict(rows['segments']),
+        'segment_violations': segment_violations,
+        'employee_violations': employee_violations,
+        'revenue_violations': revenue_violations,
+        'date_range': {
+            'min_date': str(min_date) if min_date else None,
+            'max_date': str(max_date) if max_date else None,
+            'span_years': date_span_years
+        },
+        'issues': issues
+    }
+
+def dim_frameworks_sql(dialect: Dict[str, str]) -> Dict[str, str]:
+    missing = ', '.join(f"CASE WHEN {field} IS NULL THEN 1 ELSE 0 END" for field in FRAMEWORK_REQUIRED_FIELDS)
+    return {'frameworks': f"SELECT framework_name, {missing} FROM {FRAMEWORKS} ORDER BY framework_id"}
+
+def dim_frameworks_result(rows: Dict[str, List[tuple]]) -> Dict[str, Any]:
+    frameworks = rows['frameworks']
+    if not frameworks:
+        return {'error': 'No framework data loaded'}
+
+    issues = []
+    if len(frameworks) != 8:
+        issues.append(f"Expected 8 frameworks, got {len(frameworks)}")
+
+    actual_frameworks = {row[0] or '' for row in frameworks}
+    missing_frameworks = EXPECTED_FRAMEWORKS - actual_frameworks
+    extra_frameworks = actual_frameworks - EXPECTED_FRAMEWORKS
+    if missing_frameworks:
+        issues.append(f"Missing frameworks: {', '.join(missing_frameworks)}")
+    if extra_frameworks:
+        issues.append(f"Unexpected frameworks: {', '.join(extra_frameworks)}")
+
+    for row in frameworks:
+        for field, is_missing in zip(FRAMEWORK_REQUIRED_FIELDS, row[1:]):
+            if is_missing:
+                issues.append(f"Missing {field} in framework {row[0] or 'unknown'}")
+
+    return {
+        'table': 'DIM_COMPLIANCE_FRAMEWORKS',
+        'total_records': len(frameworks),
+        'expected_frameworks': len(EXPECTED_FRAMEWORKS),
+        'actual_frameworks': list(actual_frameworks),
+        'issues': issues
+    }
+
+def fact_subscription_events_sql(dialect: Dict[str, str]) -> Dict[str, str]:
+    rules = rules_by_name('events')
+    return {
+        'summary': (
+            f"SELECT COUNT(*), COUNT(DISTINCT customer_id), "
+            f"{count_if(rule_violation_sql(rules['contract_length_by_event_type']))}, "
+            f"{count_if(rule_violation_sql(rules['event_type_values']))}, "
+            f"{count_if(rule_violation_sql(rules['mrr_amount_range']))}, "
+            f"(SELECT COUNT(*) FROM {CUSTOMERS}) "
+            f"FROM {EVENTS}"
+        ),
+        'missing_customers': (
+            f"SELECT COUNT(*) FROM {CUSTOMERS} c WHERE NOT EXISTS "
+            f"(SELECT 1 FROM {EVENTS} e WHERE e.customer_id = c.customer_id)"
+        ),
+        'event_types': distribution_sql(EVENTS, 'event_type', 'event_id'),
+        'contract_lengths': distribution_sql(EVENTS, 'contract_length_months', 'event_id',
+                                             where="COALESCE(event_type, '') <> 'churn'", default='0'),
+        'invalid_first_events': (
+            f"SELECT COUNT(*) FROM ("
+            f"SELECT event_type, ROW_NUMBER() OVER (PARTITION BY customer_id ORDER BY event_date, event_id) AS event_rank "
+            f"FROM {EVENTS}) ranked "
+            f"WHERE event_rank = 1 AND COALESCE(event_type, '') <> 'new'"
+        ),
+        'events_after_churn': (
+            f"SELECT COUNT(DISTINCT e.customer_id) FROM {EVENTS} e "
+            f"JOIN (SELECT customer_id, MIN(event_date) AS churn_date FROM {EVENTS} "
+            f"WHERE event_type = 'churn' GROUP BY customer_id) churned "
+            f"ON e.customer_id = churned.customer_id "
+            f"WHERE e.event_date > churned.churn_date"
+        )
+    }
+
+def fact_subscription_events_result(rows: Dict[str, List[tuple]]) -> Dict[str, Any]:
+    total, customers_with_events, unrealistic_contracts, invalid_event_types, negative_mrr, customer_count = rows['summary'][0]
+    if not total:
+        return {'error': 'No subscription events data loaded'}
+    unrealistic_contracts = unrealistic_contracts or 0
+    invalid_event_types = invalid_event_types or 0
+    negative_mrr = negative_mrr or 0
+    missing_customers = rows['missing_customers'][0][0]
+    invalid_first_events = rows['invalid_first_events'][0][0]
+    events_after_churn = rows['events_after_churn'][0][0]
+
+    issues = []
+    if missing_customers:
+        issues.append(f"{missing_customers} customers have no subscription events")
+    if invalid_event_types > 0:
+        issues.append(f"{invalid_event_types} events have an unknown event_type")
+    if unrealistic_contracts > 0:
+        issues.append(f"{unrealistic_contracts} events have unrealistic contract lengths (<12 months)")
+    if negative_mrr > 0:
+        issues.append(f"{negative_mrr} events have a missing or negative mrr_amount")
+    if invalid_first_events > 0:
+        issues.append(f"{invalid_first_events} customers don't have 'new' as their first event")
+    if events_after_churn > 0:
+        issues.append(f"{events_after_churn} customers have events after churn")
+
+    return {
+        'table': 'FACT_SUBSCRIPTION_EVENTS',
+        'total_records': total,
+        'customers_with_events': customers_with_events,
+        'avg_events_per_customer': total / customer_count if customer_count else 0,
+        'event_types': dict(rows['event_types']),
+        'contract_lengths': dict(rows['contract_lengths']),
+        'unrealistic_contracts': unrealistic_contracts,
+        'invalid_event_types': invalid_event_types,
+        'negative_mrr': negative_mrr,
+        'events_after_churn': events_after_churn,
+        'issues': issues
+    }
+
+def fact_framework_adoptions_sql(dialect: Dict[str, str]) -> Dict[str, str]:
+    rules = rules_by_name('adoptions')
+    return {
+        'summary': (
+            f"SELECT COUNT(*), COUNT(DISTINCT customer_id), "
+            f"{count_if(rule_violation_sql(rules['status_values']))}, "
+            f"{count_if(rule_violation_sql(rules['completion_after_start']))}, "
+            f"(SELECT COUNT(*) FROM {CUSTOMERS}) "
+            f"FROM {ADOPTIONS}"
+        ),
+        'missing_customers': (
+            f"SELECT COUNT(*) FROM {CUSTOMERS} c WHERE NOT EXISTS "
+            f"(SELECT 1 FROM {ADOPTIONS} a WHERE a.customer_id = c.customer_id)"
+        ),
+        'framework_counts': distribution_sql(ADOPTIONS, 'framework_id', 'adoption_id', default='NULL'),
+        'status_distribution': distribution_sql(ADOPTIONS, 'status', 'adoption_id')
+    }
+
+def fact_framework_adoptions_result(rows: Dict[str, List[tuple]]) -> Dict[str, Any]:
+    total, customers_with_adoptions, invalid_statuses, temporal_issues, customer_count = rows['summary'][0]
+    if not total:
+        return {'error': 'No framework adoptions data loaded'}
+    invalid_statuses = invalid_statuses or 0
+    temporal_issues = temporal_issues or 0
+    missing_customers = rows['missing_customers'][0][0]
+
+    issues = []
+    if missing_customers:
+        issues.append(f"{missing_customers} customers have no framework adoptions")
+    if invalid_statuses > 0:
+        issues.append(f"{invalid_statuses} adoptions have an unknown status")
+    if temporal_issues > 0:
+        issues.append(f"{temporal_issues} adoptions have invalid date sequences")
+
+    return {
+        'table': 'FACT_FRAMEWORK_ADOPTIONS',
+        'total_records': total,
+        'customers_with_adoptions': customers_with_adoptions,
+        'avg_adoptions_per_customer': total / customer_count if customer_count else 0,
+        'framework_counts': dict(rows['framework_counts']),
+        'status_distribution': dict(rows['status_distribution']),
+        'invalid_statuses': invalid_statuses,
+        'temporal_issues': temporal_issues,
+        'issues': issues
+    }
+
+def fact_compliance_activities_sql(dialect: Dict[str, str]) -> Dict[str, str]:
+    rules = rules_by_name('activities')
+    return {
+        'summary': (
+            f"SELECT COUNT(*), COUNT(DISTINCT customer_id), COUNT(DISTINCT adoption_id), "
+            f"{count_if('automated_flag')}, {count_if('success_flag')}, "
+            f"(SELECT COUNT(*) FROM {CUSTOMERS}), (SELECT COUNT(*) FROM {ADOPTIONS}) "
+            f"FROM {ACTIVITIES}"
+        ),
+        'rule_violations': (
+            "SELECT " + ', '.join(count_if(rule_violation_sql(rules[name])) for name in ACTIVITY_RULE_ISSUES) +
+            f" FROM {ACTIVITIES}"
+        ),
+        'orphaned_adoptions': orphan_count_sql(ACTIVITIES, 'adoption_id', ADOPTIONS, 'adoption_id'),
+        'activity_types': distribution_sql(ACTIVITIES, 'activity_type', 'activity_id')
+    }
+
+def fact_compliance_activities_result(rows: Dict[str, List[tuple]]) -> Dict[str, Any]:
+    (total, unique_customers, unique_adoptions, automated_count, successful_count,
+     customer_count, adoption_count) = rows['summary'][0]
+    if not total:
+        return {'error': 'No compliance activities data loaded'}
+    automation_rate = (automated_count or 0) / total
+    success_rate = (successful_count or 0) / total
+    orphaned_activities = rows['orphaned_adoptions'][0][0]
+    rule_violations = {name: count or 0 for name, count in zip(ACTIVITY_RULE_ISSUES, rows['rule_violations'][0])}
+
+    issues = []
+    if automation_rate > 0.8:
+        issues.append(f"Automation rate unusually high: {automation_rate:.1%}")
+    if success_rate < 0.7 or success_rate > 0.95:
+        issues.append(f"Success rate outside expected range: {success_rate:.1%}")
+    issues.extend(activity_rule_issues(rule_violations))
+    if orphaned_activities:
+        issues.append(f"{orphaned_activities} activities reference non-existent adoptions")
+
+    return {
+        'table': 'FACT_COMPLIANCE_ACTIVITIES',
+        'total_records': total,
+        'unique_customers': unique_customers,
+        'unique_adoptions': unique_adoptions,
+        'activities_per_customer': total / customer_count if customer_count else 0,
+        'activities_per_adoption': total / adoption_count if adoption_count else 0,
+        'activity_types': dict(rows['activity_types']),
+        'automation_rate': automation_rate,
+        'success_rate': success_rate,
+        'rule_violations': rule_violations,
+        'issues': issues
+    }
+
+def foreign_keys_sql(dialect: Dict[str, str]) -> Dict[str, str]:
+    queries = {
+        'distinct_customers': (
+            f"SELECT (SELECT COUNT(DISTINCT customer_id) FROM {CUSTOMERS}), "
+            f"(SELECT COUNT(DISTINCT customer_id) FROM {EVENTS}), "
+            f"(SELECT COUNT(DISTINCT customer_id) FROM {ADOPTIONS}), "
+            f"(SELECT COUNT(DISTINCT customer_id) FROM {ACTIVITIES})"
+        ),
+        'framework_ids': f"SELECT DISTINCT framework_id FROM {FRAMEWORKS} ORDER BY framework_id"
+    }
+    for key, child, column, parent, parent_column, _ in FOREIGN_KEYS:
+        queries[key] = orphan_count_sql(child, column, parent, parent_column)
+    return queries
+
+def foreign_keys_result(rows: Dict[str, List[tuple]]) -> Dict[str, Any]:
+    customers, event_customers, adoption_customers, activity_customers = rows['distinct_customers'][0]
+    framework_ids = [row[0] for row in rows['framework_ids']]
+
+    result = {
+        'foreign_key_checks': 'All table relationships',
+        'customer_ids_in_customers': customers,
+        'customer_ids_in_events': event_customers,
+        'customer_ids_in_adoptions': adoption_customers,
+        'customer_ids_in_activities': activity_customers
+    }
+    issues = []
+    for key, _, _, _, _, message in FOREIGN_KEYS:
+        orphaned = rows[key][0][0]
+        result[key] = orphaned
+        if orphaned:
+            issues.append(f"{orphaned} {message}")
+
+    if len(framework_ids) != 8:
+        issues.append(f"Framework IDs not sequential 1-8: {framework_ids}")
+
+    result['framework_ids'] = framework_ids
+    result['issues'] = issues
+    return result
+
+def median_sql(source: str, group_columns: List[str], value: str = 'amount') -> str:
+    """Median of value per group of source rows, as (group columns..., median)."""
+    groups = ', '.join(group_columns)
+    # 2.0 keeps the division fractional in every dialect before FLOOR picks the middle row(s)
+    return (
+        f"SELECT {groups}, AVG({value}) FROM ("
+        f"SELECT {groups}, {value}, ROW_NUMBER() OVER (PARTITION BY {groups} ORDER BY {value}) AS rn, "
+        f"COUNT(*) OVER (PARTITION BY {groups}) AS n FROM ({source}) amounts) ranked "
+        f"WHERE rn IN (FLOOR((n + 1) / 2.0), FLOOR((n + 2) / 2.0)) GROUP BY {groups}"
+    )
+
+def mrr_billing_consistency_sql(dialect: Dict[str, str]) -> Dict[str, str]:
+    amounts = (
+        f"SELECT event_id, customer_id, COALESCE(product_tier, 'unknown') AS tier, "
+        f"COALESCE(billing_period, 'unknown') AS period, mrr_amount, {annualized_sql()} AS amount "
+        f"FROM {EVENTS} WHERE event_type IN ('new', 'renewal', 'expansion')"
+    )
+    return {
+        'period_stats': (
+            f"SELECT tier, period, COUNT(*), SUM(amount), SUM(amount * amount), MIN(amount), MAX(amount) "
+            f"FROM ({amounts}) amounts GROUP BY tier, period ORDER BY MIN(event_id)"
+        ),
+        # Medians like statistics.median: the middle row, or the mean of the middle
+        # two, by window row number (portable, unlike MEDIAN/PERCENTILE_CONT)
+        'period_medians': median_sql(amounts, ['tier', 'period']),
+        'tier_medians': median_sql(amounts, ['tier']),
+        # Compare squared deviations with 9 * variance so no SQRT is needed
+        'outliers': (
+            f"SELECT a.event_id, a.customer_id, a.tier, a.period, a.mrr_amount, a.amount, t.mean, t.variance "
+            f"FROM ({amounts}) a JOIN ("
+            f"SELECT tier, AVG(amount) AS mean, "
+            f"(SUM(amount * amount) - SUM(amount) * SUM(amount) / COUNT(*)) / (COUNT(*) - 1) AS variance "
+            f"FROM ({amounts}) amounts GROUP BY tier HAVING COUNT(*) > 1) t ON a.tier = t.tier "
+            f"WHERE t.variance > 0 AND (a.amount - t.mean) * (a.amount - t.mean) > 9 * t.variance "
+            f"ORDER BY a.event_id"
+        )
+    }
+
+def _moments(count: int, total: float, total_sq: float, low: float, high: float,
+             median: Optional[float]) -> Dict[str, Any]:
+    variance = (total_sq - total * total / count) / (count - 1) if count > 1 else 0
+    return {
+        'count': count,
+        'mean': total / count,
+        'median': median,
+        'min': low,
+        'max': high,
+        'std_dev': math.sqrt(max(variance, 0))
+    }
+
+def mrr_billing_consistency_result(rows: Dict[str, List[tuple]]) -> Dict[str, Any]:
+    results = {
+        'tier_consistency': {},
+        'billing_period_stats': {},
+        'outliers': [],
+        'issues': []
+    }
+
+    period_medians = {(tier, period): median for tier, period, median in rows['period_medians']}
+    tier_medians = {tier: median for tier, median in rows['tier_medians']}
+
+    by_tier = {}
+    for tier, period, count, total, total_sq, low, high in rows['period_stats']:
+        by_tier.setdefault(tier, {})[period] = (count, total, total_sq, low, high)
+
+    for tier, periods in by_tier.items():
+        tier_stats = {period: _moments(*values, period_medians.get((tier, period)))
+                      for period, values in periods.items()}
+        tier_overall = _moments(
+            sum(v[0] for v in periods.values()),
+            sum(v[1] for v in periods.values()),
+            sum(v[2] for v in periods.values()),
+            min(v[3] for v in periods.values()),
+            max(v[4] for v in periods.values()),
+            tier_medians.get(tier)
+        )
+
+        billing_means = [stats['mean'] for stats in tier_stats.values()]
+        mean_variance = 1.0
+        if len(billing_means) > 1:
+            mean_variance = max(billing_means) / min(billing_means) if min(billing_means) > 0 else 0
+            if mean_variance > 1.2:
+                results['issues'].append(
+                    f"High variance in {tier} tier across billing periods: {mean_variance:.2f}x difference"
+                )
+
+        results['tier_consistency'][tier] = {
+            'overall': tier_overall,
+            'by_billing_period': tier_stats,
+            'billing_period_variance': mean_variance
+        }
+
+    for event_id, customer_id, tier, period, mrr_amount, amount, mean, variance in rows['outliers']:
+        results['outliers'].append({
+            'event_id': event_id,
+            'customer_id': customer_id,
+            'tier': tier,
+            'billing_period': period,
+            'original_amount': mrr_amount,
+            'annualized_amount': amount,
+            'z_score': abs(amount - mean) / math.sqrt(variance),
+            'tier_mean': mean
+        })
+
+    if results['outliers']:
+        results['issues'].append(f"Found {len(results['outliers'])} outlier amounts (>3 std dev from tier mean)")
+
+    return results
+
+# Same names and order as quality_checks.CHECK_REGISTRY
+SQL_CHECK_REGISTRY = [
+    {'name': 'dim_customers', 'sql': dim_customers_sql, 'result': dim_customers_result},
+    {'name': 'dim_frameworks', 'sql': dim_frameworks_sql, 'result': dim_frameworks_result},
+    {'name': 'fact_subscription_events', 'sql': fact_subscription_events_sql,
+     'result': fact_subscription_events_result},
+    {'name': 'fact_framework_adoptions', 'sql': fact_framework_adoptions_sql,
+     'result': fact_framework_adoptions_result},
+    {'name': 'fact_compliance_activities', 'sql': fact_compliance_activities_sql,
+     'result': fact_compliance_activities_result},
+    {'name': 'foreign_keys', 'sql': foreign_keys_sql, 'result': foreign_keys_result},
+    {'name': 'mrr_billing_consistency', 'sql': mrr_billing_consistency_sql,
+     'result': mrr_billing_consistency_result}
+]
+
+SQL_CHECKS_BY_NAME = {spec['name']: spec for spec in SQL_CHECK_REGISTRY}
+
+def generate_check_sql(dialect: str, check_names: Optional[List[str]] = None) -> Dict[str, Dict[str, str]]:
+    """SQL for every selected check in one dialect: {check: {query name: sql}}."""
+    specs = [SQL_CHECKS_BY_NAME[name] for name in check_names] if check_names else SQL_CHECK_REGISTRY
+    return {spec['name']: spec['sql'](DIALECTS[dialect]) for spec in specs}
+
+def run_sql_checks(conn: Any, engine: str, check_names: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run the generated SQL on an open connection and assemble check results."""
+    specs = [SQL_CHECKS_BY_NAME[name] for name in check_names] if check_names else SQL_CHECK_REGISTRY
+    results = {}
+    timings = {}
+    for spec in specs:
+        start = time.perf_counter()
+        queries = spec['sql'](DIALECTS[engine])
+        rows = {name: conn.execute(sql).fetchall() for name, sql in queries.items()}
+        result = spec['result'](rows)
+        elapsed = time.perf_counter() - start
+        result['check_name'] = spec['name']
+        result['elapsed_seconds'] = elapsed
+        results[spec['name']] = result
+        timings[f"check:{spec['name']}"] = elapsed
+    return {'results': results, 'timings': timings}
+
+def print_check_sql(dialect: str) -> None:
+    """Print every check's SQL as a runnable script."""
+    print(f"-- Phantom Sec POC quality checks ({dialect} dialect)")
+    for check_name, queries in generate_check_sql(dialect).items():
+        for query_name, sql in queries.items():
+            print(f"\n-- {check_name}: {query_name}")
+            print(f"{sql};")
+
+def main(argv: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description="Run the quality checks as SQL in an embedded engine.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--engine', choices=['auto', 'duckdb', 'sqlite'], default='auto',
+                        help="Embedded engine (auto prefers duckdb, falls back to sqlite3)")
+    parser.add_argument('--emit-sql', choices=sorted(DIALECTS), default=None,
+                        help="Print the check SQL for a dialect instead of running it")
+    args = parser.parse_args(argv)
+
+    if args.emit_sql:
+        print_check_sql(args.emit_sql)
+        return None
+
+    print("🚀 Running quality checks as SQL...")
+    start = time.perf_counter()
+    conn, engine, row_counts = load_dataset(args.data_dir, args.engine)
+    load_seconds = time.perf_counter() - start
+    print(f"\n📖 Loaded into {engine}: " + ", ".join(f"{count:,} {table}" for table, count in row_counts.items()))
+
+    if not row_counts.get('customers'):
+        print("❌ Could not load customer data. Exiting.")
+        return {'data_dir': args.data_dir, 'tables': row_counts, 'results': {}, 'timings': {'load': load_seconds}}
+
+    run = run_sql_checks(conn, engine)
+    results = run['results']
+    validations = [result for name, result in results.items() if name != 'mrr_billing_consistency']
+    print_quality_report(validations)
+    if 'mrr_billing_consistency' in results:
+        print_mrr_consistency(results['mrr_billing_consistency'])
+    timings = {'load': load_seconds, **run['timings']}
+    print_check_timings(timings)
+    return {'data_dir': args.data_dir, 'tables': row_counts, 'results': results, 'timings': timings}
+
+if __name__ == "__main__":
+    run = main()
+    if run is not None:
+        finish_quality_run(run)
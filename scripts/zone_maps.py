@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Per-shard zone maps: small sidecar metadata that lets readers skip shards.
+
+Every fact output file or shard gets a '<shard>.zonemap' sidecar, built from
+the rows as the writer streams them into the file (no extra scan):
+1. Row count, and the null count of every column
+2. Min/max of every date (as ISO dates), ID and amount column
+3. A bloom filter over customer_id
+
+A shard whose date range cannot overlap a filter window, or whose bloom
+filter rules out a customer, is skipped without being opened
+(prune_shards). The same sidecars answer row count and NOT NULL checks
+for the whole dataset from metadata alone (zone_map_checks). Shards
+without a fresh sidecar are always read.
+"""
+
+import argparse
+import json
+import math
+import os
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+from local_engine import DERIVED_SQL, SETUP_SQL, parse_setup_sql, strptime_format, table_sources
+from quality_checks import finish_quality_run, load_json_data
+from sketches import hash64, pack_bytes, unpack_bytes
+
+ZONE_MAP_SUFFIX = '.zonemap'
+
+# Bump when the sidecar contents change so old sidecars are rebuilt
+ZONE_MAP_VERSION = 1
+
+BLOOM_COLUMN = 'customer_id'
+BLOOM_ERROR_RATE = 0.01
+
+# Fact tables that carry zone maps -> date column used for date-range pruning
+ZONE_MAP_TABLES = {
+    'events': 'event_date',
+    'adoptions': 'start_date',
+    'activities': 'activity_date',
+    'fact_mrr_daily': 'snapshot_date'
+}
+
+NUMERIC_TYPES = ('INTEGER', 'DECIMAL', 'NUMBER', 'FLOAT')
+
+_SCHEMA = {}
+
+class BloomFilter:
+    """Bloom filter sized for `capacity` keys at `error_rate` false positives."""
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE):
+        capacity = max(capacity, 1)
+        self.bits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.data = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, value: Any) -> List[int]:
+        # Double hashing: two 32-bit halves of one 64-bit hash
+        h = hash64(value)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, value: Any) -> None:
+        for position in self._positions(value):
+            self.data[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: Any) -> bool:
+        return all(self.data[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'bits': self.bits, 'hashes': self.hashes, 'data': pack_bytes(bytes(self.data))}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BloomFilter':
+        bloom = cls.__new__(cls)
+        bloom.bits = data['bits']
+        bloom.hashes = data['hashes']
+        bloom.data = bytearray(unpack_bytes(data['data']))
+        return bloom
+
+def table_schema(table: str) -> Dict[str, Any]:
+    """Parsed DDL of a Bronze or derived table, read once per process."""
+    if not _SCHEMA:
+        _SCHEMA.update(parse_setup_sql(SETUP_SQL))
+        _SCHEMA.update(parse_setup_sql(DERIVED_SQL))
+    return _SCHEMA[table]
+
+def zone_columns(table: str) -> List[Tuple[str, str, Optional[str]]]:
+    """(source field, kind, date format) for every loaded column; kind is date, number or text."""
+    columns = []
+    for _, field, cast_type, date_format in table_schema(table)['projections']:
+        if date_format:
+            columns.append((field, 'date', date_format))
+        elif cast_type.split('(')[0].upper() in NUMERIC_TYPES:
+            columns.append((field, 'number', None))
+        else:
+            columns.append((field, 'text', None))
+    return columns
+
+def iso_date(value: Any, date_format: str) -> Optional[str]:
+    """ISO form of a formatted date string, None when it does not parse."""
+    text = str(value)
+    if date_format == 'MM/DD/YYYY' and len(text) == 10 and text[2] == text[5] == '/':
+        return f"{text[6:]}-{text[:2]}-{text[3:5]}"
+    try:
+        return datetime.strptime(text, strptime_format(date_format)).date().isoformat()
+    except ValueError:
+        return None
+
+class ZoneMapAccumulator:
+    """Zone map of one shard, fed rows as they stream past."""
+
+    def __init__(self, table: str):
+        self.table = table
+        self.columns = zone_columns(table)
+        self.stats = {field: {'nulls': 0, 'min': None, 'max': None} for field, _, _ in self.columns}
+        self.invalid_dates = {}
+        self.keys = set()
+        self.row_count = 0
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.row_count += 1
+        for field, kind, date_format in self.columns:
+            value = row.get(field)
+            entry = self.stats[field]
+            if value is None:
+                entry['nulls'] += 1
+                continue
+            if kind == 'text':
+                continue
+            if kind == 'date':
+                value = iso_date(value, date_format)
+                if value is None:
+                    self.invalid_dates[field] = self.invalid_dates.get(field, 0) + 1
+                    continue
+            if entry['min'] is None or value < entry['min']:
+                entry['min'] = value
+            if entry['max'] is None or value > entry['max']:
+                entry['max'] = value
+        if row.get(BLOOM_COLUMN) is not None:
+            self.keys.add(row[BLOOM_COLUMN])
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.add(row)
+
+    def zone_map(self) -> Dict[str, Any]:
+        bloom = None
+        if BLOOM_COLUMN in self.stats:
+            bloom = BloomFilter(len(self.keys))
+            for key in self.keys:
+                bloom.add(key)
+        return {
+            'version': ZONE_MAP_VERSION,
+            'table': self.table,
+            'row_count': self.row_count,
+            'columns': self.stats,
+            'invalid_dates': self.invalid_dates,
+            'bloom': bloom.to_dict() if bloom else None
+        }
+
+def build_zone_map(table: str, rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Zone map of one shard's rows in a single pass."""
+    accumulator = ZoneMapAccumulator(table)
+    accumulator.add_rows(rows)
+    return accumulator.zone_map()
+
+def zone_map_path(shard_path: str) -> str:
+    """Sidecar location for a data file or shard."""
+    return shard_path + ZONE_MAP_SUFFIX
+
+def write_zone_map(shard_path: str, table: str, rows: Optional[List[Dict[str, Any]]] = None,
+                   zone_map: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build the zone map for one shard (unless already built) and write it next to it."""
+    if zone_map is None:
+        if rows is None:
+            rows = load_json_data(shard_path)
+        zone_map = build_zone_map(table, rows)
+    with open(zone_map_path(shard_path), 'w') as f:
+        json.dump(zone_map, f)
+    return zone_map
+
+def load_zone_map(shard_path: str, table: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    The shard's zone map, or None when it is missing or older than the shard.
+
+    With `table`, a missing or stale sidecar is rebuilt (one read of the shard).
+    """
+    sidecar = zone_map_path(shard_path)
+    if os.path.exists(sidecar) and os.path.getmtime(sidecar) >= os.path.getmtime(shard_path):
+        with open(sidecar, 'r') as f:
+            zone_map = json.load(f)
+        if zone_map.get('version') == ZONE_MAP_VERSION:
+            return zone_map
+    return write_zone_map(shard_path, table) if table else None
+
+def shard_may_match(zone_map: Optional[Dict[str, Any]], date_column: Optional[str] = None,
+                    start: Optional[str] = None, end: Optional[str] = None,
+                    customer_id: Optional[int] = None) -> bool:
+    """
+    False only when the zone map proves no row matches.
+
+    start/end are inclusive ISO dates (YYYY-MM-DD) applied to date_column.
+    """
+    if zone_map is None:
+        return True
+    if date_column and (start or end):
+        stats = zone_map['columns'].get(date_column)
+        if stats is not None:
+            if stats['min'] is None:
+                # Every value is null (or unparseable), so no row is in any window
+                return False
+            if (end and stats['min'] > end) or (start and stats['max'] < start):
+                return False
+    if customer_id is not None:
+        stats = zone_map['columns'].get(BLOOM_COLUMN)
+        if stats is not None and (stats['min'] is None or not stats['min'] <= customer_id <= stats['max']):
+            return False
+        if zone_map.get('bloom') and customer_id not in BloomFilter.from_dict(zone_map['bloom']):
+            return False
+    return True
+
+def prune_shards(data_dir: str, table: str, start: Optional[str] = None, end: Optional[str] = None,
+                 customer_id: Optional[int] = None, build_missing: bool = False) -> Tuple[List[str], List[str]]:
+    """Split a table's data files into (may match, skipped) for a date window and/or customer."""
+    kept, skipped = [], []
+    date_column = ZONE_MAP_TABLES.get(table)
+    for path in table_sources(data_dir, table):
+        zone_map = load_zone_map(path, table if build_missing else None)
+        if shard_may_match(zone_map, date_column, start, end, customer_id):
+            kept.append(path)
+        else:
+            skipped.append(path)
+    return kept, skipped
+
+def table_zone_summary(data_dir: str, table: str, build_missing: bool = True) -> Dict[str, Any]:
+    """Merge a table's shard zone maps into table-level counts and ranges."""
+    summary = {'files': 0, 'without_zone_map': 0, 'row_count': 0, 'columns': {}, 'invalid_dates': {}}
+    for path in table_sources(data_dir, table):
+        summary['files'] += 1
+        zone_map = load_zone_map(path, table if build_missing else None)
+        if zone_map is None:
+            summary['without_zone_map'] += 1
+            continue
+        summary['row_count'] += zone_map['row_count']
+        for field, stats in zone_map['columns'].items():
+            merged = summary['columns'].setdefault(field, {'nulls': 0, 'min': None, 'max': None})
+            merged['nulls'] += stats['nulls']
+            if stats['min'] is not None and (merged['min'] is None or stats['min'] < merged['min']):
+                merged['min'] = stats['min']
+            if stats['max'] is not None and (merged['max'] is None or stats['max'] > merged['max']):
+                merged['max'] = stats['max']
+        for field, count in zone_map['invalid_dates'].items():
+            summary['invalid_dates'][field] = summary['invalid_dates'].get(field, 0) + count
+    return summary
+
+def zone_map_checks(summary: Dict[str, Any], table: str) -> List[str]:
+    """NOT NULL and date format violations visible from a table's zone maps."""
+    definition = table_schema(table)
+    not_null = set(definition['not_null'])
+    fields = {field: column for column, field, _, _ in definition['projections']}
+    issues = []
+    for field, stats in summary['columns'].items():
+        if stats['nulls'] and fields[field] in not_null:
+            issues.append(f"{stats['nulls']:,} nulls in NOT NULL column {fields[field]}")
+    for field, count in summary['invalid_dates'].items():
+        issues.append(f"{count:,} {field} values are not valid dates")
+    return issues
+
+def print_zone_summary(table: str, summary: Dict[str, Any], issues: List[str]) -> None:
+    print(f"\n📊 {table_schema(table)['name']}: {summary['row_count']:,} rows in {summary['files']} file(s)")
+    print("-" * 50)
+    for field, stats in summary['columns'].items():
+        if stats['min'] is not None:
+            print(f"  {field:<28} {str(stats['min']):>12} .. {str(stats['max']):<12} nulls {stats['nulls']:,}")
+        elif stats['nulls']:
+            print(f"  {field:<28} {'':>28} nulls {stats['nulls']:,}")
+    for issue in issues:
+        print(f"  ❌ {issue}")
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Build per-shard zone maps, check them, and show which shards a filter reads.")
+    parser.add_argument('--data-dir', default='../data', help="Directory containing the generated JSON files")
+    parser.add_argument('--rebuild', action='store_true', help="Rebuild every zone map before reading them")
+    parser.add_argument('--from', dest='start', default=None, help="Window start as YYYY-MM-DD (shows pruned shards)")
+    parser.add_argument('--to', dest='end', default=None, help="Window end as YYYY-MM-DD (inclusive)")
+    parser.add_argument('--customer-id', type=int, default=None, help="Show the shards that may hold this customer")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        for table in ZONE_MAP_TABLES:
+            for path in table_sources(args.data_dir, table):
+                write_zone_map(path, table)
+
+    print("🗺️  ZONE MAP SUMMARY")
+    print("=" * 80)
+    tables = {}
+    results = {}
+    for table in ZONE_MAP_TABLES:
+        summary = table_zone_summary(args.data_dir, table)
+        if summary['files'] == 0:
+            continue
+        issues = zone_map_checks(summary, table)
+        tables[table] = summary['row_count']
+        results[f'{table}_zone_map'] = {
+            'table': table_schema(table)['name'],
+            'files': summary['files'],
+            'without_zone_map': summary['without_zone_map'],
+            'issues': issues
+        }
+        print_zone_summary(table, summary, issues)
+
+    if args.start or args.end or args.customer_id is not None:
+        print(f"\n🔎 Shards read for {args.start or '...'} - {args.end or '...'}"
+              + (f", customer {args.customer_id}" if args.customer_id is not None else ''))
+        for table in ZONE_MAP_TABLES:
+            kept, skipped = prune_shards(args.data_dir, table, args.start, args.end, args.customer_id)
+            if kept or skipped:
+                print(f"  {table_schema(table)['name']:<32} read {len(kept):>4}, skipped {len(skipped):>4}")
+
+    return {'data_dir': args.data_dir, 'tables': tables, 'results': results, 'timings': {}}
+
+if __name__ == "__main__":
+    finish_quality_run(main())
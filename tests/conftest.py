@@ -0,0 +1,76 @@
+"""
+Shared fixtures: a tiny dataset built with the generators.
+
+The scripts import each other as top-level modules, so scripts/ goes on
+sys.path. The dataset is generated once per session from the first customers
+of data/DIM_CUSTOMERS.json with a seeded random; tests that modify files work
+on a copy (the `dataset` fixture).
+"""
+
+import json
+import os
+import random
+import shutil
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, 'scripts'))
+
+from fact_partitions import write_fact_table  # noqa: E402
+from generate_compliance_activities import generate_compliance_activities  # noqa: E402
+from generate_framework_adoptions import generate_framework_adoptions  # noqa: E402
+from generate_frameworks import generate_compliance_frameworks  # noqa: E402
+from generate_subscription_events import generate_subscription_lifecycle  # noqa: E402
+
+TINY_CUSTOMERS = 12
+SEED = 20240101
+
+class RowCollector:
+    """Accumulator that keeps every generated row."""
+
+    def __init__(self):
+        self.rows = []
+
+    def add_rows(self, rows):
+        self.rows.extend(rows)
+
+def generate_tiny_dataset(data_dir):
+    """Write customers, frameworks and the three fact tables (events partitioned by month) to data_dir."""
+    random.seed(SEED)
+    with open(os.path.join(REPO_DIR, 'data', 'DIM_CUSTOMERS.json'), 'r') as f:
+        customers = json.load(f)[:TINY_CUSTOMERS]
+    frameworks = generate_compliance_frameworks()
+    for name, rows in (('DIM_CUSTOMERS.json', customers), ('DIM_COMPLIANCE_FRAMEWORKS.json', frameworks)):
+        with open(os.path.join(data_dir, name), 'w') as f:
+            json.dump(rows, f, indent=2)
+
+    events = []
+    event_id_counter = 1
+    for customer in customers:
+        customer_events, event_id_counter = generate_subscription_lifecycle(customer, event_id_counter)
+        events.extend(customer_events)
+    adoptions = RowCollector()
+    generate_framework_adoptions(customers, frameworks, [adoptions])
+    activities = RowCollector()
+    generate_compliance_activities(adoptions.rows, frameworks, customers, [activities])
+
+    write_fact_table(data_dir, 'events', events, partitioned=True)
+    write_fact_table(data_dir, 'adoptions', adoptions.rows)
+    write_fact_table(data_dir, 'activities', activities.rows)
+    return {'customers': customers, 'frameworks': frameworks, 'events': events,
+            'adoptions': adoptions.rows, 'activities': activities.rows}
+
+@pytest.fixture(scope='session')
+def tiny_dataset(tmp_path_factory):
+    """(data_dir, generated rows by table) of the shared, read-only tiny dataset."""
+    data_dir = tmp_path_factory.mktemp('data')
+    return str(data_dir), generate_tiny_dataset(str(data_dir))
+
+@pytest.fixture
+def dataset(tiny_dataset, tmp_path):
+    """A private copy of the tiny dataset that a test may modify."""
+    data_dir = tmp_path / 'data'
+    shutil.copytree(tiny_dataset[0], data_dir)
+    return str(data_dir)
@@ -0,0 +1,57 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from bulk_loader import LoadError, bulk_load, load_order
+from local_engine import SETUP_SQL, parse_setup_sql
+
+def test_load_order_puts_parents_first():
+    order = load_order(parse_setup_sql(SETUP_SQL))
+    assert order.index('customers') < order.index('events')
+    assert order.index('frameworks') < order.index('adoptions') < order.index('activities')
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_sqlite_load_reconciles(tiny_dataset, workers):
+    data_dir, generated = tiny_dataset
+    conn = sqlite3.connect(':memory:')
+    results = {result['table']: result for result in bulk_load(conn, data_dir, batch_size=7, workers=workers)}
+
+    expected = {
+        'DIM_CUSTOMERS': len(generated['customers']),
+        'DIM_COMPLIANCE_FRAMEWORKS': len(generated['frameworks']),
+        'FACT_SUBSCRIPTION_EVENTS': len(generated['events']),
+        'FACT_FRAMEWORK_ADOPTIONS': len(generated['adoptions']),
+        'FACT_COMPLIANCE_ACTIVITIES': len(generated['activities'])
+    }
+    assert set(results) == set(expected)
+    for name, rows in expected.items():
+        assert results[name]['reconciled']
+        assert results[name]['rows_read'] == results[name]['rows_loaded'] == rows
+        assert conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0] == rows
+    assert results['FACT_SUBSCRIPTION_EVENTS']['files'] > 1
+
+def test_sqlite_append_and_replace(tiny_dataset):
+    data_dir, generated = tiny_dataset
+    conn = sqlite3.connect(':memory:')
+    bulk_load(conn, data_dir, workers=1)
+    appended = bulk_load(conn, data_dir, workers=1, replace=False)
+    assert all(result['reconciled'] for result in appended)
+    assert conn.execute("SELECT COUNT(*) FROM DIM_CUSTOMERS").fetchone()[0] == 2 * len(generated['customers'])
+
+    bulk_load(conn, data_dir, workers=1)
+    assert conn.execute("SELECT COUNT(*) FROM DIM_CUSTOMERS").fetchone()[0] == len(generated['customers'])
+
+def test_bad_value_aborts_the_table(dataset):
+    path = os.path.join(dataset, 'DIM_CUSTOMERS.json')
+    with open(path, 'r') as f:
+        customers = json.load(f)
+    customers[3]['signup_date'] = 'not a date'
+    with open(path, 'w') as f:
+        json.dump(customers, f)
+
+    conn = sqlite3.connect(':memory:')
+    with pytest.raises(LoadError, match='row 4: signup_date'):
+        bulk_load(conn, dataset, workers=1)
+    assert conn.execute("SELECT COUNT(*) FROM DIM_CUSTOMERS").fetchone()[0] == 0
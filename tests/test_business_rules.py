@@ -0,0 +1,46 @@
+import sqlite3
+
+from business_rules import evaluate_rules, rule_violation_sql, rules_by_name
+
+EVENTS = [
+    {'event_type': 'new', 'contract_length_months': 12, 'mrr_amount': 100},
+    {'event_type': 'renewal', 'contract_length_months': 48, 'mrr_amount': 100},
+    {'event_type': 'expansion', 'contract_length_months': 6, 'mrr_amount': -1},
+    {'event_type': 'churn', 'contract_length_months': 0, 'mrr_amount': 0},
+    {'event_type': 'churn', 'contract_length_months': 5, 'mrr_amount': 0},
+    {'event_type': 'refund', 'contract_length_months': None, 'mrr_amount': None}
+]
+
+ACTIVITIES = [
+    {'activity_type': 'audit', 'control_category': 'monitoring', 'risk_level': 'low', 'duration_minutes': 300},
+    {'activity_type': 'pentest', 'control_category': 'monitoring', 'risk_level': None, 'duration_minutes': -1},
+    {'activity_type': 'training', 'control_category': 'physical', 'risk_level': 'high', 'duration_minutes': None}
+]
+
+def test_contract_lengths_only_flag_short_non_churn_contracts():
+    violations = evaluate_rules('events', EVENTS)
+    assert violations['contract_length_by_event_type'] == [2]
+    assert violations['event_type_values'] == [5]
+    assert violations['mrr_amount_range'] == [2, 5]
+
+def test_activity_rules():
+    assert evaluate_rules('activities', ACTIVITIES) == {
+        'activity_type_values': [1],
+        'control_category_values': [2],
+        'risk_level_values': [1],
+        'duration_minutes_range': [1, 2]
+    }
+
+def test_sql_matches_python():
+    conn = sqlite3.connect(':memory:')
+    for table, rows in (('events', EVENTS), ('activities', ACTIVITIES)):
+        columns = list(rows[0])
+        conn.execute(f"CREATE TABLE {table} ({', '.join(columns)})")
+        conn.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' for _ in columns)})",
+                         [tuple(row[column] for column in columns) for row in rows])
+        expected = evaluate_rules(table, rows)
+        for name, rule in rules_by_name(table).items():
+            if rule['type'] in ('date_format', 'temporal_order'):
+                continue
+            failing = [i for (i,) in conn.execute(f"SELECT rowid - 1 FROM {table} WHERE {rule_violation_sql(rule)}")]
+            assert failing == expected[name], name
@@ -0,0 +1,78 @@
+import csv
+import os
+
+import pytest
+
+from bulk_loader import cast_value, prepare_shard
+from csv_output import (DELIMITED_FORMATS, NULL_MARKER, convert_table, delimited_path, delimited_paths,
+                        delimited_rows, load_sql, table_definitions, write_delimited)
+from fact_partitions import write_fact_table
+from local_engine import table_sources
+from quality_checks import load_json_data, load_table
+
+def read_delimited(path, definition, fmt):
+    """Rows of a delimited file cast the way COPY INTO with the file format would."""
+    with open(path, 'r', newline='') as f:
+        reader = csv.reader(f, delimiter=DELIMITED_FORMATS[fmt]['delimiter'])
+        header = next(reader)
+        rows = []
+        for record in reader:
+            assert len(record) == len(header)
+            values = []
+            for text, (_, _, cast_type, date_format) in zip(record, definition['projections']):
+                if text == NULL_MARKER:
+                    values.append(None)
+                elif date_format:
+                    # DATE_FORMAT = 'YYYY-MM-DD'
+                    values.append(cast_value(text, cast_type, 'YYYY-MM-DD'))
+                else:
+                    values.append(cast_value(text, cast_type, None))
+            rows.append(tuple(values))
+    return header, rows
+
+@pytest.mark.parametrize('fmt', sorted(DELIMITED_FORMATS))
+@pytest.mark.parametrize('table', ['customers', 'frameworks', 'events', 'adoptions', 'activities'])
+def test_delimited_load_matches_json_load(tiny_dataset, tmp_path, table, fmt):
+    data_dir, _ = tiny_dataset
+    definition = table_definitions()[table]
+    for source in table_sources(data_dir, table):
+        path = str(tmp_path / ('out' + DELIMITED_FORMATS[fmt]['suffix']))
+        count = write_delimited(path, table, load_json_data(source), fmt)
+        header, rows = read_delimited(path, definition, fmt)
+        expected, _ = prepare_shard(source, definition['projections'])
+        assert header == [column for column, _ in definition['columns']]
+        assert count == len(rows)
+        assert rows == expected
+
+def test_quoting_nulls_and_empty_strings(tmp_path):
+    rows = [
+        {'customer_id': 1, 'company_name': 'Acme, "Inc"', 'segment': 'smb', 'industry': 'line\nbreak',
+         'signup_date': '03/04/2024', 'employee_count': 10.0, 'annual_revenue': 1000},
+        {'customer_id': 2, 'company_name': '', 'segment': None, 'signup_date': '12/31/2023'}
+    ]
+    definition = table_definitions()['customers']
+    for fmt in DELIMITED_FORMATS:
+        path = str(tmp_path / ('customers' + DELIMITED_FORMATS[fmt]['suffix']))
+        assert list(delimited_rows(path, 'customers', rows, fmt)) == rows
+        _, loaded = read_delimited(path, definition, fmt)
+        by_column = [dict(zip([column for column, _ in definition['columns']], row)) for row in loaded]
+        assert by_column[0]['company_name'] == 'Acme, "Inc"'
+        assert by_column[0]['industry'] == 'line\nbreak'
+        assert by_column[0]['signup_date'] == '2024-03-04'
+        assert by_column[0]['employee_count'] == 10
+        assert by_column[1]['company_name'] == ''
+        assert by_column[1]['segment'] is None
+        assert by_column[1]['industry'] is None
+
+def test_delimited_copy_follows_partitions(dataset):
+    json_paths = write_fact_table(dataset, 'events', load_table(dataset, 'events'), partitioned=True, delimited='tsv')
+    definition = table_definitions()['events']
+    assert delimited_paths(dataset, definition, 'tsv') == sorted(delimited_path(path, 'tsv') for path in json_paths)
+    assert delimited_paths(dataset, definition, 'csv') == []
+
+    written = convert_table(dataset, 'events', 'csv')
+    assert written == [delimited_path(path, 'csv') for path in json_paths]
+    assert delimited_paths(dataset, definition, 'tsv') == []
+    sql = load_sql(dataset, 'csv', tables=['events'])
+    assert sql.count('PUT file://') == len(written)
+    assert all(os.path.basename(path) in sql for path in written)
@@ -0,0 +1,63 @@
+import os
+
+from dataset_diff import build_manifest, diff_manifests, load_manifest, reload_plan, save_manifest
+from fact_partitions import remove_table_files, write_fact_table
+from incremental_checks import month_key
+from quality_checks import load_table
+
+def changes_by_table(base_dir, target_dir):
+    base, target = build_manifest(base_dir), build_manifest(target_dir)
+    return {change['table']: change for change in diff_manifests(base, target)}, base, target
+
+def test_identical_copies(tiny_dataset, dataset, tmp_path):
+    base, target = build_manifest(tiny_dataset[0]), build_manifest(dataset)
+    assert base['root'] == target['root']
+    assert diff_manifests(base, target) == []
+    assert 'Datasets are identical' in reload_plan([], base, target)
+
+    path = str(tmp_path / 'manifests' / 'base.json')
+    save_manifest(base, path)
+    assert load_manifest(path) == base
+
+def test_changed_month_is_merged(tiny_dataset, dataset):
+    events = load_table(dataset, 'events')
+    event = events[len(events) // 2]
+    event['mrr_amount'] += 1
+    write_fact_table(dataset, 'events', events, partitioned=True)
+    month = month_key(event['event_date'])
+
+    changes, base, target = changes_by_table(tiny_dataset[0], dataset)
+    assert list(changes) == ['events']
+    change = changes['events']
+    assert (change['added'], change['changed'], change['removed']) == ([], [month], [])
+    assert change['put_files'] == target['tables']['events']['partitions'][month]['files']
+    assert change['strategy'] == 'merge'
+    assert change['rows_changed'] == sum(1 for row in events if month_key(row['event_date']) == month)
+    plan = reload_plan(list(changes.values()), base, target)
+    assert plan.count('PUT file://') == 1
+    assert 'MERGE INTO FACT_SUBSCRIPTION_EVENTS' in plan
+
+def test_new_month_is_copied(tiny_dataset, dataset):
+    events = load_table(dataset, 'events')
+    appended = dict(events[-1], event_id=max(row['event_id'] for row in events) + 1, event_date='01/15/2099')
+    write_fact_table(dataset, 'events', events + [appended], partitioned=True)
+
+    changes, base, target = changes_by_table(tiny_dataset[0], dataset)
+    change = changes['events']
+    assert (change['added'], change['changed'], change['removed']) == (['2099-01'], [], [])
+    assert change['strategy'] == 'copy'
+    assert change['rows_changed'] == 1
+    assert 'COPY INTO FACT_SUBSCRIPTION_EVENTS' in reload_plan(list(changes.values()), base, target)
+
+def test_removed_and_added_tables(tiny_dataset, dataset):
+    remove_table_files(dataset, 'activities')
+    changes, _, _ = changes_by_table(tiny_dataset[0], dataset)
+    assert list(changes) == ['activities']
+    assert changes['activities']['status'] == 'removed'
+    assert changes['activities']['remove_files']
+
+    changes, _, _ = changes_by_table(dataset, tiny_dataset[0])
+    assert changes['activities']['status'] == 'added'
+    assert changes['activities']['strategy'] == 'copy'
+    assert changes['activities']['rows_total'] == len(tiny_dataset[1]['activities'])
+    assert os.path.exists(os.path.join(tiny_dataset[0], changes['activities']['put_files'][0]))
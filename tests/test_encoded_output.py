@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from encoded_output import EncodedTable, encode_rows, plain_rows
+from fact_partitions import write_fact_table
+from quality_checks import ENCODED_SUFFIX, TABLE_FILES, load_table, table_paths
+from row_index import lookup
+
+@pytest.mark.parametrize('table', ['customers', 'events', 'adoptions', 'activities'])
+def test_round_trip(tiny_dataset, table):
+    rows = tiny_dataset[1][table]
+    payload = json.loads(json.dumps(encode_rows(table, rows)))
+    decoded = EncodedTable(payload)
+    assert len(decoded) == len(rows)
+    assert decoded.to_dicts() == rows
+    assert list(plain_rows(decoded)) == rows
+    assert decoded[5:8] == rows[5:8]
+
+def test_missing_fields_and_null_flags():
+    rows = [
+        {'activity_id': 1, 'activity_type': 'scan', 'automated_flag': True, 'success_flag': None},
+        {'activity_id': 2, 'automated_flag': False},
+        {'activity_id': 3, 'activity_type': None, 'automated_flag': None, 'success_flag': False}
+    ]
+    decoded = EncodedTable(encode_rows('activities', rows))
+    assert decoded.to_dicts() == [
+        {'activity_id': 1, 'activity_type': 'scan', 'automated_flag': True, 'success_flag': None},
+        {'activity_id': 2, 'activity_type': None, 'automated_flag': False, 'success_flag': None},
+        {'activity_id': 3, 'activity_type': None, 'automated_flag': None, 'success_flag': False}
+    ]
+    assert decoded.codes('activity_type') == [0, None, None]
+    with pytest.raises(KeyError):
+        decoded.codes('activity_id')
+
+def test_empty_and_unknown_format():
+    assert EncodedTable(encode_rows('events', [])).to_dicts() == []
+    with pytest.raises(ValueError):
+        EncodedTable({'format': 99})
+
+def test_encode_then_decode_files(dataset):
+    plain = load_table(dataset, 'events')
+    written = write_fact_table(dataset, 'events', plain, partitioned=True, encoded=True)
+    assert written and all(path.endswith(ENCODED_SUFFIX) for path in written)
+    assert table_paths(dataset, TABLE_FILES['events']) == written
+    assert [dict(row) for row in load_table(dataset, 'events')] == plain
+
+    decoded = write_fact_table(dataset, 'events', load_table(dataset, 'events'), partitioned=True)
+    assert not any(path.endswith(ENCODED_SUFFIX) for path in decoded)
+    assert load_table(dataset, 'events') == plain
+
+def test_row_index_scans_encoded_files(dataset, tiny_dataset):
+    customer_id = tiny_dataset[1]['customers'][0]['customer_id']
+    expected = lookup(dataset, 'activities', 'customer_id', customer_id)
+    assert expected
+    write_fact_table(dataset, 'activities', load_table(dataset, 'activities'), encoded=True)
+    assert lookup(dataset, 'activities', 'customer_id', customer_id) == expected
@@ -0,0 +1,63 @@
+import glob
+import json
+import os
+from datetime import date, timedelta
+
+from quality_checks import load_table
+from revenue_snapshots import BRIDGE_TABLE, DAILY_TABLE, build_revenue_snapshots, format_day, month_start, parse_day
+
+AS_OF = date.today()
+
+def snapshot_outputs(data_dir):
+    """File name -> parsed content of every daily shard and the bridge."""
+    outputs = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, DAILY_TABLE, '*.json'))) + \
+            [os.path.join(data_dir, f"{BRIDGE_TABLE}.json")]:
+        with open(path, 'r') as f:
+            outputs[os.path.relpath(path, data_dir)] = json.load(f)
+    return outputs
+
+def full_build(data_dir, events, as_of=AS_OF):
+    summary = build_revenue_snapshots(data_dir, as_of, events=events, full=True)
+    assert summary['mode'] == 'full'
+    return snapshot_outputs(data_dir)
+
+def test_appended_events_match_a_rebuild(dataset, tmp_path):
+    events = sorted(load_table(dataset, 'events'), key=lambda event: event['event_id'])
+    # The last customers' events are appended; their dates reach back before the first as_of
+    known = events[:-8]
+    first_as_of = AS_OF - timedelta(days=75)
+    build_revenue_snapshots(dataset, first_as_of, events=known)
+    summary = build_revenue_snapshots(dataset, AS_OF, events=events)
+    assert summary['mode'] == 'incremental'
+    assert summary['appended_events'] == 8
+    earliest = min(parse_day(event['event_date']) for event in events[-8:])
+    assert earliest < first_as_of
+    assert summary['rewritten_from'] == format_day(month_start(earliest))
+
+    rebuild_dir = str(tmp_path / 'rebuild')
+    os.makedirs(rebuild_dir)
+    assert snapshot_outputs(dataset) == full_build(rebuild_dir, events)
+
+def test_later_as_of_only_extends(dataset, tmp_path):
+    events = load_table(dataset, 'events')
+    build_revenue_snapshots(dataset, AS_OF - timedelta(days=40), events=events)
+    summary = build_revenue_snapshots(dataset, AS_OF, events=events)
+    assert summary['mode'] == 'incremental'
+    assert summary['appended_events'] == 0
+
+    rebuild_dir = str(tmp_path / 'rebuild')
+    os.makedirs(rebuild_dir)
+    assert snapshot_outputs(dataset) == full_build(rebuild_dir, events)
+
+def test_edited_or_earlier_snapshots_rebuild(dataset):
+    events = load_table(dataset, 'events')
+    build_revenue_snapshots(dataset, AS_OF, events=events)
+
+    edited = [dict(event) for event in events]
+    edited[0]['mrr_amount'] += 100
+    assert build_revenue_snapshots(dataset, AS_OF, events=edited)['mode'] == 'full'
+    assert build_revenue_snapshots(dataset, AS_OF - timedelta(days=30), events=edited)['mode'] == 'full'
+    # Shards past the earlier as_of are gone, as in a rebuild
+    months = sorted(os.path.basename(path)[:7] for path in glob.glob(os.path.join(dataset, DAILY_TABLE, '*.json')))
+    assert months[-1] == (AS_OF - timedelta(days=30)).strftime('%Y-%m')